@@ -16,7 +16,7 @@ import traceback
 from collections import defaultdict
 
 from typing import List, Dict, Optional, Union, Set, Any, cast
-from six import string_types, iteritems, itervalues, iterkeys, StringIO
+from six import string_types, iteritems, itervalues, iterkeys, viewkeys, StringIO
 from six.moves.cPickle import load, dump, dumps  # type: ignore
 
 import numpy as np  # type: ignore
@@ -31,6 +31,14 @@ from pyNastran.bdf.field_writer_16 import print_card_16, print_field_16
 
 from pyNastran.bdf.cards.base_card import _format_comment
 from pyNastran.bdf.cards.utils import wipe_empty_fields
+from pyNastran.bdf.bdf_interface.bulk_tokenizer import (
+    BULK_CARD_NAMES, BULK_ADD_CARD_NAMES, tokenize_bulk_cards, create_bulk_cards,
+    gc_disabled)
+from pyNastran.bdf.bdf_interface.bdf_parallel import (
+    split_bulk_data_lines, parse_bulk_data_lines, get_worker_settings, read_bulk_data_worker,
+    unpack_worker_output, start_workers, collect_workers)
+from pyNastran.bdf.bdf_interface.bdf_cache import (
+    get_cache_filename, get_cache_stamp, get_cache_key, load_cached_cards, save_cached_cards)
 
 #from pyNastran.bdf.write_path import write_include
 from pyNastran.bdf.bdf_interface.assign_type import (integer,
@@ -149,7 +157,8 @@ from pyNastran.bdf.bdf_interface.pybdf import (
 
 def read_bdf(bdf_filename=None, validate=True, xref=True, punch=False,
              skip_cards=None, read_cards=None,
-             encoding=None, log=None, debug=True, mode='msc'):
+             encoding=None, log=None, debug=True, mode='msc', nworkers=None,
+             cache_dir=None):
     # type: (Union[str, None], bool, bool, bool, Union[List[str], None], Union[str, None], Union[SimpleLogger, None], Optional[bool], str) -> BDF
     """
     Creates the BDF object
@@ -183,6 +192,15 @@ def read_bdf(bdf_filename=None, validate=True, xref=True, punch=False,
     mode : str; default='msc'
         the type of Nastran
         valid_modes = {'msc', 'nx'}
+    nworkers : int; default=None
+        the number of processes to group and tokenize the INCLUDE files
+        with; the high-volume cards (e.g., GRID, CQUAD4) are still
+        created by this process
+        None/1 : read the cards in this process
+    cache_dir : str; default=None
+        the directory to cache the parsed INCLUDE files in; an INCLUDE
+        file that hasn't changed is loaded from the cache
+        None : don't use a cache
 
     Returns
     -------
@@ -218,7 +236,8 @@ def read_bdf(bdf_filename=None, validate=True, xref=True, punch=False,
     elif read_cards:
         model.set_cards(read_cards)
     model.read_bdf(bdf_filename=bdf_filename, validate=validate,
-                   xref=xref, punch=punch, read_includes=True, encoding=encoding)
+                   xref=xref, punch=punch, read_includes=True, encoding=encoding,
+                   nworkers=nworkers, cache_dir=cache_dir)
 
     #if 0:
         ### TODO: remove all the extra methods
@@ -351,6 +370,15 @@ class BDF_(BDFMethods, GetCard, AddCards, WriteMesh, UnXrefMesh):
         # flag that allows for OpenMDAO-style optimization syntax to be used
         self._is_dynamic_syntax = False
 
+        #: tokenize the high-volume cards (e.g., GRID, CQUAD4) in bulk
+        #: instead of one card at a time; see bulk_tokenizer.py
+        self.use_bulk_tokenizer = True
+
+        #: the cached SpatialIndex; see ``spatial_index``
+        self._spatial_index = None
+        #: the cached Connectivity; see ``connectivity``
+        self._connectivity = None
+
         # lines that were rejected b/c they were for a card that isnt supported
         self.reject_lines = []  # type: List[List[str]]
 
@@ -648,6 +676,8 @@ class BDF_(BDFMethods, GetCard, AddCards, WriteMesh, UnXrefMesh):
         state = self.__dict__.copy()
         # Remove the unpicklable entries.
         del state['_card_parser'], state['log']
+        state['_spatial_index'] = None
+        state['_connectivity'] = None
         if hasattr(self, '_card_parser_b'):
             del state['_card_parser_b']
         if hasattr(self, '_card_parser_prepare'):
@@ -698,7 +728,7 @@ class BDF_(BDFMethods, GetCard, AddCards, WriteMesh, UnXrefMesh):
             'material_ids', 'caero_ids', 'is_long_ids',
             'nnodes', 'ncoords', 'nelements', 'nproperties',
             'nmaterials', 'ncaeros', 'nid_map',
-            'is_bdf_vectorized',
+            'is_bdf_vectorized', 'spatial_index', 'connectivity',
 
             'point_ids', 'subcases',
             '_card_parser', '_card_parser_b', '_card_parser_prepare',
@@ -1147,7 +1177,8 @@ class BDF_(BDFMethods, GetCard, AddCards, WriteMesh, UnXrefMesh):
         self.include_dir = obj.include_dir
 
     def read_bdf(self, bdf_filename=None,
-                 validate=True, xref=True, punch=False, read_includes=True, encoding=None):
+                 validate=True, xref=True, punch=False, read_includes=True, encoding=None,
+                 nworkers=None, cache_dir=None):
         """
         Read method for the bdf files
 
@@ -1165,6 +1196,17 @@ class BDF_(BDFMethods, GetCard, AddCards, WriteMesh, UnXrefMesh):
             indicates whether INCLUDE files should be read
         encoding : str; default=None -> system default
             the unicode encoding
+        nworkers : int; default=None
+            the number of processes to group and tokenize the cards
+            with; the INCLUDE files in the bulk data deck are split
+            between the processes, while the high-volume cards (e.g.,
+            GRID, CQUAD4) are still created by this process
+            None/1 : read the cards in this process
+        cache_dir : str; default=None
+            the directory to cache the parsed INCLUDE files in; an
+            INCLUDE file that hasn't changed (including its nested
+            INCLUDE files) is loaded from the cache
+            None : don't use a cache
 
         .. code-block:: python
 
@@ -1206,6 +1248,7 @@ class BDF_(BDFMethods, GetCard, AddCards, WriteMesh, UnXrefMesh):
 
         cards_list = []
         cards_dict = {}
+        card_count = {}
         if self._is_cards_dict:
             cards_dict, card_count = self.get_bdf_cards_dict(bulk_data_lines)
             #if 0:
@@ -1217,7 +1260,8 @@ class BDF_(BDFMethods, GetCard, AddCards, WriteMesh, UnXrefMesh):
                             ##bdf_file_obj.write(comment + '\n')
                             #bdf_file_obj.write('\n'.join(cardlines) + '\n')
                         #bdf_file_obj.write('\n')
-        else:
+        elif not self._parse_cards_includes(bulk_data_lines, obj.bulk_include_ranges,
+                                            obj.bulk_include_files, nworkers, cache_dir):
             cards_list, cards_dict, card_count = self.get_bdf_cards(bulk_data_lines)
             #for card in cards:
                 #print(card)
@@ -3641,6 +3685,51 @@ class BDF_(BDFMethods, GetCard, AddCards, WriteMesh, UnXrefMesh):
             #raise RuntimeError(msg)
         return ncoords, cord1s_to_update, cord2s_to_update, nids_checked
 
+    @property
+    def spatial_index(self):
+        """
+        Gets the cached SpatialIndex, which has a node KD-tree and an
+        element bounding box tree for point, box, ray and closest
+        node/element queries.
+
+        The index is rebuilt when the nodes, elements or coordinate
+        systems are added/removed or a node is moved with ``set_position``.
+        Call ``clear_spatial_index`` after changing ``node.xyz`` or
+        ``elem.nodes`` directly.
+        """
+        from pyNastran.bdf.mesh_utils.spatial_index import SpatialIndex
+        spatial_index = getattr(self, '_spatial_index', None)
+        if spatial_index is None or not spatial_index.is_valid(self):
+            spatial_index = SpatialIndex(self)
+            self._spatial_index = spatial_index
+        return spatial_index
+
+    def clear_spatial_index(self):
+        """clears the cached SpatialIndex (e.g., after moving nodes)"""
+        self._spatial_index = None
+
+    @property
+    def connectivity(self):
+        """
+        Gets the cached Connectivity, which has the element node arrays
+        grouped by element type and the CSR node->element and
+        element->element adjacency.
+
+        The connectivity is rebuilt when the nodes or elements are
+        added/removed.  Call ``clear_connectivity`` after changing the
+        nodes of an element.
+        """
+        from pyNastran.bdf.mesh_utils.connectivity import Connectivity
+        connectivity = getattr(self, '_connectivity', None)
+        if connectivity is None or not connectivity.is_valid(self):
+            connectivity = Connectivity(self)
+            self._connectivity = connectivity
+        return connectivity
+
+    def clear_connectivity(self):
+        """clears the cached Connectivity (e.g., after changing element nodes)"""
+        self._connectivity = None
+
     @property
     def is_bdf_vectorized(self):
         """Returns False for the ``BDF`` class"""
@@ -3754,30 +3843,295 @@ class BDF_(BDFMethods, GetCard, AddCards, WriteMesh, UnXrefMesh):
 
         self.echo = False
         if cards_dict: # self._is_cards_dict = True
-            for card_name, cards in sorted(iteritems(cards_dict)):
-                if self.is_reject(card_name):
-                    self.log.info('    rejecting card_name = %s' % card_name)
-                    for comment, card_lines in cards:
-                        self.increase_card_count(card_name)
-                        self.reject_lines.append([_format_comment(comment)] + card_lines)
-                else:
-                    for comment, card_lines in cards:
-                        self.add_card(card_lines, card_name, comment=comment,
-                                      is_list=False, has_none=False)
+            self._parse_cards_dict(cards_dict)
         if cards_list:
-            # this is the block that actually runs
-            for card in cards_list:
-                card_name, comment, card_lines = card
-                if card_name is None:
-                    msg = 'card_name = %r\n' % card_name
-                    msg += 'card_lines = %s' % card_lines
-                    raise RuntimeError(msg)
-                if self.is_reject(card_name):
-                    self.reject_card_lines(card_name, card_lines, comment)
-                else:
+            card_columns, card_fields = self._tokenize_bulk_cards(cards_list)
+            with gc_disabled():
+                card_objects = create_bulk_cards(cards_list, card_columns)
+
+                # this is the block that actually runs
+                self._parse_cards_list(cards_list, card_objects, card_fields)
+
+    def _parse_cards_dict(self, cards_dict):
+        """adds the cards that are grouped by card name (e.g., BAROR)"""
+        for card_name, cards in sorted(iteritems(cards_dict)):
+            if self.is_reject(card_name):
+                self.log.info('    rejecting card_name = %s' % card_name)
+                for comment, card_lines in cards:
+                    self.increase_card_count(card_name)
+                    self.reject_lines.append([_format_comment(comment)] + card_lines)
+            else:
+                for comment, card_lines in cards:
                     self.add_card(card_lines, card_name, comment=comment,
                                   is_list=False, has_none=False)
 
+    def _parse_cards_list(self, cards_list, card_objects, card_fields):
+        """
+        adds the cards in order
+
+        Parameters
+        ----------
+        cards_list : List[[card_name, comment, card_lines], ...]
+            the cards from ``get_bdf_cards``
+        card_objects : dict[icard] = card
+            the cards that were already created
+        card_fields : dict[icard] = List[str/None]
+            the fields of the cards that were already tokenized
+
+        """
+        # the runs of GRIDs/elements that were already created
+        icards_bulk = []
+        for icard, card in enumerate(cards_list):
+            card_name, comment, card_lines = card
+            if card_name is None:
+                msg = 'card_name = %r\n' % card_name
+                msg += 'card_lines = %s' % card_lines
+                raise RuntimeError(msg)
+            if card_name in BULK_ADD_CARD_NAMES and icard in card_objects:
+                icards_bulk.append(icard)
+                continue
+            if icards_bulk:
+                self._add_bulk_card_objects(cards_list, icards_bulk, card_objects)
+                icards_bulk = []
+
+            if self.is_reject(card_name):
+                self.reject_card_lines(card_name, card_lines, comment)
+            elif icard in card_objects:
+                self._add_bulk_card_object(card_objects.pop(icard), card_name,
+                                           card_lines, comment)
+            elif icard in card_fields:
+                card = card_fields.pop(icard)
+                self.increase_card_count(card_name)
+                self._add_card_helper(BDFCard(card, has_none=False), card_name,
+                                      card_name, comment)
+            else:
+                self.add_card(card_lines, card_name, comment=comment,
+                              is_list=False, has_none=False)
+        if icards_bulk:
+            self._add_bulk_card_objects(cards_list, icards_bulk, card_objects)
+
+    def _add_bulk_card_objects(self, cards_list, icards, card_objects):
+        """
+        Adds a run of GRIDs/elements that were created by the bulk tokenizer
+
+        The nodes/elements are added with a dict update, which is the same
+        as adding them one at a time when the IDs are positive and aren't
+        already used.  Otherwise, they're added one at a time, so the
+        duplicate checks are the same.
+
+        Parameters
+        ----------
+        cards_list : List[[card_name, comment, card_lines], ...]
+            the cards from ``get_bdf_cards``
+        icards : List[int]
+            the cards in the run
+        card_objects : dict[icard] = card
+            the cards that were already created (the run is popped)
+
+        """
+        cards = [card_objects.pop(icard) for icard in icards]
+        nodes = []
+        elements = []
+        card_count = {}
+        for icard, card in zip(icards, cards):
+            card_name = cards_list[icard][0]
+            if card_name == 'GRID':
+                nodes.append((card.nid, card))
+            else:
+                elements.append((card.eid, card))
+            card_count[card_name] = card_count.get(card_name, 0) + 1
+
+        if not(_is_new_ids(self.nodes, nodes) and _is_new_ids(self.elements, elements)):
+            for icard, card in zip(icards, cards):
+                card_name, comment, card_lines = cards_list[icard]
+                self._add_bulk_card_object(card, card_name, card_lines, comment)
+            return
+
+        self.nodes.update(nodes)
+        self.elements.update(elements)
+        type_to_id_map = self._type_to_id_map
+        type_to_id_map['GRID'].extend(nid for nid, unused_node in nodes)
+        for eid, elem in elements:
+            type_to_id_map[elem.type].append(eid)
+        for card_name, count in iteritems(card_count):
+            self.increase_card_count(card_name, count)
+
+    def _parse_cards_includes(self, bulk_data_lines, include_ranges, include_files,
+                              nworkers, cache_dir):
+        """
+        Groups and tokenizes the INCLUDE files with a process pool and/or
+        loads them from the cache and adds the cards to the deck in order
+
+        Parameters
+        ----------
+        bulk_data_lines : List[str]
+            the bulk data lines
+        include_ranges : List[[istart, iend], ...]
+            the lines of the top level INCLUDE files
+        include_files : List[List[(str, float, int)]]
+            the (filename, mtime, size) of the top level INCLUDE files
+            and their nested INCLUDE files
+        nworkers : int / None
+            the number of processes, including this one
+        cache_dir : str / None
+            the directory with the cached INCLUDE files
+
+        Returns
+        -------
+        is_parsed : bool
+            False if the deck wasn't split, so the cards weren't added
+
+        """
+        use_workers = nworkers is not None and nworkers >= 2
+        if not (use_workers or cache_dir) or self._is_dynamic_syntax:
+            return False
+        for line in bulk_data_lines:
+            if line[:6].upper() == 'ECHOON':
+                # the cards are printed as they're added
+                return False
+
+        pieces = split_bulk_data_lines(bulk_data_lines, include_ranges)
+        ipieces_include = [ipiece for ipiece, (unused_istart, unused_iend, iinclude)
+                           in enumerate(pieces) if iinclude is not None]
+        if not ipieces_include:
+            return False
+
+        settings = get_worker_settings(self)
+        results = {}
+        cache_stamps = {}
+        if cache_dir:
+            for ipiece in ipieces_include:
+                istart, iend, iinclude = pieces[ipiece]
+                include_filename = include_files[iinclude][0][0]
+                cache_filename = get_cache_filename(cache_dir, include_filename)
+                # the comments in front of the first card may be in the main file
+                include_start, include_end = include_ranges[iinclude]
+                outer_lines = (bulk_data_lines[istart:include_start] +
+                               bulk_data_lines[include_end:iend])
+                cache_stamp = get_cache_stamp(include_files[iinclude], outer_lines,
+                                              settings)
+                out, is_current = load_cached_cards(
+                    cache_filename, cache_stamp, bulk_data_lines[istart:iend], settings)
+                if out is not None:
+                    results[ipiece] = out
+                if not is_current:
+                    cache_stamps[ipiece] = (cache_filename, cache_stamp)
+            self.log.debug('loaded %i of %i INCLUDE files from %r' % (
+                len(results), len(ipieces_include), cache_dir))
+        ipieces_parse = [ipiece for ipiece in ipieces_include if ipiece not in results]
+
+        if use_workers and ipieces_parse:
+            # the workers create the cards of the INCLUDE files, while the
+            # cards of the main file are grouped here
+            self.log.debug('parsing %i INCLUDE files with %i processes' % (
+                len(ipieces_parse), nworkers))
+            pool, jobs = start_workers(bulk_data_lines, pieces, ipieces_parse,
+                                       settings, nworkers)
+        else:
+            for ipiece in ipieces_parse:
+                istart, iend = pieces[ipiece][:2]
+                results[ipiece] = read_bulk_data_worker(bulk_data_lines[istart:iend],
+                                                        settings)
+            pool, jobs = None, {}
+
+        try:
+            for ipiece, (istart, iend, iinclude) in enumerate(pieces):
+                if iinclude is None:
+                    results[ipiece] = parse_bulk_data_lines(
+                        self, bulk_data_lines[istart:iend], create_objects=False)
+        except:
+            if pool is not None:
+                pool.terminate()
+            raise
+        if pool is not None:
+            results.update(collect_workers(pool, jobs))
+
+        for ipiece, (cache_filename, cache_stamp) in sorted(iteritems(cache_stamps)):
+            istart, iend = pieces[ipiece][:2]
+            cache_key = get_cache_key(bulk_data_lines[istart:iend], settings)
+            save_cached_cards(cache_filename, cache_stamp, cache_key, results[ipiece])
+
+        with gc_disabled():
+            self._add_pieces(pieces, results)
+        return True
+
+    def _add_pieces(self, pieces, results):
+        """
+        Creates the high-volume cards of each piece of the deck and adds
+        the cards in order
+
+        Parameters
+        ----------
+        pieces : List[(istart, iend, iinclude), ...]
+            the pieces from ``split_bulk_data_lines``
+        results : dict[ipiece] = varies
+            the output of ``parse_bulk_data_lines`` for the main file and
+            ``read_bulk_data_worker`` for the INCLUDE files
+
+        """
+        # the BAROR/BEAMOR cards are added first like in _parse_cards
+        cards_dict = defaultdict(list)
+        parsed_cards = []
+        for ipiece in range(len(pieces)):
+            out = results.pop(ipiece)
+            if pieces[ipiece][2] is not None:
+                out = unpack_worker_output(out)
+            (cards_list, cards_dicti, card_columns, card_objects, card_fields,
+             is_enddata) = out
+            for card_name, cards in iteritems(cards_dicti):
+                cards_dict[card_name].extend(cards)
+            parsed_cards.append((cards_list, card_columns, card_objects, card_fields))
+            if is_enddata:
+                self.card_count['ENDDATA'] = 1
+                break
+
+        self.echo = False
+        self._parse_cards_dict(cards_dict)
+        for cards_list, card_columns, card_objects, card_fields in parsed_cards:
+            card_objects.update(create_bulk_cards(cards_list, card_columns))
+            self._parse_cards_list(cards_list, card_objects, card_fields)
+
+    def _tokenize_bulk_cards(self, cards_list):
+        """
+        Tokenizes the high-volume cards (e.g., GRID, CQUAD4) in bulk
+
+        Returns
+        -------
+        card_columns : List[(card_name, icards, columns), ...]
+            the parsed fields of the cards that can be created without
+            ``add_card`` (see ``create_bulk_cards``)
+        card_fields : dict[icard] = List[str/None]
+            the fields to pass to ``add_card`` as a ``BDFCard``
+
+        """
+        if not self.use_bulk_tokenizer or self._is_dynamic_syntax:
+            return [], {}
+
+        # is_reject would add the unused card names to reject_count
+        card_names = BULK_CARD_NAMES.intersection(self.cards_to_read)
+        for card_name, unused_comment, unused_card_lines in cards_list:
+            if card_name == 'ECHOON':
+                # the cards are printed as they're added
+                return [], {}
+        return tokenize_bulk_cards(cards_list, card_names)
+
+    def _add_bulk_card_object(self, card_object, card_name, card_lines, comment):
+        """adds a card that was created by the bulk tokenizer"""
+        if card_name in self._card_parser:
+            add_card_function = self._card_parser[card_name][1]
+        else:
+            # CTETRA, CHEXA
+            add_card_function = self._add_element_object
+
+        try:
+            add_card_function(card_object)
+        except (SyntaxError, AssertionError, KeyError, ValueError):
+            # the per-card path stores the error
+            self.add_card(card_lines, card_name, comment=comment,
+                          is_list=False, has_none=False)
+            return
+        self.increase_card_count(card_name)
+
     def _parse_dynamic_syntax(self, key):
         """
         Applies the dynamic syntax for %varName
@@ -4286,6 +4640,14 @@ def _check_for_spaces(card_name, card_lines, comment):
     if card_name in ['SUBCASE ', 'CEND']:
         raise RuntimeError('No executive/case control deck was defined.')
 
+def _is_new_ids(cards_dict, id_cards):
+    """are the IDs positive, unique and not in cards_dict"""
+    ids = [card_id for card_id, unused_card in id_cards]
+    if not ids:
+        return True
+    return (min(ids) > 0 and len(set(ids)) == len(ids) and
+            viewkeys(cards_dict).isdisjoint(ids))
+
 def main():  # pragma: no cover
     """shows off how unicode works becausee it's overly complicated"""
     import pyNastran
@@ -84,6 +84,7 @@ class AddMethods(BDFAttributes):
             assert key > 0, 'nid=%s node=%s' % (key, node)
             self.nodes[key] = node
             self._type_to_id_map[node.type].append(key)
+            self._spatial_index = None
 
     def _add_ringax_object(self, ringax, allow_overwrites=False):
         # type: (Any, bool) -> None
@@ -173,6 +174,7 @@ class AddMethods(BDFAttributes):
         else:
             self.elements[key] = elem
             self._type_to_id_map[elem.type].append(key)
+            self._spatial_index = None
 
     def _add_ao_object(self, elem_flag, allow_overwrites=False):
         """adds a CBARAO"""
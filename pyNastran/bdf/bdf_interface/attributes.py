@@ -81,7 +81,7 @@ class BDFAttributes(object):
 
             'point_ids', 'subcases',
             '_card_parser', '_card_parser_b',
-            'object_methods', 'object_attributes',
+            'object_methods', 'object_attributes', 'spatial_index', 'connectivity',
         ]
         return object_attributes(self, mode=mode, keys_to_skip=keys_to_skip+my_keys_to_skip)
 
@@ -124,7 +124,7 @@ class BDFAttributes(object):
 
             'point_ids', 'subcases',
             '_card_parser', '_card_parser_b',
-            'object_methods', 'object_attributes',
+            'object_methods', 'object_attributes', 'spatial_index', 'connectivity',
         ]
         return object_methods(self, mode=mode, keys_to_skip=keys_to_skip+my_keys_to_skip)
 
@@ -0,0 +1,215 @@
+"""
+Defines a cache for the parsed INCLUDE files of ``read_bdf``:
+ - get_cache_filename(cache_dir, include_filename)
+ - get_cache_stamp(include_files, outer_lines, settings)
+ - get_cache_key(bulk_data_lines, settings)
+ - load_cached_cards(cache_filename, cache_stamp, bulk_data_lines, settings)
+ - save_cached_cards(cache_filename, cache_stamp, cache_key, out)
+
+Each top level INCLUDE file in the bulk data deck has one cache file,
+which stores the output of ``read_bulk_data_worker`` (the grouped cards,
+the numpy columns of the tokenized cards and the low-volume card objects).
+
+A cache file is checked in two steps:
+ 1. the stamp: the reader flags, the path, mtime and size of the
+    INCLUDE file and its nested INCLUDE files and the few lines of the
+    main file that are parsed with the INCLUDE file (see
+    ``split_bulk_data_lines``)
+ 2. the key: the hash of the lines of the INCLUDE file (including its
+    nested INCLUDE files) and the reader flags
+
+The lines are only hashed when the stamp changed (e.g., the file was
+touched) or when a file was modified right before the cache was saved,
+since a coarse mtime might not change for a second edit.  So an INCLUDE
+file is only parsed again when its lines change.
+
+The cards are created from the cached columns in bulk like an uncached
+read (see ``create_bulk_cards``) and are added to the model in order, so
+a cached model is the same as an uncached model.
+
+"""
+from __future__ import print_function
+import os
+import sys
+import time
+import hashlib
+
+from six.moves.cPickle import load, dump, HIGHEST_PROTOCOL  # type: ignore
+import pyNastran
+from pyNastran.bdf.bdf_interface.bulk_tokenizer import gc_disabled
+
+#: the version of the cached data, which is changed when the
+#: output of read_bulk_data_worker changes
+CACHE_VERSION = 2
+
+#: a file that was modified within this many seconds of the cache being
+#: saved may change again without changing its mtime (e.g., FAT has a
+#: 2 second mtime), so its lines are hashed
+MTIME_RESOLUTION = 2.0
+
+
+def get_cache_filename(cache_dir, include_filename):
+    """
+    Gets the cache file of an INCLUDE file
+
+    Parameters
+    ----------
+    cache_dir : str
+        the directory with the cache files
+    include_filename : str
+        the INCLUDE file
+
+    Returns
+    -------
+    cache_filename : str
+        the cache file, which is unique to the full path of the INCLUDE file
+
+    """
+    abs_filename = os.path.abspath(include_filename)
+    path_hash = hashlib.sha1(abs_filename.encode('utf8')).hexdigest()[:16]
+    basename = os.path.basename(include_filename)
+    return os.path.join(cache_dir, '%s.%s.cache' % (basename, path_hash))
+
+
+def _get_settings_header(settings):
+    """gets the version and the reader flags that the cached cards depend on"""
+    return '%s|%s|%s|%s|%s|%s' % (
+        CACHE_VERSION, pyNastran.__version__, sys.version_info[0],
+        settings['mode'], settings['use_bulk_tokenizer'],
+        ','.join(sorted(settings['cards_to_read'])))
+
+
+def get_cache_stamp(include_files, outer_lines, settings):
+    """
+    Gets the stamp of an INCLUDE file, which is checked before the
+    lines are hashed
+
+    Parameters
+    ----------
+    include_files : List[(str, float, int), ...]
+        the (filename, mtime, size) of the INCLUDE file and its nested
+        INCLUDE files (see ``BDFInputPy.bulk_include_files``)
+    outer_lines : List[str]
+        the lines of the piece that aren't in the INCLUDE file (e.g.,
+        the comments in front of its first card; see
+        ``split_bulk_data_lines``)
+    settings : dict
+        the reader flags (see ``get_worker_settings``)
+
+    Returns
+    -------
+    cache_stamp : (str, ((str, float, int), ...), (str, ...))
+        the reader flags, the files and the outer lines
+
+    """
+    include_files = tuple(tuple(include_file) for include_file in include_files)
+    return _get_settings_header(settings), include_files, tuple(outer_lines)
+
+
+def get_cache_key(bulk_data_lines, settings):
+    """
+    Hashes the lines of an INCLUDE file and the reader flags
+
+    Parameters
+    ----------
+    bulk_data_lines : List[str]
+        the bulk data lines of the INCLUDE file
+    settings : dict
+        the reader flags (see ``get_worker_settings``)
+
+    Returns
+    -------
+    cache_key : str
+        the hash
+
+    """
+    sha1 = hashlib.sha1()
+    sha1.update(_get_settings_header(settings).encode('utf8'))
+    for line in bulk_data_lines:
+        sha1.update(line.encode('utf8', 'replace'))
+        sha1.update(b'\n')
+    return sha1.hexdigest()
+
+
+def _is_stamp_current(cache_stamp, cache_stampi, save_time):
+    """
+    Is the stamp of the cache file the same as the INCLUDE file, where
+    the files weren't modified right before the cache was saved
+    """
+    if cache_stampi != cache_stamp:
+        return False
+    include_files = cache_stamp[1]
+    mtime_max = max(mtime for unused_filename, mtime, unused_size in include_files)
+    return mtime_max < save_time - MTIME_RESOLUTION
+
+
+def load_cached_cards(cache_filename, cache_stamp, bulk_data_lines, settings):
+    """
+    Loads the cards of an INCLUDE file
+
+    Parameters
+    ----------
+    cache_filename : str
+        the cache file from ``get_cache_filename``
+    cache_stamp : tuple
+        the stamp of the INCLUDE file from ``get_cache_stamp``
+    bulk_data_lines : List[str]
+        the bulk data lines of the INCLUDE file, which are only hashed
+        when the stamp isn't current
+    settings : dict
+        the reader flags (see ``get_worker_settings``)
+
+    Returns
+    -------
+    out : varies / None
+        the output of ``read_bulk_data_worker``
+        None : the cache file doesn't exist, is out of date or can't be read
+    is_current : bool
+        is the stamp of the cache file current; if not, the cache file
+        should be saved again
+
+    """
+    if not os.path.exists(cache_filename):
+        return None, False
+    try:
+        with open(cache_filename, 'rb') as cache_file:
+            cache_stampi, cache_keyi, save_time = load(cache_file)
+            is_current = _is_stamp_current(cache_stamp, cache_stampi, save_time)
+            if not is_current and cache_keyi != get_cache_key(bulk_data_lines, settings):
+                return None, False
+            with gc_disabled():
+                out = load(cache_file)
+    except Exception:
+        # a corrupt/incompatible cache file is parsed again
+        return None, False
+    return out, is_current
+
+
+def save_cached_cards(cache_filename, cache_stamp, cache_key, out):
+    """
+    Saves the cards of an INCLUDE file
+
+    Parameters
+    ----------
+    cache_filename : str
+        the cache file from ``get_cache_filename``
+    cache_stamp : tuple
+        the stamp of the INCLUDE file from ``get_cache_stamp``
+    cache_key : str
+        the hash of the INCLUDE file from ``get_cache_key``
+    out : varies
+        the output of ``read_bulk_data_worker``
+
+    """
+    cache_dir = os.path.dirname(cache_filename)
+    if cache_dir and not os.path.exists(cache_dir):
+        os.makedirs(cache_dir)
+
+    # write a temporary file, so an interrupted write isn't loaded
+    tmp_filename = '%s.%i.tmp' % (cache_filename, os.getpid())
+    with open(tmp_filename, 'wb') as cache_file:
+        dump((cache_stamp, cache_key, time.time()), cache_file, protocol=HIGHEST_PROTOCOL)
+        dump(out, cache_file, protocol=HIGHEST_PROTOCOL)
+    if os.path.exists(cache_filename):
+        os.remove(cache_filename)
+    os.rename(tmp_filename, cache_filename)
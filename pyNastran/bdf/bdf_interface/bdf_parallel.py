@@ -0,0 +1,353 @@
+"""
+Defines methods for parsing the INCLUDE files of a BDF in parallel:
+ - split_bulk_data_lines(bulk_data_lines, include_ranges)
+ - get_worker_settings(model)
+ - start_workers(bulk_data_lines, pieces, ipieces, settings, nworkers)
+ - collect_workers(pool, jobs)
+ - parse_bulk_data_lines(model, bulk_data_lines, create_objects=True)
+ - read_bulk_data_worker(bulk_data_lines, settings)
+ - unpack_worker_output(out)
+ - pack_cards_list(cards_list)
+ - unpack_cards_list(card_names, comments, nlines, lines)
+
+The bulk data deck is split at the top level INCLUDE files, so each
+INCLUDE file is one piece.  The split is moved to the start of a card
+(including the comments in front of it), so the pieces are grouped into
+the same cards as the full deck.  An INCLUDE file that starts or ends in
+the middle of a card stays in the surrounding piece.
+
+Each INCLUDE file is grouped into cards and tokenized in a worker
+process, which also creates the low-volume cards (e.g., PSHELL, FORCE).
+The high-volume cards (e.g., GRID, CQUAD4) are passed back as numpy
+columns (see ``tokenize_bulk_cards``) and are created by the calling
+process, because unpickling those objects is slower than creating them
+in bulk (0.5s vs. 0.2s for 90k CQUAD4s).  The calling process groups the
+lines of the main file while the workers run.  The GRIDs/elements are
+then added in runs with a dict update and the other cards one at a time,
+in the original card order, so the duplicate ID checks, the ENDDATA card
+and the card_count are the same as the serial reader.  Cards that need
+the model to be created (e.g., a CBAR with a BAROR) or that fail in the
+worker are passed back as fields or card lines and are added with
+``add_card``.
+
+So the workers only take the grouping and tokenizing off of the calling
+process, which is about half of an uncached read of a mesh.
+
+"""
+from __future__ import print_function
+from multiprocessing import Pool
+
+from pyNastran.utils.log import get_logger2
+from pyNastran.bdf.bdf_interface.bdf_card import BDFCard
+from pyNastran.bdf.bdf_interface.bulk_tokenizer import PARSE_ERRORS
+
+#: these cards don't use a BDFCard
+RAW_CARD_NAMES = set(['DEQATN', 'PBRSECT', 'PBMSECT'])
+
+
+def _is_data_line(line):
+    """does the line have data (not just a comment)"""
+    return bool(line.split('$', 1)[0].rstrip())
+
+
+def _is_card_start(line):
+    """is the line the first line of a card (see BDF.get_bdf_cards)"""
+    line = line.split('$', 1)[0]
+    card_name = line.split(',', 1)[0].split('\t', 1)[0][:8].rstrip()
+    return bool(card_name) and card_name[0] not in ['+', '*']
+
+
+def _get_card_boundary(bulk_data_lines, iline):
+    """
+    Gets the line to split the deck at, so the comments in front of a card
+    stay with the card
+
+    Parameters
+    ----------
+    bulk_data_lines : List[str]
+        the bulk data lines
+    iline : int
+        the first line of the INCLUDE file or the line after it
+
+    Returns
+    -------
+    iboundary : int / None
+        the line to split the deck at
+        None : the deck can't be split because iline is in the middle of a card
+
+    """
+    nlines = len(bulk_data_lines)
+    idata = iline
+    while idata < nlines and not _is_data_line(bulk_data_lines[idata]):
+        idata += 1
+    if idata == nlines:
+        # the trailing comments go with the last card
+        return nlines
+    if not _is_card_start(bulk_data_lines[idata]):
+        return None
+
+    iboundary = idata
+    while iboundary > 0 and not _is_data_line(bulk_data_lines[iboundary - 1]):
+        iboundary -= 1
+    return iboundary
+
+
+def split_bulk_data_lines(bulk_data_lines, include_ranges):
+    """
+    Splits the bulk data deck at the top level INCLUDE files
+
+    Parameters
+    ----------
+    bulk_data_lines : List[str]
+        the bulk data lines
+    include_ranges : List[[istart, iend], ...]
+        the lines of the top level INCLUDE files
+        (see ``BDFInputPy.bulk_include_ranges``)
+
+    Returns
+    -------
+    pieces : List[(istart, iend, iinclude), ...]
+        the lines of each piece in order
+        iinclude : the index of the INCLUDE file in include_ranges
+                   None for the lines of the main file
+
+    """
+    nlines = len(bulk_data_lines)
+    pieces = []
+    iprevious = 0
+    for iinclude, (istart, iend) in enumerate(include_ranges):
+        iboundary_start = _get_card_boundary(bulk_data_lines, istart)
+        iboundary_end = _get_card_boundary(bulk_data_lines, iend)
+        if iboundary_start is None or iboundary_end is None:
+            continue
+        if iboundary_start < iprevious or iboundary_end <= iboundary_start:
+            continue
+        if iboundary_start > iprevious:
+            pieces.append((iprevious, iboundary_start, None))
+        pieces.append((iboundary_start, iboundary_end, iinclude))
+        iprevious = iboundary_end
+    if iprevious < nlines:
+        pieces.append((iprevious, nlines, None))
+    return pieces
+
+
+def parse_bulk_data_lines(model, bulk_data_lines, create_objects=True):
+    """
+    Groups the lines into cards, tokenizes the high-volume cards and
+    creates the card objects that don't depend on the rest of the model
+
+    Parameters
+    ----------
+    model : BDF()
+        the model to group the cards with
+    bulk_data_lines : List[str]
+        the bulk data lines
+    create_objects : bool; default=True
+        create the card objects with the card's add_card
+        (model.card_count is modified, so this is only for a worker model)
+
+    Returns
+    -------
+    cards_list : List[[card_name, comment, card_lines], ...]
+        the cards from ``BDF.get_bdf_cards``
+    cards_dict : dict[card_name] = List[[comment, card_lines], ...]
+        the BAROR/BEAMOR cards
+    card_columns : List[(card_name, icards, columns), ...]
+        the tokenized high-volume cards (see ``tokenize_bulk_cards``)
+    card_objects : dict[icard] = card
+        the other cards that were created
+    card_fields : dict[icard] = List[str/None]
+        the fields to pass to ``add_card`` as a ``BDFCard``
+    is_enddata : bool
+        was the ENDDATA card found
+
+    """
+    had_enddata = 'ENDDATA' in model.card_count
+    cards_list, cards_dict, unused_card_count = model.get_bdf_cards(bulk_data_lines)
+    is_enddata = 'ENDDATA' in model.card_count and not had_enddata
+
+    card_columns, card_fields = model._tokenize_bulk_cards(cards_list)
+    card_objects = {}
+    if not create_objects:
+        return cards_list, cards_dict, card_columns, card_objects, card_fields, is_enddata
+
+    icards_columns = set()
+    for unused_card_name, icards, unused_columns in card_columns:
+        icards_columns.update(icards.tolist())
+
+    card_parser = model._card_parser
+    for icard, (card_name, comment, card_lines) in enumerate(cards_list):
+        if icard in icards_columns or card_name in RAW_CARD_NAMES:
+            continue
+        elif card_name not in model.cards_to_read:
+            # rejected
+            continue
+
+        try:
+            if icard in card_fields:
+                card = card_fields[icard]
+            else:
+                unused_card_obj, card = model.create_card_object(
+                    card_lines[:], card_name, is_list=False, has_none=False)
+                card_fields[icard] = card
+
+            if card_name in card_parser:
+                card_class = card_parser[card_name][0]
+                card_object = card_class.add_card(BDFCard(card, has_none=False),
+                                                  comment=comment)
+                card_objects[icard] = card_object
+                del card_fields[icard]
+        except PARSE_ERRORS:
+            # add_card stores the error
+            card_fields.pop(icard, None)
+    return cards_list, cards_dict, card_columns, card_objects, card_fields, is_enddata
+
+
+def pack_cards_list(cards_list):
+    """
+    Flattens the cards, so they're faster to send between processes
+
+    Parameters
+    ----------
+    cards_list : List[[card_name, comment, card_lines], ...]
+        the cards from ``BDF.get_bdf_cards``
+
+    Returns
+    -------
+    card_names : List[str]
+        the name of each card
+    comments : List[str]
+        the comment of each card
+    nlines : List[int]
+        the number of lines of each card
+    lines : str
+        the lines of all the cards joined with a newline
+
+    """
+    card_names = []
+    comments = []
+    nlines = []
+    lines = []
+    for card_name, comment, card_lines in cards_list:
+        card_names.append(card_name)
+        comments.append(comment)
+        nlines.append(len(card_lines))
+        lines.extend(card_lines)
+    return card_names, comments, nlines, '\n'.join(lines)
+
+
+def unpack_cards_list(card_names, comments, nlines, lines):
+    """the inverse of ``pack_cards_list``"""
+    lines = lines.split('\n') if lines else []
+    cards_list = []
+    iline = 0
+    for card_name, comment, nlinesi in zip(card_names, comments, nlines):
+        cards_list.append([card_name, comment, lines[iline:iline + nlinesi]])
+        iline += nlinesi
+    return cards_list
+
+
+def get_worker_settings(model):
+    """gets the reader flags that are passed to ``read_bulk_data_worker``"""
+    settings = {
+        'mode' : model.nastran_format,
+        'cards_to_read' : model.cards_to_read,
+        'use_bulk_tokenizer' : model.use_bulk_tokenizer,
+    }
+    return settings
+
+
+def read_bulk_data_worker(bulk_data_lines, settings):
+    """
+    Creates the cards of an INCLUDE file in a separate process
+
+    Parameters
+    ----------
+    bulk_data_lines : List[str]
+        the bulk data lines of the INCLUDE file
+    settings : dict
+        the reader flags of the calling process (see ``get_worker_settings``)
+
+    Returns
+    -------
+    packed_cards_list : tuple
+        the cards from ``pack_cards_list``
+    out : varies
+        the rest of ``parse_bulk_data_lines``
+
+    Pickling the GRID/CQUAD4 objects is about as slow as creating
+    them, so the high-volume cards are sent back as numpy columns and
+    are created by the calling process.
+
+    """
+    from pyNastran.bdf.bdf import BDF
+    model = BDF(log=get_logger2(debug=None), debug=False, mode=settings['mode'])
+    model.cards_to_read = settings['cards_to_read']
+    model.use_bulk_tokenizer = settings['use_bulk_tokenizer']
+    out = parse_bulk_data_lines(model, bulk_data_lines)
+    return (pack_cards_list(out[0]), ) + out[1:]
+
+
+def unpack_worker_output(out):
+    """the inverse of the packing in ``read_bulk_data_worker``"""
+    return (unpack_cards_list(*out[0]), ) + out[1:]
+
+
+def start_workers(bulk_data_lines, pieces, ipieces, settings, nworkers):
+    """
+    Starts the workers for the INCLUDE files
+
+    Parameters
+    ----------
+    bulk_data_lines : List[str]
+        the bulk data lines
+    pieces : List[(istart, iend, iinclude), ...]
+        the pieces from ``split_bulk_data_lines``
+    ipieces : List[int]
+        the pieces to parse
+    settings : dict
+        the reader flags (see ``get_worker_settings``)
+    nworkers : int
+        the number of processes, including the calling process
+
+    Returns
+    -------
+    pool : multiprocessing.Pool
+        the workers
+    jobs : dict[ipiece] = AsyncResult
+        the pending results for each INCLUDE file
+
+    """
+    pool = Pool(processes=nworkers - 1)
+    jobs = {}
+    for ipiece in ipieces:
+        istart, iend = pieces[ipiece][:2]
+        jobs[ipiece] = pool.apply_async(
+            read_bulk_data_worker, (bulk_data_lines[istart:iend], settings))
+    pool.close()
+    return pool, jobs
+
+
+def collect_workers(pool, jobs):
+    """
+    Waits for the workers
+
+    Parameters
+    ----------
+    pool : multiprocessing.Pool
+        the workers
+    jobs : dict[ipiece] = AsyncResult
+        the pending results for each INCLUDE file
+
+    Returns
+    -------
+    results : dict[ipiece] = varies
+        the output of ``read_bulk_data_worker`` for each INCLUDE file
+
+    """
+    try:
+        results = {ipiece : job.get() for ipiece, job in jobs.items()}
+    finally:
+        pool.terminate()
+        pool.join()
+    return results
@@ -0,0 +1,693 @@
+"""
+Defines a batched tokenizer for the high-volume bulk data cards:
+ - BULK_CARD_NAMES
+ - BULK_ADD_CARD_NAMES
+ - tokenize_card_lines(lines, nlines)
+ - get_codes(svalues)
+ - is_simple_ascii(svalues)
+ - get_integers(svalues)
+ - get_doubles(svalues)
+ - tokenize_bulk_cards(cards_list, card_names=None, chunk_size=100000)
+ - create_bulk_cards(cards_list, card_columns)
+ - parse_bulk_cards(cards_list, card_names=None, chunk_size=100000)
+ - gc_disabled()
+
+``BDF.add_card`` splits each card into fields with ``to_fields``, wraps
+them in a ``BDFCard`` and then parses each field with the ``integer`` and
+``double`` functions.  For a mesh with millions of nodes and elements,
+that's most of the time in ``read_bdf``.
+
+Cards with the same name and number of lines that are in the small field,
+fixed format (no commas, tabs or large field markers) are sliced into
+8-character fields with numpy all at once.  The GRID, CQUAD4, CTRIA3,
+CTETRA and CHEXA cards are then parsed a column at a time and the card
+objects are created directly.  The other cards and any card that doesn't
+fit the simple layout (e.g., a CQUAD4 with a thickness or a GRID with
+a PS field) pass the fields to the card's ``add_card``, so the defaults
+and errors are the same as the per-card path.
+
+Creating a few hundred thousand cards triggers the cyclic garbage
+collector over and over, and each full collection walks every card that
+has been created so far.  The cards don't have reference cycles, so the
+collector is paused while they're created and added (see ``gc_disabled``).
+
+"""
+from __future__ import print_function
+import gc
+from collections import defaultdict
+from contextlib import contextmanager
+import numpy as np
+
+from pyNastran.bdf.cards.nodes import GRID
+from pyNastran.bdf.cards.elements.shell import CQUAD4, CTRIA3
+from pyNastran.bdf.cards.elements.solid import CTETRA4, CTETRA10, CHEXA8, CHEXA20
+
+#: the cards that are tokenized in bulk
+BULK_CARD_NAMES = set([
+    'GRID', 'CQUAD4', 'CTRIA3', 'CHEXA', 'CTETRA', 'CBAR', 'CBUSH', 'RBE2',
+    'FORCE', 'PLOAD4'])
+
+#: the errors that the per-card path stores as parsing errors
+PARSE_ERRORS = (SyntaxError, AssertionError, KeyError, ValueError)
+
+
+def tokenize_card_lines(lines, nlines):
+    """
+    Slices small field, fixed format card lines into fields
+
+    Parameters
+    ----------
+    lines : List[str]
+        the lines of ncards cards, where each card has nlines lines
+    nlines : int
+        the number of lines per card
+
+    Returns
+    -------
+    fields : (ncards, 1 + 8*nlines) str ndarray
+        the unstripped fields of each card; the continuation markers
+        are removed
+
+    .. note:: like ``to_fields``, columns 73-80 are ignored
+
+    """
+    ncards = len(lines) // nlines
+    line_fields = np.array(lines, dtype='U72').view('U8').reshape(ncards, nlines, 9)
+    fields = line_fields[:, 0, :]
+    if nlines > 1:
+        continuation_fields = line_fields[:, 1:, 1:].reshape(ncards, 8 * (nlines - 1))
+        fields = np.hstack([fields, continuation_fields])
+    return np.ascontiguousarray(fields)
+
+
+def get_codes(svalues):
+    """
+    Gets the character codes of 8-character fields
+
+    Parameters
+    ----------
+    svalues : (...) str ndarray
+        the fields
+
+    Returns
+    -------
+    codes : (..., 8) uint8 ndarray
+        the character codes; the codes are only valid if
+        ``is_ascii(codes)`` is True
+
+    """
+    svalues = np.ascontiguousarray(svalues, dtype='U8')
+    codes = svalues.view('uint32').reshape(svalues.shape + (8,))
+    return codes.astype('uint8')
+
+
+def is_simple_ascii(svalues):
+    """
+    Are the fields printable ASCII characters, so a blank is a null or space?
+    Non-ASCII fields and fields with control characters should use the
+    per-card path.
+    """
+    codes = np.ascontiguousarray(svalues).view('uint32')
+    return bool((codes < 128).all() and ((codes >= 32) | (codes == 0)).all())
+
+
+def get_integers(svalues):
+    """
+    Parses a column of integer fields like ``integer``
+
+    Parameters
+    ----------
+    svalues : (n, ) str ndarray
+        the unstripped, printable ASCII fields
+
+    Returns
+    -------
+    values : (n, ) int64 ndarray
+        the integers; invalid and blank fields are 0
+    is_valid : (n, ) bool ndarray
+        the field is an integer
+    is_blank : (n, ) bool ndarray
+        the field is blank
+
+    """
+    codes = get_codes(svalues)
+    is_blank = (codes <= 32).all(axis=1)
+    values, is_valid = _get_integers(svalues, codes, is_blank)
+    return values, is_valid, is_blank
+
+
+def get_doubles(svalues):
+    """
+    Parses a column of float fields like ``double``/``double_or_blank``
+
+    Parameters
+    ----------
+    svalues : (n, ) str ndarray
+        the unstripped, printable ASCII fields
+
+    Returns
+    -------
+    values : (n, ) float64 ndarray
+        the floats; invalid and blank fields are 0.0
+    is_valid : (n, ) bool ndarray
+        the field is a float
+    is_blank : (n, ) bool ndarray
+        the field is blank
+
+    """
+    codes = get_codes(svalues)
+    is_blank = (codes <= 32).all(axis=1)
+    values, is_valid = _get_doubles(svalues, codes, is_blank)
+    return values, is_valid, is_blank
+
+
+def _get_integers(svalues, codes, is_blank):
+    """
+    Parses a column of integer fields from the (n, 8) character codes.
+
+    A block of digits with an optional leading sign is converted in bulk;
+    any other field (e.g., 1_0, 1.0) is passed to int.
+    """
+    nvalues = len(codes)
+    is_space = codes <= 32
+    is_filled = ~is_space
+    is_digit = (codes >= 48) & (codes <= 57)
+    ifirst = np.argmax(is_filled, axis=1)
+    ilast = 7 - np.argmax(is_filled[:, ::-1], axis=1)
+    first_codes = codes[np.arange(nvalues), ifirst]
+    is_signed = (first_codes == 43) | (first_codes == 45)
+
+    ndigits = is_digit.sum(axis=1)
+    is_simple = (ndigits > 0) & (ndigits + is_signed == ilast - ifirst + 1)
+
+    values = np.zeros(nvalues, dtype='int64')
+    digits = np.where(is_digit, codes - 48, 0)
+    for icol in range(8):
+        values = np.where(is_digit[:, icol], values * 10 + digits[:, icol], values)
+    values[first_codes == 45] *= -1
+    values[~is_simple] = 0
+
+    is_valid = is_simple
+    for i in np.where(~is_simple & ~is_blank)[0].tolist():
+        try:
+            values[i] = int(svalues[i])
+            is_valid[i] = True
+        except (ValueError, OverflowError):
+            pass
+    return values, is_valid
+
+
+def _get_doubles(svalues, codes, is_blank):
+    """Parses a column of float fields from the (n, 8) character codes"""
+    is_digit = (codes >= 48) & (codes <= 57)
+
+    # integers aren't allowed in float fields
+    is_valid = ~is_blank & ~(is_digit | (codes <= 32)).all(axis=1)
+    try:
+        values = np.where(is_blank, '0.', svalues).astype('float64')
+    except ValueError:
+        values = _get_doubles_nastran(svalues, codes, is_valid)
+    values[is_blank] = 0.
+    return values, is_valid
+
+
+def _get_doubles_nastran(svalues, codes, is_valid):
+    """
+    Parses a column of float fields, where some fields use the Nastran
+    exponent format (e.g., 1.0-3, 1.0D+3)
+
+    Fields with a single sign after the first character and no exponent
+    character (e.g., 1.0-3, -1.+3) have the E inserted in bulk; any
+    field that still can't be converted is parsed one at a time.
+    """
+    nvalues = len(codes)
+    is_sign = (codes == 43) | (codes == 45)
+    is_exponent = (codes == 68) | (codes == 69) | (codes == 100) | (codes == 101)
+    ifirst = np.argmax(codes > 32, axis=1)
+    icols = np.arange(8)[np.newaxis, :]
+    is_inner_sign = is_sign & (icols > ifirst[:, np.newaxis])
+    is_implicit = (is_inner_sign.sum(axis=1) == 1) & ~is_exponent.any(axis=1)
+
+    # 1.0-3 -> 1.0E-3
+    isign = np.argmax(is_inner_sign, axis=1)
+    isign[~is_implicit] = 9
+    icols9 = np.arange(9)[np.newaxis, :]
+    isource = np.where(icols9 < isign[:, np.newaxis], icols9, icols9 - 1)
+    codes9 = np.zeros((nvalues, 9), dtype='uint32')
+    codes9[:, :8] = codes
+    codes9 = codes9[np.arange(nvalues)[:, np.newaxis], isource]
+    codes9[icols9 == isign[:, np.newaxis]] = 69
+    svalues9 = codes9.view('U9').ravel()
+    svalues9[~is_valid] = '0.'
+
+    try:
+        return svalues9.astype('float64')
+    except ValueError:
+        pass
+
+    # 1.0D+3, 1.0+3-3
+    values = np.zeros(nvalues, dtype='float64')
+    for i in np.where(is_valid)[0].tolist():
+        try:
+            values[i] = float(svalues9[i])
+        except ValueError:
+            value = _to_double(svalues[i].strip())
+            if value is None:
+                is_valid[i] = False
+            else:
+                values[i] = value
+    return values
+
+
+def _to_double(svalue):
+    """converts a Nastran float field (e.g., 1.0D+3, 1.0-3); returns None if it's invalid"""
+    if svalue.isdigit():
+        return None
+    try:
+        return float(svalue)
+    except ValueError:
+        pass
+
+    svalue_upper = svalue.upper()
+    try:
+        if 'D' in svalue_upper:
+            return float(svalue_upper.replace('D', 'E'))
+
+        sign = ''
+        if svalue_upper[0] in ('+', '-'):
+            sign = svalue_upper[0]
+            svalue_upper = svalue_upper[1:]
+        if '+' in svalue_upper:
+            svalue_upper = sign + svalue_upper.replace('+', 'E+')
+        elif '-' in svalue_upper:
+            svalue_upper = sign + svalue_upper.replace('-', 'E-')
+        return float(svalue_upper)
+    except ValueError:
+        if svalue == '.':
+            return 0.
+    return None
+
+
+class _CardFields(object):
+    """the tokenized fields for a group of cards with the same name and length"""
+    def __init__(self, fields):
+        """
+        Parameters
+        ----------
+        fields : (ncards, nfields) str ndarray
+            the unstripped, printable ASCII fields from ``tokenize_card_lines``
+
+        """
+        self.fields = fields
+        self.ncards, self.nfields_max = fields.shape
+        self.codes = get_codes(fields)
+        self.is_blank_fields = (self.codes <= 32).all(axis=2)
+
+        #: len(card) after the trailing blank fields are removed
+        self.nfields = self.nfields_max - np.argmax(~self.is_blank_fields[:, ::-1], axis=1)
+        self.nfields[self.is_blank_fields.all(axis=1)] = 0
+
+    def is_blank(self, ifield):
+        """is the field blank"""
+        if ifield >= self.nfields_max:
+            return np.ones(self.ncards, dtype='bool')
+        return self.is_blank_fields[:, ifield]
+
+    def _integers(self, ifield):
+        """parses the integer field; returns (values, is_valid, is_blank)"""
+        is_blank = self.is_blank_fields[:, ifield]
+        values, is_valid = _get_integers(
+            self.fields[:, ifield], self.codes[:, ifield, :], is_blank)
+        return values, is_valid, is_blank
+
+    def integer(self, ifield):
+        """parses a required integer field"""
+        if ifield >= self.nfields_max:
+            return np.zeros(self.ncards, dtype='int64'), np.zeros(self.ncards, dtype='bool')
+        values, is_valid, unused_is_blank = self._integers(ifield)
+        return values, is_valid
+
+    def integer_or_blank(self, ifield, default):
+        """parses an integer field, where the default is an int or an int array"""
+        if ifield >= self.nfields_max:
+            values = np.zeros(self.ncards, dtype='int64')
+            values[:] = default
+            return values, np.ones(self.ncards, dtype='bool')
+        values, is_valid, is_blank = self._integers(ifield)
+        if isinstance(default, np.ndarray):
+            values[is_blank] = default[is_blank]
+        else:
+            values[is_blank] = default
+        return values, is_valid | is_blank
+
+    def integers_or_blank(self, ifields):
+        """
+        parses a series of integer fields with a default of None
+
+        Returns
+        -------
+        values : (ncards, nfields) int64 ndarray
+            the values for each card; blank fields are 0
+        is_blank : (ncards, nfields) bool ndarray
+            the field is blank (None)
+        is_valid : (ncards, ) bool ndarray
+            all the fields are integers or blank
+
+        """
+        nfields = len(ifields)
+        values = np.zeros((self.ncards, nfields), dtype='int64')
+        is_blank = np.ones((self.ncards, nfields), dtype='bool')
+        is_valid_all = np.ones(self.ncards, dtype='bool')
+        for j, ifield in enumerate(ifields):
+            valuesj, is_valid, is_blankj = self._integers(ifield)
+            is_valid_all &= is_valid | is_blankj
+            values[:, j] = valuesj
+            is_blank[:, j] = is_blankj
+        return values, is_blank, is_valid_all
+
+    def double_or_blank(self, ifield, default):
+        """parses a float field"""
+        if ifield >= self.nfields_max:
+            return np.full(self.ncards, default), np.ones(self.ncards, dtype='bool')
+        is_blank = self.is_blank_fields[:, ifield]
+        values, is_valid = _get_doubles(
+            self.fields[:, ifield], self.codes[:, ifield, :], is_blank)
+        values[is_blank] = default
+        return values, is_valid | is_blank
+
+    def get_card(self, icard):
+        """gets the fields for ``BDFCard`` (no trailing blanks; blank -> None)"""
+        card = self.fields[icard, :self.nfields[icard]].tolist()
+        return [field.strip() or None for field in card]
+
+
+def _create_objects(card_class_func, args, comments):
+    """
+    Creates the card objects
+
+    Parameters
+    ----------
+    card_class_func : callable
+        creates a card from (args_i, comment)
+    args : List[List[varies]]
+        the per-card arguments
+    comments : List[str]
+        the comments for each card
+
+    Returns
+    -------
+    card_objects : List[card/None]
+        the cards; None if the card should use ``add_card``
+
+    """
+    card_objects = []
+    for argsi, comment in zip(args, comments):
+        try:
+            card_object = card_class_func(argsi, comment)
+        except PARSE_ERRORS:
+            # the per-card path stores the error
+            card_object = None
+        card_objects.append(card_object)
+    return card_objects
+
+
+def _tokenize_grid(card_fields):
+    """parses GRIDs without a PS field"""
+    nid, is_valid = card_fields.integer(1)
+    cp, is_valid_cp = card_fields.integer_or_blank(2, 0)
+    x1, is_valid_x1 = card_fields.double_or_blank(3, 0.)
+    x2, is_valid_x2 = card_fields.double_or_blank(4, 0.)
+    x3, is_valid_x3 = card_fields.double_or_blank(5, 0.)
+    cd, is_valid_cd = card_fields.integer_or_blank(6, 0)
+    seid, is_valid_seid = card_fields.integer_or_blank(8, 0)
+    is_valid &= (
+        is_valid_cp & is_valid_x1 & is_valid_x2 & is_valid_x3 & is_valid_cd &
+        is_valid_seid & card_fields.is_blank(7) & (card_fields.nfields <= 9))
+    xyz = np.column_stack([x1, x2, x3])
+    return is_valid, (nid, xyz, cp, cd, seid)
+
+
+def _create_grid(unused_card_name, columns, comments):
+    """creates the GRIDs from the columns of _tokenize_grid"""
+    nid, xyz, cp, cd, seid = columns
+    args = zip(nid.tolist(), xyz.tolist(), cp.tolist(), cd.tolist(), seid.tolist())
+    def grid(args, comment):
+        nid, xyz, cp, cd, seid = args
+        return GRID(nid, xyz, cp, cd, '', seid, comment=comment)
+    return _create_objects(grid, args, comments)
+
+
+def _tokenize_shell(card_fields, nnodes):
+    """parses CTRIA3s/CQUAD4s without the optional fields"""
+    eid, is_valid = card_fields.integer(1)
+    pid, is_valid_pid = card_fields.integer_or_blank(2, eid)
+    is_valid &= is_valid_pid & (card_fields.nfields <= 3 + nnodes)
+    nids = []
+    for ifield in range(3, 3 + nnodes):
+        nid, is_valid_nid = card_fields.integer(ifield)
+        is_valid &= is_valid_nid
+        nids.append(nid)
+    return is_valid, (eid, pid, np.column_stack(nids))
+
+
+def _create_shell(card_name, columns, comments):
+    """creates the CTRIA3s/CQUAD4s from the columns of _tokenize_shell"""
+    eid, pid, nids = columns
+    args = zip(eid.tolist(), pid.tolist(), nids.tolist())
+    if card_name == 'CTRIA3':
+        def shell(args, comment):
+            eid, pid, nids = args
+            return CTRIA3(eid, pid, nids, zoffset=0.0, theta_mcid=0.0,
+                          tflag=0, T1=None, T2=None, T3=None, comment=comment)
+    else:
+        def shell(args, comment):
+            eid, pid, nids = args
+            return CQUAD4(eid, pid, nids, 0.0, 0.0,
+                          0, None, None, None, None, comment=comment)
+    return _create_objects(shell, args, comments)
+
+
+def _tokenize_solid(card_fields, nnodes_min, nnodes_max):
+    """
+    parses CTETRAs or CHEXAs, where the length of the card picks the
+    class like ``BDF._prepare_ctetra``
+    """
+    eid, is_valid = card_fields.integer(1)
+    pid, is_valid_pid = card_fields.integer(2)
+    is_valid &= is_valid_pid
+    nfields = card_fields.nfields
+    is_min = nfields == 3 + nnodes_min
+    is_valid &= (nfields > 3 + nnodes_min - 1) & (nfields <= 3 + nnodes_max)
+
+    nids = []
+    for ifield in range(3, 3 + nnodes_min):
+        nid, is_valid_nid = card_fields.integer(ifield)
+        is_valid &= is_valid_nid
+        nids.append(nid)
+
+    optional_ifields = [ifield for ifield in range(3 + nnodes_min, 3 + nnodes_max)
+                        if ifield < card_fields.nfields_max]
+    optional_nids, is_blank, is_valid_optional = card_fields.integers_or_blank(
+        optional_ifields)
+    is_valid &= is_valid_optional
+    return is_valid, (eid, pid, np.column_stack(nids), optional_nids, is_blank, is_min)
+
+
+def _create_solid(card_name, columns, comments):
+    """creates the CTETRAs/CHEXAs from the columns of _tokenize_solid"""
+    if card_name == 'CTETRA':
+        nnodes_max, card_class_min, card_class_max = 10, CTETRA4, CTETRA10
+    else:
+        nnodes_max, card_class_min, card_class_max = 20, CHEXA8, CHEXA20
+
+    eid, pid, nids, optional_nids, is_blank, is_min = columns
+    nblank = nnodes_max - nids.shape[1] - optional_nids.shape[1]
+    optional_nids = np.where(is_blank, None, optional_nids.astype('object'))
+    args = zip(eid.tolist(), pid.tolist(), nids.tolist(), optional_nids.tolist(),
+               is_min.tolist())
+    def solid(args, comment):
+        eid, pid, nids, optional_nids, is_min = args
+        if is_min:
+            return card_class_min(eid, pid, nids, comment=comment)
+        nids = nids + optional_nids + [None] * nblank
+        return card_class_max(eid, pid, nids, comment=comment)
+    return _create_objects(solid, args, comments)
+
+
+def _tokenize_card_columns(card_name, card_fields):
+    """
+    Parses the fields of the cards that can be created without ``add_card``
+
+    Returns
+    -------
+    is_valid : (ncards, ) bool ndarray
+        can the card be created from the columns
+    columns : tuple(ndarray, ...)
+        the parsed fields for the creation function in ``CREATE_CARDS``
+
+    """
+    if card_name == 'GRID':
+        return _tokenize_grid(card_fields)
+    elif card_name == 'CQUAD4':
+        return _tokenize_shell(card_fields, 4)
+    elif card_name == 'CTRIA3':
+        return _tokenize_shell(card_fields, 3)
+    elif card_name == 'CTETRA':
+        return _tokenize_solid(card_fields, 4, 10)
+    elif card_name == 'CHEXA':
+        return _tokenize_solid(card_fields, 8, 20)
+    return np.zeros(card_fields.ncards, dtype='bool'), None
+
+#: the functions that create the cards from the tokenized columns
+CREATE_CARDS = {
+    'GRID' : _create_grid,
+    'CQUAD4' : _create_shell,
+    'CTRIA3' : _create_shell,
+    'CTETRA' : _create_solid,
+    'CHEXA' : _create_solid,
+}
+
+#: the GRIDs/elements that ``BDF`` adds in bulk once they're created
+BULK_ADD_CARD_NAMES = set(CREATE_CARDS)
+
+
+def _is_fixed_small_field(card_lines):
+    """is the card in the small field, fixed format (no csv, tabs, or large field)"""
+    for line in card_lines:
+        if ',' in line or '\t' in line or '*' in line or '=' in line:
+            return False
+    return True
+
+
+def tokenize_bulk_cards(cards_list, card_names=None, chunk_size=100000):
+    """
+    Tokenizes the high-volume cards in bulk
+
+    Parameters
+    ----------
+    cards_list : List[[card_name, comment, card_lines], ...]
+        the cards from ``BDF.get_bdf_cards``
+    card_names : set[str]; default=None -> BULK_CARD_NAMES
+        the cards to tokenize
+    chunk_size : int; default=100000
+        the number of cards that are tokenized at once, which limits the
+        size of the temporary field arrays
+
+    Returns
+    -------
+    card_columns : List[(card_name, icards, columns), ...]
+        the parsed fields of the cards that can be created directly
+        (see ``create_bulk_cards``)
+    card_fields : dict[icard] = List[str/None]
+        the fields to pass to ``add_card`` as a ``BDFCard``
+
+    """
+    if card_names is None:
+        card_names = BULK_CARD_NAMES
+
+    groups = defaultdict(list)
+    for icard, (card_name, unused_comment, card_lines) in enumerate(cards_list):
+        if card_name in card_names and _is_fixed_small_field(card_lines):
+            groups[(card_name, len(card_lines))].append(icard)
+
+    card_columns = []
+    card_fields = {}
+    for (card_name, nlines), icards in sorted(groups.items()):
+        for i0 in range(0, len(icards), chunk_size):
+            icards_chunk = np.array(icards[i0:i0 + chunk_size])
+            lines = []
+            for icard in icards_chunk.tolist():
+                lines.extend(cards_list[icard][2])
+            fields = tokenize_card_lines(lines, nlines)
+            if not is_simple_ascii(fields):
+                # the cards use add_card
+                continue
+
+            fieldsi = _CardFields(fields)
+            is_valid, columns = _tokenize_card_columns(card_name, fieldsi)
+            if is_valid.any():
+                columns = tuple(column[is_valid] for column in columns)
+                card_columns.append((card_name, icards_chunk[is_valid], columns))
+            for i in np.where(~is_valid)[0].tolist():
+                card_fields[int(icards_chunk[i])] = fieldsi.get_card(i)
+    return card_columns, card_fields
+
+
+def create_bulk_cards(cards_list, card_columns):
+    """
+    Creates the cards from the output of ``tokenize_bulk_cards``
+
+    Parameters
+    ----------
+    cards_list : List[[card_name, comment, card_lines], ...]
+        the cards from ``BDF.get_bdf_cards``
+    card_columns : List[(card_name, icards, columns), ...]
+        the parsed fields of the cards
+
+    Returns
+    -------
+    card_objects : dict[icard] = card
+        the cards that were created; a card that failed is left out,
+        so it uses ``add_card``
+
+    """
+    card_objects = {}
+    for card_name, icards, columns in card_columns:
+        icards = icards.tolist()
+        comments = [cards_list[icard][1] for icard in icards]
+        card_objectsi = CREATE_CARDS[card_name](card_name, columns, comments)
+        card_objects.update(zip(icards, card_objectsi))
+        for icard, card_object in zip(icards, card_objectsi):
+            if card_object is None:
+                del card_objects[icard]
+    return card_objects
+
+
+def parse_bulk_cards(cards_list, card_names=None, chunk_size=100000):
+    """
+    Tokenizes the high-volume cards in bulk and creates the cards that
+    don't need ``add_card``
+
+    Parameters
+    ----------
+    cards_list : List[[card_name, comment, card_lines], ...]
+        the cards from ``BDF.get_bdf_cards``
+    card_names : set[str]; default=None -> BULK_CARD_NAMES
+        the cards to tokenize
+    chunk_size : int; default=100000
+        the number of cards that are tokenized at once, which limits the
+        size of the temporary field arrays
+
+    Returns
+    -------
+    card_objects : dict[icard] = card
+        the cards that were created without ``add_card``
+    card_fields : dict[icard] = List[str/None]
+        the fields to pass to ``add_card`` as a ``BDFCard``
+
+    """
+    card_columns, card_fields = tokenize_bulk_cards(
+        cards_list, card_names=card_names, chunk_size=chunk_size)
+    card_objects = create_bulk_cards(cards_list, card_columns)
+    return card_objects, card_fields
+
+
+@contextmanager
+def gc_disabled():
+    """
+    Pauses the cyclic garbage collector, which otherwise dominates the
+    time to create a large number of cards
+
+    .. code-block:: python
+
+        with gc_disabled():
+            card_objects = create_bulk_cards(cards_list, card_columns)
+
+    """
+    is_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if is_enabled:
+            gc.enable()
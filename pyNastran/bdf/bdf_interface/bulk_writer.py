@@ -0,0 +1,349 @@
+"""
+Writes the GRIDs and the common elements in bulk, which is byte-identical
+to calling ``card.write_card(size, is_double)`` on each card.
+
+The ids of each card type are formatted a row at a time with a single
+format string, the floats are formatted once per unique value and the
+cards are written in large chunks.  Cards that don't match the bulk
+layout (e.g., a comment or a non-default optional field) are written
+with their ``write_card`` method.
+
+defines:
+  - write_grids_bulk(bdf_file, nodes, size=8, is_double=False)
+  - write_elements_bulk(bdf_file, elements, size=8, is_double=False)
+  - strings = get_float_8_strings(values)
+  - strings = get_float_16_strings(values, is_double=False)
+"""
+from __future__ import print_function
+from collections import defaultdict
+from operator import attrgetter
+
+import numpy as np
+from pyNastran.bdf.field_writer_8 import format_floats_8
+from pyNastran.bdf.field_writer_16 import format_floats_16
+from pyNastran.bdf.field_writer_double import print_scientific_double
+
+#: the number of cards that are joined before writing them
+CHUNK_SIZE = 10000
+
+
+def write_grids_bulk(bdf_file, nodes, size=8, is_double=False):
+    """
+    Writes GRIDs in bulk
+
+    Parameters
+    ----------
+    bdf_file : file
+        the file object
+    nodes : List[GRID]
+        the sorted nodes
+    size : int; {8, 16}; default=8
+        the field width
+    is_double : bool; default=False
+        is this double precision (size=16 only)
+
+    """
+    nnodes = len(nodes)
+    cards = [None] * nnodes
+    inodes = []
+    rows = []
+    for inode, node in enumerate(nodes):
+        if (node.type != 'GRID' or node.comment or node.Cd() != 0 or
+                node.ps != '' or node.seid != 0 or node.SEid() != 0):
+            continue
+        cp = node.Cp()
+        inodes.append(inode)
+        rows.append((node.nid, cp))
+
+    if inodes:
+        xyz = np.array([nodes[inode].xyz for inode in inodes], dtype='float64')
+        if size == 8:
+            xyzs = get_float_8_strings(xyz)
+            blank = '        '
+            grid_fmt = 'GRID    %8i%8s%s%s%s\n'
+        else:
+            xyzs = get_float_16_strings(xyz, is_double=is_double)
+            blank = '                '
+            grid_fmt = ('GRID*   %%16i%%16s%%16s%%16s\n'
+                        '*       %%16s%s%s%s\n' % (blank, ' ' * 16, blank))
+
+        cp_fmt = '%8s' if size == 8 else '%16s'
+        for inode, (nid, cp), (xs, ys, zs) in zip(inodes, rows, xyzs):
+            if len(xs) + len(ys) + len(zs) != 3 * size:
+                # a value like -999999.9 that doesn't fit in the field
+                continue
+            cps = blank if cp == 0 else cp_fmt % cp
+            cards[inode] = grid_fmt % (nid, cps, xs, ys, zs)
+    _write_cards(bdf_file, nodes, cards, size, is_double, 'node', 'nid')
+
+
+def write_elements_bulk(bdf_file, elements, size=8, is_double=False):
+    """
+    Writes elements in bulk
+
+    The CQUAD4, CTRIA3, CHEXA8/20, CTETRA4/10, CBAR and CBUSH elements
+    without a comment or non-default optional fields are written in
+    bulk.
+
+    Parameters
+    ----------
+    bdf_file : file
+        the file object
+    elements : List[Element]
+        the sorted elements
+    size : int; {8, 16}; default=8
+        the field width
+    is_double : bool; default=False
+        is this double precision
+
+    """
+    groups = defaultdict(list)
+    for ielement, element in enumerate(elements):
+        class_name = element.__class__.__name__
+        if class_name in BULK_ELEMENT_WRITERS and not element.comment:
+            groups[class_name].append(ielement)
+
+    cards = [None] * len(elements)
+    for class_name, ielements in sorted(groups.items()):
+        if class_name == 'CBAR' and size != 8:
+            # print_card_16
+            continue
+        write_func = BULK_ELEMENT_WRITERS[class_name]
+        try:
+            write_func(elements, ielements, cards)
+        except Exception:
+            # the cards that weren't built are written with write_card,
+            # which reports the type/id of the card that fails
+            pass
+    _write_cards(bdf_file, elements, cards, size, is_double, 'element', 'eid')
+
+
+def _write_cards(bdf_file, cards, card_strings, size, is_double, card_class, id_name):
+    """writes the bulk strings and the other cards in chunks"""
+    chunk = []
+    for card, card_string in zip(cards, card_strings):
+        if card_string is None:
+            try:
+                card_string = card.write_card(size, is_double)
+            except:
+                print('failed printing %s...type=%s %s=%s' % (
+                    card_class, card.type, id_name, getattr(card, id_name, None)))
+                raise
+        chunk.append(card_string)
+        if len(chunk) == CHUNK_SIZE:
+            bdf_file.write(''.join(chunk))
+            chunk = []
+    if chunk:
+        bdf_file.write(''.join(chunk))
+
+
+def get_float_8_strings(values):
+    """
+    Gets the 8-character strings of an array of floats
+
+    Parameters
+    ----------
+    values : (...) float ndarray
+        the values
+
+    Returns
+    -------
+    strings : List[...]
+        the nested list of strings with the shape of values
+    """
+    return format_floats_8(values).tolist()
+
+
+def get_float_16_strings(values, is_double=False):
+    """
+    Gets the 16-character strings of an array of floats
+
+    Parameters
+    ----------
+    values : (...) float ndarray
+        the values
+    is_double : bool; default=False
+        use double precision
+
+    Returns
+    -------
+    strings : List[...]
+        the nested list of strings with the shape of values
+    """
+    if is_double:
+        return _get_float_strings(values, print_scientific_double)
+    return format_floats_16(values).tolist()
+
+
+def _get_float_strings(values, print_func):
+    """formats the unique values and maps them back"""
+    values = np.asarray(values, dtype='float64')
+    if values.size == 0:
+        return np.empty(values.shape, dtype='object').tolist()
+    unique_values, inverse = np.unique(values.ravel(), return_inverse=True)
+    unique_strings = np.array([print_func(value) for value in unique_values.tolist()],
+                              dtype='object')
+    return unique_strings[inverse].reshape(values.shape).tolist()
+
+
+def _is_blank(value, default):
+    """is the value written as a blank field"""
+    return value is None or value == default
+
+
+def _is_blank_row2(row2, defaults):
+    """
+    Are the shell theta_mcid, zoffset, tflag and thickness fields blank?
+    An integer theta_mcid (an MCID) is written, but a 0.0 theta isn't.
+    """
+    theta_mcid = row2[0]
+    if not (isinstance(theta_mcid, float) and theta_mcid == 0.0):
+        return False
+    for value, default in zip(row2[1:], defaults):
+        if value is not None and value != default:
+            return False
+    return True
+
+
+def _get_node_ids(elem):
+    """gets the node ids without looping over nodes_ref if possible"""
+    if elem.nodes_ref is None:
+        return elem.nodes
+    return elem.node_ids
+
+
+def _write_cquad4s(elements, ielements, cards):
+    """
+    Writes CQUAD4s that have default row 2 fields; theta_mcid=0 is
+    written as a blank field in that case
+    """
+    default_row2 = (0.0, 0.0, 0, 1.0, 1.0, 1.0, 1.0)
+    defaults = default_row2[1:]
+    get_row2 = attrgetter('theta_mcid', 'zoffset', 'tflag', 'T1', 'T2', 'T3', 'T4')
+    for ielement in ielements:
+        elem = elements[ielement]
+        row2 = get_row2(elem)
+        if row2 != default_row2:
+            if elem.theta_mcid_ref is not None or not _is_blank_row2(row2, defaults):
+                continue
+        nids = _get_node_ids(elem)
+        if None in nids or 0 in nids:
+            continue
+        cards[ielement] = 'CQUAD4  %8i%8i%8i%8i%8i%8i\n' % (
+            elem.eid, elem.Pid(), nids[0], nids[1], nids[2], nids[3])
+
+
+def _write_ctria3s(elements, ielements, cards):
+    """writes CTRIA3s with blank row 2 fields"""
+    defaults = (0.0, 0, 1.0, 1.0, 1.0)
+    get_row2 = attrgetter('theta_mcid', 'zoffset', 'tflag', 'T1', 'T2', 'T3')
+    for ielement in ielements:
+        elem = elements[ielement]
+        if elem.theta_mcid_ref is not None or not _is_blank_row2(get_row2(elem), defaults):
+            continue
+        nids = _get_node_ids(elem)
+        if None in nids or 0 in nids:
+            continue
+        cards[ielement] = 'CTRIA3  %8i%8i%8i%8i%8i\n' % (
+            elem.eid, elem.Pid(), nids[0], nids[1], nids[2])
+
+
+def _get_element_id_writer(fmt, nnodes):
+    """writes elements with a fixed number of nodes and no blank nodes"""
+    def write_func(elements, ielements, cards):
+        """writes the elements that don't have a blank node"""
+        for ielement in ielements:
+            elem = elements[ielement]
+            nids = _get_node_ids(elem)
+            if len(nids) != nnodes or None in nids or 0 in nids:
+                continue
+            cards[ielement] = fmt % tuple([elem.eid, elem.Pid()] + list(nids))
+    return write_func
+
+
+def _write_cbars(elements, ielements, cards):
+    """writes CBARs with an x vector and default offt/pin flags/offsets"""
+    ibars = []
+    rows = []
+    xs = []
+    for ielement in ielements:
+        elem = elements[ielement]
+        if elem.g0 is not None or not _is_blank(elem.offt, 'GGG'):
+            continue
+        if not (_is_blank(elem.pa, 0) and _is_blank(elem.pb, 0)):
+            continue
+        if not all(_is_blank(wi, 0.0) for wi in list(elem.wa) + list(elem.wb)):
+            continue
+        x = list(elem.x)
+        if len(x) != 3 or not all(isinstance(xi, float) and not np.isnan(xi) for xi in x):
+            continue
+        ibars.append(ielement)
+        rows.append((elem.eid, elem.Pid(), elem.Ga(), elem.Gb()))
+        xs.append(x)
+
+    if not ibars:
+        return
+    xs = get_float_8_strings(np.array(xs, dtype='float64'))
+    for ielement, row, (x1, x2, x3) in zip(ibars, rows, xs):
+        if len(x1) + len(x2) + len(x3) != 24:
+            continue
+        cards[ielement] = 'CBAR    %8i%8i%8i%8i%s%s%s\n' % (row + (x1, x2, x3))
+
+
+def _write_cbushs(elements, ielements, cards):
+    """
+    Writes CBUSHs with default s/ocid/si fields that are oriented
+    with an x vector or a coordinate system
+    """
+    ibushes = []
+    rows = []
+    xs = []
+    for ielement in ielements:
+        elem = elements[ielement]
+        if elem.g0 is not None or not _is_blank(elem.s, 0.5):
+            continue
+        if not _is_blank(elem.OCid(), -1) or any(si is not None for si in elem.si):
+            continue
+        ga = elem.Ga()
+        gb = elem.Gb()
+        if ga is None or gb is None:
+            continue
+        cid = elem.Cid()
+        x = list(elem.x)
+        if cid is None:
+            if len(x) != 3 or not all(isinstance(xi, float) and not np.isnan(xi) for xi in x):
+                continue
+            ibushes.append(ielement)
+            rows.append((elem.eid, elem.Pid(), ga, gb))
+            xs.append(x)
+        elif x == [None, None, None]:
+            cards[ielement] = 'CBUSH   %8i%8i%8i%8i%24s%8i\n' % (
+                elem.eid, elem.Pid(), ga, gb, '', cid)
+
+    if not ibushes:
+        return
+    xs = get_float_8_strings(np.array(xs, dtype='float64'))
+    for ielement, row, (x1, x2, x3) in zip(ibushes, rows, xs):
+        if len(x1) + len(x2) + len(x3) != 24:
+            continue
+        cards[ielement] = 'CBUSH   %8i%8i%8i%8i%s%s%s\n' % (row + (x1, x2, x3))
+
+
+#: class name : function that fills the bulk strings
+BULK_ELEMENT_WRITERS = {
+    'CQUAD4' : _write_cquad4s,
+    'CTRIA3' : _write_ctria3s,
+    'CTETRA4' : _get_element_id_writer('CTETRA  %8i%8i%8i%8i%8i%8i\n', 4),
+    'CTETRA10' : _get_element_id_writer(
+        'CTETRA  %8i%8i%8i%8i%8i%8i%8i%8i\n'
+        '        %8i%8i%8i%8i\n', 10),
+    'CHEXA8' : _get_element_id_writer(
+        'CHEXA   %8i%8i%8i%8i%8i%8i%8i%8i\n'
+        '        %8i%8i\n', 8),
+    'CHEXA20' : _get_element_id_writer(
+        'CHEXA   %8i%8i%8i%8i%8i%8i%8i%8i\n'
+        '        %8i%8i%8i%8i%8i%8i%8i%8i\n'
+        '        %8i%8i%8i%8i%8i%8i\n', 20),
+    'CBAR' : _write_cbars,
+    'CBUSH' : _write_cbushs,
+}
@@ -64,12 +64,46 @@ around the idea of cross-referencing, so it's recommended that you use it.
 
 from __future__ import print_function
 from collections import defaultdict
+from itertools import chain, compress
+from operator import attrgetter
 import traceback
 from typing import List, Dict, Any
-from six import iteritems, itervalues
+from six import iteritems, iterkeys, itervalues
+from six.moves import map
 
+import numpy as np
 from numpy import zeros, argsort, arange, array_equal
+from pyNastran.utils import integer_types
 from pyNastran.bdf.bdf_interface.attributes import BDFAttributes
+from pyNastran.bdf.bdf_interface.bulk_tokenizer import gc_disabled
+
+#: the elements that are cross-referenced in bulk
+#: class name : (allows blank nodes, the property/material id attribute,
+#:               has a theta_mcid)
+VECTORIZED_ELEMENTS = {
+    'CTRIA3' : (False, 'pid', True),
+    'CQUAD4' : (False, 'pid', True),
+    'CQUAD' : (True, 'pid', True),
+    'CTRIAR' : (False, 'pid', False),
+    'CQUADR' : (True, 'pid', False),
+    'CTRIA6' : (True, 'pid', False),
+    'CQUAD8' : (True, 'pid', False),
+    'CQUADX' : (True, 'pid', False),
+    'CSHEAR' : (False, 'pid', False),
+    'CTETRA4' : (False, 'pid', False),
+    'CPENTA6' : (False, 'pid', False),
+    'CHEXA8' : (False, 'pid', False),
+    'CTETRA10' : (True, 'pid', False),
+    'CPENTA15' : (True, 'pid', False),
+    'CHEXA20' : (True, 'pid', False),
+    'CPYRAM5' : (True, 'pid', False),
+    'CPYRAM13' : (True, 'pid', False),
+    'CROD' : (False, 'pid', False),
+    'CTUBE' : (False, 'pid', False),
+    'CONROD' : (False, 'mid', False),
+    'CELAS1' : (True, 'pid', False),
+    'CELAS2' : (True, None, False),
+}
 
 class XrefMesh(BDFAttributes):
     """
@@ -149,32 +183,33 @@ class XrefMesh(BDFAttributes):
         if not xref:
             return
         self.log.debug("Cross Referencing...")
-        if xref_nodes:
-            self._cross_reference_nodes()
-            self._cross_reference_coordinates()
-
-        if xref_elements:
-            self._cross_reference_elements()
-        if xref_properties:
-            self._cross_reference_properties()
-        if xref_masses:
-            self._cross_reference_masses()
-        if xref_materials:
-            self._cross_reference_materials()
-
-        if xref_aero:
-            self._cross_reference_aero()
-        if xref_constraints:
-            self._cross_reference_constraints()
-        if xref_loads:
-            self._cross_reference_loads()
-        if xref_sets:
-            self._cross_reference_sets()
-        if xref_optimization:
-            self._cross_reference_optimization()
-        if xref_nodes_with_elements:
-            self._cross_reference_nodes_with_elements()
-        #self.case_control_deck.cross_reference(self)
+        with gc_disabled():
+            if xref_nodes:
+                self._cross_reference_nodes()
+                self._cross_reference_coordinates()
+
+            if xref_elements:
+                self._cross_reference_elements()
+            if xref_properties:
+                self._cross_reference_properties()
+            if xref_masses:
+                self._cross_reference_masses()
+            if xref_materials:
+                self._cross_reference_materials()
+
+            if xref_aero:
+                self._cross_reference_aero()
+            if xref_constraints:
+                self._cross_reference_constraints()
+            if xref_loads:
+                self._cross_reference_loads()
+            if xref_sets:
+                self._cross_reference_sets()
+            if xref_optimization:
+                self._cross_reference_optimization()
+            if xref_nodes_with_elements:
+                self._cross_reference_nodes_with_elements()
+            #self.case_control_deck.cross_reference(self)
         self.pop_xref_errors()
 
     def _cross_reference_constraints(self):
@@ -309,9 +344,34 @@ class XrefMesh(BDFAttributes):
         # type: () -> None
         """
         Links the nodes to coordinate systems
+
+        The coordinate systems of the GRIDs are looked up in bulk.  The
+        GRIDs with a missing coordinate system (or a GRDSET) are
+        cross-referenced one at a time.
         """
         grdset = self.grdset
-        for node in itervalues(self.nodes):
+        nodes = list(itervalues(self.nodes))
+        if nodes and not grdset:
+            coord_ids, coords = _get_sorted_cards(self.coords)
+            cps = np.array([node.cp for node in nodes], dtype='int64')
+            cds = np.array([node.cd for node in nodes], dtype='int64')
+            cp_refs, is_cp = _get_cards_by_id(coord_ids, coords, cps)
+            cd_refs, is_cd = _get_cards_by_id(coord_ids, coords, cds)
+            is_cd |= cds == -1
+            is_valid = (is_cp & is_cd).tolist()
+
+            bad_nodes = []
+            for node, cp_ref, cd_ref, is_validi in zip(nodes, cp_refs.tolist(),
+                                                       cd_refs.tolist(), is_valid):
+                if not is_validi:
+                    bad_nodes.append(node)
+                    continue
+                node.cp_ref = cp_ref
+                if cd_ref is not None:
+                    node.cd_ref = cd_ref
+            nodes = bad_nodes
+
+        for node in nodes:
             try:
                 node.cross_reference(self, grdset)
             except:
@@ -329,44 +389,96 @@ class XrefMesh(BDFAttributes):
         """
         Links the elements to nodes, properties (and materials depending on
         the card).
+
+        The elements in ``VECTORIZED_ELEMENTS`` are grouped by class, so
+        the node/property ids of a group are found with one
+        ``np.searchsorted``.  The other elements and the elements with a
+        missing id are cross-referenced one at a time in the order of
+        ``self.elements``, so the errors are the same.
         """
+        element_groups = defaultdict(list)  # type: Dict[str, List[Any]]
+        other_elements = []
         for elem in itervalues(self.elements):
+            class_name = elem.__class__.__name__
+            if class_name in VECTORIZED_ELEMENTS:
+                element_groups[class_name].append(elem)
+            else:
+                other_elements.append(elem)
+
+        node_ids, nodes = _get_sorted_cards(self.nodes, self.spoints, self.epoints)
+        property_ids, properties = _get_sorted_cards(self.properties)
+        material_ids, materials = _get_sorted_cards(self.materials, self.thermal_materials)
+        coord_ids, coords = _get_sorted_cards(self.coords)
+        for class_name, elems in sorted(iteritems(element_groups)):
+            allow_empty_nodes, id_name, has_mcid = VECTORIZED_ELEMENTS[class_name]
+            nids, is_blank = _get_element_node_ids(elems)
+            if nids is None:
+                # unexpected node ids (e.g., a ragged list), so the
+                # elements are checked one at a time
+                other_elements.extend(elems)
+                continue
+
+            nodes_refs, is_valid = _get_cards_by_id(node_ids, nodes, nids)
+            if allow_empty_nodes:
+                is_valid |= is_blank
+            is_valid = is_valid.all(axis=1)
+
+            refs = None
+            if id_name is not None:
+                ids = np.fromiter(map(attrgetter(id_name), elems), dtype='int64',
+                                  count=len(elems))
+                if id_name == 'pid':
+                    refs, is_ref = _get_cards_by_id(property_ids, properties, ids)
+                else:
+                    refs, is_ref = _get_cards_by_id(material_ids, materials, ids)
+                is_valid &= is_ref
+
+            mcid_refs = None
+            if has_mcid:
+                theta_mcids = list(map(attrgetter('theta_mcid'), elems))
+                imcid = [i for i, theta_mcid in enumerate(theta_mcids)
+                         if isinstance(theta_mcid, integer_types)]
+                mcids = np.array([theta_mcids[i] for i in imcid], dtype='int64')
+                mcid_refs, is_mcid = _get_cards_by_id(coord_ids, coords, mcids)
+                is_valid[imcid] &= is_mcid
+
+            is_valid_list = is_valid.tolist()
+            valid_elems = list(compress(elems, is_valid_list))
+            other_elements.extend(compress(elems, [not is_validi for is_validi in is_valid_list]))
+
+            nodes_refs = nodes_refs[is_valid, :].tolist()
+            for elem, nodes_ref in zip(valid_elems, nodes_refs):
+                elem.nodes_ref = nodes_ref
+            if id_name == 'pid':
+                for elem, pid_ref in zip(valid_elems, refs[is_valid].tolist()):
+                    elem.pid_ref = pid_ref
+            elif id_name == 'mid':
+                for elem, mid_ref in zip(valid_elems, refs[is_valid].tolist()):
+                    elem.mid_ref = mid_ref
+            if mcid_refs is not None:
+                for i, mcid_ref in zip(imcid, mcid_refs.tolist()):
+                    if is_valid_list[i]:
+                        elems[i].theta_mcid_ref = mcid_ref
+
+        if element_groups and other_elements:
+            # keep the order of self.elements, so the errors are the same
+            ielements = {id(elem): i for i, elem in enumerate(itervalues(self.elements))}
+            other_elements.sort(key=lambda elem: ielements[id(elem)])
+        self._cross_reference_cards(other_elements)
+        self._cross_reference_cards(itervalues(self.masses))
+        self._cross_reference_cards(itervalues(self.rigid_elements))
+        self._cross_reference_cards(itervalues(self.plotels))
+
+    def _cross_reference_cards(self, cards):
+        # type: (List[Any]) -> None
+        """cross references the cards one at a time and stores the errors"""
+        for card in cards:
             try:
-                elem.cross_reference(self)
-            except (SyntaxError, RuntimeError, AssertionError, KeyError, ValueError) as error:
-                self._ixref_errors += 1
-                var = traceback.format_exception_only(type(error), error)
-                self._stored_xref_errors.append((elem, var))
-                if self._ixref_errors > self._nxref_errors:
-                    self.pop_xref_errors()
-
-        for elem in itervalues(self.masses):
-            try:
-                elem.cross_reference(self)
-            except (SyntaxError, RuntimeError, AssertionError, KeyError, ValueError) as error:
-                self._ixref_errors += 1
-                var = traceback.format_exception_only(type(error), error)
-                self._stored_xref_errors.append((elem, var))
-                if self._ixref_errors > self._nxref_errors:
-                    self.pop_xref_errors()
-
-        for elem in itervalues(self.rigid_elements):
-            try:
-                elem.cross_reference(self)
-            except (SyntaxError, RuntimeError, AssertionError, KeyError, ValueError) as error:
-                self._ixref_errors += 1
-                var = traceback.format_exception_only(type(error), error)
-                self._stored_xref_errors.append((elem, var))
-                if self._ixref_errors > self._nxref_errors:
-                    self.pop_xref_errors()
-
-        for elem in itervalues(self.plotels):
-            try:
-                elem.cross_reference(self)
+                card.cross_reference(self)
             except (SyntaxError, RuntimeError, AssertionError, KeyError, ValueError) as error:
                 self._ixref_errors += 1
                 var = traceback.format_exception_only(type(error), error)
-                self._stored_xref_errors.append((elem, var))
+                self._stored_xref_errors.append((card, var))
                 if self._ixref_errors > self._nxref_errors:
                     self.pop_xref_errors()
 
@@ -374,23 +486,45 @@ class XrefMesh(BDFAttributes):
         # type: () -> None
         """
         Links the nodes to all connected elements
+
+        The (node id, element) pairs are sorted with a stable sort, so the
+        elements of a node are in the same order as ``self.elements``.
         """
-        nodes = defaultdict(list)  # type: Dict[int, List[Any]]
+        elements = []
+        all_nids = []
+        ielements = []
         for element in itervalues(self.elements):
-            #if element.type in ['CONM2']:
-            #    pass
-            #else:
-            if element.nodes is not None:
-                for nid in element.node_ids:
-                    if nid is None:
-                        continue
-                    nodes[nid].append(element)
-                    #except AttributeError:
-                        #print(element)
-                        #print('node = %s' % str(node))
-                        #raise
-        for node in itervalues(self.nodes):
-            node.elements_ref = nodes[node.nid]
+            if element.nodes is None:
+                continue
+            if element.__class__.__name__ in VECTORIZED_ELEMENTS:
+                # the node ids without going through nodes_ref
+                nids = element.nodes
+            else:
+                nids = element.node_ids
+            all_nids.extend(nids)
+            ielements.extend([len(elements)] * len(nids))
+            elements.append(element)
+
+        nids = np.array(all_nids, dtype='object')
+        is_node = np.not_equal(nids, None)
+        nids[~is_node] = 0
+        nids = nids.astype('int64')
+        is_node &= nids > 0
+        nids = nids[is_node]
+        ielements = np.array(ielements, dtype='int64')[is_node]
+        isort = np.argsort(nids, kind='mergesort')
+        nids = nids[isort]
+
+        element_refs = np.empty(len(elements), dtype='object')
+        for i, element in enumerate(elements):
+            element_refs[i] = element
+        element_refs = element_refs[ielements[isort]].tolist()
+
+        node_ids = np.array(list(self.nodes.keys()), dtype='int64')
+        istarts = np.searchsorted(nids, node_ids, side='left').tolist()
+        iends = np.searchsorted(nids, node_ids, side='right').tolist()
+        for node, istart, iend in zip(itervalues(self.nodes), istarts, iends):
+            node.elements_ref = element_refs[istart:iend]
 
     def _cross_reference_masses(self):
         # type: () -> None
@@ -659,3 +793,93 @@ class XrefMesh(BDFAttributes):
             # pyram elpr <= 0.5
             # pyram detj <= 0.
             # pyram warp <= 0.707
+
+
+def _get_sorted_cards(*card_dicts):
+    """
+    Gets the sorted ids and cards of one or more card dictionaries
+
+    The first dictionary with an id is used, so the order sets the
+    priority (e.g., GRIDs, SPOINTs, EPOINTs).
+
+    Returns
+    -------
+    ids : (ncards, ) int ndarray
+        the sorted card ids
+    cards : (ncards, ) object ndarray
+        the cards
+    """
+    cards_dict = {}
+    for cards_dicti in reversed(card_dicts):
+        cards_dict.update(cards_dicti)
+    ncards = len(cards_dict)
+    ids = np.fromiter(iterkeys(cards_dict), dtype='int64', count=ncards)
+    cards = np.empty(ncards, dtype='object')
+    for i, card in enumerate(itervalues(cards_dict)):
+        cards[i] = card
+    isort = np.argsort(ids)
+    return ids[isort], cards[isort]
+
+
+def _get_element_node_ids(elems):
+    """
+    Gets the node ids of a group of elements
+
+    Returns
+    -------
+    nids : (nelements, nnodes) int ndarray
+        the node ids; 0 for a blank node
+        None : the elements have a different number of nodes
+    is_blank : (nelements, nnodes) bool ndarray
+        is the node blank
+    """
+    nids_list = list(map(attrgetter('nodes'), elems))
+    nnodes = set(map(len, nids_list))
+    if len(nnodes) != 1:
+        return None, None
+    nnodes = nnodes.pop()
+    nelements = len(nids_list)
+    try:
+        nids = np.fromiter(chain.from_iterable(nids_list), dtype='int64',
+                           count=nelements * nnodes)
+    except TypeError:
+        # blank nodes
+        nids = np.array(list(chain.from_iterable(nids_list)), dtype='object')
+        nids[np.equal(nids, None)] = 0
+        try:
+            nids = nids.astype('int64')
+        except (TypeError, ValueError):
+            return None, None
+    nids = nids.reshape(nelements, nnodes)
+    return nids, nids == 0
+
+
+def _get_cards_by_id(ids, cards, card_ids):
+    """
+    Looks up the cards of an array of ids
+
+    Parameters
+    ----------
+    ids : (ncards, ) int ndarray
+        the sorted card ids
+    cards : (ncards, ) object ndarray
+        the cards
+    card_ids : (...) int ndarray
+        the ids to find
+
+    Returns
+    -------
+    card_refs : (...) object ndarray
+        the cards; None for a missing id
+    is_found : (...) bool ndarray
+        was the id found
+    """
+    if len(ids) == 0:
+        card_refs = np.empty(card_ids.shape, dtype='object')
+        return card_refs, np.zeros(card_ids.shape, dtype='bool')
+    index = np.searchsorted(ids, card_ids)
+    index[index == len(ids)] = 0
+    is_found = ids[index] == card_ids
+    card_refs = cards[index]
+    card_refs[~is_found] = None
+    return card_refs, is_found
@@ -0,0 +1,149 @@
+"""
+Compares the bulk tokenizer (use_bulk_tokenizer=True) to the per-card
+path (use_bulk_tokenizer=False) in ``read_bdf``.
+
+A plate/solid mesh with GRID, CQUAD4, CTRIA3, CHEXA, CTETRA, CBAR, CBUSH,
+RBE2, FORCE and PLOAD4 cards is written to a temporary file, unless a
+BDF is passed in.
+
+Usage
+-----
+python benchmark_bulk_tokenizer.py [BDF_FILENAME...]
+
+"""
+from __future__ import print_function
+import os
+import sys
+import time
+import tempfile
+
+from pyNastran.bdf.bdf import BDF
+
+
+def write_benchmark_model(bdf_filename, nx=300, ny=300):
+    """
+    Writes a plate with a layer of hexas/tets on top, so all the bulk
+    tokenized cards are used
+
+    Parameters
+    ----------
+    bdf_filename : str
+        the file to write
+    nx / ny : int; default=300
+        the number of elements in the x/y directions
+
+    """
+    nnodes_layer = (nx + 1) * (ny + 1)
+    with open(bdf_filename, 'w') as bdf_file:
+        bdf_file.write('SOL 101\nCEND\nBEGIN BULK\n')
+        nid = 1
+        for iz in range(2):
+            for iy in range(ny + 1):
+                for ix in range(nx + 1):
+                    # some of the coordinates use the Nastran exponent format
+                    bdf_file.write('GRID    %8i        %-8s%-8s%-8s\n' % (
+                        nid, '%.3f' % (ix * 0.1), '%.3f' % (iy * 0.1),
+                        '1.-3' if iz else '0.'))
+                    nid += 1
+
+        eid = 1
+        for iy in range(ny):
+            for ix in range(nx):
+                n1 = iy * (nx + 1) + ix + 1
+                n2 = n1 + 1
+                n3 = n2 + nx + 1
+                n4 = n1 + nx + 1
+                if ix % 2:
+                    bdf_file.write('CQUAD4  %8i       1%8i%8i%8i%8i\n' % (eid, n1, n2, n3, n4))
+                    eid += 1
+                else:
+                    bdf_file.write('CTRIA3  %8i       1%8i%8i%8i\n' % (eid, n1, n2, n3))
+                    bdf_file.write('CTRIA3  %8i       1%8i%8i%8i\n' % (eid + 1, n1, n3, n4))
+                    eid += 2
+
+                if iy % 2:
+                    bdf_file.write('CHEXA   %8i       2%8i%8i%8i%8i%8i%8i\n'
+                                   '        %8i%8i\n' % (
+                                       eid, n1, n2, n3, n4, n1 + nnodes_layer,
+                                       n2 + nnodes_layer, n3 + nnodes_layer,
+                                       n4 + nnodes_layer))
+                else:
+                    bdf_file.write('CTETRA  %8i       2%8i%8i%8i%8i\n' % (
+                        eid, n1, n2, n4, n1 + nnodes_layer))
+                eid += 1
+
+                if ix == 0:
+                    bdf_file.write('CBAR    %8i       3%8i%8i      0.      0.      1.\n' % (
+                        eid, n1, n4))
+                    bdf_file.write('CBUSH   %8i       4%8i%8i                       0\n' % (
+                        eid + 1, n1, n1 + nnodes_layer))
+                    bdf_file.write('RBE2    %8i%8i  123456%8i%8i\n' % (
+                        eid + 2, n2, n2 + nnodes_layer, n3 + nnodes_layer))
+                    bdf_file.write('FORCE          1%8i       0     1.0      0.      0.      1.\n' % (
+                        n1))
+                    bdf_file.write('PLOAD4         1%8i     1.0\n' % (eid - 1))
+                    eid += 3
+        bdf_file.write(
+            'PSHELL         1     100     0.1     100\n'
+            'PSOLID         2     100\n'
+            'PBAR           3     100     1.0     1.0     1.0     1.0\n'
+            'PBUSH          4       K    100.    100.    100.    100.    100.    100.\n'
+            'MAT1         100   3.+7             0.3\n'
+            'ENDDATA\n')
+
+
+def time_read_bdf(bdf_filename, use_bulk_tokenizer, nrepeat=3):
+    """
+    Reads the BDF nrepeat times and returns the fastest time
+
+    Returns
+    -------
+    dt : float
+        the fastest read time in seconds
+    model : BDF()
+        the last model that was read
+
+    """
+    dt_min = None
+    for unused_i in range(nrepeat):
+        model = BDF(debug=None)
+        model.use_bulk_tokenizer = use_bulk_tokenizer
+        time0 = time.time()
+        model.read_bdf(bdf_filename, xref=False)
+        dt = time.time() - time0
+        if dt_min is None or dt < dt_min:
+            dt_min = dt
+    return dt_min, model
+
+
+def run_benchmark(bdf_filenames, nrepeat=3):
+    """compares the per-card and bulk tokenized readers"""
+    print('%-40s %8s %10s %10s %7s' % (
+        'bdf_filename', 'ncards', 'dt_card', 'dt_bulk', 'speedup'))
+    for bdf_filename in bdf_filenames:
+        dt_card, unused_model = time_read_bdf(bdf_filename, False, nrepeat=nrepeat)
+        dt_bulk, model = time_read_bdf(bdf_filename, True, nrepeat=nrepeat)
+        ncards = sum(model.card_count.values())
+        print('%-40s %8i %10.4f %10.4f %7.2f' % (
+            os.path.basename(bdf_filename), ncards, dt_card, dt_bulk, dt_card / dt_bulk))
+
+
+def main():  # pragma: no cover
+    """runs the benchmark"""
+    bdf_filenames = sys.argv[1:]
+    if bdf_filenames:
+        run_benchmark(bdf_filenames)
+        return
+
+    dirname = tempfile.mkdtemp()
+    bdf_filename = os.path.join(dirname, 'bulk_tokenizer.bdf')
+    write_benchmark_model(bdf_filename)
+    try:
+        run_benchmark([bdf_filename])
+    finally:
+        os.remove(bdf_filename)
+        os.rmdir(dirname)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
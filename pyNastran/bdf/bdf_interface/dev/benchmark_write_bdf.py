@@ -0,0 +1,68 @@
+"""
+Times writing the GRIDs and CQUAD4s of a plate in cards per second.
+
+The bulk writer (write_grids_bulk/write_elements_bulk), which is used by
+write_bdf, is compared to calling write_card on each card and the output
+is checked to be byte-identical.
+
+Usage
+-----
+python benchmark_write_bdf.py [NX]
+
+"""
+from __future__ import print_function
+import sys
+import time
+
+import numpy as np
+from six import StringIO
+
+from pyNastran.bdf.bdf import BDF
+from pyNastran.bdf.bdf_interface.bulk_writer import write_grids_bulk, write_elements_bulk
+from pyNastran.utils.log import SimpleLogger
+
+
+def get_plate(nx):
+    """creates a (nx, nx) CQUAD4 plate with random coordinates"""
+    model = BDF(log=SimpleLogger(level='error'))
+    model.add_pshell(1, mid1=1, t=0.1)
+    model.add_mat1(1, 3.0e7, None, 0.3)
+
+    xyz = np.random.uniform(-100., 100., size=((nx + 1) ** 2, 3))
+    for inode, xyzi in enumerate(xyz):
+        model.add_grid(inode + 1, xyzi)
+
+    eid = 1
+    for j in range(nx):
+        for i in range(nx):
+            n1 = j * (nx + 1) + i + 1
+            model.add_cquad4(eid, 1, [n1, n1 + 1, n1 + nx + 2, n1 + nx + 1])
+            eid += 1
+    return model
+
+
+def run(nx=300):
+    """times the writers"""
+    model = get_plate(nx)
+    nodes = [node for unused_nid, node in sorted(model.nodes.items())]
+    elements = [elem for unused_eid, elem in sorted(model.elements.items())]
+    ncards = len(nodes) + len(elements)
+    for size, is_double in [(8, False), (16, False), (16, True)]:
+        time0 = time.time()
+        expected = ''.join(node.write_card(size, is_double) for node in nodes)
+        expected += ''.join(elem.write_card(size, is_double) for elem in elements)
+        dt_card = time.time() - time0
+
+        time0 = time.time()
+        bdf_file = StringIO()
+        write_grids_bulk(bdf_file, nodes, size=size, is_double=is_double)
+        write_elements_bulk(bdf_file, elements, size=size, is_double=is_double)
+        dt_bulk = time.time() - time0
+        assert bdf_file.getvalue() == expected
+
+        print('size=%-2s is_double=%-5s write_card: %8.0f cards/s; bulk: %8.0f cards/s' % (
+            size, is_double, ncards / dt_card, ncards / dt_bulk))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    run(*[int(arg) for arg in sys.argv[1:]])
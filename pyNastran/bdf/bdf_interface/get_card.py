@@ -37,6 +37,7 @@ from __future__ import (nested_scopes, generators, division, absolute_import,
                         print_function, unicode_literals)
 from copy import deepcopy
 from collections import defaultdict
+from itertools import chain
 from typing import List, Dict, Set, Optional, Any
 from six import string_types, iteritems, iterkeys
 
@@ -2231,61 +2232,37 @@ class GetCard(GetMethods):
         """
         Returns a dictionary that maps node IDs to a list of elemnent IDs
 
-        .. todo:: support 0d or 1d elements
-        .. todo:: support elements with missing nodes
-                  (e.g. CQUAD8 with missing nodes)
+        The map is built from a new ``Connectivity``, so it's up to date
+        when the nodes of an element have been changed.  The GRIDs and
+        SPOINTs are keys.  Elements without a ``node_ids`` attribute are
+        skipped.
         """
-        nid_to_eids_map = {}
-        for nid in self.nodes:  # initalize the mapper
-            nid_to_eids_map[nid] = []
-
-        if self.spoints:  # SPOINTs
-            for nid in sorted(self.spoints):  # SPOINTs
-                nid_to_eids_map[nid] = []
-
-        for (eid, element) in iteritems(self.elements):  # load the mapper
-            try:
-                # not supported for 0-D and 1-D elements
-                nids = element.node_ids
-            except AttributeError:
-                print(element.type)
-            else:
-                for nid in nids:  # (e.g. CQUAD8 with missing node)
-                    if nid:
-                        nid_to_eids_map[nid].append(eid)
-
-        return nid_to_eids_map
+        nid_to_eids_map = self._get_node_id_to_element_ids_map()
+        return {nid : nid_to_eids_map[nid] for nid in chain(self.nodes, self.spoints)}
 
     def get_node_id_to_elements_map(self):
         """
         Returns a dictionary that maps node IDs to a list of elemnents
 
-        .. todo:: support 0d or 1d elements
-        .. todo:: support elements with missing nodes
-                  (e.g. CQUAD8 with missing nodes)
+        The map is built from a new ``Connectivity``, so it's up to date
+        when the nodes of an element have been changed.  The GRIDs,
+        SPOINTs and EPOINTs are keys.  Elements without a ``node_ids``
+        attribute are skipped.
         """
+        elements = self.elements
         nid_to_elements_map = {}
-        for nid in self.nodes:  # initalize the mapper
-            nid_to_elements_map[nid] = []
-
-        for nid in self.spoints:
-            nid_to_elements_map[nid] = []
-        for nid in self.epoints:
-            nid_to_elements_map[nid] = []
-
-        for (unused_eid, element) in iteritems(self.elements):  # load the mapper
-            try:
-                # not supported for 0-D and 1-D elements
-                nids = element.node_ids
-            except AttributeError:
-                print(element.type)
-            else:
-                for nid in nids:  # (e.g. CQUAD8 with missing node)
-                    if nid:
-                        nid_to_elements_map[nid].append(element)
-
+        for nid, eids in iteritems(self._get_node_id_to_element_ids_map()):
+            nid_to_elements_map[nid] = [elements[eid] for eid in eids]
         return nid_to_elements_map
 
+    def _get_node_id_to_element_ids_map(self):
+        """
+        Gets the node id to element ids map of the GRIDs/SPOINTs/EPOINTs
+        without using the cached ``self.connectivity``
+        """
+        from pyNastran.bdf.mesh_utils.connectivity import Connectivity
+        return Connectivity(self).get_node_id_to_element_ids_map()
+
     def get_property_id_to_element_ids_map(self, msg=''):
         """
         Returns a dictionary that maps a property ID to a list of elemnents
@@ -34,6 +34,16 @@ class BDFInputPy(object):
 
         self.reject_lines = []
         self.read_includes = read_includes
+
+        #: the [istart, iend) bulk data line ranges of the top level INCLUDE files
+        self.bulk_include_ranges = []  # type: List[List[int]]
+        #: the (filename, mtime, size) of the files of each of the
+        #: bulk_include_ranges: the top level INCLUDE file and then its
+        #: nested INCLUDE files; the mtime/size are from before the
+        #: file was read
+        self.bulk_include_files = []  # type: List[List[Any]]
+        self._include_ranges = []  # type: List[List[int]]
+        self._include_files = []  # type: List[List[Any]]
         self.active_filenames = []
         self.active_filename = None
 
@@ -70,7 +80,15 @@ class BDFInputPy(object):
         out = _lines_to_decks(all_lines, punch)
         system_lines, executive_control_lines, case_control_lines, bulk_data_lines = out
         if self.nastran_format in ['msc', 'nx']:
-            pass
+            # the bulk data lines are the end of all_lines
+            ibulk = len(all_lines) - len(bulk_data_lines)
+            self.bulk_include_ranges = []
+            self.bulk_include_files = []
+            for (istart, iend), include_files in zip(self._include_ranges,
+                                                     self._include_files):
+                if istart >= ibulk:
+                    self.bulk_include_ranges.append([istart - ibulk, iend - ibulk])
+                    self.bulk_include_files.append(include_files)
         elif self.nastran_format == 'zona':
             system_lines2 = []
             for system_line in system_lines:
@@ -154,6 +172,8 @@ class BDFInputPy(object):
             all the active lines in the deck
         """
         nlines = len(lines)
+        self._include_ranges = []
+        self._include_files = []
 
         i = 0
         while i < nlines:
@@ -182,6 +202,9 @@ class BDFInputPy(object):
 
                     with self._open_file(bdf_filename2, basename=False) as bdf_file:
                         #print('bdf_file.name = %s' % bdf_file.name)
+                        stat = os.fstat(bdf_file.fileno())
+                        include_file = (os.path.abspath(bdf_file.name),
+                                        stat.st_mtime, stat.st_size)
                         try:
                             lines2 = bdf_file.readlines()
                         except UnicodeDecodeError:
@@ -203,10 +226,12 @@ class BDFInputPy(object):
                     #for line in lines2:
                         #print("  ?%s" % line.rstrip())
                     lines = lines[:i] + [include_comment] + lines2 + lines[j:]
+                    self._update_include_ranges(i, 1 + len(lines2), j - i, include_file)
                     #for line in lines:
                         #print("  *%s" % line.rstrip())
                 else:
                     lines = lines[:i] + lines[j:]
+                    self._update_include_ranges(i, 0, j - i, None)
                     self.reject_lines.append(include_lines)
                     #self.reject_lines.append(write_include(bdf_filename2))
             i += 1
@@ -215,6 +240,34 @@ class BDFInputPy(object):
             self._dump_file('pyNastran_dump.bdf', lines, i)
         return lines
 
+    def _update_include_ranges(self, i, nlines_inserted, nlines_removed, include_file):
+        """
+        Tracks the lines of the top level INCLUDE files, which may
+        have nested INCLUDE files.
+
+        Parameters
+        ----------
+        i : int
+            the line of the INCLUDE statement
+        nlines_inserted : int
+            the number of lines that replace the INCLUDE statement
+            (0 if the INCLUDE file isn't read)
+        nlines_removed : int
+            the number of lines in the INCLUDE statement
+        include_file : (str, float, int) / None
+            the (filename, mtime, size) of the INCLUDE file
+            None : the INCLUDE file isn't read
+
+        """
+        if self._include_ranges and i < self._include_ranges[-1][1]:
+            # a nested INCLUDE
+            self._include_ranges[-1][1] += nlines_inserted - nlines_removed
+            if include_file is not None:
+                self._include_files[-1].append(include_file)
+        elif nlines_inserted:
+            self._include_ranges.append([i, i + nlines_inserted])
+            self._include_files.append([include_file])
+
     def _get_include_lines(self, lines, line, i, nlines):
         """
         gets the lines for the include file
@@ -0,0 +1,172 @@
+"""tests the read_bdf cache of the INCLUDE files"""
+from __future__ import print_function
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from codecs import open as codec_open
+from six import StringIO
+
+from pyNastran.bdf.bdf import BDF
+from pyNastran.bdf.bdf_interface.bdf_cache import (
+    get_cache_filename, get_cache_stamp, get_cache_key, load_cached_cards, save_cached_cards)
+
+
+def _write_nodes(bdf_filename, x):
+    """writes an INCLUDE file with a nested INCLUDE file"""
+    with codec_open(bdf_filename, 'w') as bdf_file:
+        for nid in range(1, 5):
+            bdf_file.write('GRID    %8i        %8s      0.      0.\n' % (nid, '%s' % (x * nid)))
+        bdf_file.write("INCLUDE 'cache_nodes2.bdf'\n")
+
+
+def _read_bdf(bdf_filename, cache_dir):
+    """reads the model and writes it to a string"""
+    model = BDF(debug=False)
+    model.read_bdf(bdf_filename, xref=False, cache_dir=cache_dir)
+    bdf_file_out = StringIO()
+    model.write_bdf(bdf_file_out, close=False)
+    return model, bdf_file_out.getvalue()
+
+
+def _set_old_mtime(filename):
+    """makes the file older than the cache, so the stamp is trusted"""
+    mtime = time.time() - 100.
+    os.utime(filename, (mtime, mtime))
+
+
+class TestBDFCache(unittest.TestCase):
+    """tests the cache_dir option of read_bdf"""
+
+    def test_cache_file(self):
+        """the cache is only loaded for the same stamp or key"""
+        dirname = tempfile.mkdtemp()
+        try:
+            cache_dir = os.path.join(dirname, 'cache')
+            cache_filename = get_cache_filename(cache_dir, 'nodes.bdf')
+            self.assertEqual(os.path.dirname(cache_filename), cache_dir)
+            self.assertNotEqual(cache_filename, get_cache_filename(cache_dir, 'dir/nodes.bdf'))
+
+            settings = {
+                'mode' : 'msc',
+                'cards_to_read' : set(['GRID']),
+                'use_bulk_tokenizer' : True,
+            }
+            cache_key = get_cache_key(['GRID,1'], settings)
+            self.assertNotEqual(cache_key, get_cache_key(['GRID,2'], settings))
+            settings_nx = dict(settings, mode='nx')
+            self.assertNotEqual(cache_key, get_cache_key(['GRID,1'], settings_nx))
+
+            nodes_filename = os.path.join(dirname, 'nodes.bdf')
+            with codec_open(nodes_filename, 'w') as bdf_file:
+                bdf_file.write('GRID,1\n')
+            _set_old_mtime(nodes_filename)
+            stat = os.stat(nodes_filename)
+            include_files = [(nodes_filename, stat.st_mtime, stat.st_size)]
+            cache_stamp = get_cache_stamp(include_files, [], settings)
+            self.assertNotEqual(cache_stamp, get_cache_stamp(include_files, ['$ nodes'],
+                                                             settings))
+            self.assertNotEqual(cache_stamp, get_cache_stamp(include_files, [], settings_nx))
+
+            self.assertEqual(load_cached_cards(cache_filename, cache_stamp, ['GRID,1'],
+                                               settings), (None, False))
+            save_cached_cards(cache_filename, cache_stamp, cache_key, ('cards', [1, 2]))
+
+            # the stamp is current, so the lines aren't hashed
+            out, is_current = load_cached_cards(cache_filename, cache_stamp, ['GRID,2'],
+                                                settings)
+            self.assertEqual(out, ('cards', [1, 2]))
+            self.assertTrue(is_current)
+
+            # a touched file is hashed and the cache file should be saved again
+            include_files2 = [(nodes_filename, stat.st_mtime + 1., stat.st_size)]
+            cache_stamp2 = get_cache_stamp(include_files2, [], settings)
+            out, is_current = load_cached_cards(cache_filename, cache_stamp2, ['GRID,1'],
+                                                settings)
+            self.assertEqual(out, ('cards', [1, 2]))
+            self.assertFalse(is_current)
+            self.assertEqual(load_cached_cards(cache_filename, cache_stamp2, ['GRID,2'],
+                                               settings), (None, False))
+
+            # a file that was modified right before the cache was saved is hashed
+            include_files3 = [(nodes_filename, time.time(), stat.st_size)]
+            cache_stamp3 = get_cache_stamp(include_files3, [], settings)
+            save_cached_cards(cache_filename, cache_stamp3, cache_key, ('cards', [1, 2]))
+            self.assertEqual(load_cached_cards(cache_filename, cache_stamp3, ['GRID,2'],
+                                               settings), (None, False))
+            out, is_current = load_cached_cards(cache_filename, cache_stamp3, ['GRID,1'],
+                                                settings)
+            self.assertEqual(out, ('cards', [1, 2]))
+            self.assertFalse(is_current)
+        finally:
+            shutil.rmtree(dirname)
+
+    def test_read_bdf_cache_dir(self):
+        """the cached model is the same as the uncached model"""
+        dirname = tempfile.mkdtemp()
+        try:
+            self._test_read_bdf_cache_dir(dirname)
+        finally:
+            shutil.rmtree(dirname)
+
+    def _test_read_bdf_cache_dir(self, dirname):
+        """reads a model with and without the cache in dirname"""
+        cache_dir = os.path.join(dirname, 'cache')
+        main_filename = os.path.join(dirname, 'cache_main.bdf')
+        nodes_filename = os.path.join(dirname, 'cache_nodes.bdf')
+        nodes2_filename = os.path.join(dirname, 'cache_nodes2.bdf')
+        shells_filename = os.path.join(dirname, 'cache_shells.bdf')
+        with codec_open(main_filename, 'w') as bdf_file:
+            bdf_file.write(
+                'SOL 101\n'
+                'CEND\n'
+                'BEGIN BULK\n'
+                'PSHELL         1     100     0.1     100\n'
+                'MAT1         100   3.+7             0.3\n'
+                "INCLUDE 'cache_nodes.bdf'\n"
+                "INCLUDE 'cache_shells.bdf'\n"
+                'ENDDATA\n')
+        _write_nodes(nodes_filename, 1.)
+        with codec_open(nodes2_filename, 'w') as bdf_file:
+            bdf_file.write('GRID,5,,1.,1.,1.\n')
+        with codec_open(shells_filename, 'w') as bdf_file:
+            bdf_file.write(
+                '$ the shells\n'
+                'CQUAD4         1       1       1       2       3       4\n'
+                'CQUAD4         2       1       2       3       4       5     0.1\n'
+                'FORCE          1       1       0     1.0      0.      0.      1.\n')
+        for bdf_filename in [nodes_filename, nodes2_filename, shells_filename]:
+            _set_old_mtime(bdf_filename)
+
+        unused_model, bdf_file_expected = _read_bdf(main_filename, None)
+        self.assertFalse(os.path.exists(cache_dir))
+
+        # the first read creates the cache and the second read loads it
+        for unused_i in range(2):
+            model, bdf_file_out = _read_bdf(main_filename, cache_dir)
+            self.assertEqual(bdf_file_out, bdf_file_expected)
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+            self.assertEqual(model.card_count['CQUAD4'], 2)
+
+        # the changed INCLUDE file is parsed again
+        _write_nodes(nodes_filename, 2.)
+        model, bdf_file_out = _read_bdf(main_filename, cache_dir)
+        self.assertEqual(model.nodes[4].xyz[0], 8.)
+        unused_model, bdf_file_expected = _read_bdf(main_filename, None)
+        self.assertEqual(bdf_file_out, bdf_file_expected)
+
+        # so is a changed nested INCLUDE file
+        with codec_open(nodes2_filename, 'w') as bdf_file:
+            bdf_file.write('GRID,5,,3.,1.,1.\n')
+        model, bdf_file_out = _read_bdf(main_filename, cache_dir)
+        self.assertEqual(model.nodes[5].xyz[0], 3.)
+
+        # a touched INCLUDE file is loaded from the cache
+        _set_old_mtime(shells_filename)
+        model, bdf_file_out = _read_bdf(main_filename, cache_dir)
+        self.assertEqual(model.card_count['CQUAD4'], 2)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,100 @@
+"""tests parsing the INCLUDE files with a process pool"""
+from __future__ import print_function
+import os
+import unittest
+from codecs import open as codec_open
+from six import StringIO
+
+from pyNastran.bdf.bdf import BDF
+from pyNastran.bdf.bdf_interface.bdf_parallel import (
+    split_bulk_data_lines, pack_cards_list, unpack_cards_list)
+
+
+class TestBDFParallel(unittest.TestCase):
+    """tests the nworkers option of read_bdf against the serial reader"""
+
+    def test_split_bulk_data_lines(self):
+        """the pieces start at a card, so the comments stay with the card"""
+        lines = [
+            'GRID,1',
+            '$ comment',
+            'GRID,2',   # include 1
+            'GRID,3',
+            ',,1.0',    # include 2 starts in the middle of a card
+            'GRID,4',
+            '$ trailing',
+        ]
+        pieces = split_bulk_data_lines(lines, [[2, 3], [4, 5]])
+        self.assertEqual(pieces, [(0, 1, None), (1, 3, 0), (3, 7, None)])
+
+        pieces = split_bulk_data_lines(lines, [[5, 7]])
+        self.assertEqual(pieces, [(0, 5, None), (5, 7, 0)])
+
+    def test_pack_cards_list(self):
+        """the packed cards are the same after unpacking"""
+        cards_list = [
+            ['GRID', '', ['GRID,1']],
+            ['CHEXA', ' hexa\n', ['CHEXA,1,2,3,4,5,6,7,8', ',9,10']],
+            ['ENDDATA', '', ['ENDDATA']],
+        ]
+        self.assertEqual(unpack_cards_list(*pack_cards_list(cards_list)), cards_list)
+        self.assertEqual(unpack_cards_list(*pack_cards_list([])), [])
+
+    def test_read_bdf_nworkers(self):
+        """the INCLUDE files are parsed in order, so the decks are the same"""
+        with codec_open('parallel_main.bdf', 'w') as bdf_file:
+            bdf_file.write(
+                'SOL 101\n'
+                'CEND\n'
+                'BEGIN BULK\n'
+                'PSHELL         1     100     0.1     100\n'
+                'MAT1         100   3.+7             0.3\n'
+                "INCLUDE 'parallel_nodes.bdf'\n"
+                '$ the shells\n'
+                "INCLUDE 'parallel_shells.bdf'\n"
+                'FORCE          1       1       0     1.0      0.      0.      1.\n')
+        with codec_open('parallel_nodes.bdf', 'w') as bdf_file:
+            for nid in range(1, 10):
+                bdf_file.write('GRID    %8i        %8s%8s      0.\n' % (
+                    nid, '%i.' % ((nid - 1) % 3), '%i.' % ((nid - 1) // 3)))
+            bdf_file.write('GRID,10,,1.,1.,1.\n')
+        with codec_open('parallel_shells.bdf', 'w') as bdf_file:
+            bdf_file.write(
+                'CQUAD4         1       1       1       2       5       4\n'
+                '$ a shell with a thickness\n'
+                'CQUAD4         2       1       2       3       6       5     0.1\n'
+                'CTRIA3         3       1       4       5       8\n'
+                'CTRIA3         4       1       4       8       7\n'
+                'CTRIA3         4       1       4       8       7\n'
+                'CBUSH          5       2       1      10                               0\n'
+                'ENDDATA\n'
+                'GRID          11\n')
+
+        bdf_files = []
+        models = []
+        for nworkers in [None, 2]:
+            model = BDF(debug=False)
+            model.read_bdf('parallel_main.bdf', xref=False, nworkers=nworkers)
+            bdf_file_out = StringIO()
+            model.write_bdf(bdf_file_out, close=False)
+            bdf_files.append(bdf_file_out.getvalue())
+            models.append(model)
+
+        os.remove('parallel_main.bdf')
+        os.remove('parallel_nodes.bdf')
+        os.remove('parallel_shells.bdf')
+
+        self.assertEqual(bdf_files[0], bdf_files[1])
+        for model in models:
+            self.assertEqual(len(model.nodes), 10)
+            self.assertEqual(model.card_count['ENDDATA'], 1)
+            self.assertEqual(model.card_count['CTRIA3'], 3)
+            self.assertEqual(model.card_count['CBUSH'], 1)
+            self.assertNotIn('FORCE', model.card_count)
+        self.assertEqual(models[0].reject_count, models[1].reject_count)
+        self.assertEqual(len(models[0]._stored_parse_errors),
+                         len(models[1]._stored_parse_errors))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,163 @@
+"""tests the bulk tokenizer"""
+from __future__ import print_function
+import unittest
+from six import StringIO
+import numpy as np
+
+from pyNastran.bdf.bdf import BDF
+from pyNastran.bdf.errors import DuplicateIDsError
+from pyNastran.bdf.bdf_interface.bulk_tokenizer import (
+    tokenize_card_lines, get_integers, get_doubles, is_simple_ascii, parse_bulk_cards)
+
+
+class TestBulkTokenizer(unittest.TestCase):
+    """tests the bulk tokenizer against the per-card path"""
+
+    def test_tokenize_card_lines(self):
+        """the continuation markers and columns 73-80 are dropped"""
+        lines = [
+            'CHEXA          1       2       3       4       5       6       7       8+     123',
+            '+             9      10',
+            'CHEXA         11      12      13      14      15      16      17      18',
+            '              19      20',
+        ]
+        fields = tokenize_card_lines(lines, 2)
+        self.assertEqual(fields.shape, (2, 17))
+        card = [field.strip() for field in fields[0, :].tolist()]
+        self.assertEqual(card[:3], ['CHEXA', '1', '2'])
+        self.assertEqual(card[8:11], ['8', '9', '10'])
+        self.assertEqual(card[11:], ['', '', '', '', '', ''])
+        self.assertTrue(is_simple_ascii(fields))
+
+    def test_get_integers(self):
+        """integer fields are parsed like int"""
+        svalues = np.array(['       1', '-12', '+7  ', '  0034  ', '1.0', '1 2', '', 'a'],
+                           dtype='U8')
+        values, is_valid, is_blank = get_integers(svalues)
+        self.assertEqual(values[is_valid].tolist(), [1, -12, 7, 34])
+        self.assertEqual(is_valid.tolist(), [True] * 4 + [False] * 4)
+        self.assertEqual(is_blank.tolist(), [False] * 6 + [True, False])
+
+    def test_get_doubles(self):
+        """float fields are parsed like double_or_blank"""
+        svalues = np.array(['1.5', ' -2. ', '1.-3', '-1.+3', '1.0D+3', '.', '5', '', '1.-3-4'],
+                           dtype='U8')
+        values, is_valid, is_blank = get_doubles(svalues)
+        self.assertEqual(is_valid.tolist(), [True] * 6 + [False] * 3)
+        self.assertEqual(is_blank.tolist(), [False] * 7 + [True, False])
+        self.assertTrue(np.allclose(values[:6], [1.5, -2., 1e-3, -1e3, 1e3, 0.]))
+
+    def test_parse_bulk_cards(self):
+        """cards that don't fit the simple layout aren't created directly"""
+        cards_list = [
+            ['GRID', '', ['GRID           1       0      0.    1.-3      2.']],
+            ['GRID', '', ['GRID           2       0      0.      0.      0.       0     123']],
+            ['GRID', '', ['GRID,3,,1.,2.,3.']],
+            ['CQUAD4', ' quad\n', ['CQUAD4         1       2       1       2       3       4']],
+            ['CQUAD4', '', ['CQUAD4         2       2       1       2       3       4     0.1']],
+        ]
+        card_objects, card_fields = parse_bulk_cards(cards_list)
+        self.assertEqual(sorted(card_objects), [0, 3])
+        self.assertEqual(sorted(card_fields), [1, 4])
+        self.assertEqual(card_objects[0].xyz.tolist(), [0., 1e-3, 2.])
+        self.assertEqual(card_objects[3].comment, '$ quad\n')
+        self.assertEqual(card_fields[1], ['GRID', '2', '0', '0.', '0.', '0.', '0', '123'])
+
+    def test_read_bdf(self):
+        """the bulk tokenizer and the per-card path create the same model"""
+        lines = [
+            'SOL 101\n',
+            'CEND\n',
+            'BEGIN BULK\n',
+            'GRID           1       0      0.      0.      0.\n',
+            'GRID           2       0      1.      0.      0.\n',
+            'GRID           3       0      1.      1.    1.-3\n',
+            'GRID           4       0      0.      1.      0.       0     123\n',
+            'GRID,5,,0.,0.,1.\n',
+            'GRID*                  6               0              1.              0.\n',
+            '*                     1.\n',
+            'GRID           7             1.0     1.0     1.0\n',
+            'GRID           8              0.      0.     2.0\n',
+            'CQUAD4         1       1       1       2       3       4\n',
+            'CQUAD4         2       1       1       2       3       4     0.1\n',
+            'CTRIA3         3               1       2       3\n',
+            'CTETRA         4       2       1       2       3       5\n',
+            'CTETRA         5       2       1       2       3       5       6       7\n',
+            '               8\n',
+            'CHEXA          6       2       1       2       3       4       5       6\n',
+            '               7       8\n',
+            'CBAR           7       3       1       2      0.      0.      1.\n',
+            'CBUSH          8       4       1       5                               0\n',
+            'RBE2           9       1  123456       5       6\n',
+            'FORCE          1       1       0     1.0      0.      0.      1.\n',
+            'PLOAD4         1       1     1.0\n',
+            'PSHELL         1     100     0.1     100\n',
+            'PSOLID         2     100\n',
+            'PBAR           3     100     1.0     1.0     1.0     1.0\n',
+            'PBUSH          4       K    100.    100.    100.    100.    100.    100.\n',
+            'MAT1         100   3.+7             0.3\n',
+            'ENDDATA\n',
+        ]
+        bdf_files = []
+        for use_bulk_tokenizer in [False, True]:
+            bdf_file = StringIO()
+            bdf_file.writelines(lines)
+            bdf_file.seek(0)
+
+            model = BDF(debug=False)
+            model.use_bulk_tokenizer = use_bulk_tokenizer
+            model.read_bdf(bdf_file, xref=True)
+            self.assertEqual(model.card_count['GRID'], 8)
+            self.assertEqual(model.elements[5].__class__.__name__, 'CTETRA10')
+
+            bdf_file_out = StringIO()
+            model.write_bdf(bdf_file_out, close=False)
+            bdf_files.append(bdf_file_out.getvalue())
+        self.assertEqual(bdf_files[0], bdf_files[1])
+
+    def test_read_bdf_bulk_add(self):
+        """the GRIDs/elements are added in the same order with the same duplicate checks"""
+        lines = [
+            'CEND\n',
+            'BEGIN BULK\n',
+            'GRID           2       0      1.      0.      0.\n',
+            'GRID           1       0      0.      0.      0.\n',
+            'GRID           3       0      1.      1.      0.\n',
+            'GRID           4       0      0.      1.      0.\n',
+            'CQUAD4        10       1       1       2       3       4\n',
+            'CBAR           5       3       1       2      0.      0.      1.\n',
+            'CTRIA3         3       1       1       2       3\n',
+            'PSHELL         1     100     0.1     100\n',
+            'GRID           1       0      0.      0.      0.\n',
+            'CQUAD4         1       1       1       2       3       4\n',
+            'CQUAD4        10       1       4       3       2       1\n',
+            'MAT1         100   3.+7             0.3\n',
+            'ENDDATA\n',
+        ]
+        models = []
+        for use_bulk_tokenizer in [False, True]:
+            bdf_file = StringIO()
+            bdf_file.writelines(lines)
+            bdf_file.seek(0)
+
+            model = BDF(debug=False)
+            model.use_bulk_tokenizer = use_bulk_tokenizer
+            model._stop_on_duplicate_error = False
+            with self.assertRaises(DuplicateIDsError):
+                model.read_bdf(bdf_file, xref=False, validate=False)
+            models.append(model)
+
+        model_card, model_bulk = models
+        self.assertEqual(list(model_bulk.nodes), [2, 1, 3, 4])
+        self.assertEqual(list(model_bulk.elements), list(model_card.elements))
+        self.assertEqual(list(model_bulk.elements), [10, 5, 3, 1])
+        self.assertEqual(model_bulk.elements[10].nodes, [1, 2, 3, 4])
+        self.assertEqual(len(model_bulk._duplicate_elements), 1)
+        self.assertEqual(len(model_card._duplicate_elements), 1)
+        self.assertEqual(model_bulk.card_count, model_card.card_count)
+        self.assertEqual(model_bulk.card_count['GRID'], 5)
+        self.assertEqual(dict(model_bulk._type_to_id_map), dict(model_card._type_to_id_map))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,137 @@
+"""tests the bulk cross-referencing of the nodes and elements"""
+from __future__ import print_function
+import os
+import unittest
+from collections import defaultdict
+from six import iteritems, itervalues
+
+import pyNastran
+from pyNastran.bdf.bdf import BDF, read_bdf
+from pyNastran.bdf.errors import CrossReferenceError
+from pyNastran.bdf.mesh_utils.mass_properties import mass_properties
+from pyNastran.utils.log import SimpleLogger
+
+PKG_PATH = pyNastran.__path__[0]
+MODEL_PATH = os.path.join(PKG_PATH, '..', 'models')
+log = SimpleLogger(level='error')
+
+
+def _get_ref_ids(card, ref_name):
+    """gets the ids of a cross-referenced attribute"""
+    ref = getattr(card, ref_name, None)
+    if ref is None:
+        return None
+    if isinstance(ref, list):
+        return [_get_card_id(refi) for refi in ref]
+    return _get_card_id(ref)
+
+
+def _get_card_id(card):
+    """gets the id of a node/property/material/coord"""
+    if card is None:
+        return None
+    for name in ['nid', 'pid', 'mid', 'cid', 'eid']:
+        if hasattr(card, name):
+            return (card.type, getattr(card, name))
+    return card.type
+
+
+def _cross_reference_by_card(model):
+    """cross references the model with the nodes/elements one card at a time"""
+    model.cross_reference(xref_nodes=False, xref_elements=False,
+                          xref_nodes_with_elements=False)
+    for node in itervalues(model.nodes):
+        node.cross_reference(model, model.grdset)
+    model._cross_reference_coordinates()
+    for elem in itervalues(model.elements):
+        elem.cross_reference(model)
+
+    elements_ref = defaultdict(list)
+    for elem in itervalues(model.elements):
+        if elem.nodes is not None:
+            for nid in elem.node_ids:
+                if nid is not None:
+                    elements_ref[nid].append(elem)
+    for node in itervalues(model.nodes):
+        node.elements_ref = elements_ref[node.nid]
+
+
+class TestCrossReference(unittest.TestCase):
+    """tests the bulk cross-referencing in cross_reference"""
+
+    def _check_model(self, bdf_filename):
+        """the bulk references are the same as the card references"""
+        model1 = read_bdf(bdf_filename, xref=False, log=log)
+        model2 = read_bdf(bdf_filename, xref=False, log=log)
+        _cross_reference_by_card(model1)
+        model2.cross_reference()
+
+        for nid, node1 in iteritems(model1.nodes):
+            node2 = model2.nodes[nid]
+            for ref_name in ['cp_ref', 'cd_ref']:
+                self.assertEqual(_get_ref_ids(node1, ref_name),
+                                 _get_ref_ids(node2, ref_name))
+            self.assertEqual([elem.eid for elem in node1.elements_ref],
+                             [elem.eid for elem in node2.elements_ref])
+
+        for eid, elem1 in iteritems(model1.elements):
+            elem2 = model2.elements[eid]
+            for ref_name in ['nodes_ref', 'pid_ref', 'mid_ref', 'theta_mcid_ref']:
+                self.assertEqual(_get_ref_ids(elem1, ref_name),
+                                 _get_ref_ids(elem2, ref_name),
+                                 msg='%s %s' % (elem1.type, ref_name))
+        mass1 = mass_properties(model1)[0]
+        mass2 = mass_properties(model2)[0]
+        self.assertAlmostEqual(mass1, mass2)
+        return model2
+
+    def test_xref_bulk_elements(self):
+        """the static elements model"""
+        bdf_filename = os.path.join(MODEL_PATH, 'elements', 'static_elements.bdf')
+        self._check_model(bdf_filename)
+
+    def test_xref_bulk_solid_bending(self):
+        """a CTETRA10 model"""
+        bdf_filename = os.path.join(MODEL_PATH, 'solid_bending', 'solid_bending.bdf')
+        self._check_model(bdf_filename)
+
+    def test_xref_bulk_grid_error(self):
+        """a GRID with a missing coordinate system raises"""
+        model = BDF(log=log)
+        model.add_grid(1, [0., 0., 0.])
+        model.add_grid(3, [1., 1., 0.], cp=5)
+        with self.assertRaises(KeyError) as context:
+            model.cross_reference()
+        self.assertIn('which is required by GRID nid=3', str(context.exception))
+
+    def test_xref_bulk_errors(self):
+        """the elements with a missing id are stored as cross-reference errors"""
+        model = BDF(log=log)
+        model.add_grid(1, [0., 0., 0.])
+        model.add_grid(2, [1., 0., 0.])
+        model.add_grid(3, [1., 1., 0.])
+        model.add_grid(4, [0., 1., 0.])
+        model.add_cquad4(10, 100, [1, 2, 3, 4])
+        model.add_cquad4(11, 100, [1, 2, 3, 40])
+        model.add_ctria3(12, 200, [1, 2, 3])
+        model.add_ctria3(13, 100, [1, 2, 4], theta_mcid=6)
+        model.add_conrod(14, 1000, [1, 2], A=1.0)
+        model.add_cquad4(15, 100, [1, 2, 3, 50])
+        model.add_pshell(100, mid1=1000, t=0.1)
+        model.add_mat1(1000, 3.0e7, None, 0.3)
+
+        with self.assertRaises(CrossReferenceError) as context:
+            model.cross_reference()
+        msg = str(context.exception)
+        self.assertNotIn('eid=10', msg)
+
+        # the errors are in the order of the elements
+        ierrors = [msg.index('which is required by %s' % card)
+                   for card in ['CQUAD4 eid=11', 'CTRIA3 eid=12', 'CTRIA3 eid=13',
+                                 'CQUAD4 eid=15']]
+        self.assertEqual(ierrors, sorted(ierrors))
+        self.assertEqual(model.elements[14].mid_ref.mid, 1000)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
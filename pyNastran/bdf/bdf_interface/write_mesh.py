@@ -15,6 +15,7 @@ from pyNastran.bdf.utils import print_filename
 from pyNastran.bdf.field_writer_8 import print_card_8
 from pyNastran.bdf.field_writer_16 import print_card_16
 from pyNastran.bdf.bdf_interface.attributes import BDFAttributes
+from pyNastran.bdf.bdf_interface.bulk_writer import write_grids_bulk, write_elements_bulk
 from pyNastran.bdf.cards.nodes import write_xpoints
 
 
@@ -329,13 +330,8 @@ class WriteMesh(BDFAttributes):
                 for (eid, element) in sorted(iteritems(self.elements)):
                     bdf_file.write(element.write_card_16(is_double))
             else:
-                for (eid, element) in sorted(iteritems(self.elements)):
-                    try:
-                        bdf_file.write(element.write_card(size, is_double))
-                    except:
-                        print('failed printing element...'
-                              'type=%s eid=%s' % (element.type, eid))
-                        raise
+                elements = [element for (unused_eid, element) in sorted(iteritems(self.elements))]
+                write_elements_bulk(bdf_file, elements, size, is_double)
         if self.ao_element_flags:
             for (eid, element) in sorted(iteritems(self.ao_element_flags)):
                 bdf_file.write(element.write_card(size, is_double))
@@ -853,12 +849,11 @@ class WriteMesh(BDFAttributes):
             bdf_file.write('$NODES\n')
             if self.grdset:
                 bdf_file.write(self.grdset.write_card(size))
+            nodes = [node for (unused_nid, node) in sorted(iteritems(self.nodes))]
             if is_long_ids:
-                for (unused_nid, node) in sorted(iteritems(self.nodes)):
-                    bdf_file.write(node.write_card_16(is_double))
+                write_grids_bulk(bdf_file, nodes, size=16, is_double=is_double)
             else:
-                for (unused_nid, node) in sorted(iteritems(self.nodes)):
-                    bdf_file.write(node.write_card(size, is_double))
+                write_grids_bulk(bdf_file, nodes, size=size, is_double=is_double)
 
     #def _write_nodes_associated(self, bdf_file, size=8, is_double=False):
         #"""
@@ -608,7 +608,7 @@ class CHEXA20(SolidElement):
             1 : [n1, n2, n3, n4, n9, n10, n11, n12],
             2 : [n1, n2, n6, n5, n9, n18, n13, n17],
             3 : [n2, n3, n7, n6, n10, n19, n14, n18],
-            4 : [n3, n4, n8, n7, n11, n10, n15, n19],
+            4 : [n3, n4, n8, n7, n11, n20, n15, n19],
             5 : [n4, n1, n5, n8, n12, n17, n16, n20],
             6 : [n5, n6, n7, n8, n13, n14, n15, n16],
         }
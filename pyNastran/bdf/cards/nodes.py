@@ -1219,6 +1219,8 @@ class GRID(BaseCard):
         self.cp = cid
         if xref:
             self.cp_ref = model.Coord(cid, msg=msg)
+        if hasattr(model, 'clear_spatial_index'):
+            model.clear_spatial_index()
 
     def get_position_no_xref(self, model):
         # type: (Any) -> np.ndarray
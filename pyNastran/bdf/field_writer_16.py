@@ -7,11 +7,12 @@ from six.moves import range
 
 import sys
 from typing import List, Union, Optional, Any
+import numpy as np
 from numpy import float32, isnan  # type: ignore
 
 from pyNastran.utils import integer_types
 from pyNastran.bdf.cards.utils import wipe_empty_fields
-from pyNastran.bdf.field_writer_8 import set_blank_if_default
+from pyNastran.bdf.field_writer_8 import set_blank_if_default, _format_floats
 
 def set_string16_blank_if_default(value, default):
     # type: (Any, Any) -> str
@@ -289,3 +290,40 @@ def print_card_16(fields, wipe_fields=True):
     if not out.endswith('\n'):
         out += '\n'
     return out
+
+
+#: the fixed point ranges of print_float_16 as (lower, upper, ndecimals),
+#: where lower <= abs(value) < upper
+FIXED_POINT_RANGES_16 = (
+    [(0.001, 1., 15)] +
+    [(10. ** i, 10. ** (i + 1), 14 - i) for i in range(14)],  # < 1e14
+    [(0.01, 1., 14)] +
+    [(10. ** i, 10. ** (i + 1), 13 - i) for i in range(13)],  # > -1e13
+)
+
+#: the strings of the values that aren't written in fixed point notation
+#: by print_float_16, which are cached as they're written
+FLOAT_16_MEMO = {}
+
+
+def format_floats_16(values):
+    # type: (Any) -> np.ndarray
+    """
+    Prints an array of floats in nastran 16-character width syntax.
+    The strings are the same as calling print_float_16 on each value.
+
+    Parameters
+    ----------
+    values : (...) float ndarray
+        the values to print
+
+    Returns
+    -------
+    strings : (...) '<U16' ndarray
+        the 16-character strings; print_float_16 is wider for a few
+        large negative values (e.g., -99999999999999.9), which are kept as is
+
+    .. seealso:: format_floats_8
+    """
+    return _format_floats(values, 16, FIXED_POINT_RANGES_16,
+                          print_float_16, FLOAT_16_MEMO)
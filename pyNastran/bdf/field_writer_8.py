@@ -6,7 +6,8 @@ from __future__ import (nested_scopes, generators, division, absolute_import,
 from six import string_types, integer_types
 from six.moves import range
 import sys
-from typing import List, Union, Any
+from typing import List, Dict, Tuple, Union, Any
+import numpy as np
 from numpy import float32, isnan
 
 
@@ -203,6 +204,202 @@ def print_float_8(value):
     return field
 
 
+#: the fixed point ranges of print_float_8 as (lower, upper, ndecimals),
+#: where lower <= abs(value) < upper
+FIXED_POINT_RANGES_8 = (
+    [(0.001, 1., 7)] +
+    [(10. ** i, 10. ** (i + 1), 6 - i) for i in range(6)],  # < 1e6
+    [(0.01, 1., 6)] +
+    [(10. ** i, 10. ** (i + 1), 5 - i) for i in range(5)],  # > -1e5
+)
+
+#: the maximum number of values stored in FLOAT_8_MEMO
+MEMO_SIZE = 100000
+
+#: the strings of the values that aren't written in fixed point notation
+#: (e.g., 3.0e7, 7.85e-9) by print_float_8, which are cached as they're
+#: written
+FLOAT_8_MEMO = {}
+
+
+def format_floats_8(values):
+    # type: (Any) -> np.ndarray
+    """
+    Prints an array of floats in nastran 8-character width syntax.
+    The strings are the same as calling print_float_8 on each value.
+
+    Parameters
+    ----------
+    values : (...) float ndarray
+        the values to print
+
+    Returns
+    -------
+    strings : (...) '<U8' ndarray
+        the 8-character strings; print_float_8 is wider for a few
+        large negative values (e.g., -999999.9), which are kept as is
+
+    .. code-block:: python
+
+      >>> format_floats_8([0., 1., -0.25, 3.0e7])
+      array(['      0.', '      1.', '    -.25', '    3.+7'], dtype='<U8')
+    """
+    return _format_floats(values, 8, FIXED_POINT_RANGES_8,
+                          print_float_8, FLOAT_8_MEMO)
+
+
+def _format_floats(values, width, fixed_point_ranges, print_func, memo):
+    # type: (Any, int, Any, Any, Dict[float, str]) -> np.ndarray
+    """
+    Prints an array of floats.  The unique values that are written in
+    fixed point notation are built as arrays of characters and the other
+    values are written with print_func.
+
+    Parameters
+    ----------
+    values : (...) float ndarray
+        the values to print
+    width : int
+        the field width
+    fixed_point_ranges : (List[(float, float, int)], List[(float, float, int)])
+        the (lower, upper, ndecimals) ranges of the positive and
+        negative values, where lower <= abs(value) < upper
+    print_func : function
+        the scalar function (e.g., print_float_8)
+    memo : Dict[float] = str
+        the cached strings of the values that are written with print_func
+
+    Returns
+    -------
+    strings : (...) ndarray
+        the strings
+    """
+    values = np.asarray(values, dtype='float64')
+    dtype = '<U%i' % width
+    if values.size == 0:
+        return np.empty(values.shape, dtype=dtype)
+    unique_values, inverse = np.unique(values.ravel(), return_inverse=True)
+    strings = np.full(len(unique_values), ' ' * width, dtype=dtype)
+
+    is_fixed = np.zeros(len(unique_values), dtype='bool')
+    is_zero = unique_values == 0.
+    strings[is_zero] = '%*s' % (width, '0.')
+    is_fixed[is_zero] = True
+    is_fixed[np.isnan(unique_values)] = True
+
+    abs_values = np.abs(unique_values)
+    for is_signed, ranges in zip([unique_values > 0., unique_values < 0.],
+                                 fixed_point_ranges):
+        for lower, upper, ndecimals in ranges:
+            i = np.where(is_signed & (abs_values >= lower) & (abs_values < upper))[0]
+            if len(i) == 0:
+                continue
+            strings[i] = _format_fixed_point(unique_values[i], width, ndecimals)
+            is_fixed[i] = True
+
+    ifloat = np.where(~is_fixed)[0]
+    if len(ifloat):
+        float_strings = _format_memo_floats(unique_values[ifloat], print_func, memo)
+        max_width = max(len(field) for field in float_strings)
+        if max_width > width:
+            # print_func is more than width characters for values like
+            # -999999.9, so the strings aren't truncated
+            strings = strings.astype('<U%i' % max_width)
+        strings[ifloat] = float_strings
+    return strings[inverse].reshape(values.shape)
+
+
+def _format_memo_floats(values, print_func, memo):
+    # type: (np.ndarray, Any, Dict[float, str]) -> List[str]
+    """prints the values with print_func using the cached strings"""
+    strings = []
+    for value in values.tolist():
+        try:
+            field = memo[value]
+        except KeyError:
+            field = print_func(value)
+            if len(memo) < MEMO_SIZE:
+                memo[value] = field
+        strings.append(field)
+    return strings
+
+
+def _format_fixed_point(values, width, ndecimals):
+    # type: (np.ndarray, int, int) -> np.ndarray
+    """
+    Prints the values with ``'%*.*f' % (width, ndecimals, value)``, strips
+    the leading/trailing zeros and right justifies them.
+
+    The digits are the correctly rounded (round half to even) digits of
+    the exact product ``abs(value) * 10**ndecimals``, which is found as
+    an unevaluated sum of 2 floats to match the Python formatting.
+    """
+    nvalues = len(values)
+    scale = 10 ** ndecimals
+    product, error = _two_product(np.abs(values), float(scale))
+    rounded = np.rint(product)
+    delta = product - rounded
+    inumber = rounded.astype('int64')
+    inumber[(delta == 0.5) & (error > 0.)] += 1
+    inumber[(delta == -0.5) & (error < 0.)] -= 1
+    # the digits of the number from right to left; the decimal point is
+    # ndecimals digits from the right and the number is at most width
+    # digits long (e.g., 9.9999999 -> 10.000000)
+    ndigits = width
+    digits = np.empty((nvalues, ndigits), dtype='uint32')
+    for idigit in range(ndigits):
+        digits[:, idigit] = inumber % 10
+        inumber = inumber // 10
+
+    # the trailing zeros of the fraction are stripped
+    is_frac_digit = digits[:, :ndecimals] != 0
+    nzeros = np.where(is_frac_digit.any(axis=1), is_frac_digit.argmax(axis=1), ndecimals)
+    nfrac = (ndecimals - nzeros)[:, np.newaxis]
+    is_int_digit = digits[:, ndecimals:] != 0
+    nint = np.where(is_int_digit.any(axis=1),
+                    ndigits - ndecimals - is_int_digit[:, ::-1].argmax(axis=1),
+                    0)[:, np.newaxis]
+
+    # the position of each column from the right
+    iright = np.arange(width)[::-1][np.newaxis, :]
+    idigit = iright + nzeros[:, np.newaxis] - (iright > nfrac)
+    irows = np.arange(nvalues)[:, np.newaxis]
+    chars = ord('0') + digits[irows, np.minimum(idigit, ndigits - 1)]
+    chars[iright == nfrac] = ord('.')
+    chars[(iright == nfrac + nint + 1) & (values < 0.)[:, np.newaxis]] = ord('-')
+    chars[iright > nfrac + nint + (values < 0.)[:, np.newaxis]] = ord(' ')
+    return chars.view('<U%i' % width).reshape(nvalues)
+
+
+def _two_product(a, b):
+    # type: (np.ndarray, float) -> Tuple[np.ndarray, np.ndarray]
+    """
+    Dekker's product, where a * b == product + error exactly
+
+    Returns
+    -------
+    product : (n, ) float ndarray
+        the floating point product
+    error : (n, ) float ndarray
+        the rounding error of the product
+    """
+    product = a * b
+    a_high, a_low = _split(a)
+    b_high, b_low = _split(b)
+    error = (((a_high * b_high - product) + a_high * b_low + a_low * b_high) +
+             a_low * b_low)
+    return product, error
+
+
+def _split(a):
+    # type: (Any) -> Tuple[Any, Any]
+    """Veltkamp's split of a float into 2 halves of 26 bits"""
+    c = 134217729. * a  # 2**27 + 1
+    high = c - (c - a)
+    low = a - high
+    return high, low
+
+
 #def print_float_or_int_8(value):
     ## type: (Union[int, float]) -> str
     #"""
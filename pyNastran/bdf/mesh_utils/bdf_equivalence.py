@@ -6,7 +6,8 @@ defines:
                                   size=8, is_double=False,
                                   remove_collapsed_elements=False,
                                   avoid_collapsed_elements=False,
-                                  crash_on_collapse=False, log=None, debug=True)
+                                  crash_on_collapse=False, log=None, debug=True,
+                                  chunk_size=1000000, workers=1)
 """
 from __future__ import print_function
 from six import iteritems, PY2
@@ -32,7 +33,8 @@ def bdf_equivalence_nodes(bdf_filename, bdf_filename_out, tol,
                           size=8, is_double=False,
                           remove_collapsed_elements=False,
                           avoid_collapsed_elements=False,
-                          crash_on_collapse=False, log=None, debug=True):
+                          crash_on_collapse=False, log=None, debug=True,
+                          chunk_size=1000000, workers=1):
     """
     Equivalences nodes; keeps the lower node id; creates two nodes with the same
 
@@ -76,12 +78,23 @@ def bdf_equivalence_nodes(bdf_filename, bdf_filename_out, tol,
         bdf debugging
     log : logger(); default=None
         bdf logging
+    chunk_size : int; default=1000000
+        the number of nodes that are queried at once, which bounds the
+        memory of the neighbor search
+    workers : int; default=1
+        the number of threads used to query the kdtree; -1 uses all the
+        processors
 
     Returns
     -------
     model : BDF()
         The BDF model corresponding to bdf_filename_out
 
+    The close nodes are found with a chunked kdtree query, which uses the
+    node tree of ``model.spatial_index`` when there isn't a node_set or a
+    coordinate system.  A node is equivalenced to a lower kept node that
+    it's within tol of, so chains of close nodes aren't collapsed.
+
     .. warning:: I doubt SPOINTs/EPOINTs work correctly
     .. warning:: xref not fully implemented (assumes cid=0)
 
@@ -93,15 +106,23 @@ def bdf_equivalence_nodes(bdf_filename, bdf_filename_out, tol,
     """
     if not isinstance(tol, float):
         tol = float(tol)
-    nodes_xyz, model, nids, inew = _eq_nodes_setup(
+    nodes_xyz, model, nids = _eq_nodes_setup(
         bdf_filename, tol, renumber_nodes=renumber_nodes,
-        xref=xref, node_set=node_set, debug=debug)
-    ieq, slots = _eq_nodes_build_tree(nodes_xyz, nids, tol,
-                                      inew=inew, node_set=node_set,
-                                      neq_max=neq_max)[1:]
-
-    nid_pairs = _eq_nodes_find_pairs(nids, slots, ieq, node_set=node_set)
-    _eq_nodes_final(nid_pairs, model, tol, node_set=node_set)
+        xref=xref, node_set=node_set, debug=debug)[:3]
+
+    # the node tree of model.spatial_index has the same nodes when all the
+    # GRIDs are equivalenced and they're in the global frame
+    kdt = None
+    if node_set is None and model.coord_ids == [0]:
+        spatial_index = model.spatial_index
+        if np.array_equal(spatial_index.node_ids, nids):
+            kdt = spatial_index.node_tree
+
+    inode1, inode2 = _eq_nodes_find_pairs_chunked(
+        nodes_xyz, tol, neq_max=neq_max, chunk_size=chunk_size, workers=workers,
+        kdt=kdt)
+    ikeep = _get_equivalence_classes(nodes_xyz, tol, inode1, inode2)
+    _eq_nodes_final_arrays(model, nids, ikeep)
 
     if bdf_filename_out is not None:
         model.write_bdf(bdf_filename_out, size=size, is_double=is_double)
@@ -192,10 +213,10 @@ def _eq_nodes_setup(bdf_filename, unused_tol,
 
     if needs_get_position:
         nodes_xyz = array([model.nodes[nid].get_position()
-                           for nid in nids], dtype='float32')
+                           for nid in nids], dtype='float64')
     else:
         nodes_xyz = array([model.nodes[nid].xyz
-                           for nid in nids], dtype='float32')
+                           for nid in nids], dtype='float64')
 
     if node_set is not None:
         assert nodes_xyz.shape[0] == len(nids)
@@ -303,6 +324,184 @@ def _eq_nodes_final(nid_pairs, model, tol, node_set=None):
         #skip_nodes.append(nid2)
     return
 
+def _eq_nodes_find_pairs_chunked(nodes_xyz, tol, neq_max=4, chunk_size=1000000,
+                                 workers=1, msg='', kdt=None):
+    """
+    Finds the pairs of close nodes with a kdtree query of chunk_size
+    nodes at a time
+
+    Parameters
+    ----------
+    nodes_xyz : (nnodes, 3) float ndarray
+        the xyzs to equivalence
+    tol : float
+        the spherical equivalence tolerance
+    neq_max : int; default=4
+        the number of nodes to consider for equivalencing
+    chunk_size : int; default=1000000
+        the number of nodes to query at once
+    workers : int; default=1
+        the number of threads used to query the kdtree
+    msg : str; default=''
+        custom message used for errors
+    kdt : cKDTree(); default=None
+        the kdtree of nodes_xyz (e.g., from model.spatial_index)
+        None : build the kdtree
+
+    Returns
+    -------
+    inode1 / inode2 : (npairs, ) int ndarray
+        the indices of the close nodes; a pair may be repeated
+
+    """
+    assert isinstance(tol, float), 'tol=%r' % tol
+    if kdt is None:
+        kdt = _get_tree(nodes_xyz, msg=msg)
+    nnodes = nodes_xyz.shape[0]
+
+    inode1 = []
+    inode2 = []
+    for istart in range(0, nnodes, chunk_size):
+        xyz = nodes_xyz[istart:istart + chunk_size, :]
+        deq, ieq = _query_tree(kdt, xyz, neq_max, tol, workers)
+        ieq = ieq.reshape(len(xyz), -1)
+        deq = deq.reshape(len(xyz), -1)
+
+        # the misses are nnodes; a node may not be in the neq_max closest
+        # nodes of its neighbor (e.g., coincident nodes), so both
+        # directions are kept
+        irow, icol = np.where(ieq < nnodes)
+        inode1i = irow + istart
+        inode2i = ieq[irow, icol]
+        is_pair = (inode1i != inode2i) & (deq[irow, icol] <= tol)
+        inode1.append(inode1i[is_pair])
+        inode2.append(inode2i[is_pair])
+    return np.hstack(inode1), np.hstack(inode2)
+
+
+def _query_tree(kdt, xyz, neq_max, tol, workers):
+    """queries the kdtree with multiple threads"""
+    try:
+        return kdt.query(xyz, k=neq_max, distance_upper_bound=tol, workers=workers)
+    except TypeError:
+        # scipy < 1.6
+        return kdt.query(xyz, k=neq_max, distance_upper_bound=tol, n_jobs=workers)
+
+
+def _get_equivalence_classes(nodes_xyz, tol, inode1, inode2):
+    """
+    Gets the node that each node is equivalenced to
+
+    The nodes are checked in order, so a node is equivalenced to the
+    kept node of the first lower node that it's close to, but only if
+    it's within tol of that kept node.  Chains of close nodes aren't
+    merged, so a node never moves more than tol.
+
+    Parameters
+    ----------
+    nodes_xyz : (nnodes, 3) float ndarray
+        the xyzs to equivalence
+    tol : float
+        the spherical equivalence tolerance
+    inode1 / inode2 : (npairs, ) int ndarray
+        the indices of the close nodes
+
+    Returns
+    -------
+    ikeep : (nnodes, ) int ndarray
+        the index of the node to keep; ikeep[i] = i for an unchanged node
+
+    """
+    nnodes = nodes_xyz.shape[0]
+    ikeep = np.arange(nnodes, dtype='int64')
+    if len(inode1) == 0:
+        return ikeep
+
+    # the unique (lower, upper) pairs sorted by the lower node
+    inode1 = np.asarray(inode1, dtype='int64')
+    inode2 = np.asarray(inode2, dtype='int64')
+    keys = np.unique(np.minimum(inode1, inode2) * nnodes + np.maximum(inode1, inode2))
+    ilower = keys // nnodes
+    iupper = keys - ilower * nnodes
+
+    # the nodes are merged in order, so this is a loop, but it's only over
+    # the close pairs
+    ikeep_list = ikeep.tolist()
+    xyz = nodes_xyz.tolist()
+    tol2 = tol ** 2
+    for ilow, iup in zip(ilower.tolist(), iupper.tolist()):
+        if ikeep_list[iup] != iup:
+            # already merged
+            continue
+        ikept = ikeep_list[ilow]
+        if ikept != ilow:
+            # the lower node was merged, so check the distance to the
+            # node it was merged to
+            xyz1 = xyz[ikept]
+            xyz2 = xyz[iup]
+            distance2 = ((xyz1[0] - xyz2[0]) ** 2 + (xyz1[1] - xyz2[1]) ** 2 +
+                         (xyz1[2] - xyz2[2]) ** 2)
+            if distance2 > tol2:
+                continue
+        ikeep_list[iup] = ikept
+    return np.array(ikeep_list, dtype='int64')
+
+
+def _eq_nodes_final_arrays(model, nids, ikeep):
+    """
+    Applies the nodal equivalencing to the model
+
+    The equivalenced GRIDs get the id/location of the kept GRID.  The
+    cross-referenced elements see the new ids through the GRIDs; the
+    nodes of the elements that aren't cross-referenced are renumbered.
+
+    Parameters
+    ----------
+    model : BDF()
+        the BDF model
+    nids : (nnodes, ) int ndarray
+        the sorted node ids
+    ikeep : (nnodes, ) int ndarray
+        the index of the node to keep
+
+    """
+    imerged = np.where(ikeep != np.arange(len(nids)))[0]
+    if len(imerged) == 0:
+        return
+    nids_old = np.asarray(nids)[imerged]
+    nids_new = np.asarray(nids)[ikeep[imerged]]
+
+    # find the elements with a merged node
+    connectivity = model.connectivity
+    eids_to_update = [np.array([], dtype='int64')]
+    for etype in connectivity.element_types:
+        element_nids = connectivity.type_to_node_ids[etype]
+        is_merged = np.in1d(element_nids, nids_old).reshape(element_nids.shape)
+        eids_to_update.append(connectivity.type_to_element_ids[etype][is_merged.any(axis=1)])
+
+    nid_map = dict(zip(nids_old.tolist(), nids_new.tolist()))
+    for eid in np.hstack(eids_to_update).tolist():
+        elem = model.elements[eid]
+        if getattr(elem, 'nodes_ref', None) is not None or not hasattr(elem, 'nodes'):
+            continue
+        elem.nodes = [nid_map.get(nid, nid) for nid in elem.nodes]
+
+    # the GRIDs stay in model.nodes, so they're written as duplicates of
+    # the kept GRID
+    for nid2, nid1 in zip(nids_old.tolist(), nids_new.tolist()):
+        node1 = model.nodes[nid1]
+        node2 = model.nodes[nid2]
+        node2.nid = node1.nid
+        node2.xyz = node1.xyz
+        node2.cp = node1.cp
+        assert node2.cd == node1.cd
+        assert node2.ps == node1.ps
+        assert node2.seid == node1.seid
+
+    model.clear_connectivity()
+    model.clear_spatial_index()
+
+
 def _eq_nodes_build_tree(nodes_xyz, nids, tol,
                          inew=None, node_set=None, neq_max=4, msg=''):
     """
@@ -0,0 +1,403 @@
+"""
+defines:
+    connectivity = Connectivity(model)
+
+The Connectivity is the cached node/element connectivity of a BDF, which
+is accessed with ``model.connectivity``:
+ - the element node ids as padded (nelements, nnodes) arrays, which are
+   grouped by element type
+ - the CSR node->element adjacency
+ - the CSR element->element adjacency (shared node/edge/face)
+
+The adjacency uses indices into the sorted ``node_ids``/``element_ids``
+instead of ids, so the arrays may be used directly with
+``scipy.sparse.csgraph``.  ``to_scipy`` wraps them in a
+``scipy.sparse.csr_matrix``.
+
+The connectivity is rebuilt when the nodes/elements are added or removed
+or after ``model.clear_connectivity()``.  Call ``clear_connectivity``
+after changing the nodes of an element.
+"""
+from __future__ import print_function
+from collections import defaultdict
+from six import iteritems
+import numpy as np
+import scipy.sparse
+
+#: the corner node indices of the edges of each element type
+#: (the midside nodes are ignored)
+ELEMENT_EDGES = {}
+#: the corner node indices of the faces of each element type;
+#: shells have a single face and the solid face normals point outwards
+ELEMENT_FACES = {}
+
+_TRIA_EDGES = [[0, 1], [1, 2], [2, 0]]
+_QUAD_EDGES = [[0, 1], [1, 2], [2, 3], [3, 0]]
+for _etype in ['CROD', 'CONROD', 'CTUBE', 'CBAR', 'CBEAM', 'CBEAM3', 'CBEND']:
+    ELEMENT_EDGES[_etype] = [[0, 1]]
+for _etype in ['CTRIA3', 'CTRIA6', 'CTRIAR', 'CPLSTN3', 'CPLSTN6', 'CPLSTS3',
+               'CTRAX3', 'CTRAX6', 'CTRIAX']:
+    ELEMENT_EDGES[_etype] = _TRIA_EDGES
+    ELEMENT_FACES[_etype] = [[0, 1, 2]]
+for _etype in ['CQUAD4', 'CQUAD8', 'CQUADR', 'CQUAD', 'CSHEAR', 'CPLSTN4', 'CPLSTN8',
+               'CQUADX', 'CQUADX4', 'CQUADX8']:
+    ELEMENT_EDGES[_etype] = _QUAD_EDGES
+    ELEMENT_FACES[_etype] = [[0, 1, 2, 3]]
+
+# the corners of the CTRIAX6 are nodes 1, 3 and 5
+ELEMENT_EDGES['CTRIAX6'] = [[0, 2], [2, 4], [4, 0]]
+ELEMENT_FACES['CTRIAX6'] = [[0, 2, 4]]
+
+ELEMENT_EDGES['CTETRA'] = [[0, 1], [1, 2], [2, 0], [0, 3], [1, 3], [2, 3]]
+ELEMENT_FACES['CTETRA'] = [[0, 1, 3], [0, 3, 2], [1, 2, 3], [0, 2, 1]]
+ELEMENT_EDGES['CPYRAM'] = [[0, 1], [1, 2], [2, 3], [3, 0], [0, 4], [1, 4], [2, 4], [3, 4]]
+ELEMENT_FACES['CPYRAM'] = [[0, 1, 2, 3], [0, 1, 4], [1, 2, 4], [2, 3, 4], [3, 0, 4]]
+ELEMENT_EDGES['CPENTA'] = [[0, 1], [1, 2], [2, 0], [3, 4], [4, 5], [5, 3],
+                           [0, 3], [1, 4], [2, 5]]
+ELEMENT_FACES['CPENTA'] = [[0, 1, 2], [3, 4, 5], [0, 1, 4, 3], [1, 2, 5, 4], [2, 0, 3, 5]]
+ELEMENT_EDGES['CHEXA'] = [[0, 1], [1, 2], [2, 3], [3, 0], [4, 5], [5, 6], [6, 7], [7, 4],
+                          [0, 4], [1, 5], [2, 6], [3, 7]]
+ELEMENT_FACES['CHEXA'] = [[0, 1, 2, 3], [0, 1, 5, 4], [1, 2, 6, 5], [2, 3, 7, 6],
+                          [3, 0, 4, 7], [4, 5, 6, 7]]
+
+
+class Connectivity(object):
+    """
+    Node/element connectivity arrays
+
+    Attributes
+    ----------
+    node_ids : (nnodes, ) int ndarray
+        the sorted GRID/SPOINT/EPOINT ids
+    element_ids : (nelements, ) int ndarray
+        the sorted element ids
+    element_types : List[str]
+        the sorted element types
+    type_to_element_ids : Dict[str] = (n, ) int ndarray
+        the sorted element ids of each element type
+    type_to_node_ids : Dict[str] = (n, nnodes_max) int ndarray
+        the node ids of each element type; 0 for a missing node
+        (e.g., a CQUAD8 with missing midside nodes or a CTETRA4
+        mixed with CTETRA10s)
+    node_element_indptr / node_element_indices : (nnodes+1, ) / (n, ) int ndarray
+        the CSR node->element adjacency; the elements of node_ids[i]
+        are element_ids[node_element_indices[indptr[i]:indptr[i+1]]]
+
+    Queries
+    -------
+     - eids = get_element_ids(nid)
+     - inids = get_node_indices(nids)
+     - nid_to_eids_map = get_node_id_to_element_ids_map()
+     - edges, ielements = get_edges(element_types=None)
+     - faces, ielements = get_faces(element_types=None)
+     - indptr, indices = get_element_adjacency(by='edge')
+     - matrix = to_scipy(adjacency='node_element')
+    """
+    def __init__(self, model):
+        """
+        Builds the connectivity arrays
+
+        Parameters
+        ----------
+        model : BDF()
+            the BDF model
+
+        Elements without a ``node_ids`` attribute are skipped.  Nodes
+        that aren't in the model are ignored.
+        """
+        self._key = _get_model_key(model)
+        self.node_ids = np.array(sorted(
+            set(model.nodes) | set(model.spoints) | set(model.epoints)), dtype='int64')
+
+        type_to_eids = defaultdict(list)
+        type_to_nids = defaultdict(list)
+        for eid, elem in sorted(iteritems(model.elements)):
+            try:
+                node_ids = elem.node_ids
+            except AttributeError:
+                continue
+            type_to_eids[elem.type].append(eid)
+            type_to_nids[elem.type].append(
+                [nid if nid is not None else 0 for nid in node_ids])
+
+        self.element_types = sorted(type_to_eids)
+        self.type_to_element_ids = {}
+        self.type_to_node_ids = {}
+        for etype in self.element_types:
+            nids_list = type_to_nids[etype]
+            nnodes_max = max(len(nids) for nids in nids_list)
+            nids = np.zeros((len(nids_list), nnodes_max), dtype='int64')
+            for i, nidsi in enumerate(nids_list):
+                nids[i, :len(nidsi)] = nidsi
+            self.type_to_element_ids[etype] = np.array(type_to_eids[etype], dtype='int64')
+            self.type_to_node_ids[etype] = nids
+
+        if self.element_types:
+            self.element_ids = np.sort(np.hstack(
+                [self.type_to_element_ids[etype] for etype in self.element_types]))
+        else:
+            self.element_ids = np.array([], dtype='int64')
+
+        self.node_element_indptr, self.node_element_indices = self._get_node_element_csr()
+        self._element_adjacency = {}
+
+    def is_valid(self, model):
+        """is the connectivity up to date with the model?"""
+        return self._key == _get_model_key(model)
+
+    def __repr__(self):
+        msg = 'Connectivity(nnodes=%s, nelements=%s, element_types=%s)' % (
+            len(self.node_ids), len(self.element_ids), self.element_types)
+        return msg
+
+    def get_node_indices(self, nids):
+        """
+        Gets the indices of the node ids in node_ids; -1 for a missing
+        (0) or an undefined node
+
+        Parameters
+        ----------
+        nids : (...) int ndarray
+            the node ids
+
+        """
+        nnodes = len(self.node_ids)
+        inids = np.searchsorted(self.node_ids, nids)
+        if nnodes == 0:
+            return np.full(inids.shape, -1, dtype='int64')
+        inids[inids == nnodes] = 0
+        inids[self.node_ids[inids] != nids] = -1
+        return inids
+
+    def _get_element_indices(self, etype):
+        """gets the indices of the elements of a type in element_ids"""
+        return np.searchsorted(self.element_ids, self.type_to_element_ids[etype])
+
+    def _get_node_element_csr(self):
+        """builds the CSR node->element adjacency"""
+        nnodes = len(self.node_ids)
+        inodes = []
+        ielements = []
+        for etype in self.element_types:
+            inids = self.get_node_indices(self.type_to_node_ids[etype])
+            ieids = self._get_element_indices(etype)
+            ieids = np.repeat(ieids[:, np.newaxis], inids.shape[1], axis=1)
+            is_node = inids >= 0
+            inodes.append(inids[is_node])
+            ielements.append(ieids[is_node])
+
+        if not inodes:
+            return np.zeros(nnodes + 1, dtype='int64'), np.array([], dtype='int64')
+        return _get_csr(np.hstack(inodes), np.hstack(ielements), nnodes,
+                        len(self.element_ids))
+
+    def get_element_ids(self, nid):
+        """gets the sorted element ids that use a node"""
+        inid = self.get_node_indices(np.array([nid]))[0]
+        if inid < 0:
+            return np.array([], dtype='int64')
+        istart = self.node_element_indptr[inid]
+        iend = self.node_element_indptr[inid + 1]
+        return self.element_ids[self.node_element_indices[istart:iend]]
+
+    def get_node_id_to_element_ids_map(self):
+        """
+        Gets a dictionary that maps each node id to a list of the
+        sorted element ids that use the node
+        """
+        eids = self.element_ids[self.node_element_indices].tolist()
+        indptr = self.node_element_indptr.tolist()
+        nid_to_eids_map = {}
+        for i, nid in enumerate(self.node_ids.tolist()):
+            nid_to_eids_map[nid] = eids[indptr[i]:indptr[i + 1]]
+        return nid_to_eids_map
+
+    def get_edges(self, element_types=None):
+        """
+        Gets the corner edges of the elements
+
+        Parameters
+        ----------
+        element_types : List[str]; default=None -> all
+            the element types to consider; types without edges
+            (e.g., springs) are skipped
+
+        Returns
+        -------
+        edges : (nedges, 2) int ndarray
+            the node ids of the edges (n1 < n2); an edge that's shared by
+            multiple elements is repeated
+        ielements : (nedges, ) int ndarray
+            the index of the element in element_ids
+
+        """
+        return self._get_element_node_groups(ELEMENT_EDGES, element_types, sort=True)
+
+    def get_faces(self, element_types=None):
+        """
+        Gets the faces of the shell/solid elements
+
+        Parameters
+        ----------
+        element_types : List[str]; default=None -> all
+            the element types to consider; types without faces
+            (e.g., rods) are skipped
+
+        Returns
+        -------
+        faces : (nfaces, 4) int ndarray
+            the corner node ids of the faces in the element order;
+            the 4th node of a triangle is 0
+        ielements : (nfaces, ) int ndarray
+            the index of the element in element_ids
+
+        """
+        return self._get_element_node_groups(ELEMENT_FACES, element_types, sort=False)
+
+    def _get_element_node_groups(self, local_map, element_types, sort):
+        """gets the edges/faces of the elements"""
+        if element_types is None:
+            element_types = self.element_types
+        nnodes_group = 2 if local_map is ELEMENT_EDGES else 4
+
+        groups = []
+        ielements = []
+        for etype in element_types:
+            if etype not in local_map or etype not in self.type_to_node_ids:
+                continue
+            nids = self.type_to_node_ids[etype]
+            ieids = self._get_element_indices(etype)
+            for local in local_map[etype]:
+                group = np.zeros((nids.shape[0], nnodes_group), dtype='int64')
+                group[:, :len(local)] = nids[:, local]
+                groups.append(group)
+                ielements.append(ieids)
+
+        if not groups:
+            return np.zeros((0, nnodes_group), dtype='int64'), np.array([], dtype='int64')
+        groups = np.vstack(groups)
+        ielements = np.hstack(ielements)
+        if sort:
+            groups.sort(axis=1)
+        return groups, ielements
+
+    def get_element_adjacency(self, by='edge'):
+        """
+        Gets the CSR element->element adjacency
+
+        Parameters
+        ----------
+        by : str; default='edge'
+            'node' : the elements share a node
+            'edge' : the elements share a corner edge
+            'face' : the elements share a face
+
+        Returns
+        -------
+        indptr / indices : (nelements+1, ) / (n, ) int ndarray
+            the neighbors of element_ids[i] are
+            element_ids[indices[indptr[i]:indptr[i+1]]]
+
+        """
+        if by in self._element_adjacency:
+            return self._element_adjacency[by]
+
+        nelements = len(self.element_ids)
+        if by == 'node':
+            incidence = self.to_scipy('node_element')
+            adjacency = (incidence.T * incidence).tocsr()
+            adjacency.setdiag(0)
+            adjacency.eliminate_zeros()
+            adjacency.sort_indices()
+            indptr = adjacency.indptr.astype('int64')
+            indices = adjacency.indices.astype('int64')
+        elif by in ['edge', 'face']:
+            if by == 'edge':
+                keys, ielements = self.get_edges()
+            else:
+                keys, ielements = self.get_faces()
+                keys = np.sort(keys, axis=1)
+            irows, icols = _get_shared_key_pairs(keys, ielements)
+            indptr, indices = _get_csr(irows, icols, nelements, nelements)
+        else:
+            raise ValueError("by=%r and must be 'node', 'edge' or 'face'" % by)
+
+        self._element_adjacency[by] = (indptr, indices)
+        return indptr, indices
+
+    def to_scipy(self, adjacency='node_element'):
+        """
+        Gets the adjacency as a scipy.sparse.csr_matrix of ones
+
+        Parameters
+        ----------
+        adjacency : str; default='node_element'
+            'node_element' : the (nnodes, nelements) incidence matrix
+            'element_node' / 'element_edge' / 'element_face' :
+                the (nelements, nelements) adjacency of the elements that
+                share a node/edge/face (see ``get_element_adjacency``)
+
+        """
+        nnodes = len(self.node_ids)
+        nelements = len(self.element_ids)
+        if adjacency == 'node_element':
+            indptr = self.node_element_indptr
+            indices = self.node_element_indices
+            shape = (nnodes, nelements)
+        elif adjacency in ['element_node', 'element_edge', 'element_face']:
+            indptr, indices = self.get_element_adjacency(by=adjacency.split('_')[1])
+            shape = (nelements, nelements)
+        else:
+            msg = ("adjacency=%r and must be 'node_element', 'element_node', "
+                   "'element_edge' or 'element_face'" % adjacency)
+            raise ValueError(msg)
+        data = np.ones(len(indices), dtype='int32')
+        return scipy.sparse.csr_matrix((data, indices, indptr), shape=shape)
+
+
+def _get_model_key(model):
+    """the nodes/elements that the connectivity depends on"""
+    return (id(model.nodes), len(model.nodes), id(model.spoints), len(model.spoints),
+            id(model.epoints), len(model.epoints), id(model.elements), len(model.elements))
+
+
+def _get_csr(irows, icols, nrows, ncols):
+    """
+    Gets the CSR arrays of the unique (irow, icol) pairs with the
+    columns sorted in each row
+    """
+    keys = np.unique(irows.astype('int64') * ncols + icols)
+    irows = keys // ncols
+    icols = keys - irows * ncols
+    indptr = np.zeros(nrows + 1, dtype='int64')
+    np.cumsum(np.bincount(irows, minlength=nrows), out=indptr[1:])
+    return indptr, icols
+
+
+def _get_shared_key_pairs(keys, ielements):
+    """
+    Gets the (ielement1, ielement2) pairs of the elements that share a
+    key (e.g., an edge), where the pairs are in both orders
+    """
+    nkeys = keys.shape[0]
+    if nkeys == 0:
+        return np.array([], dtype='int64'), np.array([], dtype='int64')
+    order = np.lexsort(keys.T[::-1])
+    keys = keys[order, :]
+    is_new = np.ones(nkeys, dtype='bool')
+    is_new[1:] = np.any(keys[1:, :] != keys[:-1, :], axis=1)
+    igroup = np.cumsum(is_new) - 1
+    starts = np.where(is_new)[0]
+    counts = np.diff(np.append(starts, nkeys))
+
+    # pair each key with the other keys of its group
+    ikeys = np.where(counts[igroup] > 1)[0]
+    ngroup = counts[igroup[ikeys]]
+    offsets = np.repeat(starts[igroup[ikeys]] - (np.cumsum(ngroup) - ngroup), ngroup)
+    ipartners = offsets + np.arange(ngroup.sum(), dtype='int64')
+    ikeys = np.repeat(ikeys, ngroup)
+
+    irows = ielements[order[ikeys]]
+    icols = ielements[order[ipartners]]
+    is_other = irows != icols
+    return irows[is_other], icols[is_other]
@@ -11,7 +11,7 @@ defines:
 from __future__ import print_function
 from itertools import count
 
-from six import iterkeys, iteritems
+from six import iterkeys
 import numpy as np
 from pyNastran.bdf.cards.coordinate_systems import CORD2R
 from pyNastran.bdf.field_writer_8 import print_card_8
@@ -35,7 +35,17 @@ if NUMPY_VERSION < '1.13.0':
         #nodal_result, plane_atol=plane_atol)
     #return local_points_array, global_points_array, result_array
 
-def _setup_edges(bdf_filename):
+def _get_close_element_ids(model, coord, tol):
+    """
+    Gets the ids of the elements whose bounding box is within tol of the
+    y=0 plane of the coord from ``model.spatial_index`` (in the order of
+    model.elements)
+    """
+    eids = model.spatial_index.get_elements_near_plane(coord.origin, coord.j, tol=tol)
+    eids = set(eids.tolist())
+    return [eid for eid in model.elements if eid in eids]
+
+def _setup_edges(bdf_filename, coord, tol):
     """helper method"""
     model = get_bdf_model(bdf_filename, xref=False, log=None, debug=False)
     out = model.get_xyz_in_coord_array(cid=0, fdtype='float64', idtype='int32')
@@ -43,14 +53,18 @@ def _setup_edges(bdf_filename):
     nids = nid_cp_cd[:, 0]
     #eid_to_edge_map, nid_to_edge_map, edge_to_eid_map = create_maps(model)
     #model = BDF()
-    out = model._get_maps(eids=None, map_names=None,
+
+    # the edges with a node that's within tol of the plane are on
+    # the elements with a bounding box that's within tol of the plane
+    eids = _get_close_element_ids(model, coord, tol)
+    out = model._get_maps(eids=eids, map_names=None,
                           consider_0d=False, consider_0d_rigid=False,
                           consider_1d=False, consider_2d=True, consider_3d=False)
     edge_to_eid_map = out['edge_to_eid_map']
     edges = iterkeys(edge_to_eid_map)
     return nids, xyz_cid0, edges
 
-def _setup_faces(bdf_filename):
+def _setup_faces(bdf_filename, coord, tol):
     """helper method"""
     model = get_bdf_model(bdf_filename, xref=False, log=None, debug=False)
     out = model.get_xyz_in_coord_array(cid=0, fdtype='float64', idtype='int32')
@@ -64,7 +78,8 @@ def _setup_faces(bdf_filename):
         'CTRIA3', 'CTRIAX', 'CTRIA6', 'CTRIAX6',
         'CQUAD4', 'CQUAD', 'CQUAD8', 'CQUADR', 'CQUADX', 'CQUADX8',
         'CSHEAR'])
-    for eid, elem in iteritems(model.elements):
+    for eid in _get_close_element_ids(model, coord, tol):
+        elem = model.elements[eid]
         if elem.type in shells:
             #if elem.type == 'CQUAD4':
                 # split to 2 faces...not done
@@ -103,7 +118,7 @@ def cut_edge_model_by_coord(bdf_filename, coord, tol,
         str : write a csv
     """
     assert isinstance(tol, float), tol
-    nids, xyz_cid0, edges = _setup_edges(bdf_filename)
+    nids, xyz_cid0, edges = _setup_edges(bdf_filename, coord, tol)
     local_points_array, global_points_array, result_array = _cut_edge_model_by_coord(
         nids, xyz_cid0, edges, coord, tol,
         nodal_result, plane_atol=plane_atol)
@@ -136,7 +151,9 @@ def cut_face_model_by_coord(bdf_filename, coord, tol,
         str : write a csv
     """
     assert isinstance(tol, float), tol
-    nids, xyz_cid0, faces, face_eids = _setup_faces(bdf_filename)
+    # the faces that cross the plane are within plane_atol of the plane
+    nids, xyz_cid0, faces, face_eids = _setup_faces(bdf_filename, coord,
+                                                    max(tol, plane_atol))
     unique_geometry_array, unique_results_array = _cut_face_model_by_coord(
         nids, xyz_cid0, faces, face_eids, coord, tol,
         nodal_result, plane_atol=plane_atol, skip_cleanup=skip_cleanup)
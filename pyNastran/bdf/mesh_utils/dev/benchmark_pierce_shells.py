@@ -0,0 +1,107 @@
+"""
+Times the shell piercing in rays per second.
+
+A wavy CQUAD4 surface is pierced with random rays (half of them are +z
+rays, the rest have a random direction) by:
+ - pierce_shell_model_by_rays, which pierces all the rays at once
+ - a loop over the rays, which pierces the candidates of each ray with
+   quad_intersection
+
+Usage
+-----
+python benchmark_pierce_shells.py [NX [NRAYS]]
+
+"""
+from __future__ import print_function
+import sys
+import time
+
+import numpy as np
+
+from pyNastran.bdf.bdf import BDF
+from pyNastran.bdf.mesh_utils.pierce_shells import (
+    pierce_shell_model_by_rays, quad_intersection)
+from pyNastran.utils.log import SimpleLogger
+
+
+def get_wavy_plate(nx):
+    """creates a (nx, nx) CQUAD4 surface"""
+    model = BDF(log=SimpleLogger(level='error'))
+    model.add_pshell(1, mid1=1, t=0.1)
+    model.add_mat1(1, 3.0e7, None, 0.3)
+
+    x = np.linspace(0., 1., nx + 1)
+    xv, yv = np.meshgrid(x, x, indexing='ij')
+    zv = 0.1 * np.sin(4. * np.pi * xv) * np.cos(4. * np.pi * yv)
+    for nid, xyz in enumerate(zip(xv.ravel(), yv.ravel(), zv.ravel())):
+        model.add_grid(nid + 1, list(xyz))
+
+    inode = np.arange(1, (nx + 1) ** 2 + 1).reshape(nx + 1, nx + 1)
+    n1 = inode[:-1, :-1].ravel()
+    n2 = inode[1:, :-1].ravel()
+    n3 = inode[1:, 1:].ravel()
+    n4 = inode[:-1, 1:].ravel()
+    for eid, nids in enumerate(zip(n1, n2, n3, n4)):
+        model.add_cquad4(eid + 1, 1, list(nids))
+    return model
+
+
+def get_rays(nrays):
+    """gets random rays that start below the surface"""
+    np.random.seed(0)
+    origins = np.random.random((nrays, 3))
+    origins[:, 2] = -1.
+    directions = np.zeros((nrays, 3))
+    directions[:, 2] = 1.
+    nrandom = nrays // 2
+    directions[:nrandom, :2] = 0.5 * (np.random.random((nrandom, 2)) - 0.5)
+    return origins, directions
+
+
+def pierce_loop(model, origins, directions):
+    """pierces the rays one at a time"""
+    spatial_index = model.spatial_index
+    npierces = 0
+    for origin, direction in zip(origins, directions):
+        eids = spatial_index.get_elements_on_ray(origin, direction)[0]
+        for eid in eids:
+            elem = model.elements[eid]
+            v0, v1, v2, v3 = [node.get_position() for node in elem.nodes_ref]
+            xyz_pierce = quad_intersection(origin, direction, v0, v1, v2, v3)
+            if xyz_pierce is not None:
+                npierces += 1
+    return npierces
+
+
+def main():  # pragma: no cover
+    """runs the benchmark"""
+    nx = 300
+    nrays = 50000
+    if len(sys.argv) > 1:
+        nx = int(sys.argv[1])
+    if len(sys.argv) > 2:
+        nrays = int(sys.argv[2])
+
+    time0 = time.time()
+    model = get_wavy_plate(nx)
+    model.cross_reference()
+    unused_spatial_index = model.spatial_index
+    print('nelements=%s; setup=%.2fs' % (len(model.elements), time.time() - time0))
+
+    origins, directions = get_rays(nrays)
+    time0 = time.time()
+    irays = pierce_shell_model_by_rays(model, origins, directions)[0]
+    dt = time.time() - time0
+    print('pierce_shell_model_by_rays: nrays=%s npierces=%s dt=%.2fs -> %.0f rays/s' % (
+        nrays, len(irays), dt, nrays / dt))
+
+    nrays_loop = min(nrays, 2000)
+    time0 = time.time()
+    npierces = pierce_loop(model, origins[:nrays_loop], directions[:nrays_loop])
+    dt = time.time() - time0
+    print('loop:                       nrays=%s npierces=%s dt=%.2fs -> %.0f rays/s' % (
+        nrays_loop, npierces, dt, nrays_loop / dt))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
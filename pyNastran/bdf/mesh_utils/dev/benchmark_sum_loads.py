@@ -0,0 +1,82 @@
+"""
+Times the load summation of many load cases.
+
+A wavy CQUAD4 surface is loaded with NSETS load sets of PLOAD4s (one per
+element) and FORCEs in a rotated coordinate system.  NLOADCASES LOAD
+cards combine the load sets with random scale factors.  The resultants
+are summed by:
+ - sum_forces_moments_all, which sums all the load cases at once
+ - a loop over the load cases with sum_forces_moments
+
+Usage
+-----
+python benchmark_sum_loads.py [NX [NLOADCASES]]
+
+"""
+from __future__ import print_function
+import sys
+import time
+
+import numpy as np
+
+from pyNastran.bdf.mesh_utils.dev.benchmark_pierce_shells import get_wavy_plate
+from pyNastran.bdf.mesh_utils.loads import sum_forces_moments, sum_forces_moments_all
+
+
+def add_loads(model, nsets, nload_cases):
+    """adds the load sets and the LOAD combinations"""
+    model.add_cord2r(1, origin=[0., 0., 0.], zaxis=[0., 0., 1.], xzplane=[1., 1., 0.])
+    eids = np.array(sorted(model.elements))
+    nids = np.array(sorted(model.nodes))
+    for i, eids_set in enumerate(np.array_split(eids, nsets)):
+        sid = i + 1
+        for eid in eids_set.tolist():
+            model.add_pload4(sid, [eid], [float(sid)] * 4)
+        for nid in nids[i::nsets].tolist():
+            model.add_force(sid, nid, 1.5, [1., 2., 3.], cid=1)
+
+    np.random.seed(0)
+    load_ids = list(range(1, nsets + 1))
+    for load_id in range(1001, 1001 + nload_cases):
+        scale_factors = np.random.random(nsets).tolist()
+        model.add_load(load_id, 1., scale_factors, load_ids)
+
+
+def main():  # pragma: no cover
+    """runs the benchmark"""
+    nx = 100
+    nload_cases = 500
+    nsets = 20
+    if len(sys.argv) > 1:
+        nx = int(sys.argv[1])
+    if len(sys.argv) > 2:
+        nload_cases = int(sys.argv[2])
+
+    time0 = time.time()
+    model = get_wavy_plate(nx)
+    add_loads(model, nsets, nload_cases)
+    model.cross_reference()
+    print('nelements=%s nload_cases=%s; setup=%.2fs' % (
+        len(model.elements), nload_cases, time.time() - time0))
+
+    p0 = np.zeros(3)
+    time0 = time.time()
+    load_case_ids, forces, moments = sum_forces_moments_all(
+        model, p0, sorted(model.load_combinations))
+    dt = time.time() - time0
+    print('sum_forces_moments_all: dt=%.2fs' % dt)
+
+    nload_cases_loop = min(nload_cases, 10)
+    time0 = time.time()
+    for i, load_case_id in enumerate(load_case_ids[:nload_cases_loop].tolist()):
+        force, moment = sum_forces_moments(model, p0, load_case_id)
+        assert np.allclose(force, forces[i, :]), 'force=%s forces[i]=%s' % (force, forces[i, :])
+        assert np.allclose(moment, moments[i, :]), 'moment=%s moments[i]=%s' % (
+            moment, moments[i, :])
+    dt_loop = (time.time() - time0) / nload_cases_loop * nload_cases
+    print('sum_forces_moments loop: dt=%.2fs (estimated from %s load cases)' % (
+        dt_loop, nload_cases_loop))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
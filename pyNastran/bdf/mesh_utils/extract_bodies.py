@@ -1,14 +1,18 @@
 """
 defines:
-  - extract_bodies(bdf_filename)
+  - body_eids = extract_bodies(bdf_filename, mpc_id=0, consider_rbe3=True)
+  - nbodies, node_ids, labels = get_node_body_labels(
+        bdf_filename, mpc_id=0, consider_rbe3=True)
 """
 from __future__ import print_function
-from collections import defaultdict
-from six import iteritems, iterkeys
+from six import iteritems
 import numpy as np
-from pyNastran.bdf.bdf import BDF, read_bdf, print_card_16
+import scipy.sparse
+from scipy.sparse.csgraph import connected_components  # type: ignore
+from pyNastran.bdf.bdf import BDF, read_bdf
 
-def extract_bodies(bdf_filename, mpc_id=0):
+
+def extract_bodies(bdf_filename, mpc_id=0, consider_rbe3=True):
     """
     Finds the isolated bodies
 
@@ -18,185 +22,234 @@ def extract_bodies(bdf_filename, mpc_id=0):
         str : the path the the *.bdf file
         BDF : a BDF() boject
     mpc_id : int; default=0
+        None : don't consider the MPCs
         0 : consider all MPCs
-        >0 : use this MPC set
-        not supported
+        >0 : use this MPC/MPCADD set
+    consider_rbe3 : bool; default=True
+        RBE3s connect their nodes
+
+    Returns
+    -------
+    body_eids : Dict[ibody] = [eids, rigid_eids]
+        ibody : int
+            the body id (0, 1, ...)
+        eids : (n, ) int ndarray
+            the sorted element ids of the body
+        rigid_eids : (n, ) int ndarray
+            the sorted rigid element ids of the body
 
     Considers:
     ----------
      - elements
      - rigid_elements
+     - MPC
+     - MPCADD
 
     Doesn't consider:
     -----------------
       - elements_mass
-      - MPC
-      - MPCADD
       - DMIx
 
-    Doesn't support:
-    ----------------
-      - xref
-      - duplicate element ids
-      - large values
+    The nodes are connected with a sparse node-node graph, so the bodies
+    are the connected components of the graph (see get_node_body_labels).
+    """
+    model = _get_model(bdf_filename)
+    nbodies, node_ids, labels, element_groups = _get_node_body_labels(
+        model, mpc_id=mpc_id, consider_rbe3=consider_rbe3)
+    if nbodies == 0:
+        return {}
+
+    body_eids = {}
+    for ibody in range(nbodies):
+        body_eids[ibody] = []
+    for eids, inodes in element_groups:
+        ibodies = labels[inodes]
+        order = np.lexsort((eids, ibodies))
+        ibodies = ibodies[order]
+        eids = eids[order]
+        istarts = np.searchsorted(ibodies, np.arange(nbodies + 1))
+        for ibody in range(nbodies):
+            body_eids[ibody].append(
+                np.asarray(eids[istarts[ibody]:istarts[ibody + 1]], dtype='int32'))
 
+    if nbodies > 1:
+        model.log.info('nbodies = %i' % nbodies)
+    return body_eids
+
+
+def get_node_body_labels(bdf_filename, mpc_id=0, consider_rbe3=True):
     """
+    Labels the nodes with the connected body that they're part of
+
+    Parameters
+    ----------
+    bdf_filename : str/BDF
+        str : the path the the *.bdf file
+        BDF : a BDF() boject
+    mpc_id : int; default=0
+        None : don't consider the MPCs
+        0 : consider all MPCs
+        >0 : use this MPC/MPCADD set
+    consider_rbe3 : bool; default=True
+        RBE3s connect their nodes
+
+    Returns
+    -------
+    nbodies : int
+        the number of bodies; a model in one piece has 1 body
+    node_ids : (nnodes, ) int ndarray
+        the sorted GRID/SPOINT/EPOINT ids
+    labels : (nnodes, ) int ndarray
+        the body of each node (0, 1, ..., nbodies-1); -1 for a free node,
+        which isn't used by an element, rigid element or MPC
+
+    """
+    model = _get_model(bdf_filename)
+    nbodies, node_ids, labels = _get_node_body_labels(
+        model, mpc_id=mpc_id, consider_rbe3=consider_rbe3)[:3]
+    nfree = (labels < 0).sum()
+    model.log.debug('nbodies=%s nfree_nodes=%s' % (nbodies, nfree))
+    return nbodies, node_ids, labels
+
+
+def _get_model(bdf_filename):
+    """loads the model"""
     if isinstance(bdf_filename, BDF):
         model = bdf_filename
     else:
         model = read_bdf(bdf_filename, xref=False)
+    return model
 
-    debug = False
-    nnodes = len(model.nodes)
-    nspoints = 0
-    nepoints = 0
-    if model.spoints:
-        nspoints = len(model.spoints)
-    if model.epoints:
-        nepoints = len(model.epoints)
-    npoints = nnodes + nspoints + nepoints
-    nelements = len(model.elements) + len(model.rigid_elements) + len(model.masses)
-    if npoints == 0 or nelements == 0:
-        return {}
 
-    nid_to_eid_map = defaultdict(list)
-    eid_to_nid_map = defaultdict(list)
-    for eid, elem in iteritems(model.elements):
-        if debug:  # pragma: no cover
-            print(print_card_16(elem.repr_fields()))
-        node_ids = elem.node_ids
-        eid_to_nid_map[eid] = node_ids
-        for nid in node_ids:
-            if nid is None:
-                continue
-            nid_to_eid_map[nid].append(eid)
-
-    rigid_offset = 0
-    if len(model.elements):
-        rigid_offset = max(model.elements)
-    for eid, elem in iteritems(model.rigid_elements):
-        if debug:  # pragma: no cover
-            print(print_card_16(elem.repr_fields()))
-        eid += rigid_offset
-        assert eid not in model.elements, 'eid=%s cannot be used twice' % eid
-        #node_ids = elem.node_ids
-        node_ids = elem.independent_nodes + elem.dependent_nodes
-        eid_to_nid_map[eid] = node_ids
-        for nid in node_ids:
-            if nid is None:
-                raise RuntimeError(elem)
-            nid_to_eid_map[nid].append(eid)
-    #mpc_offset = rigid_offset + max(model.rigid_elements)
-
-    if len(nid_to_eid_map) == 0:
-        raise RuntimeError(model.get_bdf_stats())
-        #return {}
-
-    nids_used = set([])
-    eids_used = set([])
-    ibody = 0
-    all_nids_to_check = set(list(nid_to_eid_map.keys()))
-    nids_to_check = set([next(iterkeys(nid_to_eid_map))])
-    if debug:  # pragma: no cover
-        print('all_nids_to_check= ', all_nids_to_check)
-    body_eids = {ibody : set([])}
-    nbodies_max = 3
-    while all_nids_to_check:
-        if debug:  # pragma: no cover
-            print(all_nids_to_check)
-        while nids_to_check:
-            #if len(nids_to_check) < 10:
-                #print('nids_to_check =', nids_to_check)
-            nid = nids_to_check.pop()
-            if debug:  # pragma: no cover
-                print('nid = ', nid)
-                print('all_nids_to_check =', all_nids_to_check)
-            if nid not in all_nids_to_check:
-                msg = 'nids_to_check = %s' % nids_to_check
-                raise RuntimeError(msg)
-            if debug:  # pragma: no cover
-                print('nids_used         =', nids_used)
-                print('all_nids_to_check =', all_nids_to_check)
-
-            nids_used.add(nid)
-            if debug:  # pragma: no cover
-                print('  adding nid=%s' % nid)
-            all_nids_to_check.remove(nid)
-            if debug:  # pragma: no cover
-                print('  nids_used         =', nids_used)
-                print('  all_nids_to_check =', all_nids_to_check)
-
-            eids = nid_to_eid_map[nid]
-            if debug:  # pragma: no cover
-                print('  eids = %s' % eids)
-            for eidi in eids:
-                if eidi in eids_used:
-                    continue
-                eids_used.add(eidi)
-                try:
-                    elem = model.elements[eidi]
-                except KeyError:
-                    elem = model.rigid_elements[eidi - rigid_offset]
-                if debug:  # pragma: no cover
-                    print(print_card_16(elem.repr_fields()))
-                    print('adding eidi=%s' % eidi)
-                body_eids[ibody].add(eidi)
-                nidsi = eid_to_nid_map[eidi]
-                for nidi in nidsi:
-                    if nidi not in nids_used:
-                        nids_to_check.add(nidi)
-                        if debug:  # pragma: no cover
-                            print('  adding nid=%s' % nidi)
-                del nidsi # , elem
-            if debug:  # pragma: no cover
-                print('next eid\n')
-                print('---------------------------')
-            del nid, eids
-
-        if len(body_eids[ibody]) == 0:
-            return body_eids
-            # unused node
-            #try:
-                #nid = nids_to_check.pop()
-            #except KeyError:
-                #break
-            #continue
-            #msg = 'cannot find a new body...nbodies=%s\nelements:' % ibody
-            #for nid, eids in sorted(iteritems(nid_to_eid_map)):
-                #msg += '  nid=%r eids=%s\n' % (nid, eids)
-                #for eid in eids:
-                    #try:
-                        #elem = model.elements[eid]
-                    #except KeyError:
-                        #elem = model.rigid_elements[eid - rigid_offset]
-                    #msg += print_card_16(elem.repr_fields())
-
-                    #msg += 'eid=%s used=%s\n\n' % (eid, eid in eids_used)
-                #msg += '----------------\n'
-            #msg += ''
-            #raise RuntimeError(msg + model.get_bdf_stats())
-        ibody += 1
-        if ibody > nbodies_max:
-            raise RuntimeError('Too many bodies...\n' + model.get_bdf_stats())
-        body_eids[ibody] = set([])
-        #print('--------------------------------------')
-    if len(body_eids[ibody]) == 0:
-        del body_eids[ibody]
-
-    body_eids2 = {}
-    for ibody, body in sorted(iteritems(body_eids)):
-        abody = np.unique(np.array(list(body), dtype='int64'))
-        ielem = np.where(abody <= rigid_offset)
-        irigid = np.where(abody > rigid_offset)
-        #ielem = np.asarray(ielem, dtype='int32')
-        #ielem = np.asarray(ielem, dtype='int32')
-        body_eids2[ibody] = [
-            np.asarray(abody[ielem], dtype='int32'),
-            np.asarray(abody[irigid], dtype='int32')
-        ]
-    #print('body_eids = %s' % body_eids2)
-    nbodies = len(body_eids2)
-    if nbodies > 1:
-        print('nbodies = %i' % nbodies)
-    return body_eids2
+def _get_node_body_labels(model, mpc_id=0, consider_rbe3=True):
+    """
+    Builds the node-node graph and finds the connected components
+
+    Each element/rigid element/MPC connects its first node to the rest
+    of its nodes, which has the same components as connecting all of the
+    nodes.
+
+    Returns
+    -------
+    nbodies : int
+        the number of bodies
+    node_ids : (nnodes, ) int ndarray
+        the sorted GRID/SPOINT/EPOINT ids
+    labels : (nnodes, ) int ndarray
+        the body of each node; -1 for a free node
+    element_groups : List[(eids, inodes)]
+        the elements/rigid elements and their first node index
 
+    """
+    connectivity = model.connectivity
+    node_ids = connectivity.node_ids
+    nnodes = len(node_ids)
+
+    # the first node of each element is connected to the other nodes
+    irows = []
+    icols = []
+    element_eids = []
+    element_inodes = []
+    for etype in connectivity.element_types:
+        eids = connectivity.type_to_element_ids[etype]
+        inodes = connectivity.get_node_indices(connectivity.type_to_node_ids[etype])
+        _add_star_edges(eids, inodes, irows, icols, element_eids, element_inodes)
+
+    eids = []
+    rigid_nids = []
+    for eid, elem in sorted(iteritems(model.rigid_elements)):
+        if elem.type == 'RBE3' and not consider_rbe3:
+            continue
+        eids.append(eid)
+        rigid_nids.append(elem.independent_nodes + elem.dependent_nodes)
+
+    rigid_eids = []
+    rigid_inodes = []
+    if eids:
+        inodes = connectivity.get_node_indices(_get_padded_node_ids(rigid_nids))
+        _add_star_edges(np.array(eids, dtype='int64'), inodes,
+                        irows, icols, rigid_eids, rigid_inodes)
+
+    mpc_nids = [mpc.node_ids for mpc in _get_mpcs(model, mpc_id)]
+    if mpc_nids:
+        inodes = connectivity.get_node_indices(_get_padded_node_ids(mpc_nids))
+        _add_star_edges(np.arange(len(mpc_nids)), inodes, irows, icols, [], [])
+
+    if nnodes == 0 or not irows:
+        return 0, node_ids, np.full(nnodes, -1, dtype='int64'), []
+
+    irows = np.hstack(irows)
+    icols = np.hstack(icols)
+    data = np.ones(len(irows), dtype='int8')
+    graph = scipy.sparse.coo_matrix((data, (irows, icols)), shape=(nnodes, nnodes)).tocsr()
+    unused_ncomponents, components = connected_components(graph, directed=False)
+
+    # the free nodes are their own component, so they're removed
+    is_used = np.zeros(nnodes, dtype='bool')
+    is_used[irows] = True
+    is_used[icols] = True
+    used_components = np.unique(components[is_used])
+    labels = np.full(nnodes, -1, dtype='int64')
+    labels[is_used] = np.searchsorted(used_components, components[is_used])
+    nbodies = len(used_components)
+
+    element_groups = []
+    for eids, inodes in [(element_eids, element_inodes), (rigid_eids, rigid_inodes)]:
+        if eids:
+            element_groups.append((np.hstack(eids), np.hstack(inodes)))
+        else:
+            element_groups.append((np.array([], dtype='int64'), np.array([], dtype='int64')))
+    return nbodies, node_ids, labels, element_groups
+
+
+def _add_star_edges(eids, inodes, irows, icols, all_eids, all_inodes):
+    """
+    Adds the graph edges from the first node of each element to its
+    other nodes
+
+    Parameters
+    ----------
+    eids : (nelements, ) int ndarray
+        the element ids
+    inodes : (nelements, nnodes) int ndarray
+        the node indices; -1 for a missing node
+    irows / icols : List[(n, ) int ndarray]
+        the graph edges, which are appended to
+    all_eids / all_inodes : List[(n, ) int ndarray]
+        the element ids with a node and their first node index, which
+        are appended to
+
+    """
+    is_node = inodes >= 0
+    has_node = is_node.any(axis=1)
+    if not has_node.any():
+        # e.g., a CHBDYE that only references a PLOTEL/boundary id
+        return
+    eids = eids[has_node]
+    inodes = inodes[has_node, :]
+    is_node = is_node[has_node, :]
+    ifirst = inodes[np.arange(inodes.shape[0]), np.argmax(is_node, axis=1)]
+
+    irows.append(np.repeat(ifirst[:, np.newaxis], inodes.shape[1], axis=1)[is_node])
+    icols.append(inodes[is_node])
+    all_eids.append(eids)
+    all_inodes.append(ifirst)
+
+
+def _get_padded_node_ids(nids_list):
+    """gets the node ids as a 0 padded array"""
+    nnodes_max = max(len(nids) for nids in nids_list)
+    nids = np.zeros((len(nids_list), max(nnodes_max, 1)), dtype='int64')
+    for i, nidsi in enumerate(nids_list):
+        nids[i, :len(nidsi)] = [nid if nid is not None else 0 for nid in nidsi]
+    return nids
+
+
+def _get_mpcs(model, mpc_id):
+    """gets the MPCs to consider"""
+    if mpc_id is None:
+        return []
+    if mpc_id == 0:
+        return [mpc for unused_mpc_id, mpcs in sorted(iteritems(model.mpcs))
+                for mpc in mpcs]
+    return model.get_reduced_mpcs(mpc_id, consider_mpcadd=True)
@@ -1,12 +1,14 @@
 """
 defines:
     * nids_close = find_closest_nodes(nodes_xyz, nids, xyz_compare, neq_max, tol)
+    * nids_close = find_closest_nodes(model, None, xyz_compare, neq_max, tol)
     * ieq = find_closest_nodes_index(nodes_xyz, xyz_compare, neq_max, tol)
 """
 from __future__ import print_function
 from itertools import count
 import numpy as np
 
+from pyNastran.bdf.bdf import BDF
 from pyNastran.bdf.mesh_utils.bdf_equivalence import (
     _get_tree)
 
@@ -16,10 +18,12 @@ def find_closest_nodes(nodes_xyz, nids, xyz_compare, neq_max=1, tol=None, msg=''
 
     Parameters
     ----------
-    nodes_xyz : (Nnodes, 3) float ndarray
-        the source points (e.g., xyz_cid0)
-    nids : (Nnodes, ) int ndarray
-        the source node ids (e.g.; nid_cp_cid[:, 0])
+    nodes_xyz : (Nnodes, 3) float ndarray / BDF
+        ndarray : the source points (e.g., xyz_cid0)
+        BDF : the GRIDs of the model, which are searched with the
+              cached node tree of model.spatial_index
+    nids : (Nnodes, ) int ndarray / None
+        the source node ids (e.g.; nid_cp_cid[:, 0]); None for a BDF
     xyz_compare : (Ncompare, 3) float ndarray
         the xyz points to compare to; xyz_to_find
     tol : float; default=None
@@ -40,6 +44,9 @@ def find_closest_nodes(nodes_xyz, nids, xyz_compare, neq_max=1, tol=None, msg=''
         msgi = 'neq_max=%r must be an int; type=%s\n%s' % (
             neq_max, type(neq_max), msg)
         raise TypeError(msgi)
+    if isinstance(nodes_xyz, BDF):
+        return _find_closest_model_nodes(nodes_xyz, xyz_compare, neq_max, tol, msg=msg)
+
     #ieq = find_closest_nodes_index(nodes_xyz, xyz_compare, neq_max, tol)
     if tol is None:
         xyz_max = nodes_xyz.max(axis=0)
@@ -69,6 +76,26 @@ def find_closest_nodes(nodes_xyz, nids, xyz_compare, neq_max=1, tol=None, msg=''
     return nids_out
 
 
+def _find_closest_model_nodes(model, xyz_compare, neq_max, tol, msg=''):
+    """
+    Finds the closest GRIDs of a model with ``model.spatial_index``
+
+    See ``find_closest_nodes``
+    """
+    unused_distances, nids_out = model.spatial_index.get_closest_nodes(
+        xyz_compare, k=neq_max, tol=tol)
+    is_missing = (nids_out == -1)
+    if neq_max > 1:
+        is_missing = is_missing.all(axis=1)
+    if is_missing.any():
+        msgi = 'Cannot find:\n'
+        for i in np.where(is_missing)[0]:
+            msgi += '  xyz=%s\n' % xyz_compare[i, :]
+        msgi += msg
+        raise IndexError(msgi)
+    return nids_out
+
+
 def find_closest_nodes_index(nodes_xyz, xyz_compare, neq_max, tol, msg=''):
     """
     Finds the closest nodes to an arbitrary set of xyz points
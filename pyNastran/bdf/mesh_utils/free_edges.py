@@ -2,10 +2,15 @@
 defines:
     edges = free_edges(model)
     edges = non_paired_edges(model)
+    edges, counts = get_shell_edge_counts(model)
 """
 from __future__ import print_function
-from collections import defaultdict
-from six import iteritems
+import numpy as np
+
+SHELL_ELEMENTS = [
+    'CTRIA3', 'CTRIAX', 'CTRIA6', 'CTRIAX6',
+    'CQUAD4', 'CQUAD', 'CQUAD8', 'CQUADR', 'CQUADX', 'CQUADX8',
+    'CSHEAR']
 
 
 def free_edges(model):
@@ -18,14 +23,14 @@ def free_edges(model):
     model : BDF()
         the BDF model
 
-    """
-    edge_to_eids = _get_edge_to_eids_map(model)
+    Returns
+    -------
+    free_edges : List[(int, int)]
+        the sorted (n1 < n2) edges in sorted order
 
-    free_edges = []
-    for edge, eids in iteritems(edge_to_eids):
-        if len(eids) == 1:
-            free_edges.append(edge)
-    return free_edges
+    """
+    edges, counts = get_shell_edge_counts(model)
+    return [tuple(edge) for edge in edges[counts == 1].tolist()]
 
 def non_paired_edges(model):
     """
@@ -37,25 +42,43 @@ def non_paired_edges(model):
     model : BDF()
         the BDF model
 
+    Returns
+    -------
+    non_paired_edges : List[(int, int)]
+        the sorted (n1 < n2) edges in sorted order
+
+    """
+    edges, counts = get_shell_edge_counts(model)
+    return [tuple(edge) for edge in edges[counts != 2].tolist()]
+
+def get_shell_edge_counts(model):
+    """
+    Gets the unique edges of the shell elements and the number of
+    elements that share each edge
+
+    Parameters
+    ----------
+    model : BDF()
+        the BDF model
+
+    Returns
+    -------
+    edges : (nedges, 2) int ndarray
+        the sorted unique edges (n1 < n2)
+    counts : (nedges, ) int ndarray
+        the number of elements with the edge
+
     """
-    edge_to_eids = _get_edge_to_eids_map(model)
-
-    non_paired_edges = []
-    for edge, eids in iteritems(edge_to_eids):
-        if len(eids) != 2:
-            non_paired_edges.append(edge)
-    return non_paired_edges
-
-def _get_edge_to_eids_map(model):
-    """helper method"""
-    edge_to_eids = defaultdict(set)
-    shell_elements = ['CTRIA3', 'CTRIAX', 'CTRIA6', 'CTRIAX6',
-                      'CQUAD4', 'CQUAD', 'CQUAD8', 'CQUADR', 'CQUADX', 'CQUADX8',
-                      'CSHEAR']
-    for eid, elem in iteritems(model.elements):
-        if elem.type not in shell_elements:
-            continue
-        edges = elem.get_edge_ids()
-        for edge in edges:
-            edge_to_eids[edge].add(eid)
-    return edge_to_eids
+    edges = model.connectivity.get_edges(element_types=SHELL_ELEMENTS)[0]
+
+    # skip the edges with a blank node and the collapsed edges
+    is_valid = (edges[:, 0] > 0) & (edges[:, 0] != edges[:, 1])
+    edges = edges[is_valid, :]
+    if len(edges) == 0:
+        return edges, np.array([], dtype='int64')
+
+    # the edges are counted as a single integer key
+    nkeys = edges[:, 1].max() + 1
+    keys, counts = np.unique(edges[:, 0] * nkeys + edges[:, 1], return_counts=True)
+    edges = np.column_stack([keys // nkeys, keys % nkeys])
+    return edges, counts
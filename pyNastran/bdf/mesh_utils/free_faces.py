@@ -9,13 +9,12 @@ defines:
 from __future__ import print_function
 import sys
 from codecs import open
-from copy import deepcopy
-from collections import defaultdict
 
 from six import iteritems, PY2, string_types
 
 from pyNastran.bdf.field_writer_8 import print_card_8
 from pyNastran.bdf.bdf import read_bdf
+from pyNastran.bdf.mesh_utils.skin_solid_elements import get_solid_skin_faces
 
 def get_element_faces(model, element_ids=None):
     """
@@ -55,67 +54,6 @@ def get_element_faces(model, element_ids=None):
     return eid_faces
 
 
-def get_solid_skin_faces(model):
-    """
-    Gets the elements and faces that are skinned from solid elements
-    This doesn't include internal faces.
-
-    Parameters
-    ----------
-    model : BDF()
-        the BDF object
-
-    Returns
-    -------
-    eid_set : Dict[tuple(int, int, ...)] = List[int]
-       key : sorted face
-       value : list of element ids with that face
-    face_map : Dict[tuple(int, int, ...)] = List[int]
-       key : sorted face
-       value : unsorted face
-
-    """
-    eid_faces = get_element_faces(model)
-    face_set = defaultdict(int)
-    eid_set = defaultdict(list)
-    face_map = {}
-    for eid, face in eid_faces:
-        #print(eid, face)
-        raw_face = deepcopy(face)
-        try:
-            face.sort()
-        except:
-            print('face = %s' % str(face))
-            raise
-        tface = tuple(face)
-        #print(tface)
-        face_set[tface] += 1
-        eid_set[tface].append(eid)
-        face_map[tface] = raw_face
-
-    #print('eid_set:')
-    #for tface, eidset in iteritems(eid_set):
-        #print(tface, eidset)
-
-    #print('face_set:')
-    #for tface, faceset in iteritems(face_set):
-        #print(tface, faceset)
-
-    #print('face_map:')
-    #for tface, facemap in iteritems(face_map):
-        #print(tface, facemap)
-
-    del_faces = []
-    for face, face_count in iteritems(face_set):
-        if face_count == 2:
-            del_faces.append(face)
-
-    for face in del_faces:
-        del face_set[face]
-        del eid_set[face]
-    return eid_set, face_map
-
-
 def write_skin_solid_faces(model, skin_filename,
                            write_solids=False, write_shells=True,
                            size=8, is_double=False, encoding=None,
@@ -2,15 +2,20 @@
 Defines:
   - sum_forces_moments
       find the net force/moment on the model
+  - sum_forces_moments_all
+      find the net force/moment on the model for many load cases
   - sum_forces_moments_elements
       find the net force/moment on the model for a subset of elements
 """
 from __future__ import print_function
+from collections import defaultdict
 from six import iteritems
 import numpy as np
 from numpy import array, cross, allclose, mean
 from numpy.linalg import norm  # type: ignore
+import scipy.sparse
 from pyNastran.utils import integer_types
+from pyNastran.bdf.mesh_utils.spatial_index import _get_node_xyz_cid0
 
 
 def sum_forces_moments(model, p0, loadcase_id, include_grav=False, xyz_cid0=None):
@@ -54,15 +59,7 @@ def sum_forces_moments(model, p0, loadcase_id, include_grav=False, xyz_cid0=None
     if not isinstance(loadcase_id, integer_types):
         raise RuntimeError('loadcase_id must be an integer; loadcase_id=%r' % loadcase_id)
 
-    cid = 0
-    if isinstance(p0, integer_types):
-        if cid == 0:
-            p = model.nodes[p0].get_position()
-        else:
-            p = model.nodes[p0].get_position_wrt(model, cid)
-    else:
-        p = array(p0)
-
+    p = _get_reference_point(model, p0)
     loads, scale_factors, unused_is_grav = model.get_reduced_loads(
         loadcase_id, skip_scale_factor0=True)
 
@@ -186,6 +183,103 @@ def sum_forces_moments(model, p0, loadcase_id, include_grav=False, xyz_cid0=None
         model.log.debug('case=%s loadtype=%r not supported' % (loadcase_id, load_type))
     return (F, M)
 
+def sum_forces_moments_all(model, p0, loadcase_ids=None, include_grav=False, xyz_cid0=None):
+    """
+    Sums applied forces & moments about a reference point p0 for many
+    load cases at once.
+
+    The load cards are flattened into arrays of force/moment resultants
+    once using the precomputed node locations, face areas, normals,
+    centroids and coordinate transforms.  The LOAD combinations are
+    reduced to a sparse (nloadcases, nload_sets) scale factor matrix,
+    so the resultants of all the load cases come from one matrix
+    product.  Considers the same cards as ``sum_forces_moments``.
+
+    Parameters
+    ----------
+    model : BDF()
+        a BDF object
+    p0 : NUMPY.NDARRAY shape=(3,) or integer (node ID)
+        the reference point
+    loadcase_ids : List[int]; default=None -> all the LOAD/load ids
+        the LOAD=IDs to analyze
+    include_grav : bool; default=False
+        includes gravity in the summation
+    xyz_cid0 : None / Dict[int] = (3, ) ndarray
+        the nodes in the global coordinate system
+
+    Returns
+    -------
+    loadcase_ids : (nloadcases, ) int ndarray
+        the LOAD=IDs
+    forces : (nloadcases, 3) float ndarray
+        the forces
+    moments : (nloadcases, 3) float ndarray
+        the moments
+
+    .. note:: The moment of a PLOAD1 depends on the loads that come
+              before it, so load cases with a PLOAD1 are summed with
+              ``sum_forces_moments``.
+
+    """
+    if loadcase_ids is None:
+        loadcase_ids = sorted(set(model.load_combinations) | set(model.loads))
+    loadcase_ids = np.asarray(loadcase_ids, dtype='int32').reshape(-1)
+    p = _get_reference_point(model, p0)
+
+    # the (load case, load set) scale factors
+    load_sets = {}
+    pload1_load_ids = set([])
+    rows = []
+    cols = []
+    scales = []
+    icases_pload1 = []
+    for icase, loadcase_id in enumerate(loadcase_ids.tolist()):
+        load_set_scales = []
+        _reduce_load_sets(model, loadcase_id, 1., load_set_scales, [])
+        is_pload1 = False
+        for load_id, scale in load_set_scales:
+            if load_id not in load_sets:
+                load_sets[load_id] = len(load_sets)
+                if any(load.type == 'PLOAD1' for load in model.Load(load_id)):
+                    pload1_load_ids.add(load_id)
+            rows.append(icase)
+            cols.append(load_sets[load_id])
+            scales.append(scale)
+            is_pload1 = is_pload1 or load_id in pload1_load_ids
+        if is_pload1:
+            icases_pload1.append(icase)
+
+    # the cards of each load set
+    cards = []
+    icards_set = []
+    for load_id, iset in sorted(iteritems(load_sets), key=lambda item: item[1]):
+        if load_id in pload1_load_ids:
+            continue
+        load_set = [load for load in model.Load(load_id) if load.type != 'LOAD']
+        cards += load_set
+        icards_set += [iset] * len(load_set)
+    nsets = len(load_sets)
+    ncards = len(cards)
+
+    card_forces_moments = _get_card_forces_moments(model, cards, p, include_grav, xyz_cid0)
+    card_matrix = scipy.sparse.coo_matrix(
+        (np.ones(ncards, dtype='float64'),
+         (np.array(icards_set, dtype='int32'), np.arange(ncards, dtype='int32'))),
+        shape=(nsets, ncards)).tocsr()
+    scale_matrix = scipy.sparse.coo_matrix(
+        (np.array(scales, dtype='float64'),
+         (np.array(rows, dtype='int32'), np.array(cols, dtype='int32'))),
+        shape=(len(loadcase_ids), nsets)).tocsr()
+    forces_moments = scale_matrix.dot(card_matrix.dot(card_forces_moments))
+
+    for icase in icases_pload1:
+        forces, moments = sum_forces_moments(
+            model, p0, int(loadcase_ids[icase]), include_grav=include_grav, xyz_cid0=xyz_cid0)
+        forces_moments[icase, :3] = forces
+        forces_moments[icase, 3:] = moments
+    return loadcase_ids, forces_moments[:, :3], forces_moments[:, 3:]
+
 def _elementi_pload1(model, loadcase_id, load, scale, xyz, F, M, p):
     """helper method for ``sum_forces_moments``"""
     elem = load.eid_ref
@@ -949,3 +1043,253 @@ def _get_area_normal(axb, nodes, xyz):
         msg += 'nunit = %s\n' % nunit
         raise FloatingPointError(msg)
     return area, normal
+
+def _get_reference_point(model, p0):
+    """gets the reference point from a node id or a location"""
+    if isinstance(p0, integer_types):
+        return model.nodes[p0].get_position()
+    return array(p0)
+
+def _reduce_load_sets(model, load_id, scale, load_set_scales, unallowed_load_ids):
+    """
+    Reduces a load case to the scale factors of its load sets in the
+    same way as ``get_reduced_loads``.  A load set is the non-LOAD
+    cards of ``model.Load(load_id)``.
+    """
+    load_case = model.Load(load_id)
+    is_load_set = False
+    for load in load_case:
+        if load.type != 'LOAD':
+            is_load_set = True
+            continue
+        load_scale = load.scale * scale
+        for load_idi, scalei in zip(load.get_load_ids(), load.scale_factors):
+            # prevents recursion
+            if load_idi in unallowed_load_ids:
+                msg = 'There is a recursion error.  LOAD trace=%s; load_id=%s' % (
+                    unallowed_load_ids, load_idi)
+                raise RuntimeError(msg)
+            _reduce_load_sets(model, load_idi, load_scale * scalei, load_set_scales,
+                              unallowed_load_ids + [load_idi])
+    if is_load_set:
+        load_set_scales.append((load_id, scale))
+
+def _get_card_forces_moments(model, cards, p, include_grav, xyz_cid0):
+    """
+    Gets the force/moment of each load card for a scale factor of 1.0
+
+    Parameters
+    ----------
+    model : BDF()
+        a BDF object
+    cards : List[load]
+        the FORCE, MOMENT, PLOAD, PLOAD2, PLOAD4, GRAV, etc. cards
+    p : (3, ) float ndarray
+        the reference point
+    include_grav : bool
+        includes gravity in the summation
+    xyz_cid0 : None / Dict[int] = (3, ) ndarray
+        the nodes in the global coordinate system
+
+    Returns
+    -------
+    forces_moments : (ncards, 6) float ndarray
+        the forces and moments about p
+    """
+    ncards = len(cards)
+    forces_moments = np.zeros((ncards, 6), dtype='float64')
+    if ncards == 0:
+        return forces_moments
+    nids, xyz = _get_node_locations(model, xyz_cid0)
+
+    icards_by_type = defaultdict(list)
+    for icard, card in enumerate(cards):
+        icards_by_type[card.type].append(icard)
+
+    # the faces for PLOAD, PLOAD2 and PLOAD4
+    face = ([], [], [], [])  # icards, node ids, pressures, normals
+    unsupported_types = set([])
+    for load_type, icards in sorted(iteritems(icards_by_type)):
+        loads = [cards[icard] for icard in icards]
+        icards = np.array(icards, dtype='int32')
+        if load_type in ['FORCE', 'FORCE1', 'FORCE2']:
+            forces = _get_load_vectors(loads, load_type == 'FORCE')
+            inodes = _get_node_indices(nids, [load.node_id for load in loads])
+            forces_moments[icards, :3] = forces
+            forces_moments[icards, 3:] = cross(xyz[inodes, :] - p, forces)
+        elif load_type in ['MOMENT', 'MOMENT1', 'MOMENT2']:
+            forces_moments[icards, 3:] = _get_load_vectors(loads, load_type == 'MOMENT')
+        elif load_type == 'PLOAD':
+            for icard, load in zip(icards, loads):
+                nodes = load.node_ids
+                if len(nodes) not in [3, 4]:
+                    msg = 'invalid number of nodes on PLOAD card; nodes=%s' % str(nodes)
+                    raise RuntimeError(msg)
+                _add_face(face, icard, nodes, load.pressure)
+        elif load_type == 'PLOAD2':
+            for icard, load in zip(icards, loads):
+                for eid in load.element_ids:
+                    elem = model.elements[eid]
+                    if elem.type in ['CTRIA3', 'CTRIAR']:
+                        _add_face(face, icard, elem.node_ids[:3], load.pressure)
+                    elif elem.type in ['CQUAD4', 'CSHEAR', 'CQUADR']:
+                        _add_face(face, icard, elem.node_ids[:4], load.pressure)
+                    else:
+                        model.log.warning('case=%s etype=%r loadtype=%r not supported' % (
+                            load.sid, elem.type, load.type))
+        elif load_type == 'PLOAD4':
+            xyz_dict = None
+            for icard, load in zip(icards, loads):
+                if _add_pload4_faces(face, icard, load):
+                    continue
+
+                # solid faces and the cards that sum_forces_moments rejects
+                if xyz_dict is None:
+                    xyz_dict = dict(zip(nids.tolist(), xyz))
+                F = np.zeros(3, dtype='float64')
+                M = np.zeros(3, dtype='float64')
+                _elementi_pload4(model, load.sid, load, 1., xyz_dict, F, M, p)
+                forces_moments[icard, :3] = F
+                forces_moments[icard, 3:] = M
+        elif load_type == 'GRAV':
+            if include_grav:
+                mass, mass_moment = _get_mass_moment(model, p)
+                gravity = np.array([load.GravityVector() for load in loads], dtype='float64')
+                forces_moments[icards, :3] = mass * gravity
+                forces_moments[icards, 3:] = cross(mass_moment, gravity)
+        else:
+            # we collect them so we only get one print
+            unsupported_types.add(load_type)
+
+    _add_face_forces_moments(forces_moments, face, nids, xyz, p)
+    for load_type in sorted(unsupported_types):
+        model.log.debug('loadtype=%r not supported' % load_type)
+    return forces_moments
+
+def _get_node_locations(model, xyz_cid0):
+    """gets the sorted node ids and their locations in the global frame"""
+    if xyz_cid0 is None:
+        return _get_node_xyz_cid0(model)
+    nids = np.array(sorted(xyz_cid0), dtype='int32')
+    xyz = np.array([xyz_cid0[nid] for nid in nids.tolist()], dtype='float64')
+    return nids, xyz.reshape(len(nids), 3)
+
+def _get_node_indices(nids, node_ids):
+    """gets the indices of the node ids in the sorted nids"""
+    node_ids = np.asarray(node_ids, dtype='int32')
+    inodes = np.searchsorted(nids, node_ids)
+    is_found = inodes < len(nids)
+    is_found[is_found] = nids[inodes[is_found]] == node_ids[is_found]
+    if not is_found.all():
+        raise KeyError('nids=%s are not GRIDs' % np.unique(node_ids[~is_found]).tolist())
+    return inodes
+
+def _get_load_vectors(loads, is_local):
+    """gets the FORCE/MOMENT vectors in the global frame"""
+    mags = np.array([load.mag for load in loads], dtype='float64')
+    vectors = np.array([load.xyz for load in loads], dtype='float64')
+    if is_local:
+        cids = np.array([load.Cid() for load in loads], dtype='int32')
+        for cid in np.unique(cids).tolist():
+            if cid == 0:
+                continue
+            i = np.where(cids == cid)[0]
+            coord = loads[i[0]].cid_ref
+            vectors[i, :] = coord.transform_vector_to_global_array(vectors[i, :])
+    return mags[:, np.newaxis] * vectors
+
+def _add_face(face, icard, nodes, pressure, normal=None):
+    """adds a pressure face for ``_add_face_forces_moments``"""
+    icards, face_nodes, pressures, normals = face
+    icards.append(icard)
+    face_nodes.append(nodes)
+    pressures.append(pressure)
+    normals.append((np.nan, np.nan, np.nan) if normal is None else normal)
+
+def _add_pload4_faces(face, icard, load):
+    """
+    Adds the faces of a PLOAD4 on shells with the same checks as
+    ``_elementi_pload4``
+
+    Returns
+    -------
+    is_added : bool
+        the faces were added; otherwise, ``_elementi_pload4`` is used
+    """
+    if load.Cid() != 0 or load.line_load_dir != 'NORM' or load.surf_or_line != 'SURF':
+        return False
+    nfaces = []
+    for elem in load.eids_ref:
+        if elem.type in ['CTRIA3', 'CTRIA6', 'CTRIAR']:
+            nfaces.append(3)
+        elif elem.type in ['CQUAD4', 'CQUAD8', 'CQUAD', 'CQUADR', 'CSHEAR']:
+            nfaces.append(4)
+        else:
+            return False
+
+    normal = None
+    if norm(load.nvector) != 0.0:
+        normal = load.nvector / np.linalg.norm(load.nvector)
+    for elem, nface in zip(load.eids_ref, nfaces):
+        pressures = load.pressures[:nface]
+        if min(pressures) != max(pressures):
+            pressure = mean(pressures)
+        else:
+            pressure = load.pressures[0]
+        _add_face(face, icard, elem.node_ids[:nface], pressure, normal)
+    return True
+
+def _add_face_forces_moments(forces_moments, face, nids, xyz, p):
+    """sums the pressure forces/moments on the tri/quad faces by card"""
+    icards, face_nodes, pressures, normals = face
+    if not icards:
+        return
+    icards = np.array(icards, dtype='int32')
+    pressures = np.array(pressures, dtype='float64')
+    normals = np.array(normals, dtype='float64')
+    nnodes = np.array([len(nodes) for nodes in face_nodes], dtype='int32')
+
+    ncards = forces_moments.shape[0]
+    for nnode in [3, 4]:
+        i = np.where(nnodes == nnode)[0]
+        if len(i) == 0:
+            continue
+        inodes = _get_node_indices(nids, [face_nodes[j] for j in i.tolist()])
+        area, normal, centroid = _get_area_normal_centroid(xyz, inodes)
+        is_normal = ~np.isnan(normals[i, 0])
+        normal[is_normal, :] = normals[i[is_normal], :]
+
+        forces = (pressures[i] * area)[:, np.newaxis] * normal
+        moments = cross(centroid - p, forces)
+        for j in range(3):
+            forces_moments[:, j] += np.bincount(icards[i], weights=forces[:, j],
+                                                minlength=ncards)
+            forces_moments[:, j + 3] += np.bincount(icards[i], weights=moments[:, j],
+                                                    minlength=ncards)
+
+def _get_area_normal_centroid(xyz, inodes):
+    """gets the area, normal and centroid of (n, 3) tri/(n, 4) quad faces"""
+    n1 = xyz[inodes[:, 0], :]
+    n2 = xyz[inodes[:, 1], :]
+    n3 = xyz[inodes[:, 2], :]
+    if inodes.shape[1] == 3:
+        axb = cross(n1 - n2, n1 - n3)
+        centroid = (n1 + n2 + n3) / 3.
+    else:
+        n4 = xyz[inodes[:, 3], :]
+        axb = cross(n1 - n3, n2 - n4)
+        centroid = (n1 + n2 + n3 + n4) / 4.
+    nunit = norm(axb, axis=1)
+    area = 0.5 * nunit
+    normal = axb / nunit[:, np.newaxis]
+    return area, normal, centroid
+
+def _get_mass_moment(model, p):
+    """gets the mass and the first moment of mass about p of the elements"""
+    mass = 0.
+    mass_moment = np.zeros(3, dtype='float64')
+    for unused_eid, elem in iteritems(model.elements):
+        massi = elem.Mass()
+        mass += massi
+        mass_moment += massi * (elem.Centroid() - p)
+    return mass, mass_moment
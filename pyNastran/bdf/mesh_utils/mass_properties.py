@@ -4,6 +4,10 @@
 Defines:
   - mass_poperties
       get the mass & moment of inertia of the model
+  - mass_properties_vectorized
+      get the mass & moment of inertia of the model using arrays
+  - mass_properties_breakdown
+      get the mass & moment of inertia of each property, material or group
 """
 from __future__ import print_function, unicode_literals
 from collections import defaultdict
@@ -13,6 +17,7 @@ from numpy.linalg import norm  # type: ignore
 import numpy as np
 from pyNastran.utils import integer_types
 from pyNastran.utils.mathematics import integrate_positive_unit_line
+from pyNastran.bdf.mesh_utils.spatial_index import _get_node_xyz_cid0
 
 NO_MASS = set([
     'GRID', 'PARAM', 'FORCE', 'FORCE1', 'FORCE2', 'MOMENT1', 'MOMENT2', 'LOAD',
@@ -373,6 +378,561 @@ def _increment_inertia(centroid, reference_point, m, mass, cg, I):
     cg += m * centroid
     return mass
 
+def mass_properties_vectorized(model, element_ids=None, mass_ids=None,
+                               reference_point=None,
+                               sym_axis=None, scale=None, inertia_reference='cg'):
+    """
+    Calculates mass properties in the global system about the
+    reference point.  The common elements are calculated as arrays
+    for each element type.
+
+    Parameters
+    ----------
+    model : BDF()
+        a BDF object
+    element_ids : List[int]; ndarray
+        the element ids to consider
+    mass_ids : List[int]; ndarray
+        the mass ids to consider
+    reference_point : (3, ) ndarray; default = <0,0,0>.
+        an array that defines the origin of the frame.
+    inertia_reference : str; default='cg'
+        'cg' : inertia is taken about the cg
+        'ref' : inertia is about the reference point
+
+    Returns
+    -------
+    mass : float
+        the mass of the model
+    cg : (3, ) float NDARRAY
+        the cg of the model as an array.
+    I : (6, ) float NDARRAY
+        moment of inertia array([Ixx, Iyy, Izz, Ixy, Ixz, Iyz])
+
+    .. seealso:: mass_properties
+
+    """
+    reference_point, is_cg = _update_reference_point(
+        model, reference_point, inertia_reference)
+    unused_eids, masses, centroids, unused_pids, unused_mids = get_mass_centroids(
+        model, element_ids=element_ids, mass_ids=mass_ids)
+    igroup = np.zeros(len(masses), dtype='int32')
+    mass, cg, I = _reduce_mass_properties(
+        model, masses, centroids, igroup, 1,
+        reference_point, is_cg, sym_axis, scale)
+    return mass[0], cg[0, :], I[:, 0]
+
+def mass_properties_breakdown(model, group_by='property', element_ids=None, mass_ids=None,
+                              reference_point=None,
+                              sym_axis=None, scale=None, inertia_reference='cg'):
+    """
+    Calculates the mass properties of each property, material or group
+    of elements in one pass.
+
+    Parameters
+    ----------
+    model : BDF()
+        a BDF object
+    group_by : str/dict; default='property'
+        'property' : sum by property id
+        'material' : sum by material id
+        Dict[key] = ids : sum the element/mass ids of each group;
+            an id may be in multiple groups
+    element_ids : List[int]; ndarray
+        the element ids to consider
+    mass_ids : List[int]; ndarray
+        the mass ids to consider
+    reference_point : (3, ) ndarray; default = <0,0,0>.
+        an array that defines the origin of the frame.
+    inertia_reference : str; default='cg'
+        'cg' : inertia is taken about the cg of each group
+        'ref' : inertia is about the reference point
+
+    Returns
+    -------
+    mass_properties : Dict[key] = (mass, cg, I)
+        the mass, cg and moment of inertia of each group
+        (see ``mass_properties``).  The property/material id of the
+        masses (e.g., CONM2) and the property id of the CONRODs is 0.
+        A composite property uses the material of the first ply.
+
+    Examples
+    --------
+    >>> pid_mass_properties = mass_properties_breakdown(model, 'property')
+    >>> mass, cg, I = pid_mass_properties[pid]
+
+    >>> groups = {'wing' : wing_eids, 'fuselage' : fuselage_eids}
+    >>> group_mass_properties = mass_properties_breakdown(model, groups)
+
+    """
+    reference_point, is_cg = _update_reference_point(
+        model, reference_point, inertia_reference)
+    eids, masses, centroids, pids, mids = get_mass_centroids(
+        model, element_ids=element_ids, mass_ids=mass_ids)
+
+    if isinstance(group_by, dict):
+        keys = list(group_by.keys())
+        ielements = []
+        igroups = []
+        for igroup, key in enumerate(keys):
+            ielement = np.where(np.in1d(eids, np.asarray(group_by[key], dtype=eids.dtype)))[0]
+            ielements.append(ielement)
+            igroups.append(np.full(len(ielement), igroup, dtype='int32'))
+        ielements = np.hstack(ielements) if ielements else np.array([], dtype='int32')
+        igroup = np.hstack(igroups) if igroups else np.array([], dtype='int32')
+        masses = masses[ielements]
+        centroids = centroids[ielements, :]
+    elif group_by in ['property', 'material']:
+        group_ids = pids if group_by == 'property' else mids
+        keys, igroup = np.unique(group_ids, return_inverse=True)
+        keys = keys.tolist()
+    else:
+        msg = "group_by=%r and must be 'property', 'material' or a dict" % group_by
+        raise ValueError(msg)
+
+    mass, cg, I = _reduce_mass_properties(
+        model, masses, centroids, igroup, len(keys),
+        reference_point, is_cg, sym_axis, scale)
+    return {key: (mass[i], cg[i, :], I[:, i]) for i, key in enumerate(keys)}
+
+def _reduce_mass_properties(model, masses, centroids, igroup, ngroups,
+                            reference_point, is_cg, sym_axis, scale):
+    """
+    Sums the mass, cg and inertia of each group
+
+    Returns
+    -------
+    mass : (ngroups, ) float ndarray
+        the mass of each group
+    cg : (ngroups, 3) float ndarray
+        the cg of each group
+    I : (6, ngroups) float ndarray
+        the moment of inertia of each group [Ixx, Iyy, Izz, Ixy, Ixz, Iyz]
+    """
+    mass = _sum_by_group(igroup, masses, ngroups)
+    cg = np.zeros((ngroups, 3), dtype='float64')
+    for i in range(3):
+        cg[:, i] = _sum_by_group(igroup, masses * centroids[:, i], ngroups)
+
+    x, y, z = (centroids - reference_point).T
+    x2 = x * x
+    y2 = y * y
+    z2 = z * z
+    I = np.zeros((6, ngroups), dtype='float64')
+    for i, inertia in enumerate([y2 + z2, x2 + z2, x2 + y2, x * y, x * z, y * z]):
+        I[i, :] = _sum_by_group(igroup, masses * inertia, ngroups)
+
+    is_mass = mass != 0.
+    cg[is_mass, :] /= mass[is_mass, np.newaxis]
+
+    # only transform if we're calculating the inertia about the cg
+    if is_cg:
+        I = transform_inertia(mass, cg.T, reference_point, cg.T, I)
+
+    # the columns of cg.T are updated in place
+    mass, unused_cg, I = _apply_mass_symmetry(model, sym_axis, scale, mass, cg.T, I)
+    return mass, cg, I
+
+def _sum_by_group(igroup, values, ngroups):
+    """sums the values of each group"""
+    return np.bincount(igroup, weights=values, minlength=ngroups).astype('float64')
+
+def get_mass_centroids(model, element_ids=None, mass_ids=None):
+    """
+    Gets the mass and center of mass of the elements and masses.
+
+    The CTRIA3, CTRIAR, CQUAD4, CQUADR, CTETRA, CPENTA, CHEXA, CPYRAM,
+    CROD, CONROD, CTUBE and CBAR elements are calculated as arrays for
+    each element type from the node locations and a table of the
+    property/material values.  The other elements (and elements with
+    a property that isn't supported such as a PLPLANE) use
+    ``Mass()`` and ``center_of_mass()``.
+
+    Parameters
+    ----------
+    model : BDF()
+        a cross-referenced BDF object
+    element_ids : List[int]; ndarray
+        the element ids to consider
+    mass_ids : List[int]; ndarray
+        the mass ids to consider
+
+    Returns
+    -------
+    eids : (n, ) int ndarray
+        the element/mass ids
+    masses : (n, ) float ndarray
+        the mass of each element
+    centroids : (n, 3) float ndarray
+        the center of mass of each element
+    pids : (n, ) int ndarray
+        the property id of each element (0 for no property)
+    mids : (n, ) int ndarray
+        the material id of each element (0 for no material)
+
+    """
+    unused_element_ids, elements, unused_mass_ids, masses = _mass_properties_elements_init(
+        model, element_ids, mass_ids)
+
+    elements_by_type = defaultdict(list)
+    for element in elements:
+        elements_by_type[element.__class__.__name__].append(element)
+
+    nids, xyz_cid0 = _get_node_xyz_cid0(model)
+    eids = []
+    mass = []
+    centroid = []
+    pids = []
+    mids = []
+    scalar_elements = []
+    for class_name, elems in sorted(iteritems(elements_by_type)):
+        if class_name not in VECTORIZED_MASS_ELEMENTS:
+            scalar_elements.extend(elems)
+            continue
+        func, nnodes = VECTORIZED_MASS_ELEMENTS[class_name]
+        inids, is_valid = _get_element_node_indices(elems, nids, nnodes)
+        prop_func = _get_property_table if class_name != 'CONROD' else _get_conrod_table
+        pidsi, midsi, table, is_valid_prop = prop_func(elems, _PROPERTY_FUNCS[class_name])
+        is_valid &= is_valid_prop
+        for ielem in np.where(~is_valid)[0]:
+            scalar_elements.append(elems[ielem])
+
+        ivalid = np.where(is_valid)[0]
+        if len(ivalid) == 0:
+            continue
+        elems = [elems[ielem] for ielem in ivalid]
+        xyz = xyz_cid0[inids[ivalid, :], :]
+        massi, centroidi, is_validi = func(elems, xyz, table[ivalid, :])
+        eids.append(np.array([elem.eid for elem in elems], dtype='int32')[is_validi])
+        mass.append(massi[is_validi])
+        centroid.append(centroidi[is_validi, :])
+        pids.append(pidsi[ivalid][is_validi])
+        mids.append(midsi[ivalid][is_validi])
+        for ielem in np.where(~is_validi)[0]:
+            scalar_elements.append(elems[ielem])
+
+    out = _get_mass_centroids_scalar(model, scalar_elements, masses)
+    for datai, arrays in zip(out, [eids, mass, centroid, pids, mids]):
+        arrays.append(datai)
+    eids = np.hstack(eids)
+    mass = np.hstack(mass)
+    centroid = np.vstack(centroid)
+    pids = np.hstack(pids)
+    mids = np.hstack(mids)
+    return eids, mass, centroid, pids, mids
+
+def _get_mass_centroids_scalar(model, elements, masses):
+    """gets the mass and centroid of the elements with ``Mass()``"""
+    eids = []
+    mass = []
+    centroids = []
+    pids = []
+    mids = []
+    no_mass = NO_MASS
+    for pack in [elements, masses]:
+        for element in pack:
+            try:
+                p = element.center_of_mass()  # was Centroid()
+            except AttributeError:
+                if element.type in no_mass:
+                    continue
+                model.log.error(element.rstrip())
+                raise
+
+            try:
+                m = element.Mass()
+            except:
+                # PLPLANE
+                if element.pid_ref.type == 'PSHELL':
+                    model.log.warning('p=%s' % p)
+                    raise
+                model.log.warning("could not get the inertia for element/property\n%s%s" % (
+                    element, element.pid_ref))
+                continue
+            eids.append(element.eid)
+            mass.append(m)
+            centroids.append(p)
+            pid_ref = getattr(element, 'pid_ref', None)
+            if pid_ref is None:
+                pids.append(0)
+                mids.append(_get_material_id(element))
+            else:
+                pids.append(pid_ref.pid)
+                mids.append(_get_material_id(pid_ref))
+
+    eids = np.array(eids, dtype='int32')
+    mass = np.array(mass, dtype='float64')
+    centroids = np.array(centroids, dtype='float64').reshape(len(eids), 3)
+    pids = np.array(pids, dtype='int32')
+    mids = np.array(mids, dtype='int32')
+    return eids, mass, centroids, pids, mids
+
+def _get_material_id(card):
+    """gets the material id of an element/property; 0 for no material"""
+    try:
+        mid = card.Mid()
+    except TypeError:
+        # PCOMP, PCOMPG
+        mid = card.Mid(0)
+    except (AttributeError, RuntimeError):
+        return 0
+    return mid if isinstance(mid, integer_types) else 0
+
+def _get_element_node_indices(elems, nids, nnodes):
+    """
+    Gets the indices of the first nnodes nodes of the elements into the
+    sorted node ids.  Elements with a blank node or a node that isn't a
+    GRID are invalid.
+    """
+    node_ids = [elem.node_ids[:nnodes] for elem in elems]
+    try:
+        element_nids = np.array(node_ids, dtype='int32')
+    except (TypeError, ValueError):
+        element_nids = np.array([[nid if nid is not None else 0 for nid in nidsi]
+                                 for nidsi in node_ids], dtype='int32')
+    element_nids = element_nids.reshape(len(elems), nnodes)
+    inids = np.searchsorted(nids, element_nids)
+    inids[inids == len(nids)] = 0
+    is_valid = (nids[inids] == element_nids).all(axis=1) if len(nids) else (
+        np.zeros(len(elems), dtype='bool'))
+    return inids, is_valid
+
+def _get_property_table(elems, prop_func):
+    """
+    Gets the property values of the elements, which are found once per
+    property
+
+    Parameters
+    ----------
+    elems : List[Element]
+        the elements
+    prop_func : function
+        prop_func(prop) returns a tuple of floats; an exception indicates
+        that the property isn't supported
+
+    Returns
+    -------
+    pids : (nelements, ) int ndarray
+        the property ids
+    mids : (nelements, ) int ndarray
+        the material ids
+    table : (nelements, nvalues) float ndarray
+        the values of the property of each element
+    is_valid : (nelements, ) bool ndarray
+        is the property supported
+    """
+    pid_refs = [elem.pid_ref for elem in elems]
+    pids = np.array([prop.pid for prop in pid_refs], dtype='int32')
+    upids, ipid = np.unique(pids, return_inverse=True)
+    props = dict(zip(pids.tolist(), pid_refs))
+    rows = []
+    umids = []
+    is_valid_pid = []
+    for pid in upids.tolist():
+        prop = props[pid]
+        try:
+            row = prop_func(prop)
+            is_valid = all(isinstance(value, float) for value in row)
+        except Exception:
+            row = None
+            is_valid = False
+        rows.append(row)
+        is_valid_pid.append(is_valid)
+        umids.append(_get_material_id(prop))
+    nvalues = max(len(row) for row in rows if row is not None) if any(is_valid_pid) else 1
+    table = np.array([row if is_valid else (np.nan, ) * nvalues
+                      for row, is_valid in zip(rows, is_valid_pid)], dtype='float64')
+    mids = np.array(umids, dtype='int32')[ipid]
+    return pids, mids, table[ipid, :], np.array(is_valid_pid, dtype='bool')[ipid]
+
+def _get_conrod_table(elems, unused_prop_func):
+    """gets the (rho, A, nsm) of the CONRODs"""
+    nelements = len(elems)
+    pids = np.zeros(nelements, dtype='int32')
+    mids = np.zeros(nelements, dtype='int32')
+    table = np.full((nelements, 3), np.nan, dtype='float64')
+    is_valid = np.zeros(nelements, dtype='bool')
+    for ielem, elem in enumerate(elems):
+        mid_ref = elem.mid_ref
+        if mid_ref is None:
+            continue
+        row = (mid_ref.rho, elem.A, elem.nsm)
+        if all(isinstance(value, float) for value in row):
+            mids[ielem] = mid_ref.mid
+            table[ielem, :] = row
+            is_valid[ielem] = True
+    return pids, mids, table, is_valid
+
+def _get_shell_property(prop):
+    """gets the (is_pshell, t, rho, nsm, mass_per_area) of a shell property"""
+    if prop.type == 'PSHELL':
+        return (1., prop.t, prop.mid_ref.Rho(), prop.nsm, 0.)
+    elif prop.type in ['PCOMP', 'PCOMPG']:
+        return (0., 0., 0., 0., prop.MassPerArea())
+    raise NotImplementedError(prop.type)
+
+def _get_shell_mass_centroids(elems, xyz, table):
+    """
+    Gets the mass/centroid of CTRIA3/CTRIAR/CQUAD4/CQUADR elements
+
+    The thickness of a PSHELL is the average of the nodal thicknesses,
+    which are defined by the thickness flag and the T1-T4 fields.
+    """
+    nnodes = xyz.shape[1]
+    n1 = xyz[:, 0, :]
+    n2 = xyz[:, 1, :]
+    n3 = xyz[:, 2, :]
+    if nnodes == 3:
+        centroid = (n1 + n2 + n3) / 3.
+        area = 0.5 * _norm(np.cross(n1 - n2, n1 - n3))
+    else:
+        n4 = xyz[:, 3, :]
+        centroid = (n1 + n2 + n3 + n4) / 4.
+        area = 0.5 * _norm(np.cross(n3 - n1, n4 - n2))
+
+    is_pshell = table[:, 0] == 1.
+    t0 = table[:, 1]
+    tflag = np.array([elem.tflag for elem in elems])
+    tscales = [elem.get_thickness_scale() for elem in elems]
+    is_valid = ~is_pshell | ((tflag == 0) | (tflag == 1))
+
+    # thickness = sum([ti if ti is not None else t0 for ti in tscales]) / nt
+    #   (tflag=0; absolute)
+    # thickness = sum([ti * t0 if ti is not None else t0 for ti in tscales]) / nt
+    #   (tflag=1; relative)
+    tscales = np.array([tscale if tscale is not None else [None] * nnodes
+                        for tscale in tscales], dtype='float64')
+    thickness = np.zeros(len(elems), dtype='float64')
+    for inode in range(nnodes):
+        ti = tscales[:, inode]
+        ti = np.where(np.isnan(ti), t0, np.where(tflag == 0, ti, ti * t0))
+        thickness += ti
+    thickness /= nnodes
+
+    mass_per_area = np.where(is_pshell, table[:, 3] + table[:, 2] * thickness, table[:, 4])
+    mass = mass_per_area * area
+    return mass, centroid, is_valid
+
+def _get_solid_property(prop):
+    """gets the (rho, ) of a solid property"""
+    return (prop.Rho(), )
+
+def _get_ctetra_mass_centroids(unused_elems, xyz, table):
+    """gets the mass/centroid of the primary tetrahedron of a CTETRA"""
+    n1, n2, n3, n4 = [xyz[:, inode, :] for inode in range(4)]
+    volume = -_dot(n1 - n4, np.cross(n2 - n4, n3 - n4)) / 6.
+    centroid = (n1 + n2 + n3 + n4) / 4.
+    mass = table[:, 0] * volume
+    return mass, centroid, np.ones(len(mass), dtype='bool')
+
+def _get_cpenta_mass_centroids(unused_elems, xyz, table):
+    """gets the mass/centroid of a CPENTA using the corner nodes"""
+    n1, n2, n3, n4, n5, n6 = [xyz[:, inode, :] for inode in range(6)]
+    area1 = 0.5 * _norm(np.cross(n3 - n1, n2 - n1))
+    area2 = 0.5 * _norm(np.cross(n6 - n4, n5 - n4))
+    c1 = (n1 + n2 + n3) / 3.
+    c2 = (n4 + n5 + n6) / 3.
+    volume = np.abs((area1 + area2) / 2. * _norm(c1 - c2))
+    centroid = (c1 + c2) / 2.
+    mass = table[:, 0] * volume
+    return mass, centroid, np.ones(len(mass), dtype='bool')
+
+def _get_chexa_mass_centroids(unused_elems, xyz, table):
+    """gets the mass/centroid of a CHEXA using the corner nodes"""
+    n1, n2, n3, n4, n5, n6, n7, n8 = [xyz[:, inode, :] for inode in range(8)]
+    area1 = 0.5 * _norm(np.cross(n3 - n1, n4 - n2))
+    area2 = 0.5 * _norm(np.cross(n7 - n5, n8 - n6))
+    c1 = (n1 + n2 + n3 + n4) / 4.
+    c2 = (n5 + n6 + n7 + n8) / 4.
+    volume = np.abs((area1 + area2) / 2. * _norm(c1 - c2))
+    centroid = (c1 + c2) / 2.
+    mass = table[:, 0] * volume
+    return mass, centroid, np.ones(len(mass), dtype='bool')
+
+def _get_cpyram_mass_centroids(unused_elems, xyz, table):
+    """gets the mass/centroid of a CPYRAM using the corner nodes"""
+    n1, n2, n3, n4, n5 = [xyz[:, inode, :] for inode in range(5)]
+    area1 = 0.5 * _norm(np.cross(n3 - n1, n4 - n2))
+    c1 = (n1 + n2 + n3 + n4) / 4.
+    volume = np.abs(area1 / 3. * _norm(c1 - n5))
+    centroid = (c1 + n5) / 2.
+    mass = table[:, 0] * volume
+    return mass, centroid, np.ones(len(mass), dtype='bool')
+
+def _get_crod_property(prop):
+    """gets the (rho, A, nsm) of a PROD"""
+    return (prop.mid_ref.rho, prop.A, prop.nsm)
+
+def _get_rod_mass_centroids(unused_elems, xyz, table):
+    """gets the mass/centroid of a CROD/CONROD; m = (rho * A + nsm) * L"""
+    n1 = xyz[:, 0, :]
+    n2 = xyz[:, 1, :]
+    length = _norm(n2 - n1)
+    mass = (table[:, 0] * table[:, 1] + table[:, 2]) * length
+    centroid = (n1 + n2) / 2.
+    return mass, centroid, np.ones(len(mass), dtype='bool')
+
+def _get_mass_per_length(prop):
+    """gets the (mass_per_length, ) of a PTUBE/PBAR/PBARL"""
+    return (prop.MassPerLength(), )
+
+def _get_line_mass_centroids(unused_elems, xyz, table):
+    """gets the mass/centroid of a CTUBE/CBAR; m = L * mass_per_length"""
+    n1 = xyz[:, 0, :]
+    n2 = xyz[:, 1, :]
+    length = _norm(n2 - n1)
+    mass = length * table[:, 0]
+    centroid = (n1 + n2) / 2.
+    return mass, centroid, np.ones(len(mass), dtype='bool')
+
+def _norm(vectors):
+    """the norm of each row"""
+    return np.sqrt(_dot(vectors, vectors))
+
+def _dot(vectors1, vectors2):
+    """the dot product of each row"""
+    return (vectors1 * vectors2).sum(axis=1)
+
+#: class name : (the mass/centroid function, the number of nodes that are used)
+VECTORIZED_MASS_ELEMENTS = {
+    'CTRIA3' : (_get_shell_mass_centroids, 3),
+    'CTRIAR' : (_get_shell_mass_centroids, 3),
+    'CQUAD4' : (_get_shell_mass_centroids, 4),
+    'CQUADR' : (_get_shell_mass_centroids, 4),
+    'CTETRA4' : (_get_ctetra_mass_centroids, 4),
+    'CTETRA10' : (_get_ctetra_mass_centroids, 4),
+    'CPENTA6' : (_get_cpenta_mass_centroids, 6),
+    'CPENTA15' : (_get_cpenta_mass_centroids, 6),
+    'CHEXA8' : (_get_chexa_mass_centroids, 8),
+    'CHEXA20' : (_get_chexa_mass_centroids, 8),
+    'CPYRAM5' : (_get_cpyram_mass_centroids, 5),
+    'CPYRAM13' : (_get_cpyram_mass_centroids, 5),
+    'CROD' : (_get_rod_mass_centroids, 2),
+    'CONROD' : (_get_rod_mass_centroids, 2),
+    'CTUBE' : (_get_line_mass_centroids, 2),
+    'CBAR' : (_get_line_mass_centroids, 2),
+}
+
+#: class name : the function that gets the property values
+_PROPERTY_FUNCS = {
+    'CTRIA3' : _get_shell_property,
+    'CTRIAR' : _get_shell_property,
+    'CQUAD4' : _get_shell_property,
+    'CQUADR' : _get_shell_property,
+    'CTETRA4' : _get_solid_property,
+    'CTETRA10' : _get_solid_property,
+    'CPENTA6' : _get_solid_property,
+    'CPENTA15' : _get_solid_property,
+    'CHEXA8' : _get_solid_property,
+    'CHEXA20' : _get_solid_property,
+    'CPYRAM5' : _get_solid_property,
+    'CPYRAM13' : _get_solid_property,
+    'CROD' : _get_crod_property,
+    'CONROD' : None,
+    'CTUBE' : _get_mass_per_length,
+    'CBAR' : _get_mass_per_length,
+}
+
 def mass_properties_nsm(model, element_ids=None, mass_ids=None, nsm_id=None,
                         reference_point=None,
                         sym_axis=None, scale=None, inertia_reference='cg',
@@ -1,14 +1,16 @@
 """
 Defines:
- - pierce_shell_model(bdf_filename, xyz_points, tol=1.0)
+ - pierce_shell_model(bdf_filename, xyz_points)
+ - irays, eids, xyz_pierces, t = pierce_shell_model_by_rays(
+       bdf_filename, origins, directions, tmin=0., tmax=None)
+ - is_hit, t = triangle_intersections(origins, directions, v0, v1, v2)
 """
-from itertools import count
+import warnings
 from typing import List, Optional
 from six import iteritems
-from six.moves import zip
 import numpy as np
 from pyNastran.bdf.bdf import BDF, read_bdf
-from pyNastran.bdf.mesh_utils.bdf_equivalence import _get_tree
+from pyNastran.bdf.mesh_utils.spatial_index import _get_ranges
 
 
 def quad_intersection(orig, direction, v0, v1, v2, v3):
@@ -80,21 +82,198 @@ def triangle_intersection(orig, direction, v0, v1, v2):
     return orig + direction * (e2.dot(qvec) * inv_det)
 
 
-def pierce_shell_model(bdf_filename, xyz_points, tol=1.0):
-    # type: (Union[BDF, str], Any, float) -> List[int], np.ndarray, List[List[int]]
+def triangle_intersections(origins, directions, v0, v1, v2,
+                           tmin=-np.inf, tmax=np.inf, eps=1e-8):
+    # type: (np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, float, float, float) -> Any
+    """
+    Pierces a set of triangles with a set of rays (Moller-Trumbore)
+
+    Parameters
+    ----------
+    origins : (n, 3) float ndarray
+        the points to pierce
+    directions : (n, 3) float ndarray
+        the pierce vectors
+    v0, v1, v2 : (n, 3) float ndarray
+        the xyz points of the triangles
+    tmin / tmax : float; default=-inf/inf
+        the range of the rays in units of direction
+        the defaults are for a line
+    eps : float; default=1e-8
+        the tolerance for a ray that is parallel to the triangle
+
+    Returns
+    -------
+    is_hit : (n, ) bool ndarray
+        is the triangle pierced
+    t : (n, ) float ndarray
+        the pierce location is origin + t * direction (nan for a miss)
+
+    """
+    e1 = v1 - v0
+    e2 = v2 - v0
+    pvec = np.cross(directions, e2)
+    det = np.einsum('ij,ij->i', e1, pvec)
+
+    # the ray is parallel to the plane
+    is_hit = np.abs(det) >= eps
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv_det = 1. / det
+    tvec = origins - v0
+    u = np.einsum('ij,ij->i', tvec, pvec) * inv_det
+    qvec = np.cross(tvec, e1)
+    v = np.einsum('ij,ij->i', directions, qvec) * inv_det
+    t = np.einsum('ij,ij->i', e2, qvec) * inv_det
+
+    is_hit &= (u >= 0.) & (u <= 1.) & (v >= 0.) & (u + v <= 1.) & (t >= tmin) & (t <= tmax)
+    t[~is_hit] = np.nan
+    return is_hit, t
+
+
+def pierce_shell_model_by_rays(bdf_filename, origins, directions, tmin=0., tmax=None):
+    # type: (Union[BDF, str], Any, Any, float, Optional[float]) -> Any
+    """
+    Pierces the shells of a model with a set of rays
+
+    The candidate elements are found with the element bounding box tree
+    of ``model.spatial_index`` and the CTRIA3/CTRIA6/CTRIAR and
+    CQUAD4/CQUAD8/CQUADR/CQUAD/CSHEAR (split into 2 triangles) elements
+    are pierced in one batch.  The midside nodes are not considered.
+
+    Parameters
+    ----------
+    bdf_filename : str / BDF()
+        the model to run
+    origins : (nrays, 3) float ndarray
+        the points to pierce
+    directions : (nrays, 3) / (3, ) float ndarray
+        the pierce vectors
+    tmin : float; default=0.
+        the min length of the rays in units of direction
+        -inf : pierce with a line
+    tmax : float; default=None
+        the max length of the rays in units of direction
+        None : infinite
+
+    Returns
+    -------
+    irays : (npierce, ) int ndarray
+        the index of the ray for each pierce
+    eids : (npierce, ) int ndarray
+        the pierced element ids
+    xyz_pierces : (npierce, 3) float ndarray
+        the pierce locations
+    t : (npierce, ) float ndarray
+        the pierce location is origin + t * direction
+
+    The pierces are sorted by ray and then by t, so all the pierces of a
+    ray are given in order.
+
+    """
+    if isinstance(bdf_filename, BDF):
+        model = bdf_filename
+    else:
+        model = read_bdf(bdf_filename)
+
+    origins = np.atleast_2d(np.asarray(origins, dtype='float64'))
+    assert origins.shape[1] == 3, origins.shape
+    nrays = origins.shape[0]
+    directions = np.asarray(directions, dtype='float64')
+    if directions.ndim == 1:
+        directions = np.tile(directions, (nrays, 1))
+    if tmax is None:
+        tmax = np.inf
+
+    spatial_index = model.spatial_index
+    tri_eids, v0, v1, v2 = _get_shell_triangles(model, spatial_index)
+
+    # the elements with a bounding box that's hit
+    irays, eids = spatial_index.get_elements_on_rays(origins, directions, tmin=tmin, tmax=tmax)
+
+    # the triangles of those elements (none for a non-shell element)
+    itri_start = np.searchsorted(tri_eids, eids, side='left')
+    ntris = np.searchsorted(tri_eids, eids, side='right') - itri_start
+    itris = _get_ranges(itri_start, ntris)
+    irays = np.repeat(irays, ntris)
+
+    is_hit, t = triangle_intersections(
+        origins[irays, :], directions[irays, :], v0[itris, :], v1[itris, :], v2[itris, :],
+        tmin=tmin, tmax=tmax)
+    irays = irays[is_hit]
+    eids = tri_eids[itris[is_hit]]
+    t = t[is_hit]
+
+    # drop the second pierce of a quad that's pierced on its diagonal,
+    # but keep both pierces of a warped quad that's pierced twice
+    isort = np.lexsort((t, eids, irays))
+    irays = irays[isort]
+    eids = eids[isort]
+    t = t[isort]
+    is_first = np.ones(len(irays), dtype='bool')
+    is_first[1:] = ((irays[1:] != irays[:-1]) | (eids[1:] != eids[:-1]) |
+                    ~np.isclose(t[1:], t[:-1], rtol=1e-8, atol=1e-12))
+    irays = irays[is_first]
+    eids = eids[is_first]
+    t = t[is_first]
+
+    # sort by ray and then t
+    isort = np.lexsort((eids, t, irays))
+    irays = irays[isort]
+    eids = eids[isort]
+    t = t[isort]
+
+    xyz_pierces = origins[irays, :] + directions[irays, :] * t[:, np.newaxis]
+    return irays, eids, xyz_pierces, t
+
+
+def _get_shell_triangles(model, spatial_index):
+    """
+    Gets the triangles of the shell elements
+
+    Returns
+    -------
+    tri_eids : (ntri, ) int ndarray
+        the sorted element id of each triangle
+    v0, v1, v2 : (ntri, 3) float ndarray
+        the corners of the triangles
+
+    """
+    tri_types = ['CTRIA3', 'CTRIA6', 'CTRIAR']
+    quad_types = ['CQUAD4', 'CQUAD8', 'CQUADR', 'CQUAD', 'CSHEAR']
+    tri_eids = []
+    tri_nids = []
+    for eid, elem in sorted(iteritems(model.elements)):
+        if elem.type in tri_types:
+            n1, n2, n3 = elem.node_ids[:3]
+            tri_eids.append(eid)
+            tri_nids.append((n1, n2, n3))
+        elif elem.type in quad_types:
+            n1, n2, n3, n4 = elem.node_ids[:4]
+            tri_eids.extend([eid, eid])
+            tri_nids.extend([(n1, n2, n3), (n1, n3, n4)])
+
+    tri_eids = np.array(tri_eids, dtype='int32')
+    tri_nids = np.array(tri_nids, dtype='int64').reshape(len(tri_eids), 3)
+    xyz = spatial_index.xyz_cid0[np.searchsorted(spatial_index.node_ids, tri_nids), :]
+    return tri_eids, xyz[:, 0, :], xyz[:, 1, :], xyz[:, 2, :]
+
+
+def pierce_shell_model(bdf_filename, xyz_points, tol=None):
+    # type: (Union[BDF, str], Any, Optional[float]) -> List[int], np.ndarray, List[List[int]]
     """
     Pierces a shell model with a <0., 0., 1.> vector.  In other words,
     models are pierced in the xy plane.
 
     Parameters
     ----------
-    bdf_filename : str / BDF()
+    bdf_filename : str / BDF
         the model to run
     xyz_points : (npoints, 3) float ndarray
         the xyz_points to pierce
-    tol : float; default=1.0
-        the pierce tolerance
-        pick a value that is ~3x the max local element edge length
+    tol : float; default=None
+        deprecated and unused; the elements are culled with the bounding
+        box tree of ``model.spatial_index``, so all the elements are
+        considered
 
     Returns
     -------
@@ -110,126 +289,51 @@ def pierce_shell_model(bdf_filename, xyz_points, tol=1.0):
         ndarray : pierced element's nodes
         None : invalid pierce
 
+    See Also
+    --------
+    pierce_shell_model_by_rays : all the pierces of an arbitrary ray
+
     """
-    xyz_points = np.asarray(xyz_points)
+    if tol is not None:
+        warnings.warn('pierce_shell_model(tol=%s) is deprecated and unused; '
+                      'the elements are culled with the bounding box tree' % tol,
+                      DeprecationWarning)
+    xyz_points = np.asarray(xyz_points, dtype='float64')
     assert xyz_points.shape[1] == 3, xyz_points.shape
-    xy_points = xyz_points[:, :2]
-    assert xy_points.shape[1] == 2, xy_points.shape
 
     if isinstance(bdf_filename, BDF):
         model = bdf_filename
     else:
         model = read_bdf(bdf_filename)
 
-    eids = []
-    centroids = []
-    etypes_to_skip = [
-        'CHEXA', 'CPENTA', 'CTETRA', 'CPYRAM',
-        'CBUSH', 'CBUSH1D', 'CBUSH2D',
-        'CBEAM', 'CROD', 'CONROD',
-        'CELAS1', 'CELAS2', 'CELAS3', 'CELAS4',
-        'CDAMP1', 'CDAMP2', 'CDAMP3', 'CDAMP4', 'CDAMP5',
-    ]
-    for eid, elem in iteritems(model.elements):
-        if elem.type in ['CQUAD4', 'CTRIA3']:
-            centroid = elem.Centroid()
-        elif elem.type in etypes_to_skip:
-            continue
-        else:
-            print(elem.type)
-            #raise NotImplementedError(elem)
-            continue
-        eids.append(eid)
-        centroids.append(centroid)
-    eids = np.array(eids, dtype='int32')
-    assert len(eids) > 0, 'eids=%s\n' % eids
-    centroids_xy = np.array(centroids, dtype='float64')[:, :2]
-
-    #print('centroids:\n%s\n' % str(centroids_xy))
-    assert centroids_xy.shape[1] == 2, centroids_xy.shape
-
-
-    msg = 'which is required by pierce_shell_model'
-    kdt = _get_tree(centroids_xy, msg=msg)
-    results = kdt.query_ball_point(xy_points, tol)
-    nresults = len(results)
-    iresults = np.arange(nresults)
-    #print(results)
-    #print(iresults)
-
+    # the pierces of each point are sorted by z, so the last is the max
     direction = np.array([0., 0., 1.])
-    ipoints = []
+    irays, eids, xyz_pierces = pierce_shell_model_by_rays(
+        model, xyz_points, direction, tmin=-np.inf)[:3]
+    npoints = xyz_points.shape[0]
+    is_last = np.ones(len(irays), dtype='bool')
+    is_last[:-1] = irays[1:] != irays[:-1]
+    ilast = np.full(npoints, -1, dtype='int64')
+    ilast[irays[is_last]] = np.where(is_last)[0]
+
     eids_pierce = []
     xyz_pierces_max = []
     node_ids = []
-    for i, xyz_point, eidsi in zip(count(), xyz_points, results):
-        model.log.debug('eidsi = [%s]' % ', '.join([str(eidii).rstrip('L') for eidii in eidsi]))
-        if not eidsi:
-            ipoints.append(i)
-            eids_pierce.append(None)
-            xyz_pierces_max.append(None)
-            node_ids.append(None)
-            model.log.warning('skipping %s because it failed tolerancing (tol=%s)' % (xyz_point, tol))
-            continue
-
-        model.log.debug('xyz_point = %s' % xyz_point)
-        eidsi2 = eids[eidsi]
-        eids_newi = []
-        piercesi = []
-        zpiercesi = []
-        for eid in eidsi2:
-            elem = model.elements[eid]
-            if elem.type == 'CQUAD4':
-                v0 = elem.nodes_ref[0].get_position()
-                v1 = elem.nodes_ref[1].get_position()
-                v2 = elem.nodes_ref[2].get_position()
-                v3 = elem.nodes_ref[3].get_position()
-                xyz_pierce = quad_intersection(xyz_point, direction, v0, v1, v2, v3)
-            elif elem.type == 'CTRIA3':
-                v0 = elem.nodes_ref[0].get_position()
-                v1 = elem.nodes_ref[1].get_position()
-                v2 = elem.nodes_ref[2].get_position()
-                xyz_pierce = triangle_intersection(xyz_point, direction, v0, v1, v2)
-            else:
-                raise NotImplementedError(elem)
-
-            if xyz_pierce is None:
-                #model.log.warning('failed to pierce eid=%s' % eid)
-                continue
-
-            zpierce = xyz_pierce[2]
-            model.log.debug('  eid=%s xyz_pierce=%s zpierce=%s' % (eid, xyz_pierce, zpierce))
-            eids_newi.append(eid)
-            piercesi.append(xyz_pierce)
-            zpiercesi.append(zpierce)
-
-        if len(zpiercesi) == 0:
-            ipoints.append(i)
+    for xyz_point, ilasti in zip(xyz_points, ilast):
+        if ilasti == -1:
             eids_pierce.append(None)
             xyz_pierces_max.append(None)
             node_ids.append(None)
-            model.log.warning('skipping %s because no pierces found (tol=%s)' % (xyz_point, tol))
+            model.log.warning('skipping %s because no pierces found' % xyz_point)
             continue
 
-        #print('zpiercesi = %s' % zpiercesi)
-        zpiercesi_max = max(zpiercesi)
-        ipierce_max = zpiercesi.index(zpiercesi_max)
-        eid_max = eids_newi[ipierce_max]
-        xyz_piercei_max = piercesi[ipierce_max]
-        model.log.debug('i=%s xyz_point=%s xyz_piercei_max=%s zpiercesi=%s zmax=%s eid_max=%s' % (
-            i, xyz_point, xyz_piercei_max,
-            zpiercesi, zpiercesi_max, eid_max))
-
-        ipoints.append(i)
+        eid_max = int(eids[ilasti])
         eids_pierce.append(eid_max)
-        xyz_pierces_max.append(xyz_piercei_max)
-        #print(model.elements[eid_max])
+        xyz_pierces_max.append(xyz_pierces[ilasti, :])
         node_ids.append(model.elements[eid_max].node_ids)
 
     xyz_pierces_max = np.array(xyz_pierces_max)
-    model.log.debug('ipoints=%s' % ipoints)
-    model.log.info('eids_pierce=%s' % eids_pierce)
-    model.log.info('xyz_pierces_max:\n%s' % xyz_pierces_max)
-    model.log.info('node_ids=%s' % node_ids)
-
+    model.log.debug('eids_pierce=%s' % eids_pierce)
+    model.log.debug('xyz_pierces_max:\n%s' % xyz_pierces_max)
+    model.log.debug('node_ids=%s' % node_ids)
     return eids_pierce, xyz_pierces_max, node_ids
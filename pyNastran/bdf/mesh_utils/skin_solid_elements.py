@@ -1,16 +1,49 @@
 """
 defines:
- - get_solid_skin_faces(model)
+ - write_skin_solid_faces(model, skin_filename, write_solids=False, write_shells=True,
+                          size=8, is_double=False, encoding=None)
+ - eid_set, face_map = get_solid_skin_faces(model)
+ - faces, eids = get_solid_skin_face_arrays(model)
+ - faces, eids, iface = get_solid_face_arrays(model)
 """
 from __future__ import print_function
-from collections import defaultdict
-from copy import deepcopy
+from collections import OrderedDict
 from six import PY2, iteritems
 from codecs import open
+import numpy as np
 
 from pyNastran.bdf.field_writer_8 import print_card_8
 from pyNastran.bdf.field_writer_16 import print_card_16
 
+#: the (number of linear nodes, number of quadratic nodes) of the solids
+SOLID_NNODES = {
+    'CTETRA' : (4, 10),
+    'CPENTA' : (6, 15),
+    'CHEXA' : (8, 20),
+    'CPYRAM' : (5, 13),
+}
+
+#: the node indices of the faces of the solids, which is keyed by
+#: (element type, number of nodes); these match ``elem.faces``, so the
+#: normals point outwards
+SOLID_FACES = {
+    ('CTETRA', 4) : [[0, 1, 3], [0, 3, 2], [1, 2, 3], [0, 2, 1]],
+    ('CTETRA', 10) : [[0, 1, 2, 4, 5, 6], [0, 1, 3, 4, 8, 7],
+                      [1, 2, 3, 5, 9, 8], [2, 0, 3, 6, 7, 9]],
+    ('CPENTA', 6) : [[0, 1, 2], [3, 4, 5], [0, 1, 4, 3], [1, 2, 5, 4], [2, 0, 3, 5]],
+    ('CPENTA', 15) : [[0, 1, 2, 6, 7, 8], [3, 4, 5, 9, 10, 11],
+                      [0, 1, 4, 3, 6, 13, 9, 12], [1, 2, 5, 4, 7, 14, 10, 13],
+                      [2, 0, 3, 5, 8, 12, 11, 14]],
+    ('CHEXA', 8) : [[0, 1, 2, 3], [0, 1, 5, 4], [1, 2, 6, 5],
+                    [2, 3, 7, 6], [3, 0, 4, 7], [4, 5, 6, 7]],
+    ('CHEXA', 20) : [[0, 1, 2, 3, 8, 9, 10, 11], [0, 1, 5, 4, 8, 17, 12, 16],
+                     [1, 2, 6, 5, 9, 18, 13, 17], [2, 3, 7, 6, 10, 19, 14, 18],
+                     [3, 0, 4, 7, 11, 16, 15, 19], [4, 5, 6, 7, 12, 13, 14, 15]],
+    ('CPYRAM', 5) : [[0, 1, 2, 3], [0, 1, 4], [1, 2, 4], [2, 3, 4], [3, 0, 4]],
+    ('CPYRAM', 13) : [[0, 1, 2, 3, 5, 6, 7, 8], [0, 1, 4, 5, 10, 9],
+                      [1, 2, 4, 6, 11, 10], [2, 3, 4, 7, 12, 11], [3, 0, 4, 8, 9, 12]],
+}
+
 
 def write_skin_solid_faces(model, skin_filename,
                            write_solids=False, write_shells=True,
@@ -123,46 +156,158 @@ def get_solid_skin_faces(model):
        face : List(int, int, ...)
            the face nids
 
+    Faces that are shared by more than 2 elements are included.
     """
-    eid_faces = model.get_element_faces()
-    face_set = defaultdict(int)
-    eid_set = defaultdict(list)
+    faces, eids, unused_iface = get_solid_face_arrays(model)
+    eid_set = OrderedDict()
     face_map = {}
-    for eid, face in eid_faces:
-        #print(eid, face)
-        raw_face = deepcopy(face)
-        try:
-            face.sort()
-        except:
-            print('face = %s' % str(face))
-            raise
-        tface = tuple(face)
-        #print(tface)
-        face_set[tface] += 1
-        eid_set[tface].append(eid)
+    if len(eids) == 0:
+        return eid_set, face_map
+
+    counts, ifirst, inverse = _get_face_counts(faces)
+    is_skin = counts[inverse] != 2
+
+    # the faces are in the order of their first use
+    iskin = np.where(is_skin)[0]
+    iskin = iskin[np.argsort(ifirst[inverse[iskin]], kind='mergesort')]
+    for face, eid in zip(faces[iskin, :].tolist(), eids[iskin].tolist()):
+        raw_face = [nid for nid in face if nid > 0]
+        tface = tuple(sorted(raw_face))
+        if tface in eid_set:
+            eid_set[tface].append(eid)
+        else:
+            eid_set[tface] = [eid]
         face_map[tface] = raw_face
+    return eid_set, face_map
 
-    #print('eid_set:')
-    #for tface, eidset in iteritems(eid_set):
-        #print(tface, eidset)
 
-    #print('face_set:')
-    #for tface, faceset in iteritems(face_set):
-        #print(tface, faceset)
+def get_solid_skin_face_arrays(model):
+    """
+    Gets the free faces of the solid elements, which are the faces that
+    are used by one solid element
 
-    #print('face_map:')
-    #for tface, facemap in iteritems(face_map):
-        #print(tface, facemap)
+    Parameters
+    ----------
+    model : BDF()
+        the BDF object
 
-    del_faces = []
-    for face, face_count in iteritems(face_set):
-        if face_count == 2:
-            del_faces.append(face)
+    Returns
+    -------
+    faces : (nfaces, 8) int ndarray
+        the face node ids, which are ordered so the normals point
+        outwards; 0 is used for the unused columns
+        (e.g., a CTETRA4 face has 3 nodes)
+    eids : (nfaces, ) int ndarray
+        the element id of each face
 
-    for face in del_faces:
-        del face_set[face]
-        del eid_set[face]
-    return eid_set, face_map
+    """
+    faces, eids, unused_iface = get_solid_face_arrays(model)
+    if len(eids) == 0:
+        return faces, eids
+    counts, unused_ifirst, inverse = _get_face_counts(faces)
+    is_free = counts[inverse] == 1
+    return faces[is_free, :], eids[is_free]
+
+
+def get_solid_face_arrays(model):
+    """
+    Gets all the faces of the solid elements, which includes the
+    internal faces
+
+    Parameters
+    ----------
+    model : BDF()
+        the BDF object
+
+    Returns
+    -------
+    faces : (nfaces, 8) int ndarray
+        the face node ids in the order of ``elem.faces``; 0 is used for
+        the unused columns
+    eids : (nfaces, ) int ndarray
+        the element id of each face
+    iface : (nfaces, ) int ndarray
+        the index of the face in the element (0-based)
+
+    The faces are in the order of the elements in the model and then
+    the face number.
+    """
+    connectivity = model.connectivity
+    all_faces = []
+    all_eids = []
+    all_ifaces = []
+    for etype in ['CTETRA', 'CPENTA', 'CHEXA', 'CPYRAM']:
+        if etype not in connectivity.type_to_node_ids:
+            continue
+        nids = connectivity.type_to_node_ids[etype]
+        eids = connectivity.type_to_element_ids[etype]
+        nnodes_linear, nnodes_quadratic = SOLID_NNODES[etype]
+
+        # a higher order element has a midside node
+        if nids.shape[1] > nnodes_linear:
+            is_quadratic = np.any(nids[:, nnodes_linear:] > 0, axis=1)
+        else:
+            is_quadratic = np.zeros(len(eids), dtype='bool')
+
+        for is_quadratici, nnodes in [(False, nnodes_linear), (True, nnodes_quadratic)]:
+            ielements = np.where(is_quadratic == is_quadratici)[0]
+            if len(ielements) == 0:
+                continue
+            nidsi = nids[ielements, :]
+            for iface, face in enumerate(SOLID_FACES[(etype, nnodes)]):
+                facei = np.zeros((len(ielements), 8), dtype='int64')
+                facei[:, :len(face)] = nidsi[:, face]
+                all_faces.append(facei)
+                all_eids.append(eids[ielements])
+                all_ifaces.append(np.full(len(ielements), iface, dtype='int64'))
+
+    if not all_faces:
+        return (np.zeros((0, 8), dtype='int64'), np.array([], dtype='int64'),
+                np.array([], dtype='int64'))
+    faces = np.vstack(all_faces)
+    eids = np.hstack(all_eids)
+    ifaces = np.hstack(all_ifaces)
+
+    # sort by the model order of the elements and then by the face
+    model_eids = np.array(list(model.elements), dtype='int64')
+    isort = np.argsort(model_eids)
+    ranks = isort[np.searchsorted(model_eids, eids, sorter=isort)]
+    order = np.lexsort((ifaces, ranks))
+    return faces[order, :], eids[order], ifaces[order]
+
+
+def _get_face_counts(faces):
+    """
+    Counts the number of times each face is used
+
+    Returns
+    -------
+    counts : (nunique, ) int ndarray
+        the number of times each unique face is used
+    ifirst : (nunique, ) int ndarray
+        the index of the first use of the unique face
+    inverse : (nfaces, ) int ndarray
+        the unique face of each face
+
+    """
+    nfaces = faces.shape[0]
+    sorted_faces = np.sort(faces, axis=1)
+
+    # the blank nodes are sorted first, so the unused columns are skipped
+    is_used = np.any(sorted_faces > 0, axis=0)
+    sorted_faces = sorted_faces[:, is_used]
+
+    # lexsort is stable, so the first face of a group is the first use
+    order = np.lexsort(sorted_faces.T[::-1])
+    sorted_faces = sorted_faces[order, :]
+    is_new = np.ones(nfaces, dtype='bool')
+    is_new[1:] = np.any(sorted_faces[1:, :] != sorted_faces[:-1, :], axis=1)
+    istarts = np.where(is_new)[0]
+    counts = np.diff(np.append(istarts, nfaces))
+    ifirst = order[istarts]
+    inverse = np.empty(nfaces, dtype='int64')
+    inverse[order] = np.cumsum(is_new) - 1
+    return counts, ifirst, inverse
 
 
 def _write_skin_solid_faces(model, skin_filename, face_map,
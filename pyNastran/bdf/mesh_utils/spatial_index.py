@@ -0,0 +1,639 @@
+"""
+defines:
+    spatial_index = SpatialIndex(model, leaf_size=8)
+
+The SpatialIndex is the cached spatial search structure of a BDF, which is
+accessed with ``model.spatial_index``:
+ - a node KD-tree (``scipy.spatial.cKDTree``) of the GRIDs
+ - an axis aligned bounding box (AABB) tree of the elements, which is a
+   bounding volume hierarchy (BVH) stored as flat arrays
+
+The index is rebuilt when the nodes, elements or coordinate systems are
+added/removed, a node is moved with ``set_position`` or after
+``model.clear_spatial_index()``.  The check is cheap, so the queries don't
+depend on the model size, but it doesn't see in-place changes (e.g.,
+changing ``node.xyz`` or ``elem.nodes``).  Call
+``model.clear_spatial_index()`` after those.
+"""
+from __future__ import print_function
+import heapq
+from six import iteritems
+import numpy as np
+from numpy.linalg import norm  # type: ignore
+import scipy.spatial
+
+
+class SpatialIndex(object):
+    """
+    Spatial queries of the nodes and the element bounding boxes
+
+    Node Queries
+    ------------
+     - nids = get_nodes_in_sphere(xyz, radius)
+     - nids = get_nodes_in_box(box_min, box_max)
+     - distances, nids = get_closest_nodes(xyz, k=1, tol=None)
+
+    Element Queries
+    ---------------
+    The element queries are on the bounding boxes of the elements, so
+    they return the candidates for an exact test.
+     - eids = get_elements_at_point(xyz, tol=0.)
+     - eids = get_elements_in_box(box_min, box_max)
+     - eids, tmin = get_elements_on_ray(origin, direction, tmax=None)
+     - irays, eids = get_elements_on_rays(origins, directions, tmin=0., tmax=None)
+     - eid, distance = get_closest_element(xyz)
+     - eids = get_elements_near_plane(origin, normal, tol=0.)
+    """
+    def __init__(self, model, leaf_size=8):
+        """
+        Builds the spatial index
+
+        Parameters
+        ----------
+        model : BDF()
+            the BDF model
+        leaf_size : int; default=8
+            the max number of elements in a leaf of the element tree
+
+        """
+        self._key = _get_model_key(model)
+        self.leaf_size = leaf_size
+
+        #: the sorted GRID ids and their xyz_cid0 locations
+        self.node_ids, self.xyz_cid0 = _get_node_xyz_cid0(model)
+        self.node_tree = None
+        if len(self.node_ids):
+            self.node_tree = scipy.spatial.cKDTree(self.xyz_cid0)
+
+        #: the sorted element ids and their bounding boxes
+        self.element_ids, self.element_box_min, self.element_box_max = _get_element_boxes(
+            model, self.node_ids, self.xyz_cid0)
+
+        self._bvh_min, self._bvh_max, self._bvh_left, self._bvh_start, self._bvh_count, \
+            self._bvh_order = _build_bvh(self.element_box_min, self.element_box_max,
+                                         leaf_size=leaf_size)
+
+    def is_valid(self, model):
+        """is the index up to date with the model?"""
+        return self._key == _get_model_key(model)
+
+    def __repr__(self):
+        msg = 'SpatialIndex(nnodes=%s, nelements=%s, leaf_size=%s)' % (
+            len(self.node_ids), len(self.element_ids), self.leaf_size)
+        return msg
+
+    #---------------------------------------------------------------------------
+    # nodes
+    def get_nodes_in_sphere(self, xyz, radius):
+        """
+        Gets the nodes within a radius of a point
+
+        Parameters
+        ----------
+        xyz : (3, ) float ndarray
+            the point
+        radius : float
+            the search radius
+
+        Returns
+        -------
+        nids : (n, ) int ndarray
+            the sorted node ids
+
+        """
+        if self.node_tree is None:
+            return np.array([], dtype=self.node_ids.dtype)
+        inodes = self.node_tree.query_ball_point(np.asarray(xyz, dtype='float64'), radius)
+        return self.node_ids[np.sort(np.array(inodes, dtype='int64'))]
+
+    def get_nodes_in_box(self, box_min, box_max):
+        """
+        Gets the nodes within an axis aligned box
+
+        Parameters
+        ----------
+        box_min / box_max : (3, ) float ndarray
+            the corners of the box
+
+        Returns
+        -------
+        nids : (n, ) int ndarray
+            the sorted node ids
+
+        """
+        if self.node_tree is None:
+            return np.array([], dtype=self.node_ids.dtype)
+        box_min = np.asarray(box_min, dtype='float64')
+        box_max = np.asarray(box_max, dtype='float64')
+        center = (box_min + box_max) / 2.
+        radius = norm(box_max - box_min) / 2.
+        inodes = np.array(self.node_tree.query_ball_point(center, radius * 1.0001),
+                          dtype='int64')
+        xyz = self.xyz_cid0[inodes, :]
+        is_inside = np.all((xyz >= box_min) & (xyz <= box_max), axis=1)
+        return self.node_ids[np.sort(inodes[is_inside])]
+
+    def get_closest_nodes(self, xyz, k=1, tol=None):
+        """
+        Gets the closest nodes to a set of points
+
+        Parameters
+        ----------
+        xyz : (npoints, 3) / (3, ) float ndarray
+            the points
+        k : int; default=1
+            the number of close nodes
+        tol : float; default=None
+            the max distance
+            None : the whole model
+
+        Returns
+        -------
+        distances : (npoints, ) or (npoints, k) float ndarray
+            the distance to the nodes; inf if a node wasn't found
+        nids : (npoints, ) or (npoints, k) int ndarray
+            the closest node ids; -1 if a node wasn't found
+
+        """
+        if self.node_tree is None:
+            raise RuntimeError('the model has no GRIDs')
+        if tol is None:
+            tol = np.inf
+        distances, inodes = self.node_tree.query(np.asarray(xyz, dtype='float64'),
+                                                 k=k, distance_upper_bound=tol)
+        inodes = np.asarray(inodes)
+        is_found = inodes < len(self.node_ids)
+        nids = np.full(inodes.shape, -1, dtype=self.node_ids.dtype)
+        nids[is_found] = self.node_ids[inodes[is_found]]
+        return distances, nids
+
+    #---------------------------------------------------------------------------
+    # elements
+    def get_elements_at_point(self, xyz, tol=0.):
+        """
+        Gets the elements whose bounding box contains a point
+
+        Parameters
+        ----------
+        xyz : (3, ) float ndarray
+            the point
+        tol : float; default=0.
+            the box tolerance
+
+        Returns
+        -------
+        eids : (n, ) int ndarray
+            the sorted element ids
+
+        """
+        xyz = np.asarray(xyz, dtype='float64')
+        return self.get_elements_in_box(xyz, xyz, tol=tol)
+
+    def get_elements_in_box(self, box_min, box_max, tol=0.):
+        """
+        Gets the elements whose bounding box overlaps a box
+
+        Parameters
+        ----------
+        box_min / box_max : (3, ) float ndarray
+            the corners of the box
+        tol : float; default=0.
+            the box tolerance
+
+        Returns
+        -------
+        eids : (n, ) int ndarray
+            the sorted element ids
+
+        """
+        box_min = np.asarray(box_min, dtype='float64') - tol
+        box_max = np.asarray(box_max, dtype='float64') + tol
+
+        def is_overlap(bmin, bmax):
+            """does the box overlap the bounding boxes?"""
+            return np.all((bmin <= box_max) & (bmax >= box_min), axis=1)
+
+        ielements = self._get_element_indices(is_overlap)
+        return self.element_ids[np.sort(ielements)]
+
+    def get_elements_on_ray(self, origin, direction, tmax=None):
+        """
+        Gets the elements whose bounding box is hit by a ray
+
+        Parameters
+        ----------
+        origin : (3, ) float ndarray
+            the start of the ray
+        direction : (3, ) float ndarray
+            the direction of the ray
+        tmax : float; default=None
+            the max length of the ray in units of direction
+            None : infinite
+
+        Returns
+        -------
+        eids : (n, ) int ndarray
+            the element ids sorted by the distance to the box
+        tmin : (n, ) float ndarray
+            the distance to the box in units of direction (0. if the
+            origin is inside the box)
+
+        """
+        origin = np.asarray(origin, dtype='float64')
+        direction = np.asarray(direction, dtype='float64')
+        if tmax is None:
+            tmax = np.inf
+
+        def is_hit(bmin, bmax):
+            """does the ray hit the bounding boxes?"""
+            return _get_ray_box_hits(origin, direction, bmin, bmax, 0., tmax)[0]
+
+        ielements = self._get_element_indices(is_hit)
+        tmin = _get_ray_box_hits(origin, direction, self.element_box_min[ielements, :],
+                                 self.element_box_max[ielements, :], 0., tmax)[1]
+        isort = np.argsort(tmin, kind='mergesort')
+        return self.element_ids[ielements[isort]], tmin[isort]
+
+    def get_elements_on_rays(self, origins, directions, tmin=0., tmax=None):
+        """
+        Gets the elements whose bounding box is hit by a set of rays
+
+        All the rays are culled through the tree at the same time, so
+        this is much faster than calling ``get_elements_on_ray`` for
+        each ray.
+
+        Parameters
+        ----------
+        origins : (nrays, 3) float ndarray
+            the start of the rays
+        directions : (nrays, 3) / (3, ) float ndarray
+            the direction of the rays
+        tmin : float; default=0.
+            the min length of the rays in units of direction
+            -inf : a line
+        tmax : float; default=None
+            the max length of the rays in units of direction
+            None : infinite
+
+        Returns
+        -------
+        irays : (n, ) int ndarray
+            the index of the ray for each hit
+        eids : (n, ) int ndarray
+            the element id for each hit
+
+        """
+        origins = np.atleast_2d(np.asarray(origins, dtype='float64'))
+        directions = np.asarray(directions, dtype='float64')
+        nrays = origins.shape[0]
+        if directions.ndim == 1:
+            directions = np.tile(directions, (nrays, 1))
+        assert directions.shape == origins.shape, 'origins.shape=%s directions.shape=%s' % (
+            str(origins.shape), str(directions.shape))
+        if tmax is None:
+            tmax = np.inf
+        if len(self.element_ids) == 0 or nrays == 0:
+            empty = np.array([], dtype='int64')
+            return empty, self.element_ids[empty]
+
+        # walk the tree a level at a time for all the (ray, tree node) pairs
+        irays = np.arange(nrays, dtype='int64')
+        inodes = np.zeros(nrays, dtype='int64')
+        leaf_irays = []
+        leaf_inodes = []
+        while len(inodes):
+            is_hit = _get_ray_box_hits(
+                origins[irays, :], directions[irays, :],
+                self._bvh_min[inodes, :], self._bvh_max[inodes, :], tmin, tmax)[0]
+            irays = irays[is_hit]
+            inodes = inodes[is_hit]
+            left = self._bvh_left[inodes]
+            is_leaf = left < 0
+            leaf_irays.append(irays[is_leaf])
+            leaf_inodes.append(inodes[is_leaf])
+
+            irays = np.repeat(irays[~is_leaf], 2)
+            inodes = np.column_stack([left[~is_leaf], left[~is_leaf] + 1]).ravel()
+
+        leaf_irays = np.hstack(leaf_irays)
+        leaf_inodes = np.hstack(leaf_inodes)
+        counts = self._bvh_count[leaf_inodes]
+        ielements = self._bvh_order[_get_ranges(self._bvh_start[leaf_inodes], counts)]
+        irays = np.repeat(leaf_irays, counts)
+        is_hit = _get_ray_box_hits(
+            origins[irays, :], directions[irays, :],
+            self.element_box_min[ielements, :], self.element_box_max[ielements, :],
+            tmin, tmax)[0]
+        irays = irays[is_hit]
+        ielements = ielements[is_hit]
+        isort = np.lexsort((ielements, irays))
+        return irays[isort], self.element_ids[ielements[isort]]
+
+    def get_elements_near_plane(self, origin, normal, tol=0.):
+        """
+        Gets the elements whose bounding box is within a distance of a plane
+
+        Parameters
+        ----------
+        origin : (3, ) float ndarray
+            a point on the plane
+        normal : (3, ) float ndarray
+            the normal to the plane
+        tol : float; default=0.
+            the max distance to the plane
+
+        Returns
+        -------
+        eids : (n, ) int ndarray
+            the sorted element ids
+
+        """
+        origin = np.asarray(origin, dtype='float64')
+        normal = np.asarray(normal, dtype='float64')
+        normal = normal / norm(normal)
+
+        def is_near(bmin, bmax):
+            """is the box within tol of the plane?"""
+            distance = ((bmin + bmax) / 2. - origin).dot(normal)
+            radius = ((bmax - bmin) / 2.).dot(np.abs(normal))
+            return np.abs(distance) <= radius + tol
+
+        ielements = self._get_element_indices(is_near)
+        return self.element_ids[np.sort(ielements)]
+
+    def get_closest_element(self, xyz):
+        """
+        Gets the element with the closest bounding box to a point
+
+        If the point is inside multiple bounding boxes, the element
+        with the closest centroid of the bounding box is returned.
+
+        Parameters
+        ----------
+        xyz : (3, ) float ndarray
+            the point
+
+        Returns
+        -------
+        eid : int
+            the element id
+        distance : float
+            the distance to the bounding box (0. if the point is inside)
+
+        """
+        if len(self.element_ids) == 0:
+            raise RuntimeError('the model has no elements')
+        xyz = np.asarray(xyz, dtype='float64')
+        bvh_min = self._bvh_min
+        bvh_max = self._bvh_max
+        box_min = self.element_box_min
+        box_max = self.element_box_max
+
+        # best first search of the tree, which is sorted by the distance
+        # to the box and then the distance to the center of the box
+        best = (np.inf, np.inf, -1)
+        heap = [(_get_box_distance(xyz, bvh_min[:1], bvh_max[:1])[0], 0)]
+        while heap:
+            distance, inode = heapq.heappop(heap)
+            if distance > best[0]:
+                break
+
+            left = self._bvh_left[inode]
+            if left >= 0:
+                children = np.array([left, left + 1])
+                distances = _get_box_distance(xyz, bvh_min[children], bvh_max[children])
+                for child, distancei in zip(children, distances):
+                    if distancei <= best[0]:
+                        heapq.heappush(heap, (distancei, child))
+                continue
+
+            istart = self._bvh_start[inode]
+            ielements = self._bvh_order[istart:istart + self._bvh_count[inode]]
+            distances = _get_box_distance(xyz, box_min[ielements], box_max[ielements])
+            center_distances = norm(
+                (box_min[ielements] + box_max[ielements]) / 2. - xyz, axis=1)
+            i = np.lexsort((center_distances, distances))[0]
+            besti = (distances[i], center_distances[i], ielements[i])
+            if besti[:2] < best[:2]:
+                best = besti
+        distance, unused_center_distance, ielement = best
+        return self.element_ids[ielement], distance
+
+    def _get_element_indices(self, is_hit_func):
+        """
+        Gets the indices of the elements whose bounding boxes pass a
+        vectorized test, which is also used to cull the tree
+        """
+        if len(self.element_ids) == 0:
+            return np.array([], dtype='int64')
+
+        # walk the tree a level at a time
+        inodes = np.array([0], dtype='int64')
+        leaves = []
+        while len(inodes):
+            inodes = inodes[is_hit_func(self._bvh_min[inodes], self._bvh_max[inodes])]
+            left = self._bvh_left[inodes]
+            is_leaf = left < 0
+            leaves.append(inodes[is_leaf])
+            left = left[~is_leaf]
+            inodes = np.hstack([left, left + 1])
+
+        leaves = np.hstack(leaves)
+        ipositions = _get_ranges(self._bvh_start[leaves], self._bvh_count[leaves])
+        ielements = self._bvh_order[ipositions]
+        is_hit = is_hit_func(self.element_box_min[ielements], self.element_box_max[ielements])
+        return ielements[is_hit]
+
+
+def _get_model_key(model):
+    """
+    The nodes/elements/coords that the index depends on
+
+    This doesn't see a node that is moved in place or an element whose
+    nodes are changed in place, so ``model.clear_spatial_index()`` must be
+    called after those.
+    """
+    return (id(model.nodes), len(model.nodes), id(model.elements), len(model.elements),
+            id(model.coords), len(model.coords))
+
+
+def _get_node_xyz_cid0(model):
+    """gets the sorted GRID ids and their locations in the global frame"""
+    if not model.nodes:
+        return np.array([], dtype='int32'), np.zeros((0, 3), dtype='float64')
+    out = model.get_xyz_in_coord_array(cid=0, fdtype='float64', idtype='int32')
+    nid_cp_cd, xyz_cid0 = out[:2]
+
+    # skip the SPOINTs/EPOINTs, which don't have a location
+    all_nids = nid_cp_cd[:, 0]
+    nids = np.array(sorted(model.nodes), dtype='int32')
+    inids = np.searchsorted(all_nids, nids)
+    return nids, xyz_cid0[inids, :]
+
+
+def _get_element_boxes(model, nids, xyz_cid0):
+    """
+    Gets the axis aligned bounding boxes of the elements
+
+    Nodes that aren't GRIDs (e.g., SPOINTs, grounded springs) are skipped.
+    Elements without GRIDs are skipped.
+    """
+    eids = []
+    nelement_nodes = []
+    element_nids = []
+    for eid, elem in sorted(iteritems(model.elements)):
+        node_ids = [nid if nid is not None else 0 for nid in elem.node_ids]
+        eids.append(eid)
+        nelement_nodes.append(len(node_ids))
+        element_nids.extend(node_ids)
+
+    eids = np.array(eids, dtype='int32')
+    nelement_nodes = np.array(nelement_nodes, dtype='int64')
+    element_nids = np.array(element_nids, dtype='int64')
+    nnodes = len(nids)
+    if nnodes == 0 or len(eids) == 0:
+        return eids[:0], np.zeros((0, 3), dtype='float64'), np.zeros((0, 3), dtype='float64')
+
+    inids = np.searchsorted(nids, element_nids)
+    inids[inids == nnodes] = 0
+    is_grid = nids[inids] == element_nids
+
+    # the skipped nodes don't change the min/max
+    xyz_min = np.where(is_grid[:, np.newaxis], xyz_cid0[inids, :], np.inf)
+    xyz_max = np.where(is_grid[:, np.newaxis], xyz_cid0[inids, :], -np.inf)
+
+    is_element = nelement_nodes > 0
+    istart = np.cumsum(nelement_nodes) - nelement_nodes
+    box_min = np.minimum.reduceat(xyz_min, istart[is_element], axis=0)
+    box_max = np.maximum.reduceat(xyz_max, istart[is_element], axis=0)
+    eids = eids[is_element]
+
+    is_valid = np.isfinite(box_min[:, 0])
+    return eids[is_valid], box_min[is_valid, :], box_max[is_valid, :]
+
+
+def _build_bvh(box_min, box_max, leaf_size=8):
+    """
+    Builds a bounding volume hierarchy
+
+    The tree is built a level at a time.  Each node with more than
+    leaf_size boxes is split at the median of the box centers along its
+    longest axis.  The children of node i are left[i] and left[i] + 1.
+
+    Returns
+    -------
+    bvh_min / bvh_max : (nnodes, 3) float ndarray
+        the bounding boxes of the tree nodes
+    bvh_left : (nnodes, ) int ndarray
+        the first child; -1 for a leaf
+    bvh_start / bvh_count : (nnodes, ) int ndarray
+        the boxes of the tree node are order[start:start+count]
+    order : (nboxes, ) int ndarray
+        the indices of the boxes
+
+    """
+    nboxes = box_min.shape[0]
+    order = np.arange(nboxes, dtype='int64')
+    if nboxes == 0:
+        zero = np.zeros(0, dtype='int64')
+        return np.zeros((0, 3)), np.zeros((0, 3)), zero, zero, zero, order
+    centers = (box_min + box_max) / 2.
+
+    bvh_min = []
+    bvh_max = []
+    bvh_left = []
+    bvh_start = []
+    bvh_count = []
+    starts = np.array([0], dtype='int64')
+    counts = np.array([nboxes], dtype='int64')
+    nnodes = 0
+    while len(starts):
+        nlevel = len(starts)
+        iends = np.column_stack([starts, starts + counts]).ravel()
+        box_mini = np.vstack([box_min[order, :], box_min[:1, :]])
+        box_maxi = np.vstack([box_max[order, :], box_max[:1, :]])
+        level_min = np.minimum.reduceat(box_mini, iends, axis=0)[::2, :]
+        level_max = np.maximum.reduceat(box_maxi, iends, axis=0)[::2, :]
+
+        is_split = counts > leaf_size
+        nsplit = is_split.sum()
+        left = np.full(nlevel, -1, dtype='int64')
+        left[is_split] = nnodes + nlevel + 2 * np.arange(nsplit)
+
+        bvh_min.append(level_min)
+        bvh_max.append(level_max)
+        bvh_left.append(left)
+        bvh_start.append(starts)
+        bvh_count.append(counts)
+        nnodes += nlevel
+
+        # sort the boxes of the split nodes along the longest axis
+        split_starts = starts[is_split]
+        split_counts = counts[is_split]
+        axis = np.argmax(level_max[is_split, :] - level_min[is_split, :], axis=1)
+        ipositions = _get_ranges(split_starts, split_counts)
+        inode = np.repeat(np.arange(nsplit), split_counts)
+        key = centers[order[ipositions], axis[inode]]
+        order[ipositions] = order[ipositions[np.lexsort((key, inode))]]
+
+        nleft = split_counts // 2
+        starts = np.column_stack([split_starts, split_starts + nleft]).ravel()
+        counts = np.column_stack([nleft, split_counts - nleft]).ravel()
+
+    return (np.vstack(bvh_min), np.vstack(bvh_max), np.hstack(bvh_left),
+            np.hstack(bvh_start), np.hstack(bvh_count), order)
+
+
+def _get_ranges(starts, counts):
+    """gets the concatenated np.arange(start, start+count) of each range"""
+    ntotal = counts.sum()
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return offsets + np.arange(ntotal, dtype='int64')
+
+
+def _get_ray_box_hits(origins, directions, box_min, box_max, tmin, tmax):
+    """
+    Intersects rays with boxes with the slab method
+
+    Parameters
+    ----------
+    origins / directions : (n, 3) / (3, ) float ndarray
+        the rays
+    box_min / box_max : (n, 3) float ndarray
+        the boxes
+    tmin / tmax : float
+        the range of the rays in units of direction
+
+    Returns
+    -------
+    is_hit : (n, ) bool ndarray
+        does the ray hit the box?
+    tenter : (n, ) float ndarray
+        the distance (in units of direction) where the ray enters the box;
+        tmin if the origin is inside the box and inf for a miss
+
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv_directions = 1. / directions
+        t1 = (box_min - origins) * inv_directions
+        t2 = (box_max - origins) * inv_directions
+    tnear = np.minimum(t1, t2)
+    tfar = np.maximum(t1, t2)
+
+    # a ray that is parallel to a slab must start inside the slab
+    is_parallel = np.broadcast_to(directions == 0., tnear.shape)
+    if is_parallel.any():
+        is_inside = (origins >= box_min) & (origins <= box_max)
+        tnear = np.where(is_parallel, np.where(is_inside, -np.inf, np.inf), tnear)
+        tfar = np.where(is_parallel, np.where(is_inside, np.inf, -np.inf), tfar)
+
+    tenter = np.maximum(tnear.max(axis=1), tmin)
+    is_hit = tenter <= np.minimum(tfar.min(axis=1), tmax)
+    tenter[~is_hit] = np.inf
+    return is_hit, tenter
+
+
+def _get_box_distance(xyz, box_min, box_max):
+    """gets the distance from a point to a set of boxes (0. inside)"""
+    dxyz = np.maximum(np.maximum(box_min - xyz, xyz - box_max), 0.)
+    return norm(dxyz, axis=1)
@@ -0,0 +1,143 @@
+"""tests the Connectivity of the BDF"""
+from __future__ import print_function
+import unittest
+
+import numpy as np
+
+from pyNastran.bdf.bdf import BDF
+from pyNastran.bdf.mesh_utils.connectivity import Connectivity
+from pyNastran.utils.log import SimpleLogger
+
+log = SimpleLogger(level='error')
+
+
+def _get_model():
+    """two CHEXAs with a CQUAD4/CTRIA3 skin, a CONROD and a spring to an SPOINT"""
+    model = BDF(log=log)
+    nid = 1
+    for x in [0., 1., 2.]:
+        for y, z in [(0., 0.), (1., 0.), (1., 1.), (0., 1.)]:
+            model.add_grid(nid, [x, y, z])
+            nid += 1
+    model.add_grid(20, [5., 5., 5.])
+    model.add_spoint([100])
+
+    model.add_chexa(1, 1, [1, 2, 3, 4, 5, 6, 7, 8])
+    model.add_chexa(2, 1, [5, 6, 7, 8, 9, 10, 11, 12])
+    model.add_cquad4(10, 2, [1, 2, 6, 5])
+    model.add_ctria3(11, 2, [5, 6, 9])
+    model.add_ctria3(12, 2, [6, 10, 9])
+    model.add_conrod(20, 1, [12, 20], A=1.0)
+    model.add_celas2(30, 1000., [20, 100], c1=1)
+    return model
+
+
+def _get_brute_force_map(model):
+    """the node id -> element ids map as a loop"""
+    nid_to_eids_map = {nid: [] for nid in list(model.nodes) + list(model.spoints)}
+    for eid, elem in sorted(model.elements.items()):
+        for nid in elem.node_ids:
+            if nid:
+                nid_to_eids_map[nid].append(eid)
+    return nid_to_eids_map
+
+
+class TestConnectivity(unittest.TestCase):
+    """tests the Connectivity"""
+
+    def test_node_element_adjacency(self):
+        """the CSR node->element adjacency matches the loop"""
+        model = _get_model()
+        connectivity = Connectivity(model)
+        self.assertEqual(connectivity.element_ids.tolist(), [1, 2, 10, 11, 12, 20, 30])
+        self.assertEqual(connectivity.element_types,
+                         ['CELAS2', 'CHEXA', 'CONROD', 'CQUAD4', 'CTRIA3'])
+        self.assertEqual(connectivity.type_to_node_ids['CTRIA3'].tolist(),
+                         [[5, 6, 9], [6, 10, 9]])
+        self.assertEqual(connectivity.node_ids.tolist(), list(range(1, 13)) + [20, 100])
+
+        nid_to_eids_map = _get_brute_force_map(model)
+        self.assertEqual(connectivity.get_node_id_to_element_ids_map(), nid_to_eids_map)
+        self.assertEqual(model.get_node_id_to_element_ids_map(), nid_to_eids_map)
+        self.assertEqual(connectivity.get_element_ids(6).tolist(), [1, 2, 10, 11, 12])
+        self.assertEqual(connectivity.get_element_ids(1000).tolist(), [])
+
+        nid_to_elements_map = model.get_node_id_to_elements_map()
+        self.assertEqual([elem.eid for elem in nid_to_elements_map[100]], [30])
+
+        incidence = connectivity.to_scipy('node_element')
+        self.assertEqual(incidence.shape, (14, 7))
+        self.assertEqual(incidence.nnz, sum(len(eids) for eids in nid_to_eids_map.values()))
+
+    def test_node_id_maps(self):
+        """the public maps are rebuilt and have the same keys as the loop"""
+        model = _get_model()
+        model.add_epoint([200])
+        unused_connectivity = model.connectivity
+        self.assertEqual(sorted(model.get_node_id_to_element_ids_map()),
+                         list(range(1, 13)) + [20, 100])
+        self.assertEqual(sorted(model.get_node_id_to_elements_map()),
+                         list(range(1, 13)) + [20, 100, 200])
+
+        # changing the nodes of an element doesn't invalidate the cache
+        model.elements[12].nodes = [6, 10, 11]
+        nid_to_eids_map = model.get_node_id_to_element_ids_map()
+        self.assertEqual(nid_to_eids_map, _get_brute_force_map(model))
+        self.assertEqual(nid_to_eids_map[11], [2, 12])
+        self.assertEqual(nid_to_eids_map[9], [2, 11])
+        nid_to_elements_map = model.get_node_id_to_elements_map()
+        self.assertEqual([elem.eid for elem in nid_to_elements_map[11]], [2, 12])
+
+    def test_element_adjacency(self):
+        """the elements that share a node/edge/face"""
+        model = _get_model()
+        connectivity = Connectivity(model)
+        eids = connectivity.element_ids
+
+        def get_neighbors(by):
+            """gets the neighbor ids of each element"""
+            indptr, indices = connectivity.get_element_adjacency(by=by)
+            return {eid: eids[indices[indptr[i]:indptr[i+1]]].tolist()
+                    for i, eid in enumerate(eids)}
+
+        neighbors = get_neighbors('face')
+        self.assertEqual(neighbors[1], [2, 10])
+        self.assertEqual(neighbors[11], [])
+        self.assertEqual(neighbors[20], [])
+
+        neighbors = get_neighbors('edge')
+        self.assertEqual(neighbors[1], [2, 10, 11])
+        self.assertEqual(neighbors[11], [1, 2, 10, 12])
+        self.assertEqual(neighbors[12], [2, 11])
+        self.assertEqual(neighbors[30], [])
+
+        neighbors = get_neighbors('node')
+        self.assertEqual(neighbors[20], [2, 30])
+        self.assertEqual(neighbors[30], [20])
+
+        edges, ielements = connectivity.get_edges(['CTRIA3'])
+        self.assertEqual(edges.tolist(), [[5, 6], [6, 10], [6, 9], [9, 10], [5, 9], [6, 9]])
+        self.assertEqual(eids[ielements].tolist(), [11, 12, 11, 12, 11, 12])
+        faces = connectivity.get_faces(['CHEXA'])[0]
+        self.assertEqual(faces.shape, (12, 4))
+
+        matrix = connectivity.to_scipy('element_edge')
+        self.assertEqual(matrix.shape, (7, 7))
+        self.assertTrue(np.array_equal(matrix.toarray(), matrix.toarray().T))
+        with self.assertRaises(ValueError):
+            connectivity.to_scipy('cat')
+
+    def test_connectivity_cache(self):
+        """the cached connectivity is rebuilt when the model changes"""
+        model = _get_model()
+        connectivity = model.connectivity
+        self.assertIs(model.connectivity, connectivity)
+        model.add_conrod(21, 1, [1, 20], A=1.0)
+        self.assertIsNot(model.connectivity, connectivity)
+        self.assertEqual(model.connectivity.get_element_ids(20).tolist(), [20, 21, 30])
+        model.clear_connectivity()
+        self.assertNotIn('connectivity', model.object_attributes())
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
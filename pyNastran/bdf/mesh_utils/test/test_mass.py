@@ -3,11 +3,16 @@ import unittest
 import os
 import numpy as np
 import pyNastran
-from pyNastran.bdf.bdf import BDF
+from pyNastran.bdf.bdf import BDF, read_bdf
+from pyNastran.bdf.mesh_utils.mass_properties import (
+    mass_properties, mass_properties_vectorized, mass_properties_breakdown,
+    get_mass_centroids)
 from pyNastran.utils import object_methods
+from pyNastran.utils.log import SimpleLogger
 
 rootpath = pyNastran.__path__[0]
 mesh_utils_path = os.path.join(rootpath, 'bdf', 'mesh_utils', 'test')
+model_path = os.path.join(rootpath, '..', 'models')
 
 
 class TestMass(unittest.TestCase):
@@ -162,5 +167,88 @@ class TestMass(unittest.TestCase):
         assert np.allclose(mass, 0.005311658333), 'mass=%s' % mass
         assert np.allclose(mass2, 2.050833333), 'mass2=%s' % mass2
 
+    def _check_mass_properties_vectorized(self, model, **kwargs):
+        """the vectorized mass properties are the same as the element sums"""
+        mass, cg, I = mass_properties(model, **kwargs)
+        mass2, cg2, I2 = mass_properties_vectorized(model, **kwargs)
+        self.assertAlmostEqual(mass, mass2)
+        assert np.allclose(cg, cg2), 'cg=%s cg2=%s' % (cg, cg2)
+        assert np.allclose(I, I2), 'I=%s I2=%s' % (I, I2)
+        return mass, cg, I
+
+    def test_mass_vectorized_elements(self):
+        """the per-element masses/centroids are the same as Mass()/Centroid()"""
+        log = SimpleLogger(level='error')
+        bdf_filename = os.path.join(model_path, 'elements', 'static_elements.bdf')
+        model = read_bdf(bdf_filename, log=log)
+        self._check_mass_properties_vectorized(model)
+        self._check_mass_properties_vectorized(model, reference_point=[1., 2., 3.],
+                                               inertia_reference='ref')
+        self._check_mass_properties_vectorized(model, sym_axis='xz', scale=2.)
+
+        eids, masses, centroids, pids, unused_mids = get_mass_centroids(model)
+        self.assertEqual(len(np.unique(eids)), len(eids))
+        for eid, mass, centroid, pid in zip(eids, masses, centroids, pids):
+            if eid in model.masses:
+                elem = model.masses[eid]
+                self.assertEqual(pid, 0)
+            else:
+                elem = model.elements[eid]
+            self.assertAlmostEqual(mass, elem.Mass(), msg='%s eid=%s' % (elem.type, eid))
+            assert np.allclose(centroid, elem.center_of_mass()), '%s eid=%s' % (elem.type, eid)
+
+        eids = [eid for eid, elem in model.elements.items() if elem.type == 'CQUAD4']
+        self._check_mass_properties_vectorized(model, element_ids=eids, mass_ids=[])
+
+    def test_mass_vectorized_solid_bending(self):
+        """a CTETRA10 model"""
+        log = SimpleLogger(level='error')
+        bdf_filename = os.path.join(model_path, 'solid_bending', 'solid_bending.bdf')
+        model = read_bdf(bdf_filename, log=log)
+        self._check_mass_properties_vectorized(model)
+
+    def test_mass_breakdown(self):
+        """the mass properties of each property/material/group"""
+        log = SimpleLogger(level='error')
+        bdf_filename = os.path.join(model_path, 'elements', 'static_elements.bdf')
+        model = read_bdf(bdf_filename, log=log)
+        mass, cg, unused_I = mass_properties(model)
+
+        for group_by in ['property', 'material']:
+            breakdown = mass_properties_breakdown(model, group_by)
+            self.assertAlmostEqual(sum(massi for massi, cgi, Ii in breakdown.values()), mass)
+            mass_cg = sum(massi * cgi for massi, cgi, Ii in breakdown.values())
+            assert np.allclose(mass_cg, mass * cg), 'mass*cg=%s expected=%s' % (mass_cg, mass * cg)
+
+        breakdown = mass_properties_breakdown(model, 'property')
+        pid_eids = model.get_element_ids_dict_with_pids()
+        for pid, eids in sorted(pid_eids.items()):
+            if not eids:
+                continue
+            expected = mass_properties(model, element_ids=eids, mass_ids=[])
+            actual = breakdown.get(pid, (0., np.zeros(3), np.zeros(6)))
+            self.assertAlmostEqual(actual[0], expected[0], msg='pid=%s' % pid)
+            assert np.allclose(actual[1], expected[1]), 'pid=%s' % pid
+            assert np.allclose(actual[2], expected[2]), 'pid=%s' % pid
+
+        # the groups overlap
+        eids = sorted(model.elements)
+        mass_ids = sorted(model.masses)
+        groups = {
+            'all' : eids + mass_ids,
+            'first' : eids[:10],
+            'masses' : mass_ids,
+            'empty' : [],
+        }
+        breakdown = mass_properties_breakdown(model, groups)
+        self.assertAlmostEqual(breakdown['all'][0], mass)
+        self.assertAlmostEqual(breakdown['first'][0],
+                               mass_properties(model, element_ids=eids[:10], mass_ids=[])[0])
+        self.assertAlmostEqual(breakdown['masses'][0],
+                               mass_properties(model, element_ids=[], mass_ids=mass_ids)[0])
+        self.assertEqual(breakdown['empty'][0], 0.)
+        with self.assertRaises(ValueError):
+            mass_properties_breakdown(model, 'cat')
+
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
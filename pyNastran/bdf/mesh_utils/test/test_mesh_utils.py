@@ -2,6 +2,7 @@
 from __future__ import print_function
 import os
 import unittest
+import warnings
 from codecs import open as codec_open
 
 from six import StringIO, iteritems
@@ -20,10 +21,18 @@ from pyNastran.bdf.mesh_utils.delete_bad_elements import get_bad_shells
 from pyNastran.bdf.mesh_utils.export_mcids import export_mcids
 from pyNastran.bdf.mesh_utils.split_cbars_by_pin_flag import split_cbars_by_pin_flag
 from pyNastran.bdf.mesh_utils.split_elements import split_line_elements
-from pyNastran.bdf.mesh_utils.pierce_shells import pierce_shell_model, quad_intersection, triangle_intersection
+from pyNastran.bdf.mesh_utils.pierce_shells import (
+    pierce_shell_model, pierce_shell_model_by_rays, quad_intersection, triangle_intersection,
+    triangle_intersections)
+from pyNastran.bdf.mesh_utils.free_edges import (
+    free_edges, non_paired_edges, get_shell_edge_counts)
+from pyNastran.bdf.mesh_utils.skin_solid_elements import (
+    get_solid_skin_faces, get_solid_skin_face_arrays)
+from pyNastran.bdf.mesh_utils.extract_bodies import extract_bodies, get_node_body_labels
 from pyNastran.bdf.mesh_utils.mirror_mesh import write_bdf_symmetric, bdf_mirror, make_symmetric_model
 from pyNastran.bdf.mesh_utils.cut_model_by_plane import cut_edge_model_by_coord, cut_face_model_by_coord, connect_face_rows
 from pyNastran.bdf.mesh_utils.mesh import create_structured_cquad4s
+from pyNastran.bdf.mesh_utils.find_closest_nodes import find_closest_nodes
 from pyNastran.utils.log import SimpleLogger
 
 # testing these imports are up to date
@@ -354,6 +363,57 @@ class TestMeshUtils(unittest.TestCase):
         os.remove(bdf_filename)
         os.remove(bdf_filename_out)
 
+    def test_eq5(self):
+        """a chain of close nodes isn't collapsed past the tolerance"""
+        model = BDF(log=log, debug=False)
+        # 10-11-12 is a chain (0.15 apart); 10 and 12 aren't close
+        model.add_grid(12, [0.3, 0., 0.])
+        model.add_grid(11, [0.15, 0., 0.])
+        model.add_grid(10, [0., 0., 0.])
+
+        # 6 coincident nodes, which is more than neq_max
+        for nid in [506, 505, 504, 503, 502, 501, 500]:
+            model.add_grid(nid, [5., 5., 5.])
+        model.add_grid(1, [9., 9., 9.])
+        model.add_conrod(1, 1000, [12, 1], A=1.0)
+        model.add_conrod(2, 1000, [506, 1], A=1.0)
+        model.add_conrod(3, 1000, [1, 11], A=1.0)
+
+        tol = 0.2
+        bdf_equivalence_nodes(model, None, tol,
+                              renumber_nodes=False, neq_max=4, xref=False,
+                              crash_on_collapse=False, log=log, debug=False,
+                              chunk_size=2)
+        nids = {nid: node.nid for nid, node in iteritems(model.nodes)}
+        self.assertEqual(nids[11], 10)
+        self.assertEqual(nids[12], 12)
+        for nid in [501, 502, 503, 504, 505, 506]:
+            self.assertEqual(nids[nid], 500)
+        self.assertEqual(nids[1], 1)
+        self.assertEqual(model.elements[1].node_ids, [12, 1])
+        self.assertEqual(model.elements[2].node_ids, [500, 1])
+        self.assertEqual(model.elements[3].node_ids, [1, 10])
+
+    def test_find_closest_nodes(self):
+        """the closest nodes of an array and a model are the same"""
+        model = BDF(log=log, debug=False)
+        nid, unused_eid = create_structured_cquad4s(
+            model, 1, [0., 0., 0.], [4., 0., 0.], [4., 3., 1.], [0., 3., 1.], 8, 6)
+        nids = np.array(sorted(model.nodes), dtype='int32')
+        nodes_xyz = np.array([model.nodes[nidi].get_position() for nidi in nids])
+        xyz_compare = np.array([[0.1, 0.1, 0.], [3.9, 2.9, 1.1], [2., 1.5, 2.]])
+
+        nids_close = find_closest_nodes(nodes_xyz, nids, xyz_compare)
+        self.assertEqual(find_closest_nodes(model, None, xyz_compare).tolist(),
+                         nids_close.tolist())
+        self.assertEqual(nids_close[:2].tolist(), [1, nid - 1])
+
+        nids_close = find_closest_nodes(nodes_xyz, nids, xyz_compare, neq_max=3)
+        self.assertEqual(find_closest_nodes(model, None, xyz_compare, neq_max=3).tolist(),
+                         nids_close.tolist())
+        with self.assertRaises(IndexError):
+            find_closest_nodes(model, None, xyz_compare, tol=0.2)
+
     def test_fix_bad_quads(self):
         """split high interior angle quads"""
         msg = [
@@ -807,7 +867,154 @@ class TestMeshUtils(unittest.TestCase):
             [0.4, 0.6, 0.],
             [-1., -1, 0.],
         ]
-        pierce_shell_model(model, xyz_points)
+        eids_pierce, xyz_pierces_max, node_ids = pierce_shell_model(model, xyz_points)
+        self.assertEqual(eids_pierce, [2, None])
+        np.testing.assert_almost_equal(xyz_pierces_max[0], [0.4, 0.6, 1.])
+        self.assertEqual(node_ids[0], [5, 6, 7, 8])
+
+        # all the pierces of a set of rays
+        origins = [
+            [0.5, 0.5, -1.],  # on the diagonal of the quads
+            [0.5, 0.5, 0.75],
+            [10.5, 0.5, 2.],
+            [5., 0.5, 0.1],
+        ]
+        directions = [
+            [0., 0., 1.],
+            [0.1, 0.1, -1.],
+            [0., 0., -1.],
+            [-1., 0., 0.],
+        ]
+        irays, eids, xyz_pierces, t = pierce_shell_model_by_rays(model, origins, directions)
+        self.assertEqual(irays.tolist(), [0, 0, 0, 1, 1, 2])
+        self.assertEqual(eids.tolist(), [1, 3, 2, 3, 1, 4])
+        np.testing.assert_almost_equal(t, [1., 1.5, 2., 0.25, 0.75, 2.])
+        np.testing.assert_almost_equal(xyz_pierces[3], [0.525, 0.525, 0.5])
+
+        # a line pierces behind the origin
+        irays, eids = pierce_shell_model_by_rays(
+            model, origins[1], directions[1], tmin=-np.inf)[:2]
+        self.assertEqual(eids.tolist(), [2, 3, 1])
+
+        # a warped quad is pierced twice by the same ray
+        model.add_grid(17, [0., 0., 10.])
+        model.add_grid(18, [1., 0., 10.])
+        model.add_grid(19, [1., 1., 10.])
+        model.add_grid(20, [0., 1., 11.])
+        model.add_cquad4(5, pid, [17, 18, 19, 20])
+        model.cross_reference()
+        irays, eids, xyz_pierces, t = pierce_shell_model_by_rays(
+            model, [1.4, -0.2, 9.4], [-0.6, 0.5, 0.6])
+        self.assertEqual(eids.tolist(), [5, 5])
+        np.testing.assert_almost_equal(t, [1., 2.])
+
+        with warnings.catch_warnings(record=True) as warns:
+            warnings.simplefilter('always')
+            pierce_shell_model(model, xyz_points[:1], tol=1.0)
+        self.assertTrue(any(issubclass(warn.category, DeprecationWarning) for warn in warns))
+
+        origins = np.array([[0.2, 0.3, 0.], [2., 0., 0.]])
+        directions = np.array([[0., 0., 1.], [0., 0., 1.]])
+        is_hit, t = triangle_intersections(
+            origins, directions, np.zeros((2, 3)), np.array([[1., 0., 1.]] * 2),
+            np.array([[0., 1., 1.]] * 2))
+        self.assertEqual(is_hit.tolist(), [True, False])
+        self.assertAlmostEqual(t[0], 0.5)
+
+    def test_extract_bodies(self):
+        """tests extract_bodies with rigid elements and MPCs"""
+        model = BDF(log=log)
+        model.add_pshell(1, mid1=1, t=0.1)
+        model.add_mat1(1, 3.0e7, None, 0.3)
+        nid, eid = create_structured_cquad4s(
+            model, 1, [0., 0., 0.], [1., 0., 0.], [1., 1., 0.], [0., 1., 0.], 2, 2)
+        nid, eid = create_structured_cquad4s(
+            model, 1, [0., 0., 2.], [1., 0., 2.], [1., 1., 2.], [0., 1., 2.], 2, 2,
+            nid=nid, eid=eid)
+        model.add_grid(100, [5., 0., 0.])
+        model.add_grid(101, [6., 0., 0.])
+        model.add_conrod(100, 1, [100, 101], A=1.0)
+        model.add_grid(200, [9., 9., 9.])
+
+        body_eids = extract_bodies(model, mpc_id=None)
+        self.assertEqual(len(body_eids), 3)
+        self.assertEqual(body_eids[0][0].tolist(), [1, 2, 3, 4])
+        self.assertEqual(body_eids[1][0].tolist(), [5, 6, 7, 8])
+        self.assertEqual(body_eids[2][0].tolist(), [100])
+        nbodies, node_ids, labels = get_node_body_labels(model)
+        self.assertEqual(nbodies, 3)
+        self.assertEqual(labels[node_ids == 200].tolist(), [-1])
+
+        # the RBE2 ties the plates together and the MPC adds the rod
+        model.add_rbe2(1000, 1, '123456', [10])
+        model.add_mpc(1, [100, 9], [1, 1], [1., -1.])
+        body_eids = extract_bodies(model, mpc_id=None)
+        self.assertEqual(len(body_eids), 2)
+        self.assertEqual(body_eids[0][0].tolist(), [1, 2, 3, 4, 5, 6, 7, 8])
+        self.assertEqual(body_eids[0][1].tolist(), [1000])
+        self.assertEqual(body_eids[1][1].tolist(), [])
+
+        self.assertEqual(len(extract_bodies(model, mpc_id=0)), 1)
+        self.assertEqual(len(extract_bodies(model, mpc_id=1)), 1)
+        nbodies, node_ids, labels = get_node_body_labels(model, mpc_id=1)
+        self.assertEqual(nbodies, 1)
+        self.assertEqual(labels.tolist(), [0] * 20 + [-1])
+
+    def test_extract_bodies_no_grids(self):
+        """the CHBDYEs don't reference a GRID, so they don't add any edges"""
+        bdf_filename = os.path.join(pkg_path, '..', 'models', 'elements',
+                                    'time_thermal_elements.bdf')
+        model = read_bdf(bdf_filename, log=log)
+        body_eids = extract_bodies(model)
+        self.assertEqual(len(body_eids), 1)
+        self.assertEqual(body_eids[0][0].tolist(), [1])
+
+    def test_free_edges_and_faces(self):
+        """tests the shell free edges and the solid skin faces"""
+        model = BDF(log=log)
+        nid, eid = create_structured_cquad4s(
+            model, 1, [0., 0., 0.], [1., 0., 0.], [1., 1., 0.], [0., 1., 0.], 2, 2)
+        edges = free_edges(model)
+        self.assertEqual(len(edges), 8)
+        self.assertEqual(edges, sorted(edges))
+        self.assertIn((1, 2), edges)
+        self.assertEqual(non_paired_edges(model), edges)
+
+        # a rib on the middle row of edges (x=0.5)
+        model.add_grid(nid, [0.5, 0., 1.])
+        model.add_grid(nid + 1, [0.5, 0.5, 1.])
+        model.add_grid(nid + 2, [0.5, 1., 1.])
+        model.add_cquad4(eid, 1, [4, 5, nid + 1, nid])
+        model.add_cquad4(eid + 1, 1, [5, 6, nid + 2, nid + 1])
+        edges, counts = get_shell_edge_counts(model)
+        self.assertEqual(edges[counts == 3].tolist(), [[4, 5], [5, 6]])
+        self.assertEqual(len(free_edges(model)), 12)
+        self.assertEqual(len(non_paired_edges(model)), 14)
+
+        # a CHEXA8 next to a CHEXA20 (the faces don't match) and 2 CTETRA4s
+        model = BDF(log=log)
+        for nidi in range(1, 31):
+            model.add_grid(nidi, [float(nidi), 0., 0.])
+        model.add_chexa(1, 1, [1, 2, 3, 4, 5, 6, 7, 8])
+        model.add_chexa(2, 1, [5, 6, 7, 8] + list(range(11, 27)))
+        model.add_ctetra(3, 1, [1, 2, 3, 30])
+        model.add_ctetra(4, 1, [1, 2, 3, 29])
+        faces, eids = get_solid_skin_face_arrays(model)
+
+        expected = []
+        for eidi, elem in sorted(model.elements.items()):
+            for face in elem.faces.values():
+                if sorted(face) != [1, 2, 3]:
+                    expected.append((eidi, face))
+        self.assertEqual(len(eids), len(expected))
+        for eidi, face in zip(eids, faces.tolist()):
+            self.assertIn((eidi, [nidi for nidi in face if nidi]), expected)
+
+        eid_set, face_map = get_solid_skin_faces(model)
+        self.assertNotIn((1, 2, 3), eid_set)
+        self.assertEqual(eid_set[(5, 6, 7, 8)], [1])
+        self.assertEqual(face_map[(1, 2, 3, 4)], [1, 2, 3, 4])
+        self.assertEqual(len(eid_set), len(expected))
 
     #def test_intersect(self):
         #p0 = np.array([0,0,0], 'd')
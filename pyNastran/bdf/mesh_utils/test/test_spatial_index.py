@@ -0,0 +1,170 @@
+"""tests the SpatialIndex of the BDF"""
+from __future__ import print_function
+import unittest
+
+import numpy as np
+
+from pyNastran.bdf.bdf import BDF
+from pyNastran.bdf.mesh_utils.mesh import create_structured_cquad4s
+from pyNastran.bdf.mesh_utils.spatial_index import SpatialIndex, _build_bvh
+from pyNastran.utils.log import SimpleLogger
+
+log = SimpleLogger(level='error')
+
+
+def _get_model():
+    """a curved plate with a rod and a grounded spring"""
+    model = BDF(log=log)
+    model.add_pshell(1, mid1=1, t=0.1)
+    model.add_mat1(1, 3.0e7, None, 0.3)
+    nid, eid = create_structured_cquad4s(
+        model, 1, [0., 0., 0.], [4., 0., 0.], [4., 3., 1.], [0., 3., 1.], 8, 6)
+    model.add_grid(nid, [10., 10., 10.])
+    model.add_conrod(eid, 1, [1, nid], A=1.0)
+    model.add_spoint([100])
+    model.add_celas2(eid + 1, 1000., [nid, 100], c1=1)
+    model.add_celas2(eid + 2, 1000., [100, 0], c1=1)
+    return model
+
+
+def _get_brute_force_boxes(model):
+    """gets the element bounding boxes with a loop"""
+    boxes = {}
+    for eid, elem in model.elements.items():
+        xyz = np.array([model.nodes[nid].get_position() for nid in elem.node_ids
+                        if nid in model.nodes])
+        if len(xyz):
+            boxes[eid] = (xyz.min(axis=0), xyz.max(axis=0))
+    return boxes
+
+
+class TestSpatialIndex(unittest.TestCase):
+    """tests the SpatialIndex"""
+
+    def test_spatial_index_queries(self):
+        """the tree queries match the brute force queries"""
+        model = _get_model()
+        spatial_index = SpatialIndex(model, leaf_size=2)
+        boxes = _get_brute_force_boxes(model)
+        self.assertEqual(sorted(boxes), spatial_index.element_ids.tolist())
+        for eid, box_min, box_max in zip(spatial_index.element_ids,
+                                         spatial_index.element_box_min,
+                                         spatial_index.element_box_max):
+            np.testing.assert_array_equal(box_min, boxes[eid][0])
+            np.testing.assert_array_equal(box_max, boxes[eid][1])
+
+        nids = sorted(model.nodes)
+        xyz = np.array([model.nodes[nid].get_position() for nid in nids])
+        for point in [[1.1, 1.1, 0.3], [0., 0., 0.], [3.9, 2.9, 0.97], [5., 5., 5.]]:
+            point = np.array(point)
+            eids = [eid for eid, (box_min, box_max) in sorted(boxes.items())
+                    if np.all(box_min <= point) and np.all(point <= box_max)]
+            self.assertEqual(spatial_index.get_elements_at_point(point).tolist(), eids)
+
+            eids = [eid for eid, (box_min, box_max) in sorted(boxes.items())
+                    if np.all(box_min <= point + 0.5) and np.all(point - 0.5 <= box_max)]
+            self.assertEqual(spatial_index.get_elements_in_box(
+                point - 0.5, point + 0.5).tolist(), eids)
+            self.assertEqual(spatial_index.get_elements_at_point(point, tol=0.5).tolist(), eids)
+
+            distances = np.linalg.norm(xyz - point, axis=1)
+            inids = np.where(distances <= 1.0)[0]
+            self.assertEqual(spatial_index.get_nodes_in_sphere(point, 1.0).tolist(),
+                             [nids[i] for i in inids])
+            inids = np.where(np.all(np.abs(xyz - point) <= 1.0, axis=1))[0]
+            self.assertEqual(spatial_index.get_nodes_in_box(point - 1., point + 1.).tolist(),
+                             [nids[i] for i in inids])
+
+            distance, nid = spatial_index.get_closest_nodes(point)
+            self.assertEqual(nid, nids[np.argmin(distances)])
+            self.assertAlmostEqual(distance, distances.min())
+
+            eid, distance = spatial_index.get_closest_element(point)
+            distances = {
+                eidi: np.linalg.norm(np.maximum(np.maximum(box_min - point, point - box_max), 0.))
+                for eidi, (box_min, box_max) in boxes.items()}
+            self.assertAlmostEqual(distance, min(distances.values()))
+            self.assertAlmostEqual(distances[eid], distance)
+
+        # the plane x + z = 2.1
+        normal = np.array([1., 0., 1.]) / np.sqrt(2.)
+        for tol in [0., 0.25]:
+            eids = []
+            for eid, (box_min, box_max) in sorted(boxes.items()):
+                corners = np.array([[x, y, z] for x in [box_min[0], box_max[0]]
+                                    for y in [box_min[1], box_max[1]]
+                                    for z in [box_min[2], box_max[2]]])
+                distances = (corners - [2.1, 0., 0.]).dot(normal)
+                if distances.min() <= tol and distances.max() >= -tol:
+                    eids.append(eid)
+            self.assertEqual(spatial_index.get_elements_near_plane(
+                [2.1, 0., 0.], [1., 0., 1.], tol=tol).tolist(), eids)
+
+        # the far node is not found within the tolerance
+        unused_distance, nid = spatial_index.get_closest_nodes([[20., 20., 20.]], tol=1.)
+        self.assertEqual(nid.tolist(), [-1])
+
+        # a +z ray through the plate and a ray along the plate
+        eids, tmin = spatial_index.get_elements_on_ray([1.1, 1.1, -1.], [0., 0., 1.])
+        self.assertEqual(sorted(eids.tolist()), spatial_index.get_elements_in_box(
+            [1.1, 1.1, -1.], [1.1, 1.1, 100.]).tolist())
+        self.assertTrue(np.all(np.diff(tmin) >= 0.))
+        eids, tmin = spatial_index.get_elements_on_ray([-1., 1.1, 0.4], [1., 0., 0.],
+                                                       tmax=2.)
+        self.assertEqual(sorted(eids.tolist()), spatial_index.get_elements_in_box(
+            [-1., 1.1, 0.4], [1., 1.1, 0.4]).tolist())
+        eids = spatial_index.get_elements_on_ray([-1., 1.1, 0.4], [-1., 0., 0.])[0]
+        self.assertEqual(len(eids), 0)
+
+    def test_spatial_index_cache(self):
+        """the cached index is rebuilt when the model changes"""
+        model = _get_model()
+        spatial_index = model.spatial_index
+        self.assertIs(model.spatial_index, spatial_index)
+
+        model.add_grid(200, [0., 0., 5.])
+        spatial_index2 = model.spatial_index
+        self.assertIsNot(spatial_index2, spatial_index)
+        self.assertEqual(spatial_index2.get_closest_nodes([0., 0., 4.5])[1], 200)
+
+        model.nodes[200].set_position(model, np.array([0., 0., -5.]), xref=False)
+        self.assertEqual(model.spatial_index.get_closest_nodes([0., 0., -4.5])[1], 200)
+
+        # moving a node directly isn't seen until the index is cleared
+        spatial_index3 = model.spatial_index
+        model.nodes[200].xyz = np.array([0., 0., 5.])
+        self.assertIs(model.spatial_index, spatial_index3)
+        model.clear_spatial_index()
+        self.assertIsNot(model.spatial_index, spatial_index3)
+        self.assertEqual(model.spatial_index.get_closest_nodes([0., 0., 4.5])[1], 200)
+
+        # replacing an element without changing the number of elements
+        eid = model.spatial_index.get_closest_element([0., 0., 5.])[0]
+        self.assertNotEqual(model.elements[eid].type, 'CTRIA3')
+        del model.elements[2]
+        model.add_ctria3(2, 1, [200, 1, 2])
+        self.assertEqual(model.spatial_index.get_closest_element([0., 0., 5.]), (2, 0.))
+
+        model.clear_spatial_index()
+        self.assertIs(model._spatial_index, None)
+        self.assertNotIn('spatial_index', model.object_attributes())
+
+    def test_build_bvh(self):
+        """the leaves of the tree hold each box once"""
+        np.random.seed(42)
+        box_min = np.random.random((1000, 3))
+        box_max = box_min + 0.01
+        bvh_min, bvh_max, bvh_left, bvh_start, bvh_count, order = _build_bvh(
+            box_min, box_max, leaf_size=5)
+        is_leaf = bvh_left < 0
+        self.assertTrue(np.all(bvh_count[is_leaf] <= 5))
+        self.assertEqual(bvh_count[is_leaf].sum(), 1000)
+        self.assertEqual(sorted(order), list(range(1000)))
+        for inode in np.where(is_leaf)[0]:
+            iboxes = order[bvh_start[inode]:bvh_start[inode] + bvh_count[inode]]
+            self.assertTrue(np.all(box_min[iboxes] >= bvh_min[inode]))
+            self.assertTrue(np.all(box_max[iboxes] <= bvh_max[inode]))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
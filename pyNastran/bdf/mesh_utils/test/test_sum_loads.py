@@ -8,6 +8,7 @@ import numpy as np
 import pyNastran
 from pyNastran.bdf.bdf import BDF
 from pyNastran.bdf.bdf import CORD2C, GRID, FORCE
+from pyNastran.bdf.mesh_utils.loads import sum_forces_moments, sum_forces_moments_all
 model_path = os.path.join(pyNastran.__path__[0], '..', 'models')
 
 log = None
@@ -483,5 +484,78 @@ class TestLoadSum(unittest.TestCase):
         self.assertTrue(allclose(M2_expected, M), 'loadcase_id=%s M_expected=%s M=%s' % (loadcase_id, M2_expected, M))
 
 
+    def _check_sum_forces_moments_all(self, model, p0, include_grav=False):
+        """sum_forces_moments_all is the same as sum_forces_moments"""
+        loadcase_ids, forces, moments = sum_forces_moments_all(
+            model, p0, include_grav=include_grav)
+        self.assertEqual(loadcase_ids.tolist(),
+                         sorted(set(model.load_combinations) | set(model.loads)))
+        for loadcase_id, force, moment in zip(loadcase_ids.tolist(), forces, moments):
+            F, M = sum_forces_moments(model, p0, loadcase_id, include_grav=include_grav)
+            assert np.allclose(F, force), 'loadcase_id=%s F=%s force=%s' % (
+                loadcase_id, F, force)
+            assert np.allclose(M, moment), 'loadcase_id=%s M=%s moment=%s' % (
+                loadcase_id, M, moment)
+        return loadcase_ids, forces, moments
+
+    def test_loads_sum_all_models(self):
+        """tests sum_forces_moments_all against sum_forces_moments"""
+        bdf_filenames = [
+            os.path.join(model_path, 'solid_bending', 'solid_bending.bdf'),
+            os.path.join(model_path, 'sol_101_elements', 'static_solid_shell_bar.bdf'),
+            os.path.join(model_path, 'plate', 'plate.bdf'),
+            os.path.join(model_path, 'real', 'loads', 'loads.bdf'),
+            os.path.join(model_path, 'elements', 'static_elements.bdf'),
+            os.path.join(model_path, 'pload4', 'pload1.bdf'),
+        ]
+        p0 = array([1., 2., 3.])
+        for bdf_filename in bdf_filenames:
+            model = BDF(log=log, debug=False)
+            model.read_bdf(bdf_filename)
+            self._check_sum_forces_moments_all(model, p0)
+
+    def test_loads_sum_all_combinations(self):
+        """tests the LOAD combinations, coordinate systems and GRAV"""
+        model = BDF(log=log, debug=False)
+        model.add_grid(1, [0., 0., 0.])
+        model.add_grid(2, [1., 0., 0.])
+        model.add_grid(3, [1., 1., 0.])
+        model.add_grid(4, [0., 1., 0.])
+        model.add_grid(5, [0., 0., 1.])
+        model.add_cquad4(10, 100, [1, 2, 3, 4])
+        model.add_ctria3(11, 100, [1, 2, 5])
+        model.add_pshell(100, mid1=1000, t=0.1)
+        model.add_mat1(1000, 3.0e7, None, 0.3, rho=0.2)
+        model.add_cord2c(1, rid=0, origin=[0., 0., 0.], zaxis=[0., 0., 1.],
+                         xzplane=[1., 0., 0.])
+        model.add_cord2r(2, rid=0, origin=[0., 0., 0.], zaxis=[0., 1., 1.],
+                         xzplane=[1., 0., 0.])
+
+        model.add_force(1, 3, 1.1, [1., 90., 0.], cid=1)
+        model.add_force(1, 5, 2.2, [1., 2., 3.], cid=2)
+        model.add_moment(1, 2, 3.3, [0., 0., 1.], cid=2)
+        model.add_pload4(2, [10, 11], [1., 2., 3., 4.])
+        model.add_pload4(2, [10], [5., 5., 5., 5.], nvector=[0., 1., 1.])
+        model.add_pload(2, 6., [1, 2, 5])
+        model.add_pload2(2, 7., [10, 11])
+        model.add_grav(3, 32.2, [0., 0., -1.])
+        model.add_load(101, 2., [0.5, 2.], [1, 2])
+        model.add_load(102, 1., [0., 3.], [1, 3])
+        model.add_load(103, 0.5, [2.], [101])
+        model.cross_reference()
+
+        p0 = 5
+        loadcase_ids, forces, moments = self._check_sum_forces_moments_all(
+            model, p0, include_grav=True)
+        self.assertEqual(loadcase_ids.tolist(), [1, 2, 3, 101, 102, 103])
+        self.assertTrue(allclose(forces[3, :], forces[5, :]))
+        self.assertTrue(allclose(moments[3, :], moments[5, :]))
+        self.assertTrue(allclose(forces[4, :], 3. * forces[2, :]))
+
+        loadcase_ids, forces, moments = sum_forces_moments_all(model, p0, [102])
+        self.assertEqual(loadcase_ids.tolist(), [102])
+        self.assertTrue(allclose(forces, 0.))
+        self.assertTrue(allclose(moments, 0.))
+
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
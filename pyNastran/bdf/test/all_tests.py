@@ -12,6 +12,8 @@ from pyNastran.bdf.mesh_utils.test.test_renumber import TestRenumber
 from pyNastran.bdf.mesh_utils.test.test_remove_unused import TestRemoveUnused
 from pyNastran.bdf.mesh_utils.test.test_mass import TestMass
 from pyNastran.bdf.mesh_utils.test.test_sum_loads import TestLoadSum
+from pyNastran.bdf.mesh_utils.test.test_spatial_index import TestSpatialIndex
+from pyNastran.bdf.mesh_utils.test.test_connectivity import TestConnectivity
 
 from pyNastran.bdf.patran_utils.test_patran import TestPatran
 
@@ -21,7 +23,11 @@ from pyNastran.bdf.test.test_openmdao import TestOpenMDAO
 
 # bdf_interface
 from pyNastran.bdf.bdf_interface.test.test_assign_type import TestAssignType
+from pyNastran.bdf.bdf_interface.test.test_bulk_tokenizer import TestBulkTokenizer
+from pyNastran.bdf.bdf_interface.test.test_bdf_parallel import TestBDFParallel
+from pyNastran.bdf.bdf_interface.test.test_bdf_cache import TestBDFCache
 from pyNastran.bdf.bdf_interface.test.test_dev_utils import DevUtils
+from pyNastran.bdf.bdf_interface.test.test_cross_reference import TestCrossReference
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -4,10 +4,12 @@ from six.moves import zip, range
 import random
 import unittest
 
-from pyNastran.bdf.field_writer_8 import (print_field_8, print_float_8,
+import numpy as np
+from pyNastran.bdf.field_writer_8 import (print_field_8, print_float_8, format_floats_8,
                                           set_default_if_blank,
                                           set_blank_if_default, is_same, print_card_8)
-from pyNastran.bdf.field_writer_16 import print_field_16, print_card_16, print_float_16, print_scientific_16
+from pyNastran.bdf.field_writer_16 import (print_field_16, print_card_16, print_float_16,
+                                           print_scientific_16, format_floats_16)
 from pyNastran.bdf.field_writer_double import print_card_double
 
 
@@ -441,6 +443,56 @@ class Testfield_writer_8(unittest.TestCase):
             positive_output = [print_float_16(x) for x in nums]
             negative_output = [print_float_16(-x) for x in nums]
 
+    def test_format_floats_8(self):
+        """format_floats_8 is the same as print_float_8"""
+        for values in _get_random_floats(seed=8):
+            self._check_format_floats(values, format_floats_8, print_float_8, 8)
+
+        strings = format_floats_8([[0., 1.], [-0.25, np.nan]])
+        self.assertEqual(strings.shape, (2, 2))
+        self.assertEqual(strings.tolist(), [['      0.', '      1.'], ['    -.25', '        ']])
+        self.assertEqual(format_floats_8([]).shape, (0, ))
+
+    def test_format_floats_16(self):
+        """format_floats_16 is the same as print_float_16"""
+        for values in _get_random_floats(seed=16):
+            self._check_format_floats(values, format_floats_16, print_float_16, 16)
+
+    def _check_format_floats(self, values, format_func, print_func, width):
+        """compares the vectorized strings to the scalar strings"""
+        strings = format_func(values)
+        self.assertEqual(strings.shape, values.shape)
+        for value, field in zip(values.tolist(), strings.tolist()):
+            self.assertGreaterEqual(len(field), width)
+            self.assertEqual(field, print_func(value), msg='value=%r' % value)
+
+
+def _get_random_floats(seed, nvalues=20000):
+    """
+    Gets random floats over the ranges of print_float_8/16, the rounding
+    boundaries (e.g., 9.9999999), exact ties (e.g., 0.125) and the common
+    values (e.g., 0., 1.)
+    """
+    rand = np.random.RandomState(seed)
+    mantissa = rand.uniform(-10., 10., nvalues)
+    exponent = rand.randint(-18, 18, nvalues)
+    values = mantissa * 10. ** exponent
+    yield values
+    yield np.round(values, rand.randint(0, 8))
+    yield values.astype('float32').astype('float64')
+
+    # 9.9999995 rounds up, so the number of digits changes
+    nines = np.array([1. - 10. ** -i for i in range(1, 17)])
+    nines = np.hstack([nines * 10. ** i for i in range(-3, 16)])
+    yield np.hstack([nines, -nines])
+
+    # x.5 in the last digit is a tie that's rounded to the even digit
+    ties = (rand.randint(-10 ** 7, 10 ** 7, nvalues) + 0.5) / 2. ** rand.randint(0, 20, nvalues)
+    yield ties
+
+    yield np.array([0., -0., 1., -1., 0.5, 0.3, 0.001, -0.01, 1e5, -1e5, 1e6,
+                    3.0e7, 2.1e11, 7.85e-9, 5e-8, -5e-7, 1e14, -1e13, np.nan])
+
 def compare(value_in):
     field = print_field_8(value_in)
 
@@ -1,5 +1,6 @@
 from __future__ import unicode_literals, print_function
 import os
+import sys
 from codecs import open as codec_open
 import unittest
 from six import PY2, StringIO
@@ -427,6 +428,72 @@ class TestReadWrite(unittest.TestCase):
         assert eigb.comment == '$ this is a preload buckling case\n', 'comment=%r\n%s' % (eigb.comment, str(eigb))
         os.remove(bdf_filename2)
 
+    def test_write_bulk(self):
+        """the bulk GRID/element writer matches the card writer"""
+        model = BDF(log=log, debug=False)
+        model.add_grid(1, [0., 0., 0.])
+        model.add_grid(2, [1.e-9, -0.0, 1234567.8])
+        model.add_grid(3, [1., 1., 0.], cp=1)
+        model.add_grid(4, [0., 1., -1.e-5], cd=1)
+        model.add_grid(5, [0.1, 0.2, 0.3], comment='comment')
+        model.add_grid(6, [-0.1, 0.2, -9999999.], seid=2, ps='123')
+        for nid in range(7, 21):
+            model.add_grid(nid, [float(nid), 0.5, 0.])
+        model.add_cord2r(1, origin=[0., 0., 0.], zaxis=[0., 0., 1.], xzplane=[1., 0., 0.])
+
+        model.add_cquad4(10, 100, [1, 2, 3, 4])
+        model.add_cquad4(11, 100, [1, 2, 3, 4], theta_mcid=1)
+        model.add_cquad4(12, 100, [1, 2, 3, 4], zoffset=0.1)
+        model.add_cquad4(13, 100, [1, 2, 3, 4], T1=1.0, T2=1.0, T3=1.0, T4=1.0)
+        model.add_ctria3(20, 100, [1, 2, 3])
+        model.add_ctria3(21, 100, [1, 2, 3], theta_mcid=0.5, comment='tri')
+        model.add_ctetra(30, 200, [1, 2, 3, 4])
+        model.add_ctetra(31, 200, [1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+        model.add_ctetra(32, 200, [1, 2, 3, 4, 5, None, 7, 8, 9, 10])
+        model.add_chexa(40, 200, [1, 2, 3, 4, 5, 6, 7, 8])
+        model.add_chexa(41, 200, list(range(1, 21)))
+        model.add_chexa(42, 200, list(range(1, 9)) + [None] * 12)
+        model.add_cbar(50, 300, [1, 2], [0., 0., 1.], None)
+        model.add_cbar(51, 300, [1, 2], None, 3)
+        model.add_cbar(52, 300, [1, 2], [0., 1., 0.], None, pa=123)
+        model.add_cbush(60, 400, [1, 2], [0., 0., 1.], None)
+        model.add_cbush(61, 400, [1, 2], [None, None, None], None, cid=1)
+        model.add_cbush(62, 400, [1, 2], None, 3)
+        model.add_cbush(63, 400, [1, 2], [0., 0., 1.], None, s=0.25)
+        model.add_conrod(70, 1000, [1, 2], A=1.0)
+
+        nodes = [node for nid, node in sorted(model.nodes.items())]
+        elements = [elem for eid, elem in sorted(model.elements.items())]
+        for size, is_double in [(8, False), (16, False), (16, True)]:
+            bdf_file = StringIO()
+            model._write_grids(bdf_file, size=size, is_double=is_double, is_long_ids=False)
+            model._write_elements(bdf_file, size=size, is_double=is_double, is_long_ids=False)
+            expected = '$NODES\n' + ''.join(node.write_card(size, is_double) for node in nodes)
+            expected += '$ELEMENTS\n' + ''.join(elem.write_card(size, is_double)
+                                                 for elem in elements)
+            self.assertEqual(bdf_file.getvalue(), expected)
+
+        bdf_file = StringIO()
+        model.write_bdf(bdf_file, close=False)
+        bdf_file.seek(0)
+        model2 = BDF(log=log, debug=False)
+        model2.read_bdf(bdf_file, punch=True, xref=False)
+        self.assertEqual(model2.nodes[20].xyz.tolist(), [20., 0.5, 0.])
+        self.assertEqual(model2.nodes[3].cp, 1)
+        self.assertEqual(model2.elements[41].node_ids, list(range(1, 21)))
+
+        # the card that fails is reported
+        model.elements[12].pid = [100]
+        stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            with self.assertRaises(TypeError):
+                model._write_elements(StringIO())
+            msg = sys.stdout.getvalue()
+        finally:
+            sys.stdout = stdout
+        self.assertIn('type=CQUAD4 eid=12', msg)
+
     def test_paths(self):
         """tests parsing paths"""
         include_dir = ''
@@ -95,6 +95,49 @@ class CONM2(VectorizedCard):
         else:
             return mass
 
+    def get_mass_matrices(self, model):
+        """
+        Gets the mass matrices of all the CONM2s about their nodes
+
+        Returns
+        -------
+        M : (nelements, 6, 6) float ndarray
+            the mass matrices
+        dofs : (nelements, 6) int ndarray
+            the global dofs of the mass matrices
+
+        """
+        if (self.coord_id != 0).any():
+            msg = 'CONM2 doesnt support coord_id != 0; element_id=%s' % (
+                self.element_id[self.coord_id != 0])
+            raise NotImplementedError(msg)
+        mass = self.mass
+        x1, x2, x3 = self.x[:, 0], self.x[:, 1], self.x[:, 2]
+        I11, I21, I22, I31, I32, I33 = [self.I[:, j] for j in range(6)]
+
+        M = zeros((self.n, 6, 6), dtype='float64')
+        M[:, 0, 0] = M[:, 1, 1] = M[:, 2, 2] = mass
+
+        # the offset couples the translations and the rotations
+        M[:, 0, 4] = M[:, 4, 0] = mass * x3
+        M[:, 0, 5] = M[:, 5, 0] = -mass * x2
+        M[:, 1, 3] = M[:, 3, 1] = -mass * x3
+        M[:, 1, 5] = M[:, 5, 1] = mass * x1
+        M[:, 2, 3] = M[:, 3, 2] = mass * x2
+        M[:, 2, 4] = M[:, 4, 2] = -mass * x1
+
+        # the inertia about the node
+        M[:, 3, 3] = I11 + mass * (x2 ** 2 + x3 ** 2)
+        M[:, 4, 4] = I22 + mass * (x1 ** 2 + x3 ** 2)
+        M[:, 5, 5] = I33 + mass * (x1 ** 2 + x2 ** 2)
+        M[:, 3, 4] = M[:, 4, 3] = -I21 - mass * x1 * x2
+        M[:, 3, 5] = M[:, 5, 3] = -I31 - mass * x1 * x3
+        M[:, 4, 5] = M[:, 5, 4] = -I32 - mass * x2 * x3
+
+        inode = model.grid.get_node_index_by_node_id(self.node_id)
+        dofs = 6 * inode[:, None] + arange(6)
+        return M, dofs
+
     def get_stats(self):
         msg = []
         if self.n:
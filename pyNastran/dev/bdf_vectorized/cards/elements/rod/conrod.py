@@ -1,7 +1,7 @@
 from __future__ import print_function
 from six.moves import zip, range
 
-from numpy import arange, zeros, unique, dot, array, transpose
+from numpy import arange, zeros, unique, dot, array, transpose, hstack
 from numpy.linalg import norm  # type: ignore
 
 from pyNastran.bdf.field_writer_8 import print_card_8
@@ -43,6 +43,98 @@ def _Lambda(v1, debug=True):
     return Lambda
 
 
+def _rod_stiffness_matrices(dxyz12, k_axial, k_torsion):
+    """
+    Gets the stiffness matrices of a set of rods
+
+    Parameters
+    ----------
+    dxyz12 : (nelements, 3) float ndarray
+        the vector between the end points of each rod
+    k_axial : (nelements, ) float ndarray
+        the axial stiffness (A*E/L)
+    k_torsion : (nelements, ) float ndarray
+        the torsional stiffness (G*J/L)
+
+    Returns
+    -------
+    K : (nelements, 12, 12) float ndarray
+        the stiffness matrices in the order of ``_rod_dofs``
+
+    """
+    L = norm(dxyz12, axis=1)
+    if L.min() == 0.0:
+        raise ZeroDivisionError('invalid rod length=0.0')
+    v = dxyz12 / L[:, None]
+
+    # Lambda.T * [[1, -1], [-1, 1]] * Lambda
+    vv = v[:, :, None] * v[:, None, :]
+    nelements = len(L)
+    K = zeros((nelements, 12, 12), 'float64')
+    for k, i0 in [(k_axial, 0), (k_torsion, 6)]:
+        kvv = k[:, None, None] * vv
+        K[:, i0:i0+3, i0:i0+3] = kvv
+        K[:, i0+3:i0+6, i0+3:i0+6] = kvv
+        K[:, i0:i0+3, i0+3:i0+6] = -kvv
+        K[:, i0+3:i0+6, i0:i0+3] = -kvv
+    return K
+
+
+def _rod_mass_matrices(dxyz12, mass):
+    """
+    Gets the consistent mass matrices of a set of rods
+
+    Parameters
+    ----------
+    dxyz12 : (nelements, 3) float ndarray
+        the vector between the end points of each rod
+    mass : (nelements, ) float ndarray
+        the mass of each rod
+
+    Returns
+    -------
+    M : (nelements, 6, 6) float ndarray
+        the mass matrices for the translational dofs of ``_rod_dofs``
+
+    """
+    L = norm(dxyz12, axis=1)
+    if L.min() == 0.0:
+        raise ZeroDivisionError('invalid rod length=0.0')
+    v = dxyz12 / L[:, None]
+
+    # Lambda.T * [[2, 1], [1, 2]] * Lambda
+    mvv = (mass / 6.)[:, None, None] * (v[:, :, None] * v[:, None, :])
+    nelements = len(L)
+    M = zeros((nelements, 6, 6), 'float64')
+    M[:, :3, :3] = 2. * mvv
+    M[:, 3:, 3:] = 2. * mvv
+    M[:, :3, 3:] = mvv
+    M[:, 3:, :3] = mvv
+    return M
+
+
+def _rod_dofs(i1, i2):
+    """
+    Gets the dofs of a set of rods
+
+    Parameters
+    ----------
+    i1 / i2 : (nelements, ) int ndarray
+        the first dof of the end points of each rod
+
+    Returns
+    -------
+    dofs : (nelements, 12) int ndarray
+        the axial dofs (u1, u2), then the torsional dofs (theta1, theta2)
+
+    """
+    i1 = i1[:, None]
+    i2 = i2[:, None]
+    translation = arange(3)
+    rotation = arange(3, 6)
+    return hstack([i1 + translation, i2 + translation, i1 + rotation, i2 + rotation])
+
+
 class CONROD(RodElement):
     type = 'CONROD'
     def __init__(self, model):
@@ -354,6 +446,50 @@ class CONROD(RodElement):
         self.model.log.info('dofs = %s' % dofs)
         return(M, dofs, n_ijv)
 
+    def get_mass_matrices(self, model, xyz_cid0):
+        """
+        Gets the mass matrices of all the CONRODs
+
+        Returns
+        -------
+        M : (nelements, 6, 6) float ndarray
+            the mass matrices
+        dofs : (nelements, 6) int ndarray
+            the global dofs of the mass matrices
+
+        """
+        i1, i2 = self.get_node_indicies_by_element_index()
+        dxyz12 = xyz_cid0[i1, :] - xyz_cid0[i2, :]
+        L = norm(dxyz12, axis=1)
+        imid = self.model.materials.mat1.get_material_index_by_material_id(self.material_id)
+        rho = self.model.materials.mat1.rho[imid]
+        mass = L * (rho * self.A + self.nsm)
+        M = _rod_mass_matrices(dxyz12, mass)
+        dofs = _rod_dofs(6 * i1, 6 * i2)[:, :6]
+        return M, dofs
+
+    def get_stiffness_matrices(self, model, xyz_cid0):
+        """
+        Gets the stiffness matrices of all the CONRODs
+
+        Returns
+        -------
+        K : (nelements, 12, 12) float ndarray
+            the stiffness matrices
+        dofs : (nelements, 12) int ndarray
+            the global dofs of the stiffness matrices
+
+        """
+        i1, i2 = self.get_node_indicies_by_element_index()
+        dxyz12 = xyz_cid0[i1, :] - xyz_cid0[i2, :]
+        L = norm(dxyz12, axis=1)
+        imid = self.model.materials.mat1.get_material_index_by_material_id(self.material_id)
+        E = self.model.materials.mat1.E[imid]
+        G = self.model.materials.mat1.G[imid]
+        K = _rod_stiffness_matrices(dxyz12, self.A * E / L, G * self.J / L)
+        dofs = _rod_dofs(6 * i1, 6 * i2)
+        return K, dofs
+
     def get_stiffness_matrix(self, i, model, positions, index0s, knorm=1.0):  # CROD/CONROD
         #print("----------------")
         A = self.get_area_from_index(i)
@@ -5,7 +5,8 @@ import numpy as np
 from numpy import array, dot, arange, zeros, unique, searchsorted, transpose, int64
 from numpy.linalg import norm  # type: ignore
 
-from pyNastran.dev.bdf_vectorized.cards.elements.rod.conrod import _Lambda
+from pyNastran.dev.bdf_vectorized.cards.elements.rod.conrod import (
+    _Lambda, _rod_stiffness_matrices, _rod_mass_matrices, _rod_dofs)
 from pyNastran.utils.dev import list_print
 
 from pyNastran.bdf.field_writer_8 import print_card_8
@@ -337,6 +338,48 @@ class CROD(RodElement):
         return(M, dofs, n_ijv)
 
 
+    def get_mass_matrices(self, model, xyz_cid0):
+        """
+        Gets the mass matrices of all the CRODs
+
+        Returns
+        -------
+        M : (nelements, 6, 6) float ndarray
+            the mass matrices
+        dofs : (nelements, 6) int ndarray
+            the global dofs of the mass matrices
+
+        """
+        i1, i2 = self.get_node_indicies()
+        dxyz12 = xyz_cid0[i1, :] - xyz_cid0[i2, :]
+        mass = self.get_mass_by_element_index(xyz_cid0=xyz_cid0)
+        M = _rod_mass_matrices(dxyz12, mass)
+        dofs = _rod_dofs(6 * i1, 6 * i2)[:, :6]
+        return M, dofs
+
+    def get_stiffness_matrices(self, model, xyz_cid0):
+        """
+        Gets the stiffness matrices of all the CRODs
+
+        Returns
+        -------
+        K : (nelements, 12, 12) float ndarray
+            the stiffness matrices
+        dofs : (nelements, 12) int ndarray
+            the global dofs of the stiffness matrices
+
+        """
+        i1, i2 = self.get_node_indicies()
+        dxyz12 = xyz_cid0[i1, :] - xyz_cid0[i2, :]
+        L = norm(dxyz12, axis=1)
+        A = self.get_area_by_property_id(self.property_id)
+        E = self.get_E_by_property_id(self.property_id)
+        G = self.get_G_by_property_id(self.property_id)
+        J = self.get_J_by_property_id(self.property_id)
+        K = _rod_stiffness_matrices(dxyz12, A * E / L, G * J / L)
+        dofs = _rod_dofs(6 * i1, 6 * i2)
+        return K, dofs
+
     #=========================================================================
     def get_stiffness_matrix(self, i, model, positions, index0s, knorm=1.0):
         #print("----------------")
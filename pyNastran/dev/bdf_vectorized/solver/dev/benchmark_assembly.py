@@ -0,0 +1,120 @@
+"""
+Times the sparse assembly and solution of the solver matrices.
+
+A truss tower (a lattice of rods on the edges and face diagonals of
+nx x 2 x 2 cells), which is fixed at x=0, is assembled from 1k to 1M dofs.
+The tower has a constant bandwidth, so the direct solves scale with the
+number of dofs.  The assembly of the COO triplets into a
+CSR matrix, the static solution (spsolve) and the lowest 10 modes (eigsh)
+are timed.  Only the axial and torsional dofs of the rods have stiffness,
+so the rotational dofs are constrained.
+
+Usage
+-----
+python benchmark_assembly.py [NDOFS_MAX]
+
+"""
+from __future__ import print_function
+import sys
+import time
+
+import numpy as np
+from scipy.sparse.linalg import spsolve, eigsh  # type: ignore
+
+from pyNastran.dev.bdf_vectorized.cards.elements.rod.conrod import (
+    _rod_stiffness_matrices, _rod_mass_matrices, _rod_dofs)
+from pyNastran.dev.bdf_vectorized.solver.utils import (
+    assemble_sparse_matrix, partition_sparse_symmetric, partition_dense_vector)
+
+
+def get_rod_lattice(nx, ny, nz):
+    """
+    Creates a lattice of rods
+
+    Returns
+    -------
+    xyz : (nnodes, 3) float ndarray
+        the nodes
+    i1 / i2 : (nrods, ) int ndarray
+        the node indices of the rods
+
+    """
+    x, y, z = np.meshgrid(np.arange(nx), np.arange(ny), np.arange(nz), indexing='ij')
+    xyz = np.column_stack([x.ravel(), y.ravel(), z.ravel()]).astype('float64')
+    inode = np.arange(nx * ny * nz).reshape(nx, ny, nz)
+
+    # the edges and a diagonal on each face of the cells, so the truss is stable
+    i1 = np.hstack([
+        inode[:-1, :, :].ravel(), inode[:, :-1, :].ravel(), inode[:, :, :-1].ravel(),
+        inode[:-1, :-1, :].ravel(), inode[:, :-1, :-1].ravel(), inode[:-1, :, :-1].ravel(),
+    ])
+    i2 = np.hstack([
+        inode[1:, :, :].ravel(), inode[:, 1:, :].ravel(), inode[:, :, 1:].ravel(),
+        inode[1:, 1:, :].ravel(), inode[:, 1:, 1:].ravel(), inode[1:, :, 1:].ravel(),
+    ])
+    return xyz, i1, i2
+
+
+def get_spc_dofs(xyz):
+    """fixes the nodes at x=0 and the rotational dofs"""
+    nnodes = xyz.shape[0]
+    spc = np.zeros((nnodes, 6), dtype='bool')
+    spc[xyz[:, 0] == 0., :] = True
+
+    # the rotations are only stiff about the rod axes, so they're removed
+    spc[:, 3:] = True
+    return np.where(spc.ravel())[0]
+
+
+def run_case(nx, nmodes=10):
+    """assembles and solves one lattice"""
+    xyz, i1, i2 = get_rod_lattice(nx, 3, 3)
+    nnodes = xyz.shape[0]
+    ndofs = 6 * nnodes
+    nrods = len(i1)
+
+    time0 = time.time()
+    dxyz12 = xyz[i2, :] - xyz[i1, :]
+    K = _rod_stiffness_matrices(dxyz12, np.full(nrods, 1000.), np.full(nrods, 10.))
+    M = _rod_mass_matrices(dxyz12, np.ones(nrods))
+    dofs = _rod_dofs(6 * i1, 6 * i2)
+    Kgg = assemble_sparse_matrix(ndofs, [K], [dofs])
+    Mgg = assemble_sparse_matrix(ndofs, [M], [dofs[:, :6]])
+    dt_assemble = time.time() - time0
+
+    spc = get_spc_dofs(xyz)
+    Kaa, unused_dofs = partition_sparse_symmetric(Kgg, spc)
+    Maa = partition_sparse_symmetric(Mgg, spc)[0]
+    Fg = np.zeros(ndofs)
+    Fg[6 * (nnodes - 1)] = 1.
+    Fa = partition_dense_vector(Fg, spc)[0]
+
+    time0 = time.time()
+    unused_Ua = spsolve(Kaa.tocsc(), Fa)
+    dt_solve = time.time() - time0
+
+    time0 = time.time()
+    unused_eigenvalues = eigsh(Kaa.tocsc(), k=nmodes, M=Maa.tocsc(), sigma=0.0, which='LM')[0]
+    dt_eigsh = time.time() - time0
+    return ndofs, Kgg.nnz, dt_assemble, dt_solve, dt_eigsh
+
+
+def main():  # pragma: no cover
+    """runs the benchmark"""
+    ndofs_max = 1000000
+    if len(sys.argv) > 1:
+        ndofs_max = int(sys.argv[1])
+
+    print('%10s %12s %10s %10s %10s' % ('ndofs', 'nnz', 'assemble', 'spsolve', 'eigsh'))
+    for ndofs in [1000, 10000, 100000, 1000000]:
+        if ndofs > ndofs_max:
+            break
+        # 9 nodes per station
+        nx = ndofs // 54
+        ndofs, nnz, dt_assemble, dt_solve, dt_eigsh = run_case(nx)
+        print('%10i %12i %10.3f %10.3f %10.3f' % (
+            ndofs, nnz, dt_assemble, dt_solve, dt_eigsh))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
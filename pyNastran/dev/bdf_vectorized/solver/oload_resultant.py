@@ -0,0 +1,44 @@
+"""
+defines:
+    resultant = Resultant('OLOAD', total_load, isubcase)
+"""
+from __future__ import print_function
+from pyNastran.f06.f06_formatting import write_floats_13e
+
+
+class Resultant(object):
+    """the OLOAD RESULTANT table, which is the sum of the applied loads"""
+    def __init__(self, name, total_load, isubcase):
+        """
+        Parameters
+        ----------
+        name : str
+            the table name (e.g., 'OLOAD')
+        total_load : (6, ) float ndarray
+            the sum of the forces and moments about the origin in the
+            global frame
+        isubcase : int
+            the subcase id
+        """
+        self.name = name
+        self.total_load = total_load
+        self.isubcase = isubcase
+
+    def write_f06(self, f06_file, page_stamp, page_num):
+        """writes the resultant to the F06"""
+        msg = [
+            '                                                  %s    RESULTANT       \n' % self.name,
+            '  SUBCASE/    LOAD\n'
+            '  DAREA ID    TYPE       T1            T2            T3'
+            '            R1            R2            R3\n',
+        ]
+        loads = write_floats_13e(list(self.total_load))
+        msg.append('0 %8i   TOTALS  %s\n' % (self.isubcase, ''.join(
+            ' %-13s' % load for load in loads)))
+        msg.append(page_stamp % page_num)
+        f06_file.write(''.join(msg))
+        return page_num + 1
+
+    def __repr__(self):
+        return 'Resultant(%r, total_load=%s, isubcase=%s)' % (
+            self.name, self.total_load.tolist(), self.isubcase)
@@ -21,15 +21,16 @@ from numpy import (array, zeros, ones, arange,
                    nan, nan_to_num)
 from numpy.linalg import solve, eigh, eig  # type: ignore
 
-from scipy.sparse import dok_matrix  # type: ignore
+from scipy.sparse.linalg import spsolve, eigsh  # type: ignore
 
 # pyNastran
 from pyNastran.bdf.bdf_interface.dev.matrices import make_gpwg
 from pyNastran.dev.bdf_vectorized.solver.utils import (
-    triple, reverse_dict, partition_dense_symmetric, partition_dense_vector, remove_dofs)
+    triple, reverse_dict, partition_sparse_symmetric, partition_dense_vector, remove_dofs,
+    assemble_sparse_matrix)
 #from pyNastran.f06.f06_writer import sorted_bulk_data_header
 from pyNastran.utils.dev import list_print
-from pyNastran.utils.mathematics import print_matrix, print_annotated_matrix
+from pyNastran.utils.mathematics import print_matrix
 from pyNastran.dev.bdf_vectorized.bdf import BDF #, SPC, SPC1
 #from pyNastran.f06.f06_writer import F06Writer
 from pyNastran.op2.op2 import OP2
@@ -42,7 +43,7 @@ from pyNastran.utils.log import get_logger2
 from pyNastran.op2.tables.oug.oug_displacements import RealDisplacementArray
 #from pyNastran.op2.tables.oqg_constraintForces.oqg_spcForces import SPCForcesObject
 #from pyNastran.op2.tables.oqg_constraintForces.oqg_mpcForces import MPCForcesObject
-from pyNastran.f06.dev.tables.oload_resultant import Resultant
+from pyNastran.dev.bdf_vectorized.solver.oload_resultant import Resultant
 
 # springs
 from pyNastran.op2.tables.oes_stressStrain.real.oes_springs import (
@@ -173,6 +174,10 @@ class Solver(OP2):
           - not calculated
           - no tables created
     """
+    #: the output requests, which hide the result table properties of the OP2
+    is_stress = True
+    is_strain = True
+
     def __init__(self, fargs, log=None):
         """
         fargs : dict[key] : value
@@ -329,7 +334,6 @@ class Solver(OP2):
         #self.iUks = None
         self.Kgg = None
         self.Mgg = None
-        self.Mgg_sparse = None
         #------------------------------
         self.Us = None
         self.iUs = None
@@ -402,26 +406,24 @@ class Solver(OP2):
     def _solve(self, K, F, dofs):  # can be overwritten
         r"""solves \f$ [K]{x} = {F}\f$ for \f${x}\f$"""
         self.log.info("--------------")
-        self.log.info("Kaa_norm / %s = \n" % self.knorm + list_print(K / self.knorm))
+        self.log.info("Kaa.shape = %s; nnz = %s" % (str(K.shape), K.nnz))
         self.log.info("--------------")
-        self.log.info("Fa/%g = %s" % (self.fnorm, F / self.fnorm))
         if F[0] == 0.0:
             assert max(F) != min(F), 'no load is applied...'
         self.log.info("--------------")
 
         try:
-            U = scipy.sparse.linalg.spsolve(K, F)
-            #U = solve(K, F) # numpy
-        except:
+            U = spsolve(K.tocsc(), F)
+            if not np.all(np.isfinite(U)):
+                raise RuntimeError('Kaa is singular')
+        except RuntimeError:
             failed = []
             faileds = []
-            for i, iu in enumerate(dofs):
-                #absF = abs(F)
-                nid, dof = self.IDtoNidComponents[iu]
-                #if absF[iu] == 0.0 and ??:
-                if K[i, i] == 0.0:
-                    failed.append([nid, dof])
-                    faileds.append(i)
+            Kdiag = K.diagonal()
+            for i in np.where(Kdiag == 0.0)[0]:
+                nid, dof = self.IDtoNidComponents[dofs[i]]
+                failed.append([nid, dof])
+                faileds.append(i)
             msg = self.make_grid_point_singularity_table(failed)
             self.f06_file.write(msg)
             self.f06_file.flush()
@@ -438,9 +440,9 @@ class Solver(OP2):
                     ilist.sort()
 
                     # remove the DOFs and solve
-                    K2 = K[ilist, :][:, ilist]
+                    K2 = K.tocsr()[ilist, :][:, ilist]
                     F2 = F[ilist]
-                    U2 = solve(K2, F2)
+                    U2 = spsolve(K2.tocsc(), F2)
 
                     # put the removed DOFs back in and set their displacement to 0.0
                     U = zeros(len(F), 'float64')
@@ -548,11 +550,15 @@ class Solver(OP2):
             self.log.info('starting case')
             self.run_case(self.model, case)
 
-        self.f06_file.write('Kgg / %s =\n%s\n\n' % (self.knorm, list_print(self.Kgg / self.knorm)))
-        self.f06_file.write('Fg =\n%s\n\n' % list_print(self.Fg))
+        # the sparse matrices are only written out for small static models
+        if self.model.sol == 101 and self.Kgg.shape[0] <= 100:
+            self.f06_file.write('Kgg / %s =\n%s\n\n' % (
+                self.knorm, list_print(self.Kgg.toarray() / self.knorm)))
+            self.f06_file.write('Fg =\n%s\n\n' % list_print(self.Fg))
 
-        self.f06_file.write('Kaa / %s =\n%s\n\n' % (self.knorm, list_print(self.Kaa / self.knorm)))
-        self.f06_file.write('Fa =\n%s\n\n' % list_print(self.Fa))
+            self.f06_file.write('Kaa / %s =\n%s\n\n' % (
+                self.knorm, list_print(self.Kaa.toarray() / self.knorm)))
+            self.f06_file.write('Fa =\n%s\n\n' % list_print(self.Fa))
 
         self.f06_file.close()
         if self.op2_file is not None:
@@ -562,7 +568,7 @@ class Solver(OP2):
     def run_case(self, model, case):
         sols = {
             101: self.run_sol_101,
-            #103: self.run_sol_103,
+            103: self.run_sol_103,
         }
 
         isubcase = case.id
@@ -717,7 +723,7 @@ class Solver(OP2):
     def get_Mgg(self, model, ndofs, force_calcs=False):
         Mgg = None
         if force_calcs:
-            Mgg, Mgg_sparse = self.assemble_global_mass_matrix(model, ndofs, self.nidComponentToID)
+            Mgg = self.assemble_global_mass_matrix(model, ndofs, self.nidComponentToID)
             model.params['GRDPNT'] = 0
 
         if 'GRDPNT' in model.params:
@@ -731,8 +737,15 @@ class Solver(OP2):
         return Mgg
 
     def run_sol_103(self, model, case):
+        """
+        Runs a real eigenvalue analysis
+
+        The lowest modes of the sparse [Kaa]{x} = lambda [Maa]{x} problem
+        are found with a shift-invert Lanczos solver (eigsh).  The number
+        of modes is ND on the EIGRL/EIGR that the METHOD references
+        (default=10).
+        """
         self.end_options['SEMR'] = True
-        raise NotImplementedError()
         #"""
         #ug = un+um All structural DOF including scalar DOF
         #um DOF eliminated by multipoint constraints and rigid elements
@@ -748,55 +761,60 @@ class Solver(OP2):
         #up = ug+ue The g-set plus EXTRA points for dynamic analysis
         #uz DOF representing modal coordinates
         #uh = ue+uz DOF used in dynamic analysis by the modal method
-
-        #SPC Forces
-        #qs = Kfs * Uf + Kss * Ys
-        #qs = Kfs * Uf + Kss * (Ys + Ys_dot*dt + Ys_dotdot*dt*dt)  # where *dt means integration
         #"""
-        #assert model.sol == 103, 'model.sol=%s is not 101' % (model.sol)
-        #if 'WTMASS' in model.params:
-            ## converts weight units to mass
-            #wtmass = model.params['WTMASS'].value1
-        #else:
-            #wtmass = 1.0
-
-        #if 'COUPMASS' in model.params:
-            #coupled_mass = model.params['COUPMASS'].value1
-            #lumped_mass = False
-        #else:
-            #coupled_mass = -1
-            #lumped_mass = True
-
-        #if 'METHOD' in case:
-            #imethod = model.subcase.get_parameter('METHOD')
-            #raise NotImplementedError('METHOD')
-            ##self.eigb[imethod]
-            ##self.eigc[imethod]
-            ##self.eigr[imethod]
-            ##self.eigrl[imethod]
-
-        #Mgg = self.get_Mgg(model, ndofs, force_calcs=True)
-        ## analysis
-        #(Kgg, Fg, n) = self.setup_sol_101(model, case)
-
-        #self.build_dof_sets()
-        #Lambda, Ua = self.solve_sol_103(Kgg, Mgg)
-
-        #dofsAll = {i for i in range(n)}
-        #dofsA = remove_dofs(dofsAll, self.iUs)
-        #dofsA.sort()
-        #U = zeros(n, 'float64')
+        assert model.sol == 103, 'model.sol=%s is not 103' % (model.sol)
+        nmodes = 10
+        if 'METHOD' in case:
+            imethod = case.get_parameter('METHOD')[0]
+            method = model.Method(imethod)
+            if method.nd is not None:
+                nmodes = method.nd
+
+        (Kgg, unused_Fg, n) = self.setup_sol_101(model, case)
+        Mgg = self.assemble_global_mass_matrix(model, n, self.nidComponentToID)
+        self.build_dof_sets()
+        eigenvalues, Ua = self.solve_sol_103(Kgg, Mgg, nmodes)
+        self.eigenvalues = eigenvalues
+
+        # put the SPC'd DOFs back in
+        dofsA = remove_dofs({i for i in range(n)}, self.iUs)
+        dofsA.sort()
+        U = zeros((n, len(eigenvalues)), 'float64')
+        U[dofsA, :] = Ua
+        self.U = U
+        self.log.info('eigenvalues = %s' % eigenvalues)
+        return eigenvalues, U
+
+    def solve_sol_103(self, Kgg, Mgg, nmodes):
+        """
+        Solves the sparse real eigenvalue problem
 
-        ## TODO handle MPCs
-        #for (i, iu) in enumerate(self.iUs):
-            #U[iu] = self.Us[i]
-        #for (i, iu) in enumerate(dofsA):
-            #U[iu] = Ua[i]
+        Parameters
+        ----------
+        Kgg / Mgg : (ndofs, ndofs) csr_matrix
+            the stiffness/mass matrices
+        nmodes : int
+            the number of modes to find
+
+        Returns
+        -------
+        eigenvalues : (nmodes, ) float ndarray
+            the lowest eigenvalues (omega^2)
+        Ua : (na, nmodes) float ndarray
+            the mode shapes in the a-set
 
-        #if self.is_displacement:
-            #self._store_displacements(model, U, case)
-        #q = U
+        """
+        Kaa, dofs = partition_sparse_symmetric(Kgg, self.iUs)
+        Maa = partition_sparse_symmetric(Mgg, self.iUs)[0]
+        self.Kaa = Kaa
+        self.Maa = Maa
+        nmodes = min(nmodes, Kaa.shape[0] - 1)
 
+        # shift-invert about 0 gives the lowest modes without inverting Maa
+        eigenvalues, Ua = eigsh(Kaa.tocsc(), k=nmodes, M=Maa.tocsc(), sigma=0.0,
+                                which='LM')
+        isort = np.argsort(eigenvalues)
+        return eigenvalues[isort], Ua[:, isort]
 
     def run_sol_101(self, model, case):
         #print("case = ", case)
@@ -1656,7 +1674,7 @@ class Solver(OP2):
         Fg = self.assemble_forces(model, ndofs, case, self.nidComponentToID, xyz_cid0)
 
         self.log.info('building Kgg')
-        Kgg, Kgg_sparse = self.assemble_global_stiffness_matrix(model, ndofs, self.nidComponentToID)
+        Kgg = self.assemble_global_stiffness_matrix(model, ndofs, self.nidComponentToID)
 
         self.log.info('ready to run...')
         return Kgg, Fg, ndofs
@@ -1700,8 +1718,9 @@ class Solver(OP2):
 
         grid_cps = self.model.grid.cp
         coords = self.model.coords
+        # make_gpwg works on a dense mass matrix
         Mo, S, mass, cg, II, IQ, Q = make_gpwg(
-            Mgg, ref_point, xyz_cid0, grid_cps, coords, self.log)
+            Mgg.toarray(), ref_point, xyz_cid0, grid_cps, coords, self.log)
 
         self.grid_point_weight.reference_point = grid_point
         self.grid_point_weight.MO = Mo
@@ -1753,31 +1772,27 @@ class Solver(OP2):
         self.Fg = Fg
 
         self._save_applied_load(Fg)
-        for (i, j, a) in zip(self.iUm, self.jUm, self.Um):
-            self.log.info("Kgg[%s, %s] = %s" % (i, j, a))
-            Kgg[i, j] = a
+        if self.iUm:
+            Kgg = Kgg.tolil()
+            for (i, j, a) in zip(self.iUm, self.jUm, self.Um):
+                self.log.info("Kgg[%s, %s] = %s" % (i, j, a))
+                Kgg[i, j] = a
+            Kgg = Kgg.tocsr()
 
         self.IDtoNidComponents = reverse_dict(self.nidComponentToID)
-        self.log.info("IDtoNidComponents = %s" % self.IDtoNidComponents)
-        self.log.info("Kgg =\n" + print_annotated_matrix(Kgg, self.IDtoNidComponents,
-                                                         self.IDtoNidComponents))
         #print("Kgg = \n", Kgg)
         #print("iSize = ", i)
 
         #(Kaa, Fa) = self.Partition(Kgg)
         #sys.exit('verify Kgg')
 
-        self.log.info("Kgg/%g = \n%s" % (self.knorm, print_matrix(Kgg / self.knorm)))
-        Kaa, dofs2 = partition_dense_symmetric(Kgg, self.iUs)
-        self.log.info("Kaa/%g = \n%s" % (self.knorm, print_matrix(Kaa / self.knorm)))
-        #print("Kaa.shape = ",Kaa.shape)
+        self.log.info("Kgg.shape = %s; nnz = %s" % (str(Kgg.shape), Kgg.nnz))
+        Kaa, dofs2 = partition_sparse_symmetric(Kgg, self.iUs)
+        self.log.info("Kaa.shape = %s; nnz = %s" % (str(Kaa.shape), Kaa.nnz))
 
         #sys.exit('verify Kaa')
         Fa, _dofs2 = partition_dense_vector(Fg, self.iUs)
         #print("Kaa = \n%s" % (print_matrix(Kaa)))
-
-        self.log.info("Fg/%g = \n%s" % (self.fnorm, Fg/self.fnorm))
-        self.log.info("Fa/%g = \n%s" % (self.fnorm, Fa/self.fnorm))
         #print("Us = ", self.Us)
 
         #self.Us = array(self.Us, 'float64')  # SPC
@@ -1834,81 +1849,61 @@ class Solver(OP2):
         index0s *= 6
         return node_ids, index0s
 
-    def add_stiffness(self, K, dofs, nijv):
-        #print('self.IDtoNidComponents = %s' % self.IDtoNidComponents) # None
-        self.log.debug('self.nidComponentToID')
-        for k, value in sorted(self.nidComponentToID.items()):
-            self.log.debug('  %s : %s' % (k, value))
-        #nidComponentToID
-
-        Kgg = self.Kgg
-        kabs = np.abs(K)
-        #print(type(Kgg))
-        self.log.debug('Ki =\n\n%s' % K)
-
-        for i, dof1 in enumerate(dofs):
-            if isinstance(dof1, tuple):
-                dof1i = self.nidComponentToID[dof1]
-            else:
-                dof1i = dof1
+    def _get_dof_ids(self, dofs):
+        """maps the (nid, component) dofs of an element to the internal ids"""
+        return [self.nidComponentToID[dof] if isinstance(dof, tuple) else dof
+                for dof in dofs]
 
-            for j, dof2 in enumerate(dofs):
-                if kabs[i, j] > 0.0:
-                    self.log.debug('  i=%s j=%s dof1=%s dof2=%s Ke[i,j]=%s' % (
-                        i, j, dof1, dof2, K[i, j] / self.knorm))
-
-                    if isinstance(dof2, tuple):
-                        dof2i = self.nidComponentToID[dof2]
-                    else:
-                        dof2i = dof2
-                    #assert isinstance(dof1i, int), dof1i
-                    #assert isinstance(dof2i, int), dof2i
-                    Kgg[dof1i, dof2i] += K[i, j]
-                    #Kgg[dof1i, dof2i] += K[i, j]
-                    #print('Kgg[%s,%s]=%s' % (dof1, dof2, str(Kgg[dof1i, dof2i])) )
-        self.log.info('Kggi =\n%s' % Kgg)
+    def add_stiffness(self, K, dofs, nijv):
+        """
+        Stores an element stiffness matrix, which is assembled into
+        Kgg by ``assemble_sparse_matrix``
+        """
+        self._Kgg_matrices.append(K[np.newaxis, :, :])
+        self._Kgg_dofs.append(array([self._get_dof_ids(dofs)], dtype='int64'))
 
     def add_mass(self, M, dofs, nijv):
-        Mgg = self.Mgg
-        Mgg_sparse = self.Mgg_sparse
-        for i, dof1 in enumerate(dofs):
-            dof1i = self.nidComponentToID[dof1]
-            for j, dof2 in enumerate(dofs):
-                if abs(M[i, j]) > 0.0:
-                    dof2i = self.nidComponentToID[dof2]
-                    Mgg[dof1i, dof2i] += M[i, j]
-                    Mgg_sparse[dof1i, dof2i] += M[i, j]
-
-    def assemble_global_stiffness_matrix(self, model, i, Dofs):
-        self.Kgg = zeros((i, i), 'float64')
-        self.log.info("Kgg.shape = %s" % str(self.Kgg.shape))
-
-        dof_mapper = []
-
-        nnodes = model.grid.n
-        nspoints = model.spoint.n
-        assert nnodes > 0
-        self.log.info("nnodes = %s" % nnodes)
-        #ndofs = 6 * nnodes + nspoints
-
-        i = 0
-        nids = model.grid.node_id
-        #nids.sort()
-        self.log.info('nids = %s %s' %(nids, i))
-        #dof_ids = arange(0, 6*nnodes, 6)
-
-        #dofs_0 = [nid=2, 1] -> searchsorted(nids, nid)[0]
-
-        #for nid in sorted(iterkeys(self.nodes)):
-            #nid_dof_mapper[]
+        """
+        Stores an element mass matrix, which is assembled into
+        Mgg by ``assemble_sparse_matrix``
+        """
+        self._Mgg_matrices.append(M[np.newaxis, :, :])
+        self._Mgg_dofs.append(array([self._get_dof_ids(dofs)], dtype='int64'))
 
-        self.log.info('start calculating xyz_cid0')
+    def _get_xyz_cid0(self, model):
+        """gets the positions and the first dof of the nodes"""
         self.positions = {}
         index0s = {}
         for i in range(model.grid.n):
             nid = model.grid.node_id[i]
             self.positions[nid] = model.grid.xyz[i]
             index0s[nid] = 6 * i
+        xyz_cid0 = model.grid.xyz.copy()  ## TODO: update for coords
+        return xyz_cid0, index0s
+
+    def assemble_global_stiffness_matrix(self, model, ndofs, Dofs):
+        """
+        Assembles the sparse global stiffness matrix
+
+        The element matrices are collected as (row, column, value)
+        triplets, which are summed into a CSR matrix.  The CROD/CONROD
+        matrices are calculated for all the elements at once.
+
+        Returns
+        -------
+        Kgg : (ndofs, ndofs) csr_matrix
+            the global stiffness matrix
+
+        """
+        self._Kgg_matrices = []
+        self._Kgg_dofs = []
+
+        nnodes = model.grid.n
+        assert nnodes > 0
+        self.log.info("nnodes = %s" % nnodes)
+
+        self.log.info('start calculating xyz_cid0')
+        xyz_cid0, index0s = self._get_xyz_cid0(model)
         self.log.info('end calculating xyz_cid0')
 
         # spring
@@ -1917,7 +1912,6 @@ class Solver(OP2):
             for i in range(model.celas1.n):
                 K, dofs, nijv = model.celas1.get_stiffness_matrix(
                     i, model, self.positions, index0s)
-                self.log.info("Kcelas1 =\n%s" % K)
                 self.add_stiffness(K, dofs, nijv)
 
         if model.celas2.n:
@@ -1944,22 +1938,21 @@ class Solver(OP2):
         # conrod
         if model.conrod.n:
             self.log.info('start calculating Kconrod')
-            for i in range(model.conrod.n):
-                #self.conrod_stress = {}
-                K, dofs, nijv = model.conrod.get_stiffness_matrix(i, model, self.positions, index0s)
-                self.add_stiffness(K, dofs, nijv)
+            K, dofs = model.conrod.get_stiffness_matrices(model, xyz_cid0)
+            self._Kgg_matrices.append(K)
+            self._Kgg_dofs.append(dofs)
 
         # crod
         if model.crod.n:
             self.log.info('start calculating Kcrod')
-            for i in range(model.crod.n):
-                K, dofs, nijv = model.crod.get_stiffness_matrix(i, model, self.positions, index0s)
-                self.add_stiffness(K, dofs, nijv)
+            K, dofs = model.crod.get_stiffness_matrices(model, xyz_cid0)
+            self._Kgg_matrices.append(K)
+            self._Kgg_dofs.append(dofs)
 
         # ctube
         if model.ctube.n:
             self.log.info('start calculating Kctube')
-            for i in range(model.crod.n):
+            for i in range(model.ctube.n):
                 K, dofs, nijv = model.ctube.get_stiffness_matrix(i, model, self.positions, index0s)
                 self.add_stiffness(K, dofs, nijv)
 
@@ -1985,52 +1978,48 @@ class Solver(OP2):
                     i, model, self.positions, index0s)
                 self.add_stiffness(K, dofs, nijv)
 
-
-        #Kgg_sparse = coo_matrix((entries, (rows, cols)), shape=(i, i))
-        Kgg_sparse = None
-        Kgg = self.Kgg
-        return Kgg, Kgg_sparse
+        Kgg = assemble_sparse_matrix(ndofs, self._Kgg_matrices, self._Kgg_dofs)
+        del self._Kgg_matrices, self._Kgg_dofs
+        self.log.info("Kgg.shape = %s; nnz = %s" % (str(Kgg.shape), Kgg.nnz))
+        self.Kgg = Kgg
+        return Kgg
 
     #def assemble_global_damping_matrix(self, model, i, Dofs):
 
     def assemble_global_mass_matrix(self, model, ndofs, Dofs):
-        self.Mgg = zeros((ndofs, ndofs), 'float64')
-        self.Mgg_sparse = dok_matrix((ndofs, ndofs), dtype='float64')
+        """
+        Assembles the sparse global mass matrix
 
-        dof_mapper = []
+        Returns
+        -------
+        Mgg : (ndofs, ndofs) csr_matrix
+            the global mass matrix
+
+        """
+        self._Mgg_matrices = []
+        self._Mgg_dofs = []
 
         nnodes = model.grid.n
-        nspoints = model.spoint.n
         assert nnodes > 0, nnodes
-
-        i = 0
-        nids = model.grid.node_id
-
-        self.positions = {}
-        index0s = {}
-        for i in range(model.grid.n):
-            nid = model.grid.node_id[i]
-            self.positions[nid] = model.grid.xyz[i]
-            index0s[nid] = 6 * i
+        xyz_cid0, index0s = self._get_xyz_cid0(model)
 
         # mass
         conm1 = model.mass.conm1
         for i in range(conm1.n):
             M = conm1.get_mass_matrix(i)
-            i0 = index[conm1.node_id[i]]
+            i0 = index0s[conm1.node_id[i]]
             coord_id = conm1.coord_id[i]
             if coord_id != 0:
                 msg = 'CONM1 doesnt support coord_id != 0 for element %i; coord_id=%i' % (
                     model.conm1.element_id[i], coord_id)
                 raise RuntimeError(msg)
             # CONM1 doesn't consider coord ID
-            self.Mgg[i0:i0+6, i0:i0+6] += M[:, :]
-            for ii1, i01 in arange(i0, i0+6):
-                for ii2, i02 in arange(i0, i0+6):
-                    self.Mgg_sparse[i01, i02] = M[ii1, ii2]
-        for i in range(model.mass.conm2.n):
-            M, dofs, nijv = model.conm1.get_mass_matrix(i, model, self.positions, index0s)
-            self.add_mass(M, dofs, nijv)
+            self.add_mass(M, arange(i0, i0+6), None)
+        conm2 = model.mass.conm2
+        if conm2.n:
+            M, dofs = conm2.get_mass_matrices(model)
+            self._Mgg_matrices.append(M)
+            self._Mgg_dofs.append(dofs)
 
         #if 0:
             ## cmass
@@ -2048,13 +2037,15 @@ class Solver(OP2):
                 #self.add_mass(M, dofs, nijv)
 
         # conrod
-        for i in range(model.conrod.n):
-            M, dofs, nijv = model.conrod.get_mass_matrix(i, model, self.positions, index0s)
-            self.add_mass(M, dofs, nijv)
+        if model.conrod.n:
+            M, dofs = model.conrod.get_mass_matrices(model, xyz_cid0)
+            self._Mgg_matrices.append(M)
+            self._Mgg_dofs.append(dofs)
         # crod
-        for i in range(model.crod.n):
-            M, dofs, nijv = model.crod.get_mass_matrix(i, model, self.positions, index0s)
-            self.add_mass(M, dofs, nijv)
+        if model.crod.n:
+            M, dofs = model.crod.get_mass_matrices(model, xyz_cid0)
+            self._Mgg_matrices.append(M)
+            self._Mgg_dofs.append(dofs)
         #if 0:
             ## ctube
             #for i in range(model.ctube.n):
@@ -2088,11 +2079,11 @@ class Solver(OP2):
         # cpenta15
         # chexa20
 
-        #Mgg_sparse = coo_matrix((entries, (rows, cols)), shape=(i, i))
-        Mgg_sparse = None
-        Mgg = self.Mgg
+        Mgg = assemble_sparse_matrix(ndofs, self._Mgg_matrices, self._Mgg_dofs)
+        del self._Mgg_matrices, self._Mgg_dofs
+        self.Mgg = Mgg
         self.log.info('returning Mgg')
-        return Mgg, Mgg_sparse
+        return Mgg
 
     def apply_SPCs(self, model, case, nidComponentToID):
         has_spcs = False
@@ -1,16 +1,42 @@
 """tests the pyNastran solver"""
 from __future__ import print_function, unicode_literals
 import os
+import shutil
+import tempfile
 import unittest
 
+import numpy as np
+import scipy.linalg  # type: ignore
+
 import pyNastran
 from pyNastran.utils.log import SimpleLogger
 from pyNastran.dev.bdf_vectorized.solver.solver import Solver
 
 pkg_path = pyNastran.__path__[0]
-test_path = os.path.join(pkg_path, 'bdf', 'dev_vectorized', 'solver', 'test')
+test_path = os.path.join(pkg_path, 'dev', 'bdf_vectorized', 'solver', 'test')
 log = SimpleLogger('warning', encoding='utf8')
 
+CONROD_CONM2_BDF = """SOL 103
+CEND
+SUBCASE 1
+    LOAD = 1
+    DISP = ALL
+BEGIN BULK
+GRID,1,,0.,0.,0.,,123456
+GRID,2,,10.,0.,0.,,23456
+GRID,3,,20.,0.,0.,,23456
+GRID,4,,30.,0.,0.,,23456
+CONROD,1,1,2,99,1.,1.0
+CONROD,2,2,3,99,1.,1.0
+CONROD,3,3,4,99,1.,1.0
+CONM2,11,2,,2.0
+CONM2,12,3,,1.0,,1.0
+CONM2,13,4,,3.0
+MAT1,99,10.E6,,0.3,0.1
+FORCE,1,4,,1000.,1.,0.,0.
+ENDDATA
+"""
+
 class TestSolver(unittest.TestCase):
     """tests the pyNastran solver"""
 
@@ -73,5 +99,62 @@ class TestSolver(unittest.TestCase):
         solver = Solver(fargs, log=log)
         solver.run_solver()
 
+    def test_conrod_sol_101_dense(self):
+        """the sparse SOL 101 solution matches the dense solution"""
+        dirname = tempfile.mkdtemp()
+        try:
+            fargs = {
+                '--k' : 1.0, '--f' : 1.0, '--m' : 1.0,
+                '--debug' : False,
+                'BDFNAME' : os.path.join(test_path, 'conrod.bdf'),
+                'BDFBASE' : os.path.join(dirname, 'conrod'),
+            }
+            solver = Solver(fargs, log=log)
+            solver.run_solver()
+        finally:
+            shutil.rmtree(dirname)
+
+        Ua_dense = np.linalg.solve(solver.Kaa.toarray(), solver.Fa)
+        np.testing.assert_allclose(solver.Ua, Ua_dense)
+
+        # node 2 from conrod_expected.f06
+        displacements = solver.displacements[1]
+        self.assertEqual(displacements.node_gridtype[:, 0].tolist(), [1, 2])
+        t1, r1 = displacements.data[0, 1, [0, 3]]
+        self.assertAlmostEqual(t1, 1.2e-2, places=8)
+        self.assertAlmostEqual(r1, 1.931429e-2, places=8)
+
+    def test_conrod_conm2_sol_103_dense(self):
+        """the sparse SOL 103 eigenvalues match the dense eigenvalues"""
+        dirname = tempfile.mkdtemp()
+        try:
+            bdf_filename = os.path.join(dirname, 'conrod_conm2.bdf')
+            with open(bdf_filename, 'w') as bdf_file:
+                bdf_file.write(CONROD_CONM2_BDF)
+            fargs = {
+                '--k' : 1.0, '--f' : 1.0, '--m' : 1.0,
+                '--debug' : False,
+                'BDFNAME' : bdf_filename,
+                'BDFBASE' : os.path.join(dirname, 'conrod_conm2'),
+            }
+            solver = Solver(fargs, log=log)
+            solver.run_solver()
+        finally:
+            shutil.rmtree(dirname)
+
+        Kaa = solver.Kaa.toarray()
+        Maa = solver.Maa.toarray()
+        eigenvalues_dense = scipy.linalg.eigh(Kaa, Maa, eigvals_only=True)
+        neigenvalues = len(solver.eigenvalues)
+        np.testing.assert_allclose(solver.eigenvalues, eigenvalues_dense[:neigenvalues])
+
+        # the X2 offset of CONM2 12 couples T1 and R3 of node 3
+        ix = solver.nidComponentToID
+        Mgg = solver.Mgg.toarray()
+        self.assertAlmostEqual(Mgg[ix[(3, 1)], ix[(3, 6)]], -1.0)
+        self.assertAlmostEqual(Mgg[ix[(3, 6)], ix[(3, 1)]], -1.0)
+        self.assertAlmostEqual(Mgg[ix[(3, 4)], ix[(3, 4)]], 1.0)
+
+
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
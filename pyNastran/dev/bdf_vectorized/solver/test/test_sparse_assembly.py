@@ -0,0 +1,93 @@
+"""tests the sparse assembly of the solver matrices"""
+from __future__ import print_function
+import unittest
+
+import numpy as np
+import scipy.sparse  # type: ignore
+from scipy.sparse.linalg import spsolve, eigsh  # type: ignore
+
+from pyNastran.dev.bdf_vectorized.cards.elements.rod.conrod import (
+    _Lambda, _rod_stiffness_matrices, _rod_mass_matrices, _rod_dofs)
+from pyNastran.dev.bdf_vectorized.solver.utils import (
+    assemble_sparse_matrix, partition_sparse_symmetric, partition_dense_symmetric,
+    partition_dense_vector)
+
+
+class TestSparseAssembly(unittest.TestCase):
+    """tests the sparse assembly of the solver matrices"""
+
+    def test_rod_matrices(self):
+        """the batched rod matrices match the single element matrices"""
+        dxyz12 = np.array([
+            [1., 0., 0.],
+            [1., 2., 3.],
+            [-2., 0.5, 1.],
+        ])
+        k_axial = np.array([1., 2., 3.])
+        k_torsion = np.array([4., 5., 0.])
+        K = _rod_stiffness_matrices(dxyz12, k_axial, k_torsion)
+        M = _rod_mass_matrices(dxyz12, np.array([6., 12., 1.]))
+        self.assertEqual(K.shape, (3, 12, 12))
+        self.assertEqual(M.shape, (3, 6, 6))
+
+        for i, v in enumerate(dxyz12):
+            Lambda = _Lambda(v, debug=False)
+            Ki = np.dot(Lambda.T, np.dot(np.array([[1., -1.], [-1., 1.]]), Lambda))
+            np.testing.assert_almost_equal(K[i, :6, :6], k_axial[i] * Ki)
+            np.testing.assert_almost_equal(K[i, 6:, 6:], k_torsion[i] * Ki)
+            self.assertEqual(abs(K[i, :6, 6:]).max(), 0.)
+        np.testing.assert_almost_equal(M[0, 0, :], [2., 0., 0., 1., 0., 0.])
+
+        dofs = _rod_dofs(np.array([0, 6]), np.array([12, 0]))
+        self.assertEqual(dofs[0].tolist(), [0, 1, 2, 12, 13, 14, 3, 4, 5, 15, 16, 17])
+        self.assertEqual(dofs[1].tolist(), [6, 7, 8, 0, 1, 2, 9, 10, 11, 3, 4, 5])
+
+    def test_assemble_sparse_matrix(self):
+        """the sparse matrix matches the dense matrix"""
+        # a chain of 4 rods along x
+        nnodes = 5
+        ndofs = 6 * nnodes
+        xyz = np.zeros((nnodes, 3))
+        xyz[:, 0] = np.arange(nnodes)
+        i1 = np.arange(nnodes - 1)
+        i2 = i1 + 1
+        K = _rod_stiffness_matrices(xyz[i2] - xyz[i1], np.full(4, 10.), np.full(4, 2.))
+        dofs = _rod_dofs(6 * i1, 6 * i2)
+
+        # springs with the same dofs are summed
+        Ks = np.array([[[1., -1.], [-1., 1.]]])
+        dofs_spring = np.array([[7, 13]])
+        Kgg = assemble_sparse_matrix(ndofs, [K, Ks, np.zeros((0, 2, 2))],
+                                     [dofs, dofs_spring, np.zeros((0, 2), dtype='int32')])
+
+        Kgg_dense = np.zeros((ndofs, ndofs))
+        for Ki, dofsi in zip(K, dofs):
+            Kgg_dense[np.ix_(dofsi, dofsi)] += Ki
+        Kgg_dense[np.ix_(dofs_spring[0], dofs_spring[0])] += Ks[0]
+        np.testing.assert_almost_equal(Kgg.toarray(), Kgg_dense)
+        self.assertEqual(Kgg.format, 'csr')
+
+        # fix node 0 and the dofs without a rod stiffness
+        spc = list(range(6)) + [i for i in range(6, ndofs) if i % 6 in [1, 2, 4, 5]]
+        Kaa, dofs_a = partition_sparse_symmetric(Kgg, spc)
+        Kaa_dense, dofs_dense = partition_dense_symmetric(Kgg_dense, spc)
+        self.assertEqual(dofs_a.tolist(), sorted(dofs_dense))
+        np.testing.assert_almost_equal(Kaa.toarray(), Kaa_dense)
+
+        Fg = np.zeros(ndofs)
+        Fg[6 * 4] = 10.
+        Fa = partition_dense_vector(Fg, spc)[0]
+        Ua = spsolve(Kaa.tocsc(), Fa)
+        ix = np.where(dofs_a == 6 * 4)[0][0]
+        self.assertAlmostEqual(Ua[ix], 4.)
+
+        Maa = partition_sparse_symmetric(assemble_sparse_matrix(
+            ndofs, [_rod_mass_matrices(xyz[i2] - xyz[i1], np.ones(4))],
+            [dofs[:, :6]]), spc)[0]
+        Maa = Maa + 1e-3 * scipy.sparse.identity(Maa.shape[0], format='csr')
+        eigenvalues = eigsh(Kaa.tocsc(), k=2, M=Maa, sigma=0.0, which='LM')[0]
+        self.assertTrue(np.all(eigenvalues > 0.))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -1,6 +1,8 @@
 from six import iteritems
 from six.moves import zip, range
+import numpy as np
 from numpy import dot, ndarray, zeros
+from scipy.sparse import coo_matrix  # type: ignore
 
 def partition_sparse(Is, Js, Vs):
     I2 = []
@@ -38,21 +40,100 @@ def partition_dense_symmetric(A, dofs_in):
     return (A2, dofs)
 
 
+def partition_sparse_symmetric(A, dofs_in):
+    """
+    Removes the dofs_in rows/columns from a sparse matrix
+
+    Parameters
+    ----------
+    A : (nall, nall) sparse matrix
+        the matrix
+    dofs_in : List[int]
+        the dofs to remove
+
+    Returns
+    -------
+    A2 : (n, n) csr_matrix
+        the partitioned matrix
+    dofs : (n, ) int ndarray
+        the kept dofs
+
+    """
+    dofs = _get_kept_dofs(A.shape[0], dofs_in)
+    A2 = A.tocsr()[dofs, :][:, dofs]
+    return (A2, dofs)
+
+
 def partition_dense_vector(F, dofs_in):
     nall = F.shape[0]
     #print("partition_dense_vector:  dofs_in = %s" % sorted(dofs_in))
-    dofs = get_dof_set(nall, dofs_in)
-    dofs.sort()
+    dofs = _get_kept_dofs(nall, dofs_in)
     #print("partition_dense_vector:  dofs = %s" % dofs)
-    n = len(dofs)
-    F2 = zeros(n, 'float64')
-    for (i, dofI) in enumerate(dofs):
-        v = F[dofI]
-        if abs(v) >= 1e-8:
-            F2[i] = v
+    F2 = F[dofs].astype('float64')
+    F2[abs(F2) < 1e-8] = 0.
     return (F2, dofs)
 
 
+def _get_kept_dofs(nall, dofs_in):
+    """gets the sorted dofs that aren't in dofs_in"""
+    is_kept = np.ones(nall, dtype='bool')
+    is_kept[np.asarray(dofs_in, dtype='int64')] = False
+    return np.where(is_kept)[0]
+
+
+def assemble_sparse_matrix(ndofs, matrices, dofs):
+    """
+    Assembles element matrices into a global sparse matrix
+
+    The element matrices of each element type are given as one
+    (nelements, ndofi, ndofi) array, so the (row, column, value)
+    triplets are built without a loop over the elements.  The repeated
+    (row, column) terms are summed when the matrix is converted to CSR.
+
+    Parameters
+    ----------
+    ndofs : int
+        the size of the matrix
+    matrices : List[(nelements, ndofi, ndofi) float ndarray]
+        the element matrices of each element type
+    dofs : List[(nelements, ndofi) int ndarray]
+        the global dofs of each element matrix
+
+    Returns
+    -------
+    A : (ndofs, ndofs) csr_matrix
+        the global matrix
+
+    """
+    rows = []
+    cols = []
+    values = []
+    for matrix, dofsi in zip(matrices, dofs):
+        dofsi = np.asarray(dofsi, dtype='int64')
+        if dofsi.size == 0:
+            continue
+        nelements, ndofi = dofsi.shape
+        valuesi = np.asarray(matrix, dtype='float64').reshape(nelements * ndofi * ndofi)
+        rowsi = np.repeat(dofsi, ndofi, axis=1).ravel()
+        colsi = np.tile(dofsi, (1, ndofi)).ravel()
+
+        # skip the zero terms (e.g., a rod without torsion)
+        i = np.where(valuesi != 0.0)[0]
+        rows.append(rowsi[i])
+        cols.append(colsi[i])
+        values.append(valuesi[i])
+
+    if values:
+        rows = np.hstack(rows)
+        cols = np.hstack(cols)
+        values = np.hstack(values)
+    else:
+        rows = cols = np.zeros(0, dtype='int64')
+        values = np.zeros(0, dtype='float64')
+    A = coo_matrix((values, (rows, cols)), shape=(ndofs, ndofs)).tocsr()
+    return A
+
+
 def partition_sparse_vector(F, dofs):
     dofs.sort()
     #n = len(dofs)
@@ -1,6 +1,6 @@
 from six.moves import range
 from numpy import array, ndarray
-from pyNastran.utils.mathematics import unique2d
+from pyNastran.utils.numpy_utils import unique2d
 
 def slice_to_iter(ids):
     """
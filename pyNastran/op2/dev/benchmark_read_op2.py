@@ -0,0 +1,94 @@
+"""
+Times the OP2 reader on the bundled models.
+
+The table of contents from the array sizing pass lets the array filling
+pass jump over tables that don't need to be read again.  This compares:
+ - the original two pass walk (use_table_index=False)
+ - the indexed two pass walk (use_table_index=True)
+ - the indexed two pass walk on a memory-mapped file (use_mmap=True)
+
+Usage
+-----
+python benchmark_read_op2.py [OP2_FILENAME...]
+
+"""
+from __future__ import print_function
+import os
+import sys
+import glob
+import time
+
+import pyNastran
+from pyNastran.op2.op2 import OP2
+
+PKG_PATH = pyNastran.__path__[0]
+MODEL_PATH = os.path.abspath(os.path.join(PKG_PATH, '..', 'models'))
+
+
+def time_read_op2(op2_filename, use_table_index, nrepeat=3, subcases=None,
+                  use_mmap=False):
+    """
+    Reads the OP2 nrepeat times and returns the fastest time
+
+    Returns
+    -------
+    dt : float
+        the fastest read time in seconds
+    model : OP2()
+        the last model that was read
+
+    """
+    dt_min = None
+    for unused_i in range(nrepeat):
+        model = OP2(debug=False)
+        model.use_table_index = use_table_index
+        model.use_mmap = use_mmap
+        model.set_subcases(subcases)
+        time0 = time.time()
+        model.read_op2(op2_filename, build_dataframe=False)
+        dt = time.time() - time0
+        if dt_min is None or dt < dt_min:
+            dt_min = dt
+    return dt_min, model
+
+
+def run_benchmark(op2_filenames, nrepeat=3, subcases=None):
+    """compares the indexed/unindexed and memory-mapped readers"""
+    print('%-60s %8s %8s %8s %7s %12s' % (
+        'op2_filename', 'dt_old', 'dt_new', 'dt_mmap', 'ratio', 'skipped (kB)'))
+    dt_old_total = 0.
+    dt_new_total = 0.
+    dt_mmap_total = 0.
+    for op2_filename in op2_filenames:
+        try:
+            dt_old, unused_model = time_read_op2(
+                op2_filename, False, nrepeat=nrepeat, subcases=subcases)
+            dt_new, model = time_read_op2(
+                op2_filename, True, nrepeat=nrepeat, subcases=subcases)
+            dt_mmap, unused_model = time_read_op2(
+                op2_filename, True, nrepeat=nrepeat, subcases=subcases, use_mmap=True)
+        except Exception:
+            print('%-60s failed' % os.path.relpath(op2_filename, MODEL_PATH))
+            continue
+        dt_old_total += dt_old
+        dt_new_total += dt_new
+        dt_mmap_total += dt_mmap
+        print('%-60s %8.4f %8.4f %8.4f %7.3f %12.1f' % (
+            os.path.relpath(op2_filename, MODEL_PATH), dt_old, dt_new, dt_mmap,
+            dt_old / min(dt_new, dt_mmap), model.table_index.nbytes_skipped / 1024.))
+    if dt_new_total:
+        print('%-60s %8.4f %8.4f %8.4f %7.3f' % (
+            'total', dt_old_total, dt_new_total, dt_mmap_total,
+            dt_old_total / min(dt_new_total, dt_mmap_total)))
+
+
+def main():  # pragma: no cover
+    """runs the benchmark"""
+    op2_filenames = sys.argv[1:]
+    if not op2_filenames:
+        op2_filenames = sorted(glob.glob(os.path.join(MODEL_PATH, '*', '*.op2')))
+    run_benchmark(op2_filenames)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
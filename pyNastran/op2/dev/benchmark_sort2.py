@@ -0,0 +1,83 @@
+"""
+Compares the vectorized and unvectorized (use_vector=False) OP2 readers
+on models with SORT2 results.
+
+SORT2 element and OUG-style results used to always be read with a
+struct.unpack loop.  The common element types (springs, rods, bars,
+shear panels, bushings, centroidal shells) and the complex
+displacement-style tables now go through np.frombuffer, so the
+throughput should be similar to SORT1.
+
+Usage
+-----
+python benchmark_sort2.py [OP2_FILENAME...]
+
+"""
+from __future__ import print_function
+import os
+import sys
+import time
+
+import pyNastran
+from pyNastran.op2.op2 import OP2
+
+PKG_PATH = pyNastran.__path__[0]
+MODEL_PATH = os.path.abspath(os.path.join(PKG_PATH, '..', 'models'))
+
+#: models with SORT2 results
+SORT2_MODELS = [
+    os.path.join(MODEL_PATH, 'other', 'ofprand1.op2'),
+    os.path.join(MODEL_PATH, 'random', 'rms_tri_oesrmx1.op2'),
+    os.path.join(MODEL_PATH, 'elements', 'time_thermal_elements_sort2_nx.op2'),
+]
+
+
+def time_read_op2(op2_filename, use_vector, nrepeat=3):
+    """
+    Reads the OP2 nrepeat times and returns the fastest time
+
+    Returns
+    -------
+    dt : float
+        the fastest read time in seconds
+
+    """
+    dt_min = None
+    for unused_i in range(nrepeat):
+        model = OP2(debug=False)
+        model.use_vector = use_vector
+        time0 = time.time()
+        model.read_op2(op2_filename, build_dataframe=False)
+        dt = time.time() - time0
+        if dt_min is None or dt < dt_min:
+            dt_min = dt
+    return dt_min
+
+
+def run_benchmark(op2_filenames, nrepeat=3):
+    """compares the vectorized/unvectorized readers in MB/s"""
+    print('%-50s %10s %10s %10s %10s %7s' % (
+        'op2_filename', 'size (MB)', 'dt_loop', 'dt_vector', 'MB/s', 'speedup'))
+    for op2_filename in op2_filenames:
+        size = os.path.getsize(op2_filename) / 1024. ** 2
+        try:
+            dt_loop = time_read_op2(op2_filename, False, nrepeat=nrepeat)
+            dt_vector = time_read_op2(op2_filename, True, nrepeat=nrepeat)
+        except Exception:
+            print('%-50s failed' % os.path.relpath(op2_filename, MODEL_PATH))
+            continue
+        print('%-50s %10.3f %10.4f %10.4f %10.2f %7.2f' % (
+            os.path.relpath(op2_filename, MODEL_PATH), size, dt_loop, dt_vector,
+            size / dt_vector, dt_loop / dt_vector))
+
+
+def main():  # pragma: no cover
+    """runs the benchmark"""
+    op2_filenames = sys.argv[1:]
+    if not op2_filenames:
+        op2_filenames = SORT2_MODELS
+    run_benchmark(op2_filenames)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
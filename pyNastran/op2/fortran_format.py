@@ -9,6 +9,7 @@ from copy import deepcopy
 from struct import unpack
 from six import iteritems
 from six.moves import range
+import numpy as np
 
 from pyNastran.utils import integer_types
 from pyNastran.op2.errors import FortranMarkerError, SortCodeError
@@ -40,6 +41,13 @@ class FortranFormat(object):
         self.is_all_subcases = True
         self.valid_subcases = []
 
+        #: the element types to read (e.g., set(['CQUAD4', 'CTRIA3']));
+        #: None -> all element types
+        self.valid_element_types = None
+
+        #: the element ids to read; None -> all elements
+        self.valid_element_ids = None
+
     def show(self, n, types='ifs', endian=None):  # pragma: no cover
         """Shows binary data"""
         return self.op2_reader.show(n, types=types, endian=endian)
@@ -86,10 +94,24 @@ class FortranFormat(object):
         op2_reader = self.op2_reader
         datai = b''
         n = 0
+        if self.valid_element_ids is not None and op2_reader.is_element_id_filtered():
+            # the same rows are dropped in both passes, so the arrays
+            # are sized for the filtered record
+            data, ndata = op2_reader._read_record_ndata(as_view=self.use_mmap)
+            data, ndata = self._filter_element_ids(data, ndata)
+            if ndata == 0:
+                self._cleanup_data_members()
+                return n
+            record_len = ndata
+            filtered = True
+        else:
+            filtered = False
+
         if self.read_mode == 2:
             self.ntotal = 0
 
-            data, ndata = op2_reader._read_record_ndata()
+            if not filtered:
+                data, ndata = op2_reader._read_record_ndata(as_view=self.use_mmap)
             n = table4_parser(data, ndata)
             assert isinstance(n, integer_types), self.table_name
 
@@ -100,7 +122,9 @@ class FortranFormat(object):
 
             #n = op2_reader._skip_record()
             #n = table4_parser(datai, 300000)
-            if self.table_name in [b'R1TABRG', b'ONRGY1']:
+            if filtered:
+                pass
+            elif self.table_name in [b'R1TABRG', b'ONRGY1']:
                 data, ndata = op2_reader._read_record_ndata()
             else:
                 data, ndata = op2_reader._skip_record_ndata()
@@ -119,6 +143,43 @@ class FortranFormat(object):
         self._cleanup_data_members()
         return n
 
+    def _filter_element_ids(self, data, ndata):
+        """
+        Removes the rows of a SORT1 element result record that aren't in
+        ``valid_element_ids``.
+
+        Each row is num_wide words and starts with the eid_device
+        (eid * 10 + device_code).
+
+        Parameters
+        ----------
+        data : bytes / memoryview
+            the record
+        ndata : int
+            the length of the record
+
+        Returns
+        -------
+        data : bytes / memoryview
+            the matching rows
+        ndata : int
+            the length of the matching rows
+
+        """
+        ntotal = self.num_wide * 4
+        if ndata % ntotal:
+            # the rows aren't a fixed size
+            return data, ndata
+        nrows = ndata // ntotal
+        ints = np.frombuffer(data, dtype=self.idtype, count=nrows * self.num_wide)
+        ints = ints.reshape(nrows, self.num_wide)
+        eids = ints[:, 0] // 10
+        i = np.in1d(eids, self.valid_element_ids)
+        if i.all():
+            return data, ndata
+        rows = ints[i, :]
+        return rows.tobytes(), rows.nbytes
+
     def _reset_vector_counter(self):
         """
         if reading the data
@@ -5,7 +5,12 @@ Defines the main OP2 class.  Defines:
  - read_op2(op2_filename=None, combine=True, subcases=None,
             exclude_results=None, include_results=None,
             log=None, debug=True, debug_file=None, build_dataframe=None,
-            skip_undefined_matrices=True, mode='msc', encoding=None)
+            skip_undefined_matrices=True, mode='msc', encoding=None,
+            index_filename=None, nworkers=None)
+
+ - iter_op2_results(op2_filename, result_names=None, subcases=None,
+                    log=None, debug=None, mode='msc', encoding=None,
+                    index_filename=None)
 
  - OP2(debug=True, log=None, debug_file=None, mode='msc')
    - build_dataframe()
@@ -15,7 +20,8 @@ Defines the main OP2 class.  Defines:
    - object_methods(mode='public', keys_to_skip=None)
    - print_subcase_key()
    - read_op2(op2_filename=None, combine=True, build_dataframe=None,
-              skip_undefined_matrices=False, encoding=None)
+              skip_undefined_matrices=False, encoding=None, index_filename=None,
+              nworkers=None)
    - set_mode(mode)
    - transform_displacements_to_global(i_transform, coords, xyz_cid0=None, debug=False)
    - transform_gpforce_to_global(nids_all, nids_transform, i_transform, coords, xyz_cid0=None)
@@ -40,12 +46,17 @@ from pyNastran.op2.errors import SortCodeError, DeviceCodeError, FortranMarkerEr
 #from pyNastran.op2.op2_interface.op2_writer import OP2Writer
 #from pyNastran.op2.op2_interface.op2_f06_common import Op2F06Attributes
 from pyNastran.op2.op2_interface.op2_scalar import OP2_Scalar
+from pyNastran.op2.op2_interface.op2_parallel import (
+    set_tables_to_read, clear_unread_results, start_workers, collect_workers,
+    merge_workers)
 from pyNastran.utils import print_bad_path
+from pyNastran.utils.log import get_logger2
 
 def read_op2(op2_filename=None, combine=True, subcases=None,
              exclude_results=None, include_results=None,
              log=None, debug=True, debug_file=None, build_dataframe=None,
-             skip_undefined_matrices=True, mode='msc', encoding=None):
+             skip_undefined_matrices=True, mode='msc', encoding=None,
+             index_filename=None, nworkers=None):
     """
     Creates the OP2 object without calling the OP2 class.
 
@@ -78,6 +89,14 @@ def read_op2(op2_filename=None, combine=True, subcases=None,
         sets the filename that will be written to
     encoding : str
         the unicode encoding (default=None; system default)
+    index_filename : str; default=None
+        a table of contents sidecar file (e.g., 'model.op2.idx');
+        if it matches the OP2, it's used to jump to the requested subcases,
+        otherwise it's written
+        None : no sidecar
+    nworkers : int; default=None
+        the number of processes to read the results with
+        None/1 : read the results in this process
 
     Returns
     -------
@@ -106,7 +125,8 @@ def read_op2(op2_filename=None, combine=True, subcases=None,
 
     model.read_op2(op2_filename=op2_filename, build_dataframe=build_dataframe,
                    skip_undefined_matrices=skip_undefined_matrices, combine=combine,
-                   encoding=encoding)
+                   encoding=encoding, index_filename=index_filename,
+                   nworkers=nworkers)
     ## TODO: this will go away when OP2 is refactored
     ## TODO: many methods will be missing, but it's a start...
     ## doesn't support F06 writer
@@ -119,6 +139,86 @@ def read_op2(op2_filename=None, combine=True, subcases=None,
     return model
 
 
+def iter_op2_results(op2_filename, result_names=None, subcases=None,
+                     log=None, debug=None, mode='msc', encoding=None,
+                     index_filename=None):
+    """
+    Reads the results of an OP2 one block at a time, so the full set of
+    results is never in memory.
+
+    The array sizing pass is run once to build the table of contents.
+    Each block (the table 3/table 4 pairs of a single time step, mode or
+    frequency of a subcase for SORT1 results) is then read on its own,
+    jumping over the rest of the file.
+
+    Parameters
+    ----------
+    op2_filename : str
+        the OP2 filename
+    result_names : List[str]; default=None -> all results
+        the results to read (e.g., ['displacements', 'cquad4_stress'])
+    subcases : List[int]; default=None -> all subcases
+        the subcases to read
+    log : Log()
+        a logging object
+    debug : bool; default=None
+        True : logs debug/info/warning/error messages
+        False : logs info/warning/error messages
+        None : logs warning/error messages
+    mode : str; default='msc'
+        the version of the Nastran you're using
+        {nx, msc, optistruct}
+    encoding : str
+        the unicode encoding (default=None; system default)
+    index_filename : str; default=None
+        an optional table of contents sidecar (e.g., model.op2.idx)
+
+    Yields
+    ------
+    key : (str, key)
+        the result name and the uncombined key in the result dictionary
+        (e.g., ('displacements', (1, 6, 1, 0, 0, '', '')))
+    result : varies
+        the result object for the block (e.g., RealDisplacementArray)
+
+    Examples
+    --------
+    >>> for (result_name, key), result in iter_op2_results(
+    ...         op2_filename, result_names=['displacements']):
+    ...     print(result_name, key, result._times)
+
+    .. note:: only the results with table 3/table 4 pairs
+              (e.g., displacements, stress, strain, force) are read
+    """
+    log = get_logger2(log, debug=debug)
+    model = OP2(log=log, debug=False, mode=mode)
+    if result_names is not None:
+        model.set_results(result_names)
+        result_names = set(model._results.saved)
+    table_index = model._read_table_index(op2_filename, encoding=encoding,
+                                          index_filename=index_filename)
+    blocks = table_index.get_subtable_blocks(result_names=result_names, subcases=subcases)
+    encoding = model.encoding
+    del model
+
+    for block in blocks:
+        model = OP2(log=log, debug=False, mode=mode)
+        if result_names is not None:
+            model.set_results(result_names)
+        subtable_starts = sorted([subtable[0] for subtable in block])
+        model._read_op2_block(op2_filename, table_index, subtable_starts, encoding)
+        for result_name in model.get_table_types():
+            if result_names is not None and result_name not in result_names:
+                # some readers don't check the saved results
+                continue
+            slot = model.get_result(result_name)
+            if not isinstance(slot, dict):
+                continue
+            for key, result in iteritems(slot):
+                yield (result_name, key), result
+        del model
+
+
 #class OP2(OP2_Scalar, OP2Writer):
 class OP2(OP2_Scalar):
 
@@ -514,7 +614,8 @@ class OP2(OP2_Scalar):
         #self.ask = ask
 
     def read_op2(self, op2_filename=None, combine=True, build_dataframe=None,
-                 skip_undefined_matrices=False, encoding=None):
+                 skip_undefined_matrices=False, encoding=None, index_filename=None,
+                 nworkers=None):
         """
         Starts the OP2 file reading
 
@@ -532,6 +633,16 @@ class OP2(OP2_Scalar):
              True : prevents matrix reading crashes
         encoding : str
             the unicode encoding (default=None; system default)
+        index_filename : str; default=None
+            a table of contents sidecar file (e.g., 'model.op2.idx');
+            if it matches the OP2, it's used to jump to the requested
+            subcases, otherwise it's written
+            None : no sidecar
+        nworkers : int; default=None
+            the number of processes to read the results with;
+            the results are split between the processes after the
+            array sizing pass
+            None/1 : read the results in this process
 
         """
         if build_dataframe is None:
@@ -551,9 +662,29 @@ class OP2(OP2_Scalar):
         self.read_mode = 1
         self._close_op2 = False
 
+        self.table_index.clear()
+        if self._preloaded_table_index is not None:
+            self.table_index = self._preloaded_table_index
+            self.table_index.is_loaded = True
+        elif index_filename is not None and op2_filename is not None:
+            if self.table_index.read_file(index_filename, op2_filename,
+                                          self._get_read_again_key(), log=self.log):
+                self.log.debug('loaded the table of contents from %r' % index_filename)
+
+        pool = None
         try:
             # get GUI object names, build objects, but don't read data
             OP2_Scalar.read_op2(self, op2_filename=op2_filename)
+            if index_filename is not None and not self.table_index.is_loaded:
+                self.table_index.write_file(index_filename, self.op2_filename,
+                                            self._get_read_again_key())
+
+            if self._read_result_names is not None:
+                set_tables_to_read(self.table_index, self._read_result_names)
+            elif nworkers is not None and nworkers > 1:
+                pool, jobs = start_workers(
+                    self, nworkers, skip_undefined_matrices=skip_undefined_matrices,
+                    encoding=encoding)
 
             # TODO: stuff to figure out objects
             # TODO: stuff to show gui of table names
@@ -563,17 +694,105 @@ class OP2(OP2_Scalar):
             self.log.debug('-------- reading op2 with read_mode=2 (array filling) --------')
             OP2_Scalar.read_op2(self, op2_filename=self.op2_filename)
         except IOError:
+            if pool is not None:
+                pool.terminate()
             raise
         except:
+            if pool is not None:
+                pool.terminate()
             OP2_Scalar.close_op2(self, force=True)
             raise
+        if self._read_result_names is not None:
+            clear_unread_results(self, self._read_result_names)
+        elif pool is not None:
+            worker_results = collect_workers(self, pool, jobs)
         self._finalize()
+        if pool is not None:
+            merge_workers(self, worker_results)
         if build_dataframe:
             self.build_dataframe()
         self.create_objects_from_matrices()
         self.combine_results(combine=combine)
         self.log.debug('finished reading op2')
 
+    def _read_table_index(self, op2_filename, encoding=None, index_filename=None):
+        """
+        Runs the array sizing pass to build the table of contents
+
+        Parameters
+        ----------
+        op2_filename : str
+            the OP2 filename
+        encoding : str
+            the unicode encoding (default=None; system default)
+        index_filename : str; default=None
+            an optional table of contents sidecar (e.g., model.op2.idx)
+
+        Returns
+        -------
+        table_index : OP2TableIndex()
+            the table of contents
+
+        """
+        if encoding is None:
+            encoding = sys.getdefaultencoding()
+        self.encoding = encoding
+        self.is_vectorized = True
+
+        self.table_index.clear()
+        if index_filename is not None and self.table_index.read_file(
+                index_filename, op2_filename, self._get_read_again_key(), log=self.log):
+            self.log.debug('loaded the table of contents from %r' % index_filename)
+            return self.table_index
+
+        self.read_mode = 1
+        self._close_op2 = True
+        try:
+            OP2_Scalar.read_op2(self, op2_filename=op2_filename)
+        except:
+            OP2_Scalar.close_op2(self, force=True)
+            raise
+        if index_filename is not None:
+            self.table_index.write_file(index_filename, self.op2_filename,
+                                        self._get_read_again_key())
+
+        # the index is complete, so it can be used in the array sizing pass
+        self.table_index.is_loaded = True
+        return self.table_index
+
+    def _read_op2_block(self, op2_filename, table_index, subtable_starts, encoding):
+        """
+        Reads a subset of the table 3/table 4 pairs
+
+        Parameters
+        ----------
+        op2_filename : str
+            the OP2 filename
+        table_index : OP2TableIndex()
+            the table of contents from ``_read_table_index``
+        subtable_starts : List[int]
+            the sorted positions of the table 3/table 4 pairs to read
+        encoding : str
+            the unicode encoding
+
+        """
+        self.encoding = encoding
+        self.is_vectorized = True
+        self.table_index = table_index
+        self._read_subtable_starts = subtable_starts
+
+        self.read_mode = 1
+        self._close_op2 = False
+        try:
+            OP2_Scalar.read_op2(self, op2_filename=op2_filename)
+            self.read_mode = 2
+            self._close_op2 = True
+            OP2_Scalar.read_op2(self, op2_filename=self.op2_filename)
+        except:
+            OP2_Scalar.close_op2(self, force=True)
+            raise
+        self._finalize()
+
     def create_objects_from_matrices(self):
         """
         creates the following objects:
@@ -0,0 +1,79 @@
+"""
+Defines:
+ - MMapFile(filename)
+   - read(n=-1)
+   - read_view(n)
+   - seek(n, whence=0)
+   - tell()
+   - close()
+
+A read-only, memory-mapped stand in for the OP2 file object.
+
+``read`` returns bytes just like a file, so the table/marker reading code
+doesn't change.  ``read_view`` returns a memoryview of the mapped file,
+so large result records can be passed to ``np.frombuffer`` without being
+copied into a bytes object first.  The data is then only copied once,
+when it's put into the result array.
+
+"""
+from __future__ import print_function
+import mmap
+
+
+class MMapFile(object):
+    """a read-only, memory-mapped binary file"""
+    def __init__(self, filename):
+        """
+        Parameters
+        ----------
+        filename : str
+            the file to map
+
+        """
+        self.name = filename
+        self._file = open(filename, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self.size = len(self._mmap)
+        self.closed = False
+
+        # the mmap methods are used directly, so the marker reading
+        # isn't slowed down by an extra python call
+        #: reads n bytes (or the rest of the file) as a bytes object
+        self.read = self._mmap.read
+        #: moves to a position in the file
+        self.seek = self._mmap.seek
+        #: gets the current position in the file
+        self.tell = self._mmap.tell
+
+    def read_view(self, n):
+        """reads n bytes as a memoryview (no copy)"""
+        n0 = self._mmap.tell()
+        n1 = min(n0 + n, self.size)
+        self._mmap.seek(n1)
+        return self._view[n0:n1]
+
+    def close(self):
+        """
+        Closes the file
+
+        The map stays open (until it's garbage collected) if there are
+        still arrays that point into it.
+        """
+        if self.closed:
+            return
+        del self.read, self.seek, self.tell
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # numpy arrays still reference the map
+            pass
+        self._file.close()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
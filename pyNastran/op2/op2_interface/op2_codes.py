@@ -26,6 +26,45 @@ def get_sort_method_from_table_name(table_name):
     return sort_method
 
 
+#: the OP2 element names that don't match the card name
+CARD_NAME_MAP = {
+    'QUAD144' : 'CQUAD4', 'CQUAD144' : 'CQUAD4',
+    'QUAD4LC' : 'CQUAD4', 'TRIA3LC' : 'CTRIA3',
+    'QUAD8LC' : 'CQUAD8', 'TRIA6LC' : 'CTRIA6',
+    'QUADRLC' : 'CQUADR', 'TRIARLC' : 'CTRIAR',
+    'QUADR' : 'CQUADR', 'TRIAR' : 'CTRIAR',
+    'QUAD4' : 'CQUAD4', 'TRIA3' : 'CTRIA3', 'QUAD8' : 'CQUAD8', 'TRIA6' : 'CTRIA6',
+    'HEXA' : 'CHEXA', 'PENTA' : 'CPENTA', 'TETRA' : 'CTETRA',
+    'ROD' : 'CROD', 'TUBE' : 'CTUBE', 'GAP' : 'CGAP', 'BEAM' : 'CBEAM', 'BUSH' : 'CBUSH',
+    'QUAD4NL' : 'CQUAD4', 'TRIA3NL' : 'CTRIA3',
+    'HEXANL' : 'CHEXA', 'PENTANL' : 'CPENTA', 'TETRANL' : 'CTETRA',
+    'RODNL' : 'CROD', 'CONRODNL' : 'CONROD', 'TUBENL' : 'CTUBE',
+    'GAPNL' : 'CGAP', 'BEAMNL' : 'CBEAM', 'BAR' : 'CBAR',
+    'BUSH2D' : 'CBUSH2D',
+}
+
+def get_card_name(element_name):
+    """
+    Gets the card name for an OP2 element name
+
+    Parameters
+    ----------
+    element_name : str / None
+        the element name from the element mapper
+        (e.g., 'CBAR-34', 'QUAD144', 'QUAD4LC-composite')
+
+    Returns
+    -------
+    card_name : str / None
+        the card (e.g., 'CBAR', 'CQUAD4', 'CQUAD4')
+
+    """
+    if element_name is None:
+        return None
+    card_name = element_name.split('-')[0]
+    return CARD_NAME_MAP.get(card_name, card_name)
+
+
 class Op2Codes(object):
     def __init__(self):
         pass
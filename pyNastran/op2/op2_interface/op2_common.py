@@ -48,6 +48,10 @@ class OP2Common(Op2Codes, F06Writer):
         # how many optimization passes have there been
         self._count = 0
 
+        #: the ids of the result dictionaries that the current table added
+        #: to or resized while the table of contents is built (None=not tracked)
+        self._sized_slots = None
+
         #: the results
         self.result_names = set([])
         #: bool
@@ -1249,6 +1253,19 @@ class OP2Common(Op2Codes, F06Writer):
         #flag = 'freq/dt/mode'
         return flag, flag_type
 
+    def _set_complex_table_sort2_times(self, obj, itotal, itotal2, ints, floats):
+        """
+        Sets the frequencies for a SORT2 OUG-style table.
+
+        SORT2 stores the freq/dt/mode in the first column, so the
+        time array is filled from the block instead of the table 3 header.
+        """
+        if self._analysis_code_fmt == b'i':
+            obj._times[itotal:itotal2] = ints[:, 0]
+        else:
+            assert self._analysis_code_fmt == b'f', self._analysis_code_fmt
+            obj._times[itotal:itotal2] = floats[:, 0]
+
     def _read_complex_table_sort2_mag(self, data, is_vectorized, nnodes, result_name, flag):
         if self.is_debug_file:
             self.binary_debug.write('  _read_complex_table\n')
@@ -1262,11 +1279,26 @@ class OP2Common(Op2Codes, F06Writer):
         assert nnodes > 0
         #assert ndata % ntotal == 0
 
-        if self.use_vector and is_vectorized and 0:
-            pass
+        obj = self.obj
+        if self.use_vector and is_vectorized:
+            n = nnodes * 4 * 14
+            itotal = obj.itotal
+            itotal2 = itotal + nnodes
+
+            floats = frombuffer(data, dtype=self.fdtype).reshape(nnodes, 14).copy()
+            ints = frombuffer(data, dtype=self.idtype).reshape(nnodes, 14)
+            self._set_complex_table_sort2_times(obj, itotal, itotal2, ints, floats)
+            obj.node_gridtype[obj.itime, :] = [node_id, ints[-1, 1]]
+
+            mag = floats[:, 2:8]
+            phase = floats[:, 8:]
+            rtheta = radians(phase)
+            real_imag = mag * (cos(rtheta) + 1.j * sin(rtheta))
+            obj.data[itotal:itotal2, obj.itime, :] = real_imag
+            obj.itotal = itotal2
         else:
             n = 0
-            s = Struct(self._endian + self._analysis_code_fmt + 'i12f')
+            s = Struct(self._endian + self._analysis_code_fmt + b'i12f')
             binary_debug_fmt = '  %s=%s %%s\n' % (flag, flag_type)
             for inode in range(nnodes):
                 edata = data[n:n+56]
@@ -1300,12 +1332,25 @@ class OP2Common(Op2Codes, F06Writer):
         flag, flag_type = self.get_oug2_flag()
         node_id = self.nonlinear_factor
 
-        if self.use_vector and is_vectorized and 0:
-            pass
+        obj = self.obj
+        if self.use_vector and is_vectorized:
+            n = nnodes * 4 * 14
+            itotal = obj.itotal
+            itotal2 = itotal + nnodes
+
+            floats = frombuffer(data, dtype=self.fdtype).reshape(nnodes, 14).copy()
+            ints = frombuffer(data, dtype=self.idtype).reshape(nnodes, 14)
+            self._set_complex_table_sort2_times(obj, itotal, itotal2, ints, floats)
+            obj.node_gridtype[obj.itime, :] = [node_id, ints[-1, 1]]
+
+            real = floats[:, 2:8]
+            imag = floats[:, 8:]
+            obj.data[itotal:itotal2, obj.itime, :] = real + 1.j * imag
+            obj.itotal = itotal2
         else:
             n = 0
             #ntotal = 56  # 14 * 4
-            s = Struct(self._endian + self._analysis_code_fmt + 'i12f')
+            s = Struct(self._endian + self._analysis_code_fmt + b'i12f')
             assert self.obj is not None
             assert nnodes > 0
             #assert ndata % ntotal == 0
@@ -1372,6 +1417,9 @@ class OP2Common(Op2Codes, F06Writer):
         assert self.log is not None
 
         code = self._get_code()
+        if self._sized_slots is not None:
+            # the table of contents is being built
+            self._sized_slots.add(id(storage_obj))
         #print('code =', code)
         if hasattr(self, 'isubcase'):
             if self.code in storage_obj:
@@ -1953,6 +2001,39 @@ class OP2Common(Op2Codes, F06Writer):
         assert is_vectorized, '%r is not vectorized; obj=%s' % (result_name, obj_vector)
         return auto_return, is_vectorized
 
+    def obj_set_element(self, obj, ielement, ielement2, data, nelements):
+        """
+        Sets the element ids for a vectorized element result with one
+        row per element.
+
+        SORT1 data has an eid_device in the first column, so the element
+        ids are set on the first time step.  SORT2 data has the
+        freq/dt/mode in the first column and the element id in the
+        table 3 header, so we store it the same way the unvectorized
+        ``get_eid_dt_from_eid_device``/``add_sort1`` calls would.
+        """
+        if self.sort_method == 2:
+            self.obj_set_sort2_time(obj, data, nelements)
+            obj.element[ielement:ielement2] = self.nonlinear_factor
+        elif obj.itime == 0:
+            ints = frombuffer(data, dtype=self.idtype).reshape(nelements, self.num_wide).copy()
+            eids = ints[:, 0] // 10
+            assert eids.min() > 0, eids.min()
+            obj.element[ielement:ielement2] = eids
+
+    def obj_set_sort2_time(self, obj, data, nelements):
+        """
+        Sets the time for a vectorized SORT2 element result.
+
+        The freq/dt/mode is in the first column of each row, and the
+        unvectorized ``add_sort1`` calls keep the last one.
+        """
+        if self._analysis_code_fmt == b'i':
+            times = frombuffer(data, dtype=self.idtype).reshape(nelements, self.num_wide)
+        else:
+            times = frombuffer(data, dtype=self.fdtype).reshape(nelements, self.num_wide)
+        obj._times[obj.itime] = times[-1, 0]
+
     def _is_vectorized(self, obj_vector, slot_vector):
         """
         Checks to see if the data array has been vectorized
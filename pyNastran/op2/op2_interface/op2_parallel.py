@@ -0,0 +1,273 @@
+"""
+Defines methods for reading the results of an OP2 in parallel:
+ - partition_results(table_index, result_names, nworkers)
+ - set_tables_to_read(table_index, result_names)
+ - clear_unread_results(model, result_names)
+ - start_workers(model, nworkers)
+ - collect_workers(model, pool, jobs)
+ - merge_workers(model, worker_results)
+
+The result tables are independent once the array sizing pass has built
+the table of contents, so the results are split into groups that have
+about the same number of bytes.  The first group is read by the calling
+process, while each of the other groups is read by a worker process.
+The workers are given the table of contents of the calling process, so
+they don't repeat the scan of the file and each process only reads the
+tables that have its results.  The workers hand back the result dictionaries
+(e.g., model.cquad4_stress), which are merged into the calling model.
+
+The workers are forked processes, so the arrays are pickled back rather
+than being shared.  This is the most useful for large models with many
+result types; a model with a single large result (e.g., only
+displacements) is still read by one process.
+
+"""
+from __future__ import print_function, unicode_literals
+from copy import deepcopy
+from multiprocessing import Pool
+
+from six import iteritems
+from pyNastran.utils.log import get_logger2
+
+
+def partition_results(table_index, result_names, nworkers):
+    """
+    Splits the results into groups with approximately the same size.
+
+    Parameters
+    ----------
+    table_index : OP2TableIndex()
+        the table of contents from the array sizing pass
+    result_names : List[str]
+        the results that may be split (e.g., ['displacements', 'cquad4_stress'])
+    nworkers : int
+        the number of groups
+
+    Returns
+    -------
+    groups : List[List[str], ...]
+        the results for each process; empty groups are dropped
+
+    """
+    result_names = set(result_names)
+    nbytes = {}
+    for table in table_index.tables:
+        names = [name for name in table.result_names if name in result_names]
+        if not names:
+            continue
+        # split the table evenly between the results that are in it
+        nbytes_per_result = table.nbytes / float(len(names))
+        for name in names:
+            nbytes[name] = nbytes.get(name, 0.) + nbytes_per_result
+
+    # greedy longest processing time partitioning
+    groups = [[] for unused_i in range(nworkers)]
+    group_nbytes = [0.] * nworkers
+    for name in sorted(nbytes, key=lambda name: (-nbytes[name], name)):
+        igroup = group_nbytes.index(min(group_nbytes))
+        groups[igroup].append(name)
+        group_nbytes[igroup] += nbytes[name]
+    return [group for group in groups if group]
+
+
+def set_tables_to_read(table_index, result_names):
+    """
+    Jumps over the result tables that don't have any of the results in
+    the array filling pass.
+
+    Parameters
+    ----------
+    table_index : OP2TableIndex()
+        the table of contents from the array sizing pass
+    result_names : set[str]
+        the results to read
+
+    """
+    for table in table_index.tables:
+        if table.result_names and not result_names.intersection(table.result_names):
+            table.read_again = False
+
+
+def clear_unread_results(model, result_names):
+    """
+    Removes the results that were sized, but not filled, because their
+    tables were jumped over in the array filling pass.
+
+    Parameters
+    ----------
+    model : OP2()
+        the model after the array filling pass
+    result_names : set[str]
+        the results that were read
+
+    """
+    for name in model.get_table_types():
+        if name in result_names:
+            continue
+        slot = model.get_result(name)
+        if isinstance(slot, dict):
+            slot.clear()
+
+
+def start_workers(model, nworkers, skip_undefined_matrices=False, encoding=None):
+    """
+    Starts the workers after the array sizing pass.
+
+    The tables that only have the results that are read by the workers
+    are jumped over in the array filling pass.
+
+    Parameters
+    ----------
+    model : OP2()
+        the model after the array sizing pass
+    nworkers : int
+        the number of processes, including the calling process
+    skip_undefined_matrices : bool; default=False
+         True : prevents matrix reading crashes
+    encoding : str
+        the unicode encoding (default=None; system default)
+
+    Returns
+    -------
+    pool : multiprocessing.Pool / None
+        the workers (None if the results can't be split)
+    jobs : List[AsyncResult]
+        the pending results for each worker
+
+    """
+    result_names = set([])
+    for table in model.table_index.tables:
+        result_names.update(table.result_names)
+    groups = partition_results(model.table_index, result_names, nworkers)
+    if len(groups) < 2:
+        return None, []
+
+    worker_groups = groups[1:]
+    model.log.debug('reading %s with %i workers; results=%s' % (
+        model.op2_filename, len(groups), worker_groups))
+
+    # the workers jump over the tables with the results of the other
+    # groups, so they get the read_again flags from the array sizing pass
+    table_index = deepcopy(model.table_index) if model.use_table_index else None
+
+    # the calling process only reads the tables with its results
+    set_tables_to_read(model.table_index, set(groups[0]))
+
+    settings = {
+        'mode' : model._nastran_format,
+        'subcases' : None if model.is_all_subcases else sorted(model.valid_subcases),
+        'element_types' : model.valid_element_types,
+        'element_ids' : model.valid_element_ids,
+        'use_vector' : model.use_vector,
+        'use_table_index' : model.use_table_index,
+        'use_mmap' : model.use_mmap,
+        'skip_undefined_matrices' : skip_undefined_matrices,
+        'encoding' : encoding,
+        'table_index' : table_index,
+    }
+    pool = Pool(processes=len(worker_groups))
+    jobs = [pool.apply_async(read_results_worker, (model.op2_filename, group, settings))
+            for group in worker_groups]
+    pool.close()
+    return pool, jobs
+
+
+def collect_workers(model, pool, jobs):
+    """
+    Waits for the workers after the array filling pass.
+
+    A table may have results from more than one group, so the partially
+    filled worker results are removed from the model before it's finalized.
+
+    Parameters
+    ----------
+    model : OP2()
+        the model after the array filling pass
+    pool : multiprocessing.Pool
+        the workers
+    jobs : List[AsyncResult]
+        the pending results for each worker
+
+    Returns
+    -------
+    worker_results : List[(List[str], dict, dict), ...]
+        the output of read_results_worker for each worker
+
+    """
+    try:
+        worker_results = [job.get() for job in jobs]
+    finally:
+        pool.terminate()
+        pool.join()
+
+    for result_names, unused_results, unused_isubcase_name_map in worker_results:
+        for name in result_names:
+            model.get_result(name).clear()
+    return worker_results
+
+
+def merge_workers(model, worker_results):
+    """
+    Merges the worker results into the finalized model.
+
+    Parameters
+    ----------
+    model : OP2()
+        the finalized model
+    worker_results : List[(List[str], dict, dict), ...]
+        the output of collect_workers
+
+    """
+    for result_names, results, isubcase_name_map in worker_results:
+        for name, result in iteritems(results):
+            model.get_result(name).update(result)
+        for isubcase, names in iteritems(isubcase_name_map):
+            model.isubcase_name_map.setdefault(isubcase, names)
+
+
+def read_results_worker(op2_filename, result_names, settings):
+    """
+    Reads a subset of the results in a separate process.
+
+    Parameters
+    ----------
+    op2_filename : str
+        the OP2 to read
+    result_names : List[str]
+        the results to read (e.g., ['cquad4_stress', 'ctria3_stress'])
+    settings : dict
+        the reader flags of the calling process; settings['table_index']
+        is the table of contents of the calling process (None if the
+        file must be scanned again)
+
+    Returns
+    -------
+    result_names : List[str]
+        the results that the worker read
+    results : dict[result_name] = result
+        the result dictionaries (e.g., results['cquad4_stress'] = model.cquad4_stress)
+    isubcase_name_map : dict[isubcase] = List[str, ...]
+        the subtitle/label of each subcase
+
+    """
+    from pyNastran.op2.op2 import OP2
+    model = OP2(log=get_logger2(debug=None), debug=False)
+    getattr(model, 'set_as_%s' % settings['mode'])()
+    model.use_vector = settings['use_vector']
+    model.use_table_index = settings['use_table_index']
+    model.use_mmap = settings['use_mmap']
+    model.set_subcases(settings['subcases'])
+    model.set_element_types(settings['element_types'])
+    model.set_element_ids(settings['element_ids'])
+    model._read_result_names = set(result_names)
+    model._preloaded_table_index = settings['table_index']
+    model.read_op2(op2_filename, combine=False, build_dataframe=False,
+                   skip_undefined_matrices=settings['skip_undefined_matrices'],
+                   encoding=settings['encoding'])
+
+    results = {}
+    for name in result_names:
+        result = model.get_result(name)
+        if result:
+            results[name] = result
+    return result_names, results, model.isubcase_name_map
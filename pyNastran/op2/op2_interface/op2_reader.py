@@ -42,6 +42,7 @@ Defines various tables that don't fit in other sections:
 """
 from __future__ import print_function, unicode_literals
 import sys
+from bisect import bisect_left
 from copy import deepcopy
 from itertools import count
 from struct import unpack, Struct
@@ -51,6 +52,7 @@ import scipy  # type: ignore
 
 from pyNastran.f06.errors import FatalError
 from pyNastran.op2.errors import FortranMarkerError, SortCodeError
+from pyNastran.op2.op2_interface.op2_codes import get_card_name
 from pyNastran.op2.tables.design_response import (
     WeightResponse, StressResponse, StrainResponse, ForceResponse,
     FlutterResponse, Convergence)
@@ -64,6 +66,17 @@ class OP2Reader(object):
     """Stores methods that aren't useful to an end user"""
     def __init__(self, op2):
         self.op2 = op2
+
+        #: was any table 4 data in the current results table passed to a parser
+        self.is_table_filled = True
+
+        #: the subcase key of the table 3 that was just read
+        #: (isubcase, analysis_code, sort_method, element_type)
+        self._table3_key = None
+
+        #: the element type of the table 3 that was just read
+        #: (None for results that aren't element results)
+        self._table3_element_type = None
         #self.minor_tables = MinorTables(self)
 
         self.mapped_tables = {
@@ -2094,14 +2107,23 @@ class OP2Reader(object):
         """
         return self._read_record_ndata(debug, macro_rewind)[0]
 
-    def _read_record_ndata(self, debug=True, macro_rewind=False):
-        """reads a record and the length of the record"""
+    def _read_record_ndata(self, debug=True, macro_rewind=False, as_view=False):
+        """
+        reads a record and the length of the record
+
+        Parameters
+        ----------
+        as_view : bool; default=False
+            return a memoryview of a memory-mapped OP2 instead of bytes;
+            a record with multiple blocks is still joined into bytes
+
+        """
         op2 = self.op2
         markers0 = self.get_nmarkers(1, rewind=False, macro_rewind=macro_rewind)
         if self.is_debug_file and debug:
             self.binary_debug.write('read_record - marker = [4, %i, 4]; macro_rewind=%s\n' % (
                 markers0[0], macro_rewind))
-        record, nrecord = self._read_block_ndata()
+        record, nrecord = self._read_block_ndata(as_view=as_view)
 
         if self.is_debug_file and debug:
             msg = 'read_record - record = [%i, recordi, %i]; macro_rewind=%s\n' % (
@@ -2119,7 +2141,7 @@ class OP2Reader(object):
                 markers1 = self.get_nmarkers(1, rewind=False)
                 if self.is_debug_file and debug:
                     self.binary_debug.write('read_record - markers1 = [4, %i, 4]\n' % markers1[0])
-                recordi, nrecordi = self._read_block_ndata()
+                recordi, nrecordi = self._read_block_ndata(as_view=as_view)
                 nrecord += nrecordi
                 records.append(recordi)
                 #record += recordi
@@ -2136,14 +2158,19 @@ class OP2Reader(object):
             record = b''.join(records)
         return record, nrecord
 
-    def _read_block_ndata(self):
+    def _read_block_ndata(self, as_view=False):
         """
         Reads a block following a pattern of:
             [nbytes, data, nbytes]
 
+        Parameters
+        ----------
+        as_view : bool; default=False
+            return a memoryview of a memory-mapped OP2 instead of bytes
+
         Returns
         -------
-        data : bytes
+        data : bytes / memoryview
             the data in binary
         ndata : int
             len(data)
@@ -2153,7 +2180,10 @@ class OP2Reader(object):
         data = op2.f.read(4)
         ndata, = op2.struct_i.unpack(data)
 
-        data_out = op2.f.read(ndata)
+        if as_view:
+            data_out = op2.f.read_view(ndata)
+        else:
+            data_out = op2.f.read(ndata)
         data = op2.f.read(4)
         op2.n += 8 + ndata
         return data_out, ndata
@@ -2556,6 +2586,44 @@ class OP2Reader(object):
         self.op2.n = n
         self.op2.f.seek(n)
 
+    def is_valid_element_type(self):
+        """
+        Lets the code check whether or not to read an element type
+
+        Returns
+        -------
+        is_valid : bool
+            should the element type defined by table 3 be read?
+
+        """
+        op2 = self.op2
+        if op2.valid_element_types is None or self._table3_element_type is None:
+            return True
+        element_name = op2.element_mapper.get(self._table3_element_type)
+        return get_card_name(element_name) in op2.valid_element_types
+
+    def is_element_id_filtered(self):
+        """
+        Can the rows of the current subtable be filtered by element id?
+
+        Returns
+        -------
+        is_filtered : bool
+            the subtable is a SORT1 element result
+
+        .. note:: the random tables (e.g., OESCRM1/OEFPSD1) have a
+                  sort_method of 1 in table 3, but are SORT2 (the element
+                  id is in table 3), so the effective sort method is used
+        """
+        op2 = self.op2
+        if self._table3_element_type is None or not hasattr(op2, 'num_wide'):
+            return False
+        try:
+            sort_method = op2._sort_method
+        except AssertionError:
+            return False
+        return sort_method == 1
+
     def is_valid_subcase(self):
         """
         Lets the code check whether or not to read a subcase
@@ -2577,6 +2645,7 @@ class OP2Reader(object):
     def read_results_table(self):
         """Reads a results table"""
         op2 = self.op2
+        self.is_table_filled = False
         if self.is_debug_file:
             self.binary_debug.write('read_results_table - %s\n' % op2.table_name)
         op2.table_name = self._read_table_name(rewind=False)
@@ -2696,13 +2765,53 @@ class OP2Reader(object):
         if self.is_debug_file:
             self.binary_debug.write('---marker0 = %s---\n' % markers)
 
+        # the table of contents stores the table 3/table 4 pairs by subcase,
+        # so we can jump over subcases that weren't requested
+        table_index = op2.table_index
+        subtable_starts = op2._read_subtable_starts
+        build_index = self.read_mode == 1 and not table_index.is_loaded
+        use_table_index = (
+            op2.use_table_index and
+            (not op2.is_all_subcases or subtable_starts is not None) and
+            (self.read_mode == 2 or table_index.is_loaded))
+        subtable_start = None
+        self._table3_element_type = None
+
         # while the subtables aren't done
         while markers[0] != 0:
             op2.is_start_of_subtable = True
             if self.is_debug_file:
                 self.binary_debug.write('***isubtable = %i\n' % op2.isubtable)
+
+            n_start = op2.n
+            if use_table_index:
+                subtable = table_index.get_subtable(n_start)
+                if subtable is not None and subtable_starts is not None:
+                    i = bisect_left(subtable_starts, n_start)
+                    if i == len(subtable_starts) or subtable_starts[i] != n_start:
+                        self._goto_next_subtable(subtable, subtable_starts)
+                        markers = self.get_nmarkers(1, rewind=True)
+                        continue
+                elif subtable is not None and subtable[2] not in op2.valid_subcases:
+                    # skip table 3 and table 4
+                    self._goto(subtable[1])
+                    op2.isubtable -= 2
+                    self.read_markers([op2.isubtable, 1, 0])
+                    markers = self.get_nmarkers(1, rewind=True)
+                    continue
+
+            self._table3_key = None
             self._read_subtable_3_4(table3_parser, table4_parser, passer)
             #force_table4 = self._read_subtable_3_4(table3_parser, table4_parser, passer)
+            if build_index:
+                if self._table3_key is not None:
+                    subtable_start = n_start
+                    subtable_key = self._table3_key
+                    subtable_isubtable = op2.isubtable
+                elif subtable_start is not None:
+                    table_index.add_subtable(subtable_start, op2.n, *subtable_key,
+                                             isubtable=subtable_isubtable)
+                    subtable_start = None
             op2.isubtable -= 1
             self.read_markers([op2.isubtable, 1, 0])
             markers = self.get_nmarkers(1, rewind=True)
@@ -2713,6 +2822,34 @@ class OP2Reader(object):
         self.read_markers([0])
         op2._finish()
 
+    def _goto_next_subtable(self, subtable, subtable_starts):
+        """
+        Jumps from a table 3/table 4 pair to the next requested pair in the
+        same table or to the end of the last pair in the table
+
+        Parameters
+        ----------
+        subtable : (n_start, n_end, isubcase, analysis_code, sort_method, element_type,
+                    isubtable)
+            the table 3/table 4 pair at the current position
+        subtable_starts : List[int]
+            the sorted positions of the requested table 3/table 4 pairs
+
+        """
+        op2 = self.op2
+        table_index = op2.table_index
+        table = table_index.get_subtable_table(subtable[0])
+        i = bisect_left(subtable_starts, subtable[0])
+        if i < len(subtable_starts) and subtable_starts[i] < table.n_end:
+            next_subtable = table_index.get_subtable(subtable_starts[i])
+            self._goto(next_subtable[0])
+            op2.isubtable = next_subtable[6]
+        else:
+            last_subtable = table.subtables[-1]
+            self._goto(last_subtable[1])
+            op2.isubtable = last_subtable[6] - 2
+            self.read_markers([op2.isubtable, 1, 0])
+
     def _read_subtable_3_4(self, table3_parser, table4_parser, passer):
         """
         Reads a series of subtable 3/4
@@ -2755,6 +2892,12 @@ class OP2Reader(object):
             if not passer:
                 try:
                     table3_parser(data, ndata)
+                    data_code = op2.data_code
+                    self._table3_element_type = data_code.get('element_type')
+                    if 'isubcase' in data_code:
+                        self._table3_key = (
+                            data_code['isubcase'], data_code.get('analysis_code'),
+                            data_code.get('sort_method'), data_code.get('element_type'))
                 except SortCodeError:
                     if self.is_debug_file:
                         self.binary_debug.write('except SortCodeError!\n')
@@ -2768,9 +2911,11 @@ class OP2Reader(object):
                 #if hasattr(op2, 'isubcase'):
                     #print("code = ", op2._get_code())
         else:
-            if passer or not self.is_valid_subcase():
+            if passer or not self.is_valid_subcase() or not self.is_valid_element_type():
                 data = self._skip_record()
             else:
+                # there is data to put into an object
+                self.is_table_filled = True
                 if hasattr(op2, 'num_wide'):
                     # num_wide is the result size and is usually found in
                     # table3, but some B-list tables don't have it
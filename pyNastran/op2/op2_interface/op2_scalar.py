@@ -7,6 +7,8 @@ Defines the sub-OP2 class.  This should never be called outisde of the OP2 class
    Methods
    -------
    - set_subcases(subcases=None)
+   - set_element_types(element_types=None)
+   - set_element_ids(element_ids=None)
    - set_transient_times(times)
    - read_op2(op2_filename=None, combine=False)
    - set_additional_generalized_tables_to_read(tables)
@@ -50,6 +52,7 @@ from __future__ import (nested_scopes, generators, division, absolute_import,
 import os
 #import sys
 from struct import unpack
+from bisect import bisect_left
 from collections import Counter
 from typing import List
 from six import binary_type, string_types, iteritems, PY2, PY3, b
@@ -61,6 +64,8 @@ from pyNastran import is_release
 from pyNastran.f06.errors import FatalError
 from pyNastran.op2.tables.grid_point_weight import GridPointWeight
 from pyNastran.op2.op2_interface.op2_reader import OP2Reader
+from pyNastran.op2.op2_interface.table_index import OP2TableIndex
+from pyNastran.op2.op2_interface.mmap_file import MMapFile
 
 #============================
 
@@ -79,7 +84,7 @@ from pyNastran.op2.tables.oug.oug import OUG
 from pyNastran.op2.tables.ogpwg import OGPWG
 from pyNastran.op2.fortran_format import FortranFormat
 
-from pyNastran.utils import is_binary_file
+from pyNastran.utils import is_binary_file, integer_types
 from pyNastran.utils.log import get_logger
 
 """
@@ -697,6 +702,31 @@ class OP2_Scalar(LAMA, ONR, OGPF,
         self.is_vectorized = False
         self._close_op2 = True
 
+        #: should the table of contents from the array sizing pass be used
+        #: to jump over tables that don't need to be read again
+        self.use_table_index = True
+
+        #: the table of contents that is built in the array sizing pass
+        self.table_index = OP2TableIndex()
+
+        #: should the OP2 be memory-mapped, so the results records are
+        #: passed to the table parsers without being copied
+        self.use_mmap = False
+
+        #: the results that are filled in the array filling pass (None=all);
+        #: the tables without these results are jumped over
+        self._read_result_names = None
+
+        #: a table of contents that was built by another process (e.g., the
+        #: calling process of a read_op2 worker); it's used in place of the
+        #: sidecar/array sizing pass index, so the tables without the
+        #: _read_result_names are jumped over in both passes
+        self._preloaded_table_index = None
+
+        #: the sorted positions of the table 3/table 4 pairs to read in both
+        #: passes (None=all); used to read the results one block at a time
+        self._read_subtable_starts = None
+
         self.result_names = set([])
 
         self.grid_point_weight = GridPointWeight()
@@ -741,6 +771,47 @@ class OP2_Scalar(LAMA, ONR, OGPF,
             self.valid_subcases = set(subcases)
         self.log.debug("set_subcases - subcases = %s" % self.valid_subcases)
 
+    def set_element_types(self, element_types=None):
+        """
+        Allows you to read only the element types in the list of element
+        types.  The other element types are jumped over in the OES/OEF
+        tables, so they're never unpacked.
+
+        Parameters
+        ----------
+        element_types : List[str, ...] / str; default=None->all element types
+            list of card names (e.g., ['CQUAD4', 'CTRIA3'])
+
+        """
+        if element_types is None or element_types == []:
+            self.valid_element_types = None
+        else:
+            if isinstance(element_types, string_types):
+                element_types = [element_types]
+            self.valid_element_types = set([element_type.upper()
+                                            for element_type in element_types])
+        self.log.debug("set_element_types - element_types = %s" % self.valid_element_types)
+
+    def set_element_ids(self, element_ids=None):
+        """
+        Allows you to read only the elements in the list of element ids.
+        The rows for the other elements are removed from the SORT1
+        OES/OEF records before they're unpacked.
+
+        Parameters
+        ----------
+        element_ids : List[int, ...] / int; default=None->all elements
+            list of [eid1, eid2, ...]
+
+        """
+        if isinstance(element_ids, integer_types):
+            element_ids = [element_ids]
+        if element_ids is None or len(element_ids) == 0:
+            self.valid_element_ids = None
+        else:
+            self.valid_element_ids = np.unique(element_ids)
+        self.log.debug("set_element_ids - element_ids = %s" % self.valid_element_ids)
+
     def set_transient_times(self, times):  # TODO this name sucks...
         """
         Takes a dictionary of list of times in a transient case and
@@ -1375,7 +1446,10 @@ class OP2_Scalar(LAMA, ONR, OGPF,
 
         if not hasattr(self, 'f') or self.f is None:
             #: the OP2 file object
-            self.f = open(self.op2_filename, 'rb')
+            if self.use_mmap:
+                self.f = MMapFile(self.op2_filename)
+            else:
+                self.f = open(self.op2_filename, 'rb')
             #: the endian in bytes
             self._endian = None
             #: the endian in unicode
@@ -1461,8 +1535,35 @@ class OP2_Scalar(LAMA, ONR, OGPF,
         """
         op2_reader = self.op2_reader
         table_names = []
+        table_index = self.table_index
+        build_index = self.read_mode == 1 and not table_index.is_loaded
+        if build_index:
+            table_index.clear()
+            slot_names = self._get_result_slot_names()
+        use_table_index = self.use_table_index and (
+            self.read_mode == 2 or table_index.is_loaded)
+
         while table_name is not None:
             table_names.append(table_name)
+            n_start = self.n
+            if build_index:
+                count = self._count
+                # track the results that are found in this table
+                found_results = self._results.found
+                self._results.found = set([])
+                self._sized_slots = set([])
+            if use_table_index:
+                table = table_index.get_table(n_start)
+                if table is not None and self._is_indexed_table_skipped(table):
+                    if self.is_debug_file:
+                        self.binary_debug.write('jumping over table_name = %r\n' % table_name)
+                    op2_reader._goto(table.n_end)
+                    table_name = op2_reader._read_table_name(rewind=True, stop_on_failure=False)
+                    continue
+                if table is not None and self._read_subtable_starts is not None:
+                    # the design response tables that bump the counter
+                    # may have been jumped over
+                    self._count = table.count
 
             if self.is_debug_file:
                 self.binary_debug.write('-' * 80 + '\n')
@@ -1472,6 +1573,8 @@ class OP2_Scalar(LAMA, ONR, OGPF,
                 self.log.debug('  table_name=%r' % table_name)
 
             self.table_name = table_name
+            table_type = 'other'
+            read_again = True
             #if 0:
                 #op2_reader._skip_table(table_name)
             #else:
@@ -1487,12 +1590,20 @@ class OP2_Scalar(LAMA, ONR, OGPF,
                 assert self.f.tell() != t0, 'the position was unchanged...'
             elif table_name in MATRIX_TABLES:
                 op2_reader.read_matrix(table_name)
+                table_type = 'matrix'
+                read_again = self.debug_file is not None
             elif table_name in RESULT_TABLES:
                 op2_reader.read_results_table()
+                table_type = 'result'
+                read_again = op2_reader.is_table_filled
             elif self.skip_undefined_matrices:
                 op2_reader.read_matrix(table_name)
+                table_type = 'matrix'
+                read_again = self.debug_file is not None
             elif table_name.strip() in self.additional_matrices:
                 op2_reader.read_matrix(table_name)
+                table_type = 'matrix'
+                read_again = self.debug_file is not None
             else:
                 msg = (
                     'Invalid Table = %r\n\n'
@@ -1522,9 +1633,89 @@ class OP2_Scalar(LAMA, ONR, OGPF,
                 )
                 raise NotImplementedError(msg)
 
+            if build_index:
+                # not every reader flags its results as found, so the result
+                # dictionaries that were added to or resized are also used
+                result_names = self._results.found
+                self._results.found = found_results.union(result_names)
+                for slot_id in self._sized_slots:
+                    if slot_id in slot_names:
+                        result_names.add(slot_names[slot_id])
+                self._sized_slots = None
+                result_names = sorted(result_names)
+                table_index.add_table(table_name, n_start, self.n, table_type, read_again,
+                                      result_names, count)
             table_name = op2_reader._read_table_name(rewind=True, stop_on_failure=False)
         return table_names
 
+    def _get_result_slot_names(self):
+        """gets the {id(result_dict) : result_name} for the results that are dictionaries"""
+        slot_names = {}
+        for result_name in self.get_table_types():
+            slot = self.get_result(result_name)
+            if isinstance(slot, dict):
+                slot_names[id(slot)] = result_name
+        return slot_names
+
+    def _get_read_again_key(self):
+        """
+        Gets the reader settings that the read_again flags of the table
+        of contents depend on, so they can be stored in the sidecar file
+
+        Returns
+        -------
+        read_again_key : List[...]
+            the subcases, element types and results that are read and if
+            there is a debug file (None for all)
+
+        """
+        subcases = None if self.is_all_subcases else sorted(self.valid_subcases)
+        element_types = None
+        if self.valid_element_types is not None:
+            element_types = sorted(self.valid_element_types)
+        results = None
+        if self._results.saved != self._results.allowed:
+            results = sorted(self._results.saved)
+        return [subcases, element_types, results, self.debug_file is not None]
+
+    def _is_indexed_table_skipped(self, table):
+        """
+        Can a table in the table of contents be jumped over?
+
+        Parameters
+        ----------
+        table : OP2TableRecord
+            the table at the current position
+
+        Returns
+        -------
+        is_skipped : bool
+            the table doesn't contribute any data in the current read_mode
+
+        """
+        subtable_starts = self._read_subtable_starts
+        if subtable_starts is not None:
+            # only the tables with the requested table 3/table 4 pairs are read
+            i = bisect_left(subtable_starts, table.n_start)
+            return i == len(subtable_starts) or subtable_starts[i] >= table.n_end
+
+        if (self._preloaded_table_index is not None and self._read_result_names is not None and
+                table.result_names and
+                not self._read_result_names.intersection(table.result_names)):
+            # the results in the table are read by another process
+            return True
+
+        if self.read_mode == 2:
+            if not table.read_again:
+                return True
+            if table.table_type == 'matrix' and self.debug_file is None:
+                # matrices are read in the array sizing pass
+                return True
+
+        if table.table_type == 'result' and table.subtables and not self.is_all_subcases:
+            return not table.isubcases.intersection(self.valid_subcases)
+        return False
+
     def set_additional_generalized_tables_to_read(self, tables):
         """
         Adds methods to call a generalized table.
@@ -0,0 +1,326 @@
+"""
+Defines the table of contents that is built during the array sizing pass
+(read_mode=1) of the OP2 reader:
+ - OP2TableIndex()
+   - add_table(table_name, n_start, n_end, table_type, read_again, result_names,
+               count)
+   - add_subtable(n_start, n_end, isubcase, analysis_code, sort_method, element_type,
+                  isubtable)
+   - get_table(n)
+   - get_subtable(n)
+   - get_subtable_table(n)
+   - get_subtable_blocks(result_names=None, subcases=None)
+   - clear()
+   - read_file(idx_filename, op2_filename, read_again_key=None, log=None)
+   - write_file(idx_filename, op2_filename, read_again_key=None)
+
+ - OP2TableRecord(table_name, n_start, n_end, table_type, read_again, result_names,
+                  count)
+
+The first pass already walks every table, so we store where each table
+starts/ends.  The array filling pass (read_mode=2) can then jump over the
+tables that don't contribute any data (e.g., matrices that were read in
+the first pass, unsupported tables, filtered subcases) instead of walking
+them record by record.
+
+For results tables, each table 3/table 4 pair is also stored with its
+subcase key (isubcase, analysis_code, sort_method, element_type), so
+unrequested subcases can be jumped over.  The table 3/table 4 pairs are
+also grouped into blocks (e.g., a single time step of a subcase), so the
+results can be read one block at a time.  The result names that were
+found in each table (e.g., 'displacements', 'cquad4_stress') are stored,
+so the tables can be split between parallel readers.
+
+The index may be saved to a sidecar file (e.g., model.op2.idx), which is
+keyed to the size/modification time of the OP2.  When it's loaded, the
+array sizing pass also jumps over the unrequested subcases.  The
+read_again flags depend on the reader settings (e.g., the subcase filter),
+so they're only restored when the settings match.
+
+"""
+from __future__ import print_function, unicode_literals
+import os
+import json
+from six import integer_types
+
+#: the version of the sidecar file format
+IDX_VERSION = 4
+
+
+class OP2TableRecord(object):
+    """a single table in the OP2"""
+    def __init__(self, table_name, n_start, n_end, table_type='other', read_again=True,
+                 result_names=None, count=0):
+        """
+        Parameters
+        ----------
+        table_name : bytes
+            the name of the table (e.g., b'OUGV1')
+        n_start : int
+            the position of the table name record
+        n_end : int
+            the position of the next table name record
+        table_type : str
+            the kind of table {result, matrix, other}
+        read_again : bool
+            does the table need to be processed in the array filling pass
+        result_names : List[str]; default=None -> []
+            the results that were found in the table
+            (e.g., ['cquad4_stress', 'ctria3_stress'])
+        count : int; default=0
+            the design cycle counter (OP2._count) at the start of the table,
+            which is part of the result keys
+
+        """
+        self.table_name = table_name
+        self.n_start = n_start
+        self.n_end = n_end
+        self.table_type = table_type
+        self.read_again = read_again
+        if result_names is None:
+            result_names = []
+        self.result_names = result_names
+        self.count = count
+
+        #: the table 3/4 pairs
+        #: [(n_start, n_end, isubcase, analysis_code, sort_method, element_type,
+        #:   isubtable), ...]
+        self.subtables = []
+
+    @property
+    def nbytes(self):
+        """the size of the table in bytes"""
+        return self.n_end - self.n_start
+
+    @property
+    def isubcases(self):
+        """the subcases in the table"""
+        return set([subtable[2] for subtable in self.subtables])
+
+    def __repr__(self):
+        return 'OP2TableRecord(table_name=%r, n_start=%s, n_end=%s, table_type=%r, read_again=%s)' % (
+            self.table_name, self.n_start, self.n_end, self.table_type, self.read_again)
+
+
+class OP2TableIndex(object):
+    """table of contents for an OP2 file"""
+    def __init__(self):
+        #: the tables in file order
+        self.tables = []
+
+        #: n_start -> OP2TableRecord
+        self._table_map = {}
+
+        #: n_start -> (n_start, n_end, isubcase, analysis_code, sort_method, element_type,
+        #:             isubtable)
+        self._subtable_map = {}
+
+        #: subtable n_start -> OP2TableRecord
+        self._subtable_table_map = {}
+
+        #: the subtables for the table that is currently being read
+        self._subtables = []
+
+        #: was the index loaded from a sidecar file
+        self.is_loaded = False
+
+    def clear(self):
+        """resets the index"""
+        self.tables = []
+        self._table_map = {}
+        self._subtable_map = {}
+        self._subtable_table_map = {}
+        self._subtables = []
+        self.is_loaded = False
+
+    def add_table(self, table_name, n_start, n_end, table_type='other', read_again=True,
+                  result_names=None, count=0):
+        """stores the position of a table and the subtables that were just read"""
+        table = OP2TableRecord(table_name, n_start, n_end, table_type, read_again,
+                               result_names, count)
+        table.subtables = self._subtables
+        self._subtables = []
+        self.tables.append(table)
+        self._table_map[n_start] = table
+        for subtable in table.subtables:
+            self._subtable_map[subtable[0]] = subtable
+            self._subtable_table_map[subtable[0]] = table
+        return table
+
+    def add_subtable(self, n_start, n_end, isubcase, analysis_code, sort_method, element_type,
+                     isubtable):
+        """
+        stores the position of a table 3/table 4 pair, where isubtable is
+        the table 3 record marker (-3, -5, ...)
+        """
+        self._subtables.append(
+            (n_start, n_end, isubcase, analysis_code, sort_method, element_type, isubtable))
+
+    def get_table(self, n):
+        """gets the table that starts at position n (or None)"""
+        return self._table_map.get(n)
+
+    def get_subtable(self, n):
+        """gets the table 3/table 4 pair that starts at position n (or None)"""
+        return self._subtable_map.get(n)
+
+    def get_subtable_table(self, n):
+        """gets the table with the table 3/table 4 pair that starts at position n (or None)"""
+        return self._subtable_table_map.get(n)
+
+    def get_subtable_blocks(self, result_names=None, subcases=None):
+        """
+        Groups the table 3/table 4 pairs into blocks that may be read on
+        their own.
+
+        The n-th table 3/table 4 pair of each subcase key is put into the
+        n-th block of the subcase, so for SORT1 results, a block is a
+        single time step/mode/frequency.
+
+        Parameters
+        ----------
+        result_names : List[str]; default=None -> all results
+            only use the tables with these results (e.g., ['displacements'])
+        subcases : List[int]; default=None -> all subcases
+            only use these subcases
+
+        Returns
+        -------
+        blocks : List[List[subtable, ...], ...]
+            the table 3/table 4 pairs in each block; sorted by subcase,
+            then by block, then by file position
+
+        """
+        if result_names is not None:
+            result_names = set(result_names)
+        if subcases is not None:
+            subcases = set(subcases)
+
+        blocks = {}
+        counts = {}
+        for table in self.tables:
+            if result_names is not None and not result_names.intersection(table.result_names):
+                continue
+            for subtable in table.subtables:
+                isubcase = subtable[2]
+                if subcases is not None and isubcase not in subcases:
+                    continue
+                key = (table.table_name, ) + tuple(subtable[2:6])
+                iblock = counts.get(key, 0)
+                counts[key] = iblock + 1
+                blocks.setdefault((isubcase, iblock), []).append(subtable)
+        return [blocks[block_key] for block_key in sorted(blocks)]
+
+    @property
+    def nbytes_skipped(self):
+        """the number of bytes that don't need to be read again"""
+        return sum([table.nbytes for table in self.tables if not table.read_again])
+
+    def write_file(self, idx_filename, op2_filename, read_again_key=None):
+        """
+        Writes the index to a sidecar file
+
+        Parameters
+        ----------
+        idx_filename : str
+            the sidecar file (e.g., model.op2.idx)
+        op2_filename : str
+            the OP2 that was indexed
+        read_again_key : List[...]; default=None
+            a JSON-able description of the reader settings that the
+            read_again flags were found with
+
+        """
+        stat = os.stat(op2_filename)
+        tables = []
+        for table in self.tables:
+            tables.append([
+                table.table_name.decode('latin1'), table.n_start, table.n_end,
+                table.table_type, [list(subtable) for subtable in table.subtables],
+                table.result_names, table.count, table.read_again])
+        data = {
+            'version' : IDX_VERSION,
+            'op2_size' : stat.st_size,
+            'op2_mtime' : stat.st_mtime,
+            'read_again_key' : read_again_key,
+            'tables' : tables,
+        }
+        with open(idx_filename, 'w') as idx_file:
+            json.dump(data, idx_file)
+
+    def read_file(self, idx_filename, op2_filename, read_again_key=None, log=None):
+        """
+        Loads the index from a sidecar file
+
+        Parameters
+        ----------
+        idx_filename : str
+            the sidecar file (e.g., model.op2.idx)
+        op2_filename : str
+            the OP2 that was indexed
+        read_again_key : List[...]; default=None
+            the current reader settings; the read_again flags are only
+            restored if they were found with the same settings
+        log : logger; default=None
+            warns about a corrupt sidecar file
+
+        Returns
+        -------
+        is_loaded : bool
+            False if the file doesn't exist, is corrupt, or is
+            out of date relative to the OP2
+
+        """
+        self.clear()
+        if not os.path.exists(idx_filename):
+            return False
+        try:
+            with open(idx_filename, 'r') as idx_file:
+                data = json.load(idx_file)
+            if not isinstance(data, dict):
+                raise TypeError('the index is a %s, not a dict' % type(data).__name__)
+            stat = os.stat(op2_filename)
+            if (data.get('version') != IDX_VERSION or
+                    data.get('op2_size') != stat.st_size or
+                    data.get('op2_mtime') != stat.st_mtime):
+                return False
+
+            is_read_again = data.get('read_again_key') == read_again_key
+            for table in data['tables']:
+                self._add_table_from_file(table, is_read_again)
+        except (ValueError, KeyError, TypeError, IndexError, AttributeError) as error:
+            # a truncated or hand-edited file; it's rebuilt by the caller
+            self.clear()
+            if log is not None:
+                log.warning('ignoring the corrupt OP2 index %r; %s: %s' % (
+                    idx_filename, type(error).__name__, error))
+            return False
+        self.is_loaded = True
+        return True
+
+    def _add_table_from_file(self, table, is_read_again):
+        """adds a table from the sidecar file, checking the types of the values"""
+        (table_name, n_start, n_end, table_type, subtables, result_names,
+         count, read_again) = table
+        ints = [n_start, n_end, count]
+        for subtable in subtables:
+            if len(subtable) != 7:
+                raise IndexError('subtable=%s must have 7 values' % subtable)
+            ints.extend(subtable[:2])
+        if not all(isinstance(value, integer_types) and not isinstance(value, bool) for value in ints):
+            raise TypeError('the table positions must be integers; table=%s' % table)
+        if not isinstance(result_names, list):
+            raise TypeError('result_names=%r must be a list' % result_names)
+        self._subtables = [tuple(subtable) for subtable in subtables]
+        self.add_table(table_name.encode('latin1'), n_start, n_end, table_type,
+                       read_again=bool(read_again) or not is_read_again,
+                       result_names=result_names, count=count)
+
+    def __len__(self):
+        return len(self.tables)
+
+    def __repr__(self):
+        msg = 'OP2TableIndex; ntables=%s\n' % len(self.tables)
+        for table in self.tables:
+            msg += '  %r\n' % table
+        return msg
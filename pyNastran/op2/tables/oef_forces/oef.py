@@ -1421,7 +1421,7 @@ class OEF(OP2Common):
                 self.binary_debug.write('  #elementi = [eid_device, axial, torque]\n')
                 self.binary_debug.write('  nelements=%i; nnodes=1 # centroid\n' % nelements)
 
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
                 itotal = obj.ielement
                 ielement2 = obj.itotal + nelements
@@ -1429,11 +1429,7 @@ class OEF(OP2Common):
 
                 floats = frombuffer(data, dtype=self.fdtype).reshape(nelements, 3)
                 obj._times[obj.itime] = dt
-                if obj.itime == 0:
-                    ints = frombuffer(data, dtype=self.idtype).reshape(nelements, 3)
-                    eids = ints[:, 0] // 10
-                    assert eids.min() > 0, eids.min()
-                    obj.element[itotal:itotal2] = eids
+                self.obj_set_element(obj, itotal, itotal2, data, nelements)
 
                 #[axial, torsion]
                 obj.data[obj.itime, itotal:itotal2, :] = floats[:, 1:].copy()
@@ -1474,7 +1470,7 @@ class OEF(OP2Common):
                 self.binary_debug.write('  #elementi = [eid_device, axial, torque]\n')
                 self.binary_debug.write('  nelements=%i; nnodes=1 # centroid\n' % nelements)
 
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
                 itotal = obj.ielement
                 ielement2 = obj.itotal + nelements
@@ -1482,11 +1478,7 @@ class OEF(OP2Common):
 
                 floats = frombuffer(data, dtype=self.fdtype).reshape(nelements, 5).copy()
                 obj._times[obj.itime] = dt
-                if obj.itime == 0:
-                    ints = frombuffer(data, dtype=self.idtype).reshape(nelements, 5)
-                    eids = ints[:, 0] // 10
-                    assert eids.min() > 0, eids.min()
-                    obj.element[itotal:itotal2] = eids
+                self.obj_set_element(obj, itotal, itotal2, data, nelements)
 
                 #[axial_force, torque]
                 #(eid_device, axial_real, torque_real, axial_imag, torque_imag) = out
@@ -1812,7 +1804,7 @@ class OEF(OP2Common):
                 return nelements * self.num_wide * 4, None, None
 
             obj = self.obj
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
                 itotal = obj.ielement
                 ielement2 = obj.itotal + nelements
@@ -1820,11 +1812,7 @@ class OEF(OP2Common):
 
                 floats = frombuffer(data, dtype=self.fdtype).reshape(nelements, 2)
                 obj._times[obj.itime] = dt
-                if obj.itime == 0:
-                    ints = frombuffer(data, dtype=self.idtype).reshape(nelements, 2)
-                    eids = ints[:, 0] // 10
-                    assert eids.min() > 0, eids.min()
-                    obj.element[itotal:itotal2] = eids
+                self.obj_set_element(obj, itotal, itotal2, data, nelements)
 
                 #(eid_device, force)
                 obj.data[obj.itime, itotal:itotal2, 0] = floats[:, 1].copy()
@@ -1858,7 +1846,7 @@ class OEF(OP2Common):
                 self.binary_debug.write('  #elementi = [eid_device, force]\n')
                 self.binary_debug.write('  nelements=%i; nnodes=1 # centroid\n' % nelements)
 
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
                 itotal = obj.ielement
                 ielement2 = obj.itotal + nelements
@@ -1866,11 +1854,7 @@ class OEF(OP2Common):
 
                 floats = frombuffer(data, dtype=self.fdtype).reshape(nelements, 3).copy()
                 obj._times[obj.itime] = dt
-                if obj.itime == 0:
-                    ints = frombuffer(data, dtype=self.idtype).reshape(nelements, 3)
-                    eids = ints[:, 0] // 10
-                    assert eids.min() > 0, eids.min()
-                    obj.element[itotal:itotal2] = eids
+                self.obj_set_element(obj, itotal, itotal2, data, nelements)
 
                 #[spring_force]
                 real_imag = apply_mag_phase(floats, is_magnitude_phase, 1, 2)
@@ -1920,7 +1904,7 @@ class OEF(OP2Common):
                 return nelements * self.num_wide * 4, None, None
 
             obj = self.obj
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
                 itotal = obj.ielement
                 ielement2 = obj.itotal + nelements
@@ -1928,11 +1912,7 @@ class OEF(OP2Common):
 
                 floats = frombuffer(data, dtype=self.fdtype).reshape(nelements, 3)
                 obj._times[obj.itime] = dt
-                if obj.itime == 0:
-                    ints = frombuffer(data, dtype=self.idtype).reshape(nelements, 3)
-                    eids = ints[:, 0] // 10
-                    assert eids.min() > 0, eids.min()
-                    obj.element[itotal:itotal2] = eids
+                self.obj_set_element(obj, itotal, itotal2, data, nelements)
 
                 #(eid_device, axial, torque)
                 obj.data[obj.itime, itotal:itotal2, :] = floats[:, 1:].copy()
@@ -1967,7 +1947,7 @@ class OEF(OP2Common):
                 self.binary_debug.write('  #elementi = [eid_device, axial, torque]\n')
                 self.binary_debug.write('  nelements=%i; nnodes=1 # centroid\n' % nelements)
 
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
                 itotal = obj.ielement
                 ielement2 = obj.itotal + nelements
@@ -1975,11 +1955,7 @@ class OEF(OP2Common):
 
                 floats = frombuffer(data, dtype=self.fdtype).reshape(nelements, 5).copy()
                 obj._times[obj.itime] = dt
-                if obj.itime == 0:
-                    ints = frombuffer(data, dtype=self.idtype).reshape(nelements, 5)
-                    eids = ints[:, 0] // 10
-                    assert eids.min() > 0, eids.min()
-                    obj.element[itotal:itotal2] = eids
+                self.obj_set_element(obj, itotal, itotal2, data, nelements)
 
                 #[axial_force, torque]
                 #(eid_device, axial_real, torque_real, axial_imag, torque_imag) = out
@@ -2038,7 +2014,7 @@ class OEF(OP2Common):
 
             obj = self.obj
             #return nelements * self.num_wide * 4
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
                 itotal = obj.ielement
                 ielement2 = obj.itotal + nelements
@@ -2046,11 +2022,7 @@ class OEF(OP2Common):
 
                 floats = frombuffer(data, dtype=self.fdtype).reshape(nelements, 9)
                 obj._times[obj.itime] = dt
-                if obj.itime == 0:
-                    ints = frombuffer(data, dtype=self.idtype).reshape(nelements, 9)
-                    eids = ints[:, 0] // 10
-                    assert eids.min() > 0, eids.min()
-                    obj.element[itotal:itotal2] = eids
+                self.obj_set_element(obj, itotal, itotal2, data, nelements)
 
                 #[bm1a, bm2a, bm1b, bm2b, ts1, ts2, af, trq]
                 obj.data[obj.itime, itotal:itotal2, :] = floats[:, 1:].copy()
@@ -2209,18 +2181,14 @@ class OEF(OP2Common):
                 return nelements * self.num_wide * 4, None, None
 
             obj = self.obj
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
                 ielement = obj.ielement
                 ielement2 = ielement + nelements
 
                 floats = frombuffer(data, dtype=self.fdtype).reshape(nelements, 9)
                 obj._times[obj.itime] = dt
-                if obj.itime == 0:
-                    ints = frombuffer(data, dtype=self.idtype).reshape(nelements, 9)
-                    eids = ints[:, 0] // 10
-                    assert eids.min() > 0, eids.min()
-                    obj.element[ielement:ielement2] = eids
+                self.obj_set_element(obj, ielement, ielement2, data, nelements)
 
                 #[mx, my, mxy, bmx, bmy, bmxy, tx, ty]
                 obj.data[obj.itime, ielement:ielement2, :] = floats[:, 1:].copy()
@@ -2248,7 +2216,7 @@ class OEF(OP2Common):
                 return nelements * self.num_wide * 4, None, None
 
             obj = self.obj
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
                 ielement = obj.ielement
                 ielement2 = ielement + nelements
@@ -2257,11 +2225,7 @@ class OEF(OP2Common):
 
                 floats = frombuffer(data, dtype=self.fdtype).reshape(nelements, 17).copy()
                 obj._times[obj.itime] = dt
-                if obj.itime == 0:
-                    ints = frombuffer(data, dtype=self.idtype).reshape(nelements, 17)
-                    eids = ints[:, 0] // 10
-                    assert eids.min() > 0, eids.min()
-                    obj.element[itotal:itotal2] = eids
+                self.obj_set_element(obj, itotal, itotal2, data, nelements)
 
                 #[mx, my, mxy, bmx, bmy, bmxy, tx, ty]
                 isave1 = [1, 2, 3, 4, 5, 6, 7, 8]
@@ -2625,7 +2589,7 @@ class OEF(OP2Common):
                 return nelements * self.num_wide * 4, None, None
 
             obj = self.obj
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
                 itotal = obj.ielement
                 ielement2 = obj.itotal + nelements
@@ -2633,11 +2597,7 @@ class OEF(OP2Common):
 
                 floats = frombuffer(data, dtype=self.fdtype).reshape(nelements, 17)
                 obj._times[obj.itime] = dt
-                if obj.itime == 0:
-                    ints = frombuffer(data, dtype=self.idtype).reshape(nelements, 17)
-                    eids = ints[:, 0] // 10
-                    assert eids.min() > 0, eids.min()
-                    obj.element[itotal:itotal2] = eids
+                self.obj_set_element(obj, itotal, itotal2, data, nelements)
 
                 # [f41, f21, f12, f32, f23, f43, f34, f14, kf1,
                 #  s12, kf2, s23, kf3, s34, kf4, s41]
@@ -2684,7 +2644,7 @@ class OEF(OP2Common):
                 #self.binary_debug.write('  #elementi = [eid_device, axial, torque]\n')
                 #self.binary_debug.write('  nelements=%i; nnodes=1 # centroid\n' % nelements)
 
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
                 itotal = obj.ielement
                 ielement2 = obj.itotal + nelements
@@ -2692,11 +2652,7 @@ class OEF(OP2Common):
 
                 floats = frombuffer(data, dtype=self.fdtype).reshape(nelements, 33).copy()
                 obj._times[obj.itime] = dt
-                if obj.itime == 0:
-                    ints = frombuffer(data, dtype=self.idtype).reshape(nelements, 33)
-                    eids = ints[:, 0] // 10
-                    assert eids.min() > 0, eids.min()
-                    obj.element[itotal:itotal2] = eids
+                self.obj_set_element(obj, itotal, itotal2, data, nelements)
 
                 #[f41r, f21r, f12r, f32r, f23r, f43r, f34r, f14r
                 # kf1r, s12r, kf2r, s23r, kf3r, s34r, kf4r, s41r
@@ -1844,7 +1844,7 @@ class OES(OP2Common):
                 return nelements * self.num_wide * 4, None, None
 
             obj = self.obj
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
                 itotal = obj.ielement
                 ielement2 = obj.itotal + nelements
@@ -1888,7 +1888,7 @@ class OES(OP2Common):
 
             obj = self.obj
             assert obj is not None, self.code_information()
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
                 itotal = obj.ielement
                 ielement2 = obj.itotal + nelements
@@ -1989,7 +1989,7 @@ class OES(OP2Common):
                 return nelements * self.num_wide * 4, None, None
 
             obj = self.obj
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
                 itotal = obj.ielement
                 ielement2 = obj.itotal + nelements
@@ -2032,7 +2032,7 @@ class OES(OP2Common):
                 return nelements * self.num_wide * 4, None, None
 
             obj = self.obj
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
                 itotal = obj.ielement
                 ielement2 = obj.itotal + nelements
@@ -2084,7 +2084,7 @@ class OES(OP2Common):
                 return nelements * self.num_wide * 4, None, None
 
             obj = self.obj
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
                 itotal = obj.ielement
                 ielement2 = obj.itotal + nelements
@@ -2387,7 +2387,7 @@ class OES(OP2Common):
 
             obj = self.obj
             assert obj is not None
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
                 itotal = obj.ielement
                 ielement2 = obj.itotal + nelements
@@ -2425,7 +2425,7 @@ class OES(OP2Common):
                 return nelements * self.num_wide * 4, None, None
 
             obj = self.obj
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
                 itotal = obj.ielement
                 ielement2 = obj.itotal + nelements
@@ -2469,7 +2469,7 @@ class OES(OP2Common):
 
             obj = self.obj
             assert obj is not None
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
                 itotal = obj.ielement
                 ielement2 = obj.itotal + nelements
@@ -2543,7 +2543,7 @@ class OES(OP2Common):
                 self.binary_debug.write('  nelements=%i; nnodes=1 # centroid\n' % nelements)
 
             obj = self.obj
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 # self.itime = 0
                 # self.ielement = 0
                 # self.itotal = 0
@@ -2602,7 +2602,7 @@ class OES(OP2Common):
                 self.binary_debug.write('  nelements=%i; nnodes=1 # centroid\n' % nelements)
 
             obj = self.obj
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
                 itotal = obj.itotal
                 itotal2 = itotal + nelements
@@ -2694,7 +2694,7 @@ class OES(OP2Common):
                 self.binary_debug.write('  nelements=%i; nnodes=1 # centroid\n' % nelements)
 
             obj = self.obj
-            if self.use_vector and is_vectorized and 0:  # pragma: no cover
+            if self.use_vector and is_vectorized:
                 # self.itime = 0
                 # self.ielement = 0
                 # self.itotal = 0
@@ -2705,7 +2705,7 @@ class OES(OP2Common):
                 ielement = obj.ielement
                 ielement2 = ielement + nelements
                 obj._times[obj.itime] = dt
-                self.obj_set_element(obj, itotal, itotal2, data, nelements)
+                self.obj_set_element(obj, ielement, ielement2, data, nelements)
 
                 floats = frombuffer(data, dtype=self.fdtype).reshape(nelements, 10)
 
@@ -3519,32 +3519,26 @@ class OES(OP2Common):
 
             obj = self.obj
             assert obj.is_built is True, obj.is_built
-            if self.use_vector and is_vectorized and 0:  # pragma: no cover
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
-                ielement = obj.ielement
-                ielement2 = ielement + nelements
                 itotal = obj.itotal
-                itotal2 = itotal + nelements * nnodes_expected
+                itotal2 = itotal + nlayers * nnodes_expected
                 obj._times[obj.itime] = dt
-                if obj.itime == 0:
-                    ints = frombuffer(data, dtype=self.idtype)
-                    ints1 = ints.reshape(nelements, 9)
-                    eids = ints1[:, 0] // 10
-                    print(eids)
-                    eids = np.vstack([eids, eids]).T.ravel()
-                    print(eids.shape)
-                    print(eids)
-                    print(obj.element)
+                if self.sort_method == 2:
+                    self.obj_set_sort2_time(obj, data, nelements)
+                    obj.element[itotal:itotal2, :] = element_id
+                else:
+                    ints = frombuffer(data, dtype=self.idtype).reshape(nelements, 9)
+                    eids = ints[:, 0] // 10
                     assert eids.min() > 0, eids.min()
-                    obj.element[itotal:itotal2, 0] = eids
+                    obj.element[itotal:itotal2, :] = repeat(eids, 2)[:, np.newaxis]
 
-                floats = frombuffer(data, dtype=self.fdtype).reshape(nelements, 9)[:, 1:]
-                print(floats.shape)
-                #fd, sx, sy, txy,
-                floats1 = floats.reshape(nelements * nnodes_expected, 8)
-                obj.data[obj.itime, itotal:itotal2, :] = floats1.copy()
+                #[fd, sx, sy, txy]
+                floats = frombuffer(data, dtype=self.fdtype).reshape(nelements, 9)
+                floats1 = floats[:, 1:].reshape(nlayers, 4)
+                obj.fiber_curvature[itotal:itotal2] = floats1[:, 0]
+                obj.data[obj.itime, itotal:itotal2, :] = floats1[:, 1:]
                 obj.itotal = itotal2
-                obj.ielement = ielement2
             else:
                 struct1 = Struct(self._endian + self._analysis_code_fmt + b'8f')
                 #cen = 0 # CEN/4
@@ -3936,32 +3930,26 @@ class OES(OP2Common):
 
             obj = self.obj
             assert obj.is_built is True, obj.is_built
-            if self.use_vector and is_vectorized and 0:  # pragma: no cover
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
-                ielement = obj.ielement
-                ielement2 = ielement + nelements
                 itotal = obj.itotal
-                itotal2 = itotal + nelements * nnodes_expected
+                itotal2 = itotal + nlayers * nnodes_expected
                 obj._times[obj.itime] = dt
-                if obj.itime == 0:
-                    ints = frombuffer(data, dtype=self.idtype)
-                    ints1 = ints.reshape(nelements, 9)
-                    eids = ints1[:, 0] // 10
-                    print(eids)
-                    eids = np.vstack([eids, eids]).T.ravel()
-                    print(eids.shape)
-                    print(eids)
-                    print(obj.element)
+                if self.sort_method == 2:
+                    self.obj_set_sort2_time(obj, data, nelements)
+                    obj.element[itotal:itotal2, :] = element_id
+                else:
+                    ints = frombuffer(data, dtype=self.idtype).reshape(nelements, 9)
+                    eids = ints[:, 0] // 10
                     assert eids.min() > 0, eids.min()
-                    obj.element[itotal:itotal2, 0] = eids
+                    obj.element[itotal:itotal2, :] = repeat(eids, 2)[:, np.newaxis]
 
-                floats = frombuffer(data, dtype=self.fdtype).reshape(nelements, 9)[:, 1:]
-                print(floats.shape)
-                #fd, sx, sy, txy,
-                floats1 = floats.reshape(nelements * nnodes_expected, 8)
-                obj.data[obj.itime, itotal:itotal2, :] = floats1.copy()
+                #[fd, sx, sy, txy]
+                floats = frombuffer(data, dtype=self.fdtype).reshape(nelements, 9)
+                floats1 = floats[:, 1:].reshape(nlayers, 4)
+                obj.fiber_curvature[itotal:itotal2] = floats1[:, 0]
+                obj.data[obj.itime, itotal:itotal2, :] = floats1[:, 1:]
                 obj.itotal = itotal2
-                obj.ielement = ielement2
             else:
                 struct1 = Struct(self._endian + self._analysis_code_fmt + b'8f')
                 cen = 0 # CEN/4
@@ -5098,7 +5086,7 @@ class OES(OP2Common):
                 return nelements * self.num_wide * 4, None, None
 
             obj = self.obj
-            if self.use_vector and is_vectorized and self.sort_method == 1:
+            if self.use_vector and is_vectorized:
                 n = nelements * 4 * self.num_wide
                 itotal = obj.ielement
                 ielement2 = obj.itotal + nelements
@@ -6079,10 +6067,3 @@ class OES(OP2Common):
                 self.num_wide, self.element_type, self.element_name)
             return self._not_implemented_or_skip(data, ndata, msg), None, None
         return n, nelements, ntotal
-
-    def obj_set_element(self, obj, ielement, ielement2, data, nelements):
-        if obj.itime == 0:
-            ints = frombuffer(data, dtype=self.idtype).reshape(nelements, self.num_wide).copy()
-            eids = ints[:, 0] // 10
-            assert eids.min() > 0, eids.min()
-            obj.element[ielement:ielement2] = eids
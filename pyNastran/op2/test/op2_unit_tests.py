@@ -1,6 +1,10 @@
 from __future__ import print_function
 import os
+import json
+import shutil
+import tempfile
 import unittest
+from copy import deepcopy
 from six import iteritems, PY3
 import numpy as np
 try:
@@ -22,8 +26,9 @@ import pyNastran
 from pyNastran.utils.log import get_logger
 
 from pyNastran.bdf.bdf import BDF
-from pyNastran.op2.op2 import OP2, FatalError, read_op2
+from pyNastran.op2.op2 import OP2, FatalError, read_op2, iter_op2_results
 from pyNastran.op2.op2_interface.op2_common import get_scode_word
+from pyNastran.op2.op2_interface.op2_parallel import read_results_worker
 from pyNastran.op2.op2_geom import OP2Geom, read_op2_geom
 from pyNastran.op2.test.test_op2 import run_op2
 
@@ -460,6 +465,305 @@ class TestOP2(Tester):
         op2.write_f06(f06_filename)
         os.remove(f06_filename)
 
+    def test_set_element_types(self):
+        """tests reading only a subset of element types/ids"""
+        op2_filename = os.path.join(MODEL_PATH, 'sol_101_elements', 'static_solid_shell_bar.op2')
+        op2a = read_op2(op2_filename, debug=False)
+
+        op2b = OP2(debug=False)
+        op2b.set_element_types(['CQUAD4', 'CTRIA3'])
+        op2b.read_op2(op2_filename)
+        self.assertEqual(len(op2b.chexa_stress), 0)
+        self.assertEqual(len(op2b.cbar_force), 0)
+        self.assertEqual(len(op2b.displacements), 1)
+        self.assertEqual(len(op2b.cquad4_composite_stress), 1)
+        assert np.array_equal(op2a.cquad4_stress[1].data, op2b.cquad4_stress[1].data)
+        assert np.array_equal(op2a.ctria3_force[1].data, op2b.ctria3_force[1].data)
+
+        op2c = OP2(debug=False)
+        op2c.set_element_ids([4, 7, 16])
+        op2c.read_op2(op2_filename)
+        self.assertEqual(len(op2c.cbar_force), 0)
+
+        stressa = op2a.ctetra_stress[1]
+        stressc = op2c.ctetra_stress[1]
+        i = stressa.element_node[:, 0] == 4
+        assert np.array_equal(stressa.element_node[i, :], stressc.element_node)
+        assert np.array_equal(stressa.data[:, i, :], stressc.data)
+
+        stressa = op2a.cquad4_composite_stress[1]
+        stressc = op2c.cquad4_composite_stress[1]
+        i = stressa.element_layer[:, 0] == 16
+        assert np.array_equal(stressa.element_layer[i, :], stressc.element_layer)
+        assert np.array_equal(stressa.data[:, i, :], stressc.data)
+
+    def test_set_element_ids_random(self):
+        """the random SORT2 tables (e.g., OESCRM1) aren't filtered on column 0"""
+        log = get_logger(level='error')
+        op2_filename = os.path.join(MODEL_PATH, 'other', 'ofprand1.op2')
+        op2a = read_op2(op2_filename, debug=False, log=log)
+
+        op2b = OP2(debug=False, log=log)
+        op2b.set_element_ids([10212, 413, 202001])
+        op2b.read_op2(op2_filename)
+        for res_name in ['crm', 'psd', 'ato']:
+            resa = getattr(op2a.op2_results, res_name)
+            resb = getattr(op2b.op2_results, res_name)
+            for name in ['cbush_stress', 'cshear_force', 'cdamp1_force']:
+                resultsa = getattr(resa, name)
+                resultsb = getattr(resb, name)
+                self.assertEqual(sorted(resultsa), sorted(resultsb))
+                for key, resulta in iteritems(resultsa):
+                    resultb = resultsb[key]
+                    assert np.array_equal(resulta.element, resultb.element)
+                    assert np.array_equal(resulta.data, resultb.data)
+
+        # the RMS tables are SORT1, so they're filtered
+        forcea = op2a.op2_results.rms.cshear_force
+        forceb = op2b.op2_results.rms.cshear_force
+        for key, resulta in iteritems(forcea):
+            resultb = forceb[key]
+            i = resulta.element == 413
+            assert np.array_equal(resulta.element[i], resultb.element)
+            assert np.array_equal(resulta.data[:, i, :], resultb.data)
+
+    def test_table_index(self):
+        """tests that jumping over tables in the array filling pass doesn't change the results"""
+        op2_filename = os.path.join(MODEL_PATH, 'freq_sine', 'good_sine.op2')
+        op2a = OP2(debug=False)
+        op2a.use_table_index = False
+        op2a.read_op2(op2_filename)
+
+        op2b = OP2(debug=False)
+        op2b.read_op2(op2_filename)
+        self.assertEqual(op2a.get_op2_stats(), op2b.get_op2_stats())
+        assert op2a.assert_op2_equal(op2b, stop_on_failure=True)
+
+        table_names = [table.table_name for table in op2b.table_index.tables]
+        self.assertEqual(len(op2b.table_index), len(table_names))
+        assert b'OUGV1' in table_names, table_names
+        assert op2b.table_index.nbytes_skipped > 0, op2b.table_index
+
+    def test_table_index_file(self):
+        """tests the table of contents sidecar with a subcase filter"""
+        op2_filename = os.path.join(MODEL_PATH, 'pload4', 'chexa.op2')
+        dirname = tempfile.mkdtemp()
+        try:
+            idx_filename = os.path.join(dirname, 'chexa.op2.idx')
+
+            op2a = OP2(debug=False)
+            op2a.use_table_index = False
+            op2a.set_subcases([2])
+            op2a.read_op2(op2_filename)
+
+            # write the sidecar
+            op2b = read_op2(op2_filename, subcases=[2], debug=False,
+                            index_filename=idx_filename)
+            assert os.path.exists(idx_filename)
+            assert not op2b.table_index.is_loaded
+            oug = [table for table in op2b.table_index.tables if table.table_name == b'OUGV1'][0]
+            self.assertEqual(oug.table_type, 'result')
+            self.assertEqual(len(oug.isubcases), 24)
+
+            # use the sidecar
+            op2c = read_op2(op2_filename, subcases=[2], debug=False,
+                            index_filename=idx_filename)
+            assert op2c.table_index.is_loaded
+            self.assertEqual(list(op2c.displacements.keys()), [2])
+            self.assertEqual(op2a.get_op2_stats(), op2c.get_op2_stats())
+            assert op2a.assert_op2_equal(op2c, stop_on_failure=True)
+        finally:
+            shutil.rmtree(dirname)
+
+    def test_table_index_file_read_again(self):
+        """tests the read_again flags of the table of contents sidecar"""
+        op2_filename = os.path.join(MODEL_PATH, 'freq_sine', 'good_sine.op2')
+        dirname = tempfile.mkdtemp()
+        try:
+            idx_filename = os.path.join(dirname, 'good_sine.op2.idx')
+
+            # subcase 1 doesn't exist, so the results tables aren't read again
+            op2a = read_op2(op2_filename, subcases=[1], debug=False,
+                            index_filename=idx_filename)
+            read_again = [table.read_again for table in op2a.table_index.tables]
+            self.assertEqual(read_again.count(False), 4)
+
+            op2b = read_op2(op2_filename, subcases=[1], debug=False,
+                            index_filename=idx_filename)
+            assert op2b.table_index.is_loaded
+            self.assertEqual([table.read_again for table in op2b.table_index.tables],
+                             read_again)
+            self.assertEqual(op2b.table_index.nbytes_skipped, op2a.table_index.nbytes_skipped)
+
+            # the flags depend on the subcase filter, so they're not used
+            # for a different filter
+            op2c = read_op2(op2_filename, subcases=[101], debug=False,
+                            index_filename=idx_filename)
+            assert op2c.table_index.is_loaded
+            self.assertTrue(all(table.read_again for table in op2c.table_index.tables))
+            op2d = read_op2(op2_filename, subcases=[101], debug=False)
+            self.assertEqual(list(op2c.displacements.keys()), [101])
+            assert op2c.assert_op2_equal(op2d, stop_on_failure=True)
+        finally:
+            shutil.rmtree(dirname)
+
+    def test_table_index_file_malformed(self):
+        """tests that a malformed table of contents sidecar is rebuilt"""
+        op2_filename = os.path.join(MODEL_PATH, 'pload4', 'chexa.op2')
+        op2a = read_op2(op2_filename, debug=False)
+        dirname = tempfile.mkdtemp()
+        try:
+            idx_filename = os.path.join(dirname, 'chexa.op2.idx')
+            read_op2(op2_filename, debug=False, index_filename=idx_filename)
+            with open(idx_filename, 'r') as idx_file:
+                data = json.load(idx_file)
+
+            truncated_table = deepcopy(data)
+            truncated_table['tables'][0] = truncated_table['tables'][0][:3]
+            missing_tables = deepcopy(data)
+            del missing_tables['tables']
+            bad_position = deepcopy(data)
+            bad_position['tables'][-1][1] = 'cat'
+            bad_subtable = deepcopy(data)
+            for table in bad_subtable['tables']:
+                if table[4]:
+                    table[4][0] = table[4][0][:2]
+                    break
+            else:  # pragma: no cover
+                raise RuntimeError('no results subtables')
+
+            for bad_data in [truncated_table, missing_tables, bad_position, bad_subtable,
+                             [data]]:
+                with open(idx_filename, 'w') as idx_file:
+                    json.dump(bad_data, idx_file)
+                op2b = read_op2(op2_filename, debug=False, index_filename=idx_filename)
+                assert not op2b.table_index.is_loaded
+                assert op2a.assert_op2_equal(op2b, stop_on_failure=True)
+
+                # the sidecar is rewritten
+                with open(idx_filename, 'r') as idx_file:
+                    self.assertEqual(json.load(idx_file), data)
+        finally:
+            shutil.rmtree(dirname)
+
+    def test_mmap(self):
+        """tests reading a memory-mapped OP2"""
+        op2_filename = os.path.join(MODEL_PATH, 'sol_101_elements', 'static_solid_shell_bar.op2')
+        op2a = read_op2(op2_filename, debug=False)
+
+        op2b = OP2(debug=False)
+        op2b.use_mmap = True
+        op2b.read_op2(op2_filename)
+        self.assertEqual(op2a.get_op2_stats(), op2b.get_op2_stats())
+        assert op2a.assert_op2_equal(op2b, stop_on_failure=True)
+
+        # the results don't point into the (closed) map
+        disp = op2b.displacements[1]
+        assert disp.data.flags.writeable
+        disp.data *= 2.
+
+    def test_sort2_vectorized(self):
+        """tests the vectorized SORT2 element results against the unvectorized reader"""
+        op2_filename = os.path.join(MODEL_PATH, 'other', 'ofprand1.op2')
+        op2a = read_op2(op2_filename, debug=False)
+
+        op2b = OP2(debug=False)
+        op2b.use_vector = False
+        op2b.read_op2(op2_filename)
+        self.assertEqual(op2a.get_op2_stats(), op2b.get_op2_stats())
+        assert op2a.assert_op2_equal(op2b, stop_on_failure=True)
+
+        for result_name in ['psd.celas2_stress', 'psd.crod_force', 'psd.cbar_stress',
+                            'crm.cshear_force', 'psd.cquad4_stress']:
+            resultsa = op2a.get_result(result_name)
+            resultsb = op2b.get_result(result_name)
+            assert len(resultsa) > 0, result_name
+            for key, resulta in iteritems(resultsa):
+                resultb = resultsb[key]
+                assert np.array_equal(resulta._times, resultb._times), result_name
+                assert np.array_equal(resulta.element, resultb.element), result_name
+                assert np.array_equal(resulta.data, resultb.data), result_name
+
+    def test_read_op2_nworkers(self):
+        """tests reading the results with multiple processes"""
+        op2_filename = os.path.join(MODEL_PATH, 'sol_101_elements', 'static_solid_shell_bar.op2')
+        op2a = read_op2(op2_filename, debug=False)
+        op2b = read_op2(op2_filename, debug=False, nworkers=3)
+        self.assertEqual(op2a.get_op2_stats(), op2b.get_op2_stats())
+        assert op2a.assert_op2_equal(op2b, stop_on_failure=True)
+
+        # the table of contents has the results in each table
+        oes = [table for table in op2b.table_index.tables if table.table_name == b'OES1X1'][0]
+        assert 'ctetra_stress' in oes.result_names, oes.result_names
+        assert 'ctria3_stress' in oes.result_names, oes.result_names
+
+        # a worker uses the table of contents of the calling process
+        op2c = read_op2(op2_filename, debug=False, combine=False)
+        settings = {
+            'mode' : op2a._nastran_format,
+            'subcases' : None,
+            'element_types' : op2a.valid_element_types,
+            'element_ids' : op2a.valid_element_ids,
+            'use_vector' : op2a.use_vector,
+            'use_table_index' : True,
+            'use_mmap' : False,
+            'skip_undefined_matrices' : False,
+            'encoding' : None,
+            'table_index' : deepcopy(op2c.table_index),
+        }
+        result_names, results, unused_isubcase_name_map = read_results_worker(
+            op2_filename, ['ctetra_stress', 'displacements'], settings)
+        self.assertEqual(sorted(results), ['ctetra_stress', 'displacements'])
+        for result_name in result_names:
+            for key, resulta in iteritems(op2c.get_result(result_name)):
+                resultb = results[result_name][key]
+                assert np.array_equal(resulta.data, resultb.data), result_name
+
+    def test_iter_op2_results(self):
+        """tests reading the results one time step at a time"""
+        op2_filename = os.path.join(MODEL_PATH, 'sol_101_elements',
+                                    'transient_solid_shell_bar.op2')
+        op2 = read_op2(op2_filename, debug=False, combine=False)
+
+        result_names = ['displacements', 'cquad4_stress']
+        results = {}
+        for (result_name, key), result in iter_op2_results(
+                op2_filename, result_names=result_names):
+            assert result_name in result_names, result_name
+            assert result.ntimes == 1, result.ntimes
+            results.setdefault((result_name, key), []).append(result)
+        self.assertEqual(sorted(set([name for name, unused_key in results])),
+                         sorted(result_names))
+
+        for (result_name, key), results_list in iteritems(results):
+            result = op2.get_result(result_name)[key]
+            self.assertEqual(len(results_list), result.ntimes)
+            data = np.vstack([resulti.data for resulti in results_list])
+            times = np.hstack([resulti._times for resulti in results_list])
+            assert np.array_equal(data, result.data), result_name
+            assert np.array_equal(times, result._times), result_name
+
+        # a transient model only has subcase 1
+        keys = [key for key, unused_result in iter_op2_results(
+            op2_filename, result_names=['displacements'], subcases=[2])]
+        self.assertEqual(keys, [])
+
+        # a single subcase of a model with 24 subcases
+        op2_filename = os.path.join(MODEL_PATH, 'pload4', 'chexa.op2')
+        op2 = read_op2(op2_filename, subcases=[2], debug=False, combine=False)
+        results = {}
+        for (result_name, key), result in iter_op2_results(op2_filename, subcases=[2]):
+            self.assertEqual(key[0], 2)
+            self.assertNotIn((result_name, key), results)
+            results[(result_name, key)] = result
+        self.assertEqual(sorted(results),
+                         [('displacements', (2, 1, 1, 0, 0, '', '')),
+                          ('spc_forces', (2, 1, 1, 0, 0, '', ''))])
+        for (result_name, key), result in iteritems(results):
+            expected = op2.get_result(result_name)[key]
+            assert np.array_equal(result.data, expected.data), result_name
+            assert np.array_equal(result.node_gridtype, expected.node_gridtype), result_name
+
     def test_op2_solid_bending_01(self):
         folder = os.path.join(MODEL_PATH, 'solid_bending')
         op2_filename = os.path.join(folder, 'solid_bending.op2')
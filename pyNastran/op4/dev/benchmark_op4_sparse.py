@@ -0,0 +1,112 @@
+"""
+Times the sparse binary OP4 reader on large generated matrices.
+
+Banded, symmetric "stiffness" matrices with 6x6 nodal blocks are written
+as sparse binary OP4s (a 60k row matrix with small string headers and a
+600k row BIGMAT matrix), unless an OP4 is passed in.  The matrices are then read as coo/csc/csr matrices, with
+and without use_mmap.
+
+Usage
+-----
+python benchmark_op4_sparse.py [OP4_FILENAME...]
+
+"""
+from __future__ import print_function
+import os
+import sys
+import time
+import tempfile
+
+import numpy as np
+import scipy.sparse
+
+from pyNastran.op4.op4 import OP4
+
+
+def get_banded_matrix(nnodes, nbands=3):
+    """
+    Creates a symmetric matrix with 6x6 blocks that couple each node
+    to its nbands - 1 neighbors on each side
+
+    Returns
+    -------
+    A : csc_matrix
+        the (6*nnodes, 6*nnodes) matrix
+
+    """
+    offsets = list(range(-nbands + 1, nbands))
+    diagonals = [np.full(nnodes - abs(offset), -1.0 / (abs(offset) + 1))
+                 for offset in offsets]
+    node_matrix = scipy.sparse.diags(diagonals, offsets, shape=(nnodes, nnodes))
+    A = scipy.sparse.kron(node_matrix, np.ones((6, 6)))
+    A = A + scipy.sparse.eye(6 * nnodes) * 10.
+    return scipy.sparse.csc_matrix(A)
+
+
+def write_sparse_binary_op4(op4_filename, name, A, form=6, ncols_per_block=10000):
+    """
+    Writes a sparse binary OP4 a block of columns at a time
+
+    Like Nastran, BIGMAT is used for more than 65535 rows.
+    """
+    A = scipy.sparse.csc_matrix(A)
+    nrows, ncols = A.shape
+    column_blocks = (A[:, icol:icol + ncols_per_block]
+                     for icol in range(0, ncols, ncols_per_block))
+    op4 = OP4(debug=False)
+    op4.write_op4_sparse(op4_filename, name, column_blocks, nrows, ncols, form=form,
+                         dtype=A.dtype)
+
+
+def time_read_op4(op4_filename, sparse_format, use_mmap, nrepeat=3):
+    """reads the OP4 nrepeat times and returns the fastest time"""
+    dt_min = None
+    for unused_i in range(nrepeat):
+        op4 = OP4(debug=False)
+        op4.use_mmap = use_mmap
+        time0 = time.time()
+        matrices = op4.read_op4(op4_filename, sparse_format=sparse_format)
+        dt = time.time() - time0
+        if dt_min is None or dt < dt_min:
+            dt_min = dt
+    return dt_min, matrices
+
+
+def run_benchmark(op4_filenames, nrepeat=3):
+    """times the sparse reader modes"""
+    print('%-32s %10s %7s %7s %10s' % ('op4_filename', 'nnz', 'format', 'mmap', 'dt'))
+    for op4_filename in op4_filenames:
+        for sparse_format in ['coo', 'csc', 'csr']:
+            for use_mmap in [False, True]:
+                dt, matrices = time_read_op4(op4_filename, sparse_format, use_mmap,
+                                             nrepeat=nrepeat)
+                nnz = sum([matrix.nnz for unused_form, matrix in matrices.values()
+                           if hasattr(matrix, 'nnz')])
+                print('%-32s %10i %7s %7s %10.4f' % (
+                    os.path.basename(op4_filename), nnz, sparse_format, use_mmap, dt))
+
+
+def main():  # pragma: no cover
+    """runs the benchmark"""
+    op4_filenames = sys.argv[1:]
+    if op4_filenames:
+        run_benchmark(op4_filenames)
+        return
+
+    dirname = tempfile.mkdtemp()
+    op4_filenames = [
+        os.path.join(dirname, 'kaa_small.op4'),
+        os.path.join(dirname, 'kaa_bigmat.op4'),
+    ]
+    write_sparse_binary_op4(op4_filenames[0], 'KAA', get_banded_matrix(10000))
+    write_sparse_binary_op4(op4_filenames[1], 'KAA', get_banded_matrix(100000))
+    try:
+        run_benchmark(op4_filenames)
+    finally:
+        for op4_filename in op4_filenames:
+            os.remove(op4_filename)
+        os.rmdir(dirname)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
@@ -11,15 +11,19 @@ from six.moves import range
 
 import numpy as np
 from numpy import array, zeros, float32, float64, complex64, complex128, ndarray
-from scipy.sparse import coo_matrix  # type: ignore
+from scipy.sparse import coo_matrix, csc_matrix, issparse  # type: ignore
 
 from pyNastran.utils import is_binary_file as file_is_binary
 from pyNastran.utils.mathematics import print_matrix #, print_annotated_matrix
 from pyNastran.utils.log import get_logger2
+from pyNastran.op2.op2_interface.mmap_file import MMapFile
+
+#: the dtype of the values in a sparse binary matrix for each matrix type
+SPARSE_VALUE_DTYPES = {1 : 'f4', 2 : 'f8', 3 : 'c8', 4 : 'c16'}
 
 
 def read_op4(op4_filename=None, matrix_names=None, precision='default',
-             debug=False, log=None):
+             debug=False, log=None, sparse_format='coo'):
     """
     Reads a NASTRAN OUTPUT4 file, and stores the
     matrices as the output arguments.  The number of
@@ -60,6 +64,9 @@ def read_op4(op4_filename=None, matrix_names=None, precision='default',
     precision : str; {'default', 'single', 'double'}
         specifies if the matrices are in single or double precsion
         which means the format will be whatever the file is in
+    sparse_format : str; default='coo'
+        the type of the sparse matrices in a binary OP4
+        {'coo', 'csc', 'csr'}
 
     Returns
     -------
@@ -90,6 +97,9 @@ def read_op4(op4_filename=None, matrix_names=None, precision='default',
         | Sparse | SCIPY.SPARSE.COO_MATRIX |
         +--------+-------------------------+
 
+        A sparse binary matrix is a csc_matrix/csr_matrix for
+        sparse_format='csc'/'csr'.
+
     .. note:: based off the MATLAB code SAVEOP4 developed by ATA-E and
               later UCSD.
     .. note:: it's strongly recommended that you convert sparse matrices to
@@ -97,7 +107,51 @@ def read_op4(op4_filename=None, matrix_names=None, precision='default',
               with sparse matrices.
     """
     op4 = OP4(log=log, debug=debug)
-    return op4.read_op4(op4_filename, matrix_names, precision)
+    return op4.read_op4(op4_filename, matrix_names, precision, sparse_format=sparse_format)
+
+
+def read_op4_directory(op4_filename, debug=False, log=None, sparse_format='coo',
+                       use_mmap=False):
+    """
+    Scans a binary NASTRAN OUTPUT4 file for the matrices without
+    reading the values.  The matrices are read when they're used, so
+    only the matrices (or columns) that are needed are read from a
+    large OP4.
+
+    .. code-block:: python
+
+      >>> from pyNastran.op4.op4 import read_op4_directory
+      >>> directory = read_op4_directory(op4_filename)
+      >>> kaa = directory[b'KAA']
+      >>> kaa.shape
+      (60000, 60000)
+
+      # read the 1st column or a block
+      >>> column = kaa.get_column(0)
+      >>> block = kaa.get_block([0, 1, 2], [0, 1, 2])
+
+      # or read the full matrix
+      >>> (form, A) = kaa.form, kaa.load()
+
+    Parameters
+    ----------
+    op4_filename : str
+        a binary OP4 filename
+    sparse_format : str; default='coo'
+        the type of the sparse matrices
+        {'coo', 'csc', 'csr'}
+    use_mmap : bool; default=False
+        read the columns from a memory-mapped file
+
+    Returns
+    -------
+    directory : dict[name] = OP4Matrix
+        the matrices, which are keyed by the same name as in ``read_op4``
+
+    """
+    op4 = OP4(log=log, debug=debug)
+    op4.use_mmap = use_mmap
+    return op4.read_op4_directory(op4_filename, sparse_format=sparse_format)
 
 
 class OP4(object):
@@ -114,13 +168,26 @@ class OP4(object):
         self.log = get_logger2(log, debug)
         self._new = False
 
-    def read_op4(self, op4_filename=None, matrix_names=None, precision='default'):
+        #: the type of the sparse matrices that are read
+        #: {'coo', 'csc', 'csr'}
+        self.sparse_format = 'coo'
+
+        #: should the binary OP4 be memory-mapped, so the sparse matrix
+        #: data isn't copied before the values are gathered
+        self.use_mmap = False
+
+    def read_op4(self, op4_filename=None, matrix_names=None, precision='default',
+                 sparse_format='coo'):
         """
         See ``read_op4``
         """
         if precision not in ('default', 'single', 'double'):
             msg = "precision=%r and must be 'single', 'double', or 'default'" % precision
             raise ValueError(msg)
+        if sparse_format not in ('coo', 'csc', 'csr'):
+            msg = "sparse_format=%r and must be 'coo', 'csc', or 'csr'" % sparse_format
+            raise ValueError(msg)
+        self.sparse_format = sparse_format
 
         if op4_filename is None:
             from pyNastran.utils.gui_io import load_file_dialog
@@ -671,7 +738,11 @@ class OP4(object):
 #--------------------------------------------------------------------------
     def read_op4_binary(self, op4_filename, matrix_names=None, precision='default'):
         """matrix_names must be a list or None, but basically the same"""
-        with io.open(op4_filename, mode='rb') as op4:
+        if self.use_mmap:
+            op4_file = MMapFile(op4_filename)
+        else:
+            op4_file = io.open(op4_filename, mode='rb')
+        with op4_file as op4:
             self.n = 0
             self._endian = self._determine_endian(op4)
 
@@ -691,8 +762,11 @@ class OP4(object):
                 (name, form, matrix) = self._read_matrix_binary(op4, precision, matrix_names)
                 #print print_matrix(matrix)
                 if name is not None:
-                    if matrix_names is None or name in matrix_names:  # save the matrix
+                    if _is_matrix_name(name, matrix_names):  # save the matrix
                         matrices[name] = (form, matrix)
+                        if matrix_names is not None and len(matrices) == len(set(matrix_names)):
+                            # the rest of the file doesn't need to be scanned
+                            break
 
                 #print "not op4.closed = ",not op4.closed,form,name
                 # if not op4.closed or form is not None:
@@ -715,6 +789,49 @@ class OP4(object):
                 #
         return matrices
 
+    def read_op4_directory(self, op4_filename, sparse_format='coo'):
+        """
+        See ``read_op4_directory``
+        """
+        if sparse_format not in ('coo', 'csc', 'csr'):
+            msg = "sparse_format=%r and must be 'coo', 'csc', or 'csr'" % sparse_format
+            raise ValueError(msg)
+        self.sparse_format = sparse_format
+        if not os.path.exists(op4_filename):
+            raise IOError('cannot find op4_filename=%r' % op4_filename)
+        if not file_is_binary(op4_filename):
+            raise NotImplementedError('read_op4_directory only supports binary OP4s; '
+                                      'op4_filename=%r' % op4_filename)
+
+        directory = {}
+        with io.open(op4_filename, mode='rb') as op4:
+            self.n = 0
+            self._endian = self._determine_endian(op4)
+            while 1:
+                offset = self.n
+                data1 = op4.read(1)
+                op4.seek(offset)
+                if len(data1) == 0:
+                    break
+
+                (name, form, matrix_type, nrows, ncols,
+                 is_big_mat) = self._read_matrix_header_binary(op4)
+                nsave = self.n
+                irow = self.read_start_marker(op4)[2]
+                op4.seek(nsave)
+                self.n = nsave
+
+                is_sparse = irow == 0
+                icols, irows, offsets, nwords = self._scan_columns_binary(
+                    op4, ncols, matrix_type, is_sparse, is_big_mat)
+                directory[name] = OP4Matrix(
+                    op4_filename, name, form, matrix_type, nrows, ncols,
+                    is_sparse, is_big_mat, offset, self._endian,
+                    icols, irows, offsets, nwords,
+                    log=self.log, sparse_format=self.sparse_format,
+                    use_mmap=self.use_mmap)
+        return directory
+
     def read_start_marker(self, op4):
         if self.debug:
             self.log.info('--------------------------------------')
@@ -737,10 +854,81 @@ class OP4(object):
         return (a, icol, irow, nwords)
 
     def _read_matrix_binary(self, op4, precision, matrix_names):
-        """reads a matrix"""
+        """
+        Reads a matrix
+
+        A matrix that isn't in matrix_names is skipped over without
+        reading the values and None is returned for the matrix.
+        """
         #self.show(f, 60)
         if self.debug:
             self.log.info("*************************")
+        (name, form, Type, nrows, ncols, is_big_mat) = self._read_matrix_header_binary(op4)
+
+        # jump forward to get irow (needed for check on is_sparse),
+        # then jump back
+        nsave = self.n
+        irow = self.read_start_marker(op4)[2]
+        op4.seek(nsave)
+        self.n = nsave
+
+        #(nwords_per_value, nbytes_per_value, data_format, dtype) = self._get_matrix_info(Type)
+        data_format, dtype = self._get_matrix_info(Type)[2:]
+
+        is_sparse = False
+        if irow == 0:
+            is_sparse = True
+
+        assert self.n == op4.tell(), 'n=%s tell=%s' % (self.n, op4.tell())
+        if not _is_matrix_name(name, matrix_names):
+            self._scan_columns_binary(op4, ncols, Type, is_sparse, is_big_mat)
+            return (name, form, None)
+
+        if Type in [1, 2]:  # real
+            A = self._read_real_binary(op4, nrows, ncols, Type, is_sparse, is_big_mat)
+        elif Type in [3, 4]:  # complex
+            A = self._read_complex_binary(op4, nrows, ncols, Type, is_sparse, is_big_mat)
+        else:
+            raise TypeError("Type=%s" % Type)
+
+        #try:
+            #print_matrix(A.todense())
+        #except:
+            #pass
+
+        if data_format in ['d', 'dd']:
+            op4.read(8)
+            self.n += 8
+        elif data_format in ['f', 'ff']:
+            op4.read(4)
+            self.n += 4
+        else:
+            raise NotImplementedError(data_format)
+        #f.read(record_length); self.n+=record_length
+        #self.show(f, 10)
+        #f.read(4); self.n+=4
+
+        assert self.n == op4.tell(), 'n=%s op4.tell=%s' % (self.n, op4.tell())
+        return (name, form, A)
+
+    def _read_matrix_header_binary(self, op4):
+        """
+        Reads the header record of a matrix
+
+        Returns
+        -------
+        name : bytes (PY3) / str (PY2)
+            the name of the matrix
+        form : int
+            the form of the matrix (e.g., 6=symmetric)
+        matrix_type : int
+            1=real, single; 2=real, double; 3=complex, single; 4=complex, double
+        nrows / ncols : int
+            the shape of the matrix
+        is_big_mat : bool
+            the sparse strings have a 2 word header
+
+        """
         data = op4.read(4)
         self.n += 4
         (record_length,) = unpack(self._endian + 'i', data)
@@ -787,48 +975,61 @@ class OP4(object):
 
         if self.debug:
             self.log.info('is_big_matrix = %s' % is_big_mat)
+        return (name, form, Type, nrows, ncols, is_big_mat)
 
-        # jump forward to get irow (needed for check on is_sparse),
-        # then jump back
-        nsave = self.n
-        irow = self.read_start_marker(op4)[2]
-        op4.seek(nsave)
-        self.n = nsave
+    def _scan_columns_binary(self, op4, ncols, matrix_type, is_sparse, is_big_mat):
+        """
+        Finds the column records of a matrix without reading the values,
+        so the file is at the start of the next matrix
 
-        #(nwords_per_value, nbytes_per_value, data_format, dtype) = self._get_matrix_info(Type)
-        data_format, dtype = self._get_matrix_info(Type)[2:]
+        Returns
+        -------
+        icols : (nrecords, ) int ndarray
+            the 1-based column id of each record
+        irows : (nrecords, ) int ndarray
+            the 1-based first row of each record (0 for a sparse matrix)
+        offsets : (nrecords, ) int ndarray
+            the position of the data of each record in the file
+        nwords : (nrecords, ) int ndarray
+            the number of words in each record
 
-        is_sparse = False
-        if irow == 0:
-            is_sparse = True
+        """
+        nheader_words = 2 if is_big_mat else 1
+        marker_struct = Struct(self._endian + '5i')
 
-        assert self.n == op4.tell(), 'n=%s tell=%s' % (self.n, op4.tell())
-        if Type in [1, 2]:  # real
-            A = self._read_real_binary(op4, nrows, ncols, Type, is_sparse, is_big_mat)
-        elif Type in [3, 4]:  # complex
-            A = self._read_complex_binary(op4, nrows, ncols, Type, is_sparse, is_big_mat)
-        else:
-            raise TypeError("Type=%s" % Type)
+        icols = []
+        irows = []
+        offsets = []
+        nwords_list = []
+        while 1:
+            data = op4.read(20)
+            self.n += 20
+            (unused_record_length, unused_a, icol, irow,
+             nwords) = marker_struct.unpack(data)
+            if icol == ncols + 1:
+                break
 
-        #try:
-            #print_matrix(A.todense())
-        #except:
-            #pass
+            if is_sparse:
+                data = op4.read(4 * nheader_words)
+                if self._get_string_length(data, is_big_mat) == -1:
+                    self.n += 4 * nheader_words
+                    break
+            elif nwords == -1:
+                break
 
-        if data_format in ['d', 'dd']:
-            op4.read(8)
-            self.n += 8
-        elif data_format in ['f', 'ff']:
-            op4.read(4)
-            self.n += 4
-        else:
-            raise NotImplementedError(data_format)
-        #f.read(record_length); self.n+=record_length
-        #self.show(f, 10)
-        #f.read(4); self.n+=4
+            icols.append(icol)
+            irows.append(irow)
+            offsets.append(self.n)
+            nwords_list.append(nwords)
+            self.n += 4 * nwords
+            op4.seek(self.n)
 
-        assert self.n == op4.tell(), 'n=%s op4.tell=%s' % (self.n, op4.tell())
-        return (name, form, A)
+        # the end of the record and the trailing value
+        data_format = self._get_matrix_info(matrix_type, debug=False)[2]
+        self.n += 12 if data_format in ['d', 'dd'] else 8
+        op4.seek(self.n)
+        return (np.array(icols, dtype='int64'), np.array(irows, dtype='int64'),
+                np.array(offsets, dtype='int64'), np.array(nwords_list, dtype='int64'))
 
     def _get_matrix_info(self, matrix_type, debug=True):
         if matrix_type == 1:
@@ -894,120 +1095,128 @@ class OP4(object):
 
     def _read_real_binary(self, op4, nrows, ncols, matrix_type, is_sparse, is_big_mat):
         if is_sparse:
-            A = self._read_real_sparse_binary(op4, nrows, ncols, matrix_type, is_big_mat)
+            A = self._read_sparse_binary(op4, nrows, ncols, matrix_type, is_big_mat)
         else:
             A = self._read_real_dense_binary(op4, nrows, ncols, matrix_type, is_big_mat)
         return A
 
-    def _read_real_sparse_binary(self, op4, nrows, ncols, matrix_type, is_big_mat):
+    def _read_sparse_binary(self, op4, nrows, ncols, matrix_type, is_big_mat):
+        """
+        Reads a sparse real/complex binary matrix
+
+        The column records are scanned first, then the string headers of
+        all the columns are parsed together and the values are gathered
+        from the column data with numpy.
+
+        Returns
+        -------
+        A : coo_matrix / csc_matrix / csr_matrix
+            the matrix (see ``self.sparse_format``)
+
+        """
         if self.debug:
-            self.log.info('_read_real_sparse_binary')
+            self.log.info('_read_sparse_binary')
         out = self._get_matrix_info(matrix_type, debug=False)
-        (nwords_per_value, nbytes_per_value, data_format, dtype) = out
-        rows = []
-        cols = []
-        entries = []
+        (nwords_per_value, unused_nbytes_per_value, unused_data_format, dtype) = out
+        icols, istarts, iends, words = self._read_sparse_columns_binary(
+            op4, ncols, is_big_mat)
+
+        strings = _get_sparse_strings(words, icols, istarts, iends, is_big_mat,
+                                      nwords_per_value)
+        value_dtype = self._endian + SPARSE_VALUE_DTYPES[matrix_type]
+        rows, cols, values = _get_sparse_values(
+            words, strings, nrows, nwords_per_value, value_dtype, dtype)
+        del words
+        return _build_sparse_matrix(rows, cols, values, strings, nrows, ncols,
+                                    dtype, self.sparse_format)
+
+    def _read_sparse_columns_binary(self, op4, ncols, is_big_mat):
+        """
+        Scans the column records of a sparse matrix, so the string data
+        can be parsed all at once
 
-        data = ''
-        icol = -1  # dummy value so the loop starts
-        while icol < ncols + 1:  # if isDense
-            #if record_length==0:
-            assert self.n == op4.tell(), 'n=%s tell=%s' % (self.n, op4.tell())
-            (icol, irow, nwords) = self.get_markers_sparse(op4, is_big_mat)
-            L = nwords
+        Returns
+        -------
+        icols : (ncolumns, ) int ndarray
+            the 1-based column id of each record
+        istarts : (ncolumns, ) int ndarray
+            the first word of the strings of each record in words
+        iends : (ncolumns, ) int ndarray
+            the word after the strings of each record in words
+        words : (nwords, ) int32 ndarray
+            the data of the records; a view of the file if it's mapped
 
+        """
+        use_view = hasattr(op4, 'read_view')
+        nheader_words = 2 if is_big_mat else 1
+        marker_struct = Struct(self._endian + '5i')
+
+        n0 = self.n
+        icols = []
+        istarts = []
+        nwords_list = []
+        chunks = []
+        iword = 0
+        while 1:
+            data = op4.read(20)
+            self.n += 20
+            (unused_record_length, unused_a, icol, unused_irow,
+             nwords) = marker_struct.unpack(data)
             if icol == ncols + 1:
-                if self.debug:
-                    self.log.info('breaking on icol=%s ncol+1=%s' % (icol, ncols + 1))
                 break
 
-            if is_big_mat:
-                irow, L = self._get_irow_big_binary(op4, data[:8])
-                data = data[8:]
+            # the first string header
+            nbytes = 4 * nwords
+            if use_view:
+                data = op4.read(4 * nheader_words)
+                op4.seek(self.n + nbytes)
             else:
-                irow, L = self._get_irow_small_binary(op4, data[:4])
-                data = data[4:]
-
-            if L == -1:
+                chunk = op4.read(nbytes)
+                data = chunk[:4 * nheader_words]
+            if self._get_string_length(data, is_big_mat) == -1:
                 if self.debug:
                     self.log.info('breaking on L=-1')
+                self.n += 4 * nheader_words
+                op4.seek(self.n)
                 break
 
-            if self.debug:
-                self.log.info("  next icol")
-                self.log.info("    n=%s icol=%s irow=%s nwords=%s" % (
-                    self.n, icol, irow, nwords))
-                self._show(op4, 100, types='qd')
-                self.log.info('**************************************************')
-
-            #if nwords == 0 and is_big_mat:
-                #self.n -= 4
-                #op4.seek(self.n)
-                #break
-
-            record_length = 4 * nwords
-            data = op4.read(record_length)
-            self.n += record_length
-            if self.debug:
-                self.log.info("  data_format=%s record_length=%s n_next=%s" % (
-                    data_format, record_length, self.n))
-            #if icol == ncols + 1:
-                #break
-
-            i = 0
-            while len(data) > 0:
-                if i > 0:
-                    if is_big_mat:
-                        (irow, L) = self._get_irow_big_binary(op4, data[0:8])
-                        data = data[8:]
-                    else:
-                        (irow, L) = self._get_irow_small_binary(op4, data[0:4])
-                        data = data[4:]
-                    assert irow > 0
-                nvalues = L // nwords_per_value
-                str_values = self._endian + '%i%s' % (nvalues, data_format)
-
-                if self.debug:
-                    self.log.info('irow=%s L=%s nwords_per_value=%s nvalues=%s '
-                                  'nbytes_per_value=%s' % (irow, L, nwords_per_value,
-                                                           nvalues, nbytes_per_value))
-                    self.log.info('str_values = %r' % str_values)
-
-                value_list = unpack(str_values, data[0:nvalues * nbytes_per_value])
-                assert self.n == op4.tell(), 'n=%s tell=%s' % (self.n, op4.tell())
-
-                #irow -= 1
-                #icol -= 1
-                if self.debug:
-                    self.log.info('rows = %s' % list(i+irow-1 for i in range(nvalues)))
-                    self.log.info('cols = %s ' % ([icol-1] * nvalues))
-                    self.log.info('value_list = %s' % str(value_list))
-
-                rows.extend([i+irow-1 for i in range(nvalues)])
-                irow += nvalues
-                cols.extend([icol-1] * nvalues)
-                entries.extend(value_list)
-
-                record_length -= nvalues * nbytes_per_value
-                data = data[nvalues * nbytes_per_value:]
-                if self.debug:
-                    self.log.info("  record_length=%s nbytes_per_value=%s len(data)=%s" % (
-                        record_length, nbytes_per_value, len(data)))
-                    ##print(A)
-                    #print("********")  # ,data
-                    #print(self.print_block(data))
-                i += 1
-            #print "-------------------------------"
-
-        #if rows == []:  # NULL matrix
-            #raise NotImplementedError()
-
-        A = coo_matrix((entries, (rows, cols)), shape=(nrows, ncols),
-                       dtype=dtype)
+            if use_view:
+                istarts.append((self.n - n0) // 4)
+            else:
+                chunks.append(chunk)
+                istarts.append(iword)
+                iword += nwords
+            icols.append(icol)
+            nwords_list.append(nwords)
+            self.n += nbytes
+
+        # the end of the record
         op4.read(4)
         self.n += 4
 
-        return A
+        word_dtype = self._endian + 'i4'
+        if use_view:
+            nend = op4.tell()
+            op4.seek(n0)
+            words = np.frombuffer(op4.read_view(self.n - n0), dtype=word_dtype,
+                                  count=(self.n - n0) // 4)
+            op4.seek(nend)
+        else:
+            words = np.frombuffer(b''.join(chunks), dtype=word_dtype)
+            del chunks
+
+        icols = np.array(icols, dtype='int64')
+        istarts = np.array(istarts, dtype='int64')
+        iends = istarts + np.array(nwords_list, dtype='int64')
+        return icols, istarts, iends, words
+
+    def _get_string_length(self, data, is_big_mat):
+        """gets the number of words (L) in a string from the string header"""
+        if is_big_mat:
+            idummy = unpack(self._endian + '2i', data)[0]
+            return idummy - 1
+        IS, = unpack(self._endian + 'i', data)
+        return IS // 65536 - 1
 
     def _show(self, op4, n, types='ifs', endian=None):
         """
@@ -1228,122 +1437,11 @@ class OP4(object):
     def _read_complex_binary(self, op4, nrows, ncols, matrix_type, is_sparse, is_big_mat):
         """reads a complex binary matrix"""
         if is_sparse:
-            A = self._read_complex_sparse_binary(op4, nrows, ncols, matrix_type, is_big_mat)
+            A = self._read_sparse_binary(op4, nrows, ncols, matrix_type, is_big_mat)
         else:
             A = self._read_complex_dense_binary(op4, nrows, ncols, matrix_type, is_big_mat)
         return A
 
-    def _read_complex_sparse_binary(self, op4, nrows, ncols, matrix_type, is_big_mat):
-        """reads a sparse complex binary matrix"""
-        if self.debug:
-            self.log.info('_read_complex_sparse_binary')
-        out = self._get_matrix_info(matrix_type, debug=False)
-        (nwords_per_value, nbytes_per_value, data_format, dtype) = out
-        rows = []
-        cols = []
-        entries = []
-        record_length = 0
-        data = ''
-        icol = -1  # dummy value so the loop starts
-        while icol < ncols + 1:  # if isDense
-            #if record_length == 0:
-            assert self.n == op4.tell(), 'n=%s tell=%s' % (self.n, op4.tell())
-            (icol, irow, nwords) = self.get_markers_sparse(op4, is_big_mat)
-            if self.debug:
-                self.log.info("n=%s icol=%s irow=%s nwords=%s" % (
-                    self.n, icol, irow, nwords))
-                self.log.info("-----------")
-
-            L = nwords
-            if icol == ncols + 1:
-                break
-
-            if is_big_mat:
-                (irow, L) = self._get_irow_big_binary(op4, data[:8])
-                data = data[8:]
-            else:
-                (irow, L) = self._get_irow_small_binary(op4, data[:4])
-                data = data[4:]
-
-            if L == -1:
-                if self.debug:
-                    self.log.info('breaking on L=-1')
-                break
-
-            if self.debug:
-                self.log.info("n=%s icol=%s irow=%s nwords=%s" % (
-                    self.n, icol, irow, nwords))
-                self._show(op4, 100, types='qf')
-                self.log.info('\n\n')
-
-            #if nwords == 0 and is_big_mat:
-                #self.n -= 4
-                #op4.seek(self.n)
-                #break
-
-            record_length = 4 * nwords
-            data = op4.read(record_length)
-            self.n += record_length
-            if self.debug:
-                self.log.info("data_format=%s record_length=%s n_next=%s" % (
-                    data_format, record_length, self.n))
-            if icol == ncols + 1:
-                continue
-
-            nvalues = nwords // nwords_per_value
-            while record_length >= nbytes_per_value:
-                if self.debug:
-                    self.log.info("inner while...")
-                    self.log.info("nwords  = %s" % nwords)
-                    self.log.info("nvalues = %s" % nvalues)
-                    self.log.info("nwords_per_value = %s" % nwords_per_value)
-
-                #if nvalues == 0:
-                    #assert icol == ncols + 1
-                    #break
-
-                # we have 2x values for complex
-                str_values = self._endian + '%i%s' % (nvalues * 2, data_format)
-                if self.debug:
-                    self.log.info("  str_values = %s" % str_values)
-                    self.log.info("  nvalues*nbytes_per_value=%s len(data)=%s" % (
-                        nvalues * nbytes_per_value, len(data)))
-                value_list = unpack(str_values, data[0:nvalues * nbytes_per_value])
-                assert self.n == op4.tell(), 'n=%s tell=%s' % (self.n, op4.tell())
-                #self.show(op4, 4)
-                #print(self.print_block(data))
-                if self.debug:
-                    self.log.info("  value_list = %s" % str(value_list))
-
-                #irow -= 1
-                #icol -= 1
-                irow -= 1
-                icol -= 1
-
-                cols += [icol] * nvalues
-                rows += [i + irow for i in range(nvalues)]
-                for i, value in enumerate(value_list):
-                    if i % 2 == 0:
-                        real_value = value
-                    else:
-                        if self.debug:
-                            self.log.info("  A[%s,%s] = %s" % (
-                                irow, icol, complex(real_value, value)))
-                        #A[irow, icol] = complex(real_value, value)
-                        entries.append(complex(real_value, value))
-                        irow += 1
-
-                record_length -= nvalues * nbytes_per_value
-                data = data[nvalues * nbytes_per_value:]
-                #print("record_length=%s nbytes_per_value=%s" % (record_length, nbytes_per_value))
-                #print(print_matrix(A))
-                #print("********", data)
-
-        A = coo_matrix((entries, (rows, cols)), shape=(nrows, ncols), dtype=dtype)
-        op4.read(4)
-        self.n += 4
-        return A
-
     def get_markers_sparse(self, op4, is_big_mat):
         if is_big_mat:
             (a, icol, irow, nwords) = self.read_start_marker(op4)
@@ -1419,7 +1517,7 @@ class OP4(object):
                 wb = 'wb'
             else:
                 wb = 'w'
-            with open(op4_filename, 'w') as op4:
+            with open(op4_filename, wb) as op4:
                 self._write_op4_file(op4, name_order, is_binary, precision, matrices)
         else:
             op4 = op4_filename
@@ -1444,7 +1542,10 @@ class OP4(object):
             if not form in (1, 2, 3, 6, 8, 9):
                 raise ValueError('form=%r and must be in [1, 2, 3, 6, 8, 9]' % form)
 
-            if isinstance(matrix, coo_matrix):
+            if is_binary and issparse(matrix):
+                self._write_sparse_matrix_binary(op4, name, matrix, form=form,
+                                                 precision=precision)
+            elif isinstance(matrix, coo_matrix):
                 #write_DMIG(f, name, matrix, form, precision='default')
                 if is_binary:
                     raise NotImplementedError('sparse binary op4 writing not implemented')
@@ -1464,6 +1565,62 @@ class OP4(object):
                        'types=[coo_matrix, ndarray]' % type(matrix))
                 raise NotImplementedError(msg)
 
+    def _write_sparse_matrix_binary(self, op4, name, matrix, form=2, precision='default',
+                                    ncols_per_block=10000):
+        """writes a sparse matrix with the OP4SparseWriter"""
+        endian = self._endian if self._endian else '<'
+        nrows, ncols = matrix.shape
+        A = csc_matrix(matrix)
+        writer = OP4SparseWriter(op4, name, nrows, ncols, form=form, dtype=A.dtype,
+                                 precision=precision, endian=endian)
+        with writer:
+            for icol in range(0, ncols, ncols_per_block):
+                writer.write_columns(A[:, icol:icol + ncols_per_block])
+
+    def write_op4_sparse(self, op4_filename, name, column_blocks, nrows, ncols, form=2,
+                         dtype='float64', precision='default', is_big_mat=False):
+        """
+        Writes a sparse binary matrix from blocks of columns, so a matrix
+        that was assembled out-of-core doesn't have to be formed
+
+        Parameters
+        ----------
+        op4_filename : str/file
+            The filename to write
+            String -> opens a file (closed at the end)
+            file   -> the matrix is appended and the file isn't closed
+        name : str
+            the name of the matrix
+        column_blocks : iterable of (nrows, ncols_block) matrices
+            the blocks of consecutive columns (e.g., a generator of CSC
+            column slices)
+        nrows / ncols : int
+            the shape of the matrix
+        form : int; default=2
+            the form of the matrix (see ``read_op4``)
+        dtype : str; default='float64'
+            the dtype of the matrix
+        precision : str; default='default'
+            Overwrite the default precision ('single', 'double', 'default')
+        is_big_mat : bool; default=False
+            use BIGMAT (used for more than 65535 rows)
+
+        See ``OP4SparseWriter`` to write blocks with skipped columns.
+        """
+        if isinstance(op4_filename, string_types):
+            with open(op4_filename, 'wb') as op4:
+                self.write_op4_sparse(op4, name, column_blocks, nrows, ncols, form=form,
+                                      dtype=dtype, precision=precision,
+                                      is_big_mat=is_big_mat)
+            return
+
+        endian = self._endian if self._endian else '<'
+        writer = OP4SparseWriter(op4_filename, name, nrows, ncols, form=form, dtype=dtype,
+                                 precision=precision, is_big_mat=is_big_mat, endian=endian)
+        with writer:
+            for block in column_blocks:
+                writer.write_columns(block)
+
 
     def __backup(self, name, matrix, form=2, precision='default'):
         """
@@ -1694,6 +1851,337 @@ class OP4(object):
         op4.seek(0)
         return endian
 
+class OP4Matrix(object):
+    """
+    A matrix in a binary OP4 that is read when it's used
+
+    The positions of the column records are found by
+    ``read_op4_directory``, so a column or block only reads the
+    records of the columns that it touches.
+    """
+    def __init__(self, op4_filename, name, form, matrix_type, nrows, ncols,
+                 is_sparse, is_big_mat, offset, endian, icols, irows, offsets, nwords,
+                 log=None, sparse_format='coo', use_mmap=False):
+        """
+        Creates an OP4Matrix (see ``read_op4_directory``)
+
+        Parameters
+        ----------
+        offset : int
+            the position of the header record of the matrix in the file
+        endian : str
+            the endian of the file ('<', '>')
+        icols / irows / offsets / nwords : (nrecords, ) int ndarray
+            the column records (see ``OP4._scan_columns_binary``)
+
+        """
+        self.op4_filename = op4_filename
+        self.name = name
+        self.form = form
+        self.matrix_type = matrix_type
+        self.nrows = nrows
+        self.ncols = ncols
+        self.is_sparse = is_sparse
+        self.is_big_mat = is_big_mat
+        self.offset = offset
+        self.log = log
+        self.sparse_format = sparse_format
+        self.use_mmap = use_mmap
+
+        self._endian = endian
+        self._icols = icols
+        self._irows = irows
+        self._offsets = offsets
+        self._nwords = nwords
+        self._matrix = None
+
+    @property
+    def shape(self):
+        """the shape of the matrix"""
+        return (self.nrows, self.ncols)
+
+    @property
+    def dtype(self):
+        """the dtype of the matrix"""
+        return get_dtype(self.matrix_type)
+
+    @property
+    def is_loaded(self):
+        """has the full matrix been read?"""
+        return self._matrix is not None
+
+    def load(self):
+        """
+        Reads the full matrix (only once)
+
+        Returns
+        -------
+        A : ndarray / coo_matrix / csc_matrix / csr_matrix
+            the matrix (see ``read_op4``)
+
+        """
+        if self._matrix is None:
+            op4 = OP4(log=self.log)
+            op4.sparse_format = self.sparse_format
+            op4.use_mmap = self.use_mmap
+            op4._endian = self._endian
+            with self._open() as op4_filei:
+                op4_filei.seek(self.offset)
+                op4.n = self.offset
+                self._matrix = op4._read_matrix_binary(op4_filei, 'default', None)[2]
+        return self._matrix
+
+    def get_column(self, icol):
+        """
+        Reads a column
+
+        Parameters
+        ----------
+        icol : int
+            the 0-based column
+
+        Returns
+        -------
+        column : (nrows, ) ndarray
+            the column
+
+        """
+        column = self.get_block(None, [icol])
+        if self.is_sparse:
+            column = column.toarray()
+        return column[:, 0]
+
+    def get_block(self, rows, cols):
+        """
+        Reads a block of the matrix, which only reads the records
+        of the columns in cols
+
+        Parameters
+        ----------
+        rows : List[int] / int ndarray / slice / None
+            the 0-based rows (None -> all)
+        cols : List[int] / int ndarray / slice / None
+            the 0-based columns (None -> all)
+
+        Returns
+        -------
+        block : ndarray / coo_matrix / csc_matrix / csr_matrix
+            the (nrows_block, ncols_block) block; a sparse matrix
+            is in self.sparse_format
+
+        """
+        rows = np.atleast_1d(np.arange(self.nrows)[rows if rows is not None else slice(None)])
+        cols = np.atleast_1d(np.arange(self.ncols)[cols if cols is not None else slice(None)])
+
+        if self._matrix is not None:
+            A = self._matrix
+            if self.is_sparse:
+                A = A.tocsc()
+            icols = cols
+        else:
+            ucols = np.unique(cols)
+            A = self._read_columns(ucols)
+            icols = np.searchsorted(ucols, cols)
+
+        if self.is_sparse:
+            block = A[rows, :][:, icols]
+            return _build_sparse_block(block, self.sparse_format)
+        return A[np.ix_(rows, icols)]
+
+    def _open(self):
+        """opens the OP4 as a memory-mapped file or a regular file"""
+        if self.use_mmap:
+            return MMapFile(self.op4_filename)
+        return io.open(self.op4_filename, mode='rb')
+
+    def _read_columns(self, cols):
+        """
+        Reads the records of the sorted, unique 0-based columns
+
+        Returns
+        -------
+        A : (nrows, len(cols)) ndarray / csc_matrix
+            the columns
+
+        """
+        out = OP4(log=self.log)._get_matrix_info(self.matrix_type, debug=False)
+        (nwords_per_value, unused_nbytes_per_value, unused_data_format, dtype) = out
+        value_dtype = self._endian + SPARSE_VALUE_DTYPES[self.matrix_type]
+
+        irecords = np.where(np.in1d(self._icols - 1, cols))[0]
+        nwords = self._nwords[irecords]
+        with self._open() as op4_file:
+            chunks = []
+            for offset, nwordsi in zip(self._offsets[irecords], nwords):
+                op4_file.seek(offset)
+                chunks.append(op4_file.read(4 * nwordsi))
+        words = np.frombuffer(b''.join(chunks), dtype=self._endian + 'i4')
+        del chunks
+
+        iends = np.cumsum(nwords)
+        istarts = iends - nwords
+        icols = self._icols[irecords]
+        if self.is_sparse:
+            strings = _get_sparse_strings(words, icols, istarts, iends, self.is_big_mat,
+                                          nwords_per_value)
+            rows, icols, values = _get_sparse_values(
+                words, strings, self.nrows, nwords_per_value, value_dtype, dtype)
+            icols = np.searchsorted(cols, icols)
+            A = coo_matrix((values, (rows, icols)), shape=(self.nrows, len(cols)), dtype=dtype)
+            return A.tocsc()
+
+        A = zeros((self.nrows, len(cols)), dtype=dtype)
+        word_bytes = words.view('uint8')
+        icols = np.searchsorted(cols, icols - 1)
+        for icol, irow, istart, iend in zip(icols, self._irows[irecords], istarts, iends):
+            values = np.frombuffer(word_bytes[4 * istart:4 * iend], dtype=value_dtype)
+            A[irow - 1:irow - 1 + len(values), icol] = values
+        return A
+
+    def __repr__(self):
+        return 'OP4Matrix(name=%r, form=%s, matrix_type=%s, shape=%s, is_sparse=%s)' % (
+            self.name, self.form, self.matrix_type, self.shape, self.is_sparse)
+
+
+def _build_sparse_block(block, sparse_format):
+    """converts a block of a sparse matrix to the sparse_format"""
+    if sparse_format == 'coo':
+        return block.tocoo()
+    elif sparse_format == 'csr':
+        return block.tocsr()
+    return block.tocsc()
+
+
+class OP4SparseWriter(object):
+    """
+    Writes a sparse binary matrix to an OP4 one block of columns at a
+    time, so the full matrix never has to be in memory
+
+    .. code-block:: python
+
+      >>> with open('kaa.op4', 'wb') as op4_file:
+      ...     with OP4SparseWriter(op4_file, 'KAA', nrows, ncols, form=6) as writer:
+      ...         for block in column_blocks:
+      ...             writer.write_columns(block)
+
+    Each column is written as a record of "strings" (runs of
+    consecutive rows).  Like Nastran, BIGMAT is used for more than
+    65535 rows.
+    """
+    def __init__(self, op4_file, name, nrows, ncols, form=2, dtype='float64',
+                 precision='default', is_big_mat=False, endian='<'):
+        """
+        Writes the header of the matrix
+
+        Parameters
+        ----------
+        op4_file : file
+            a binary file opened for writing (more than one matrix may
+            be written to it)
+        name : str
+            the name of the matrix (8 characters max)
+        nrows / ncols : int
+            the shape of the matrix
+        form : int; default=2
+            the form of the matrix (see ``read_op4``)
+        dtype : str; default='float64'
+            the dtype of the matrix
+            {'float32', 'float64', 'complex64', 'complex128'}
+        precision : str; default='default'
+            Overwrite the default precision ('single', 'double', 'default')
+        is_big_mat : bool; default=False
+            use the 2 word string header
+        endian : str; default='<'
+            the endian of the file
+
+        """
+        if form not in (1, 2, 3, 6, 8, 9):
+            raise ValueError('form=%r and must be in [1, 2, 3, 6, 8, 9]' % form)
+        if precision not in ('single', 'double', 'default'):
+            msg = "precision=%r and must be 'single', 'double', or 'default'" % precision
+            raise ValueError(msg)
+        if len(name) > 8:
+            raise ValueError('name=%r is too long; 8 characters max' % name)
+
+        self.op4_file = op4_file
+        self.name = name
+        self.nrows = nrows
+        self.ncols = ncols
+        self.form = form
+        self.is_big_mat = is_big_mat or nrows > 65535
+        self.endian = endian
+        self.matrix_type = _get_type_nwv(np.zeros(1, dtype=dtype), precision)[0]
+
+        #: the dtype of the values in the file
+        self.value_dtype = endian + SPARSE_VALUE_DTYPES[self.matrix_type]
+        self.nwords_per_value = np.dtype(self.value_dtype).itemsize // 4
+
+        #: the next column (0-based) that can be written
+        self.icol = 0
+        self.is_closed = False
+
+        nrows_header = -nrows if self.is_big_mat else nrows
+        name_bytes = ('%-8s' % name).encode('ascii')
+        op4_file.write(pack(endian + '5i8si', 24, ncols, nrows_header, form,
+                            self.matrix_type, name_bytes, 24))
+
+    def write_columns(self, A, icol=None):
+        """
+        Writes a block of columns
+
+        Parameters
+        ----------
+        A : (nrows, ncols_block) csc_matrix / sparse matrix / ndarray
+            the columns
+        icol : int; default=None -> the next column
+            the 0-based column of the first column in the block; the
+            columns must be written in order, but may be skipped
+
+        """
+        if self.is_closed:
+            raise RuntimeError('the OP4 matrix %r is closed' % self.name)
+        if icol is None:
+            icol = self.icol
+        # sum_duplicates works in place, so don't modify the caller's matrix
+        A = csc_matrix(A, copy=True)
+        nrows, ncols_block = A.shape
+        if nrows != self.nrows:
+            raise ValueError('nrows=%s and must be %s' % (nrows, self.nrows))
+        if icol < self.icol or icol + ncols_block > self.ncols:
+            raise ValueError('columns=[%s, %s) must be after column %s and less '
+                             'than ncols=%s' % (icol, icol + ncols_block, self.icol,
+                                                self.ncols))
+        self.icol = icol + ncols_block
+
+        A.sum_duplicates()
+        nvalues = A.nnz
+        if nvalues == 0:
+            return
+        rows = A.indices.astype('int64')
+        cols = np.repeat(np.arange(ncols_block, dtype='int64'), np.diff(A.indptr))
+        words = _get_sparse_record_words(rows, cols + icol, A.data, self.is_big_mat,
+                                         self.value_dtype, self.endian)
+        self.op4_file.write(words.tobytes())
+
+    def close(self):
+        """writes the end of the matrix"""
+        if self.is_closed:
+            return
+        if self.matrix_type in [1, 3]:
+            msg = pack(self.endian + '4ifi', 16, self.ncols + 1, 1, 1, 1.0, 16)
+        else:
+            msg = pack(self.endian + '4idi', 20, self.ncols + 1, 1, 1, 1.0, 20)
+        self.op4_file.write(msg)
+        self.is_closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+
 def _write_sparse_matrix_ascii(op4, name, A, form=2, is_big_mat=False,
                                precision='default'):
     """
@@ -1807,6 +2295,317 @@ def _write_sparse_matrix_ascii(op4, name, A, form=2, is_big_mat=False,
     op4.write('%8i%8i%8i\n' % (ncols + 1, 1, 1))
     op4.write(' 1.0000000000000000E+00\n')
 
+def _get_sparse_record_words(rows, cols, values, is_big_mat, value_dtype, endian):
+    """
+    Creates the column records of a sparse binary matrix
+
+    Parameters
+    ----------
+    rows / cols : (nvalues, ) int ndarray
+        the 0-based row/column of each value, sorted by column and row
+    values : (nvalues, ) ndarray
+        the values
+    is_big_mat : bool
+        use the 2 word string header; the small string header limits a
+        string to 32766 words, so longer strings are split
+    value_dtype : str
+        the dtype of the values in the file (e.g., '<f8')
+    endian : str
+        the endian of the file
+
+    Returns
+    -------
+    words : (nwords, ) int32 ndarray
+        the records, including the leading/trailing record lengths
+
+    """
+    nvalues = len(rows)
+    nwords_per_value = np.dtype(value_dtype).itemsize // 4
+    nheader_words = 2 if is_big_mat else 1
+
+    # a string starts at a new column or a skipped row
+    is_start = np.ones(nvalues, dtype='bool')
+    is_start[1:] = (cols[1:] != cols[:-1]) | (rows[1:] != rows[:-1] + 1)
+    if not is_big_mat:
+        # IS = irow + 65536 * (L + 1) has to fit in an int32
+        nvalues_max = 32766 // nwords_per_value
+        istart = np.where(is_start)[0]
+        irun = np.cumsum(is_start) - 1
+        is_start = (np.arange(nvalues) - istart[irun]) % nvalues_max == 0
+
+    istring_start = np.where(is_start)[0]
+    nvalues_string = np.diff(np.hstack([istring_start, nvalues]))
+    string_cols = cols[istring_start]
+    nwords_string = nheader_words + nvalues_string * nwords_per_value
+
+    # the columns with values; a record is [length, icol, 0, nwords, strings, length]
+    ucols, icol_first_string = np.unique(string_cols, return_index=True)
+    icol_string = np.searchsorted(ucols, string_cols)
+    nwords_col = np.bincount(icol_string, weights=nwords_string).astype('int64')
+    nwords_record = nwords_col + 5
+    irecord_start = np.zeros(len(ucols), dtype='int64')
+    irecord_start[1:] = np.cumsum(nwords_record)[:-1]
+
+    words = np.zeros(int(nwords_record.sum()), dtype=endian + 'i4')
+    record_length = 12 + 4 * nwords_col
+    words[irecord_start] = record_length
+    words[irecord_start + 1] = ucols + 1
+    words[irecord_start + 3] = nwords_col
+    words[irecord_start + nwords_record - 1] = record_length
+
+    # the position of each string in its record
+    nwords_before = np.zeros(len(istring_start), dtype='int64')
+    nwords_before[1:] = np.cumsum(nwords_string)[:-1]
+    iword_string = (irecord_start[icol_string] + 4 +
+                    nwords_before - nwords_before[icol_first_string][icol_string])
+
+    irow_string = rows[istring_start] + 1
+    nwords_values = nvalues_string * nwords_per_value
+    if is_big_mat:
+        words[iword_string] = nwords_values + 1
+        words[iword_string + 1] = irow_string
+    else:
+        words[iword_string] = irow_string + 65536 * (nwords_values + 1)
+
+    # the first word of each value
+    iword_value = (np.repeat(iword_string + nheader_words - istring_start * nwords_per_value,
+                             nvalues_string) +
+                   np.arange(nvalues) * nwords_per_value)
+    value_words = np.asarray(values).astype(value_dtype).view(endian + 'i4')
+    value_words = value_words.reshape(nvalues, nwords_per_value)
+    for iword in range(nwords_per_value):
+        words[iword_value + iword] = value_words[:, iword]
+    return words
+
+
+def _get_sparse_strings(words, icols, istarts, iends, is_big_mat, nwords_per_value):
+    """
+    Parses the string headers of all the columns of a sparse matrix
+
+    The strings of a column have to be found one after another, so the
+    columns are stepped through together (one string per column at a
+    time) instead of looping over every string.
+
+    Parameters
+    ----------
+    words : (nwords, ) int32 ndarray
+        the data of the column records
+    icols : (ncolumns, ) int ndarray
+        the 1-based column id of each record
+    istarts / iends : (ncolumns, ) int ndarray
+        the word range of the strings of each record
+    is_big_mat : bool
+        the strings have a 2 word header
+    nwords_per_value : int
+        the number of words per value
+
+    Returns
+    -------
+    strings : dict[str] = (nstrings, ) int ndarray
+        the strings in column order
+        icol : the 1-based column id
+        irow : the 1-based row of the first value
+        nvalues : the number of values
+        iword : the first word of the values
+
+    """
+    nheader_words = 2 if is_big_mat else 1
+    positions = istarts.copy()
+    active = np.where(positions < iends)[0]
+
+    irecord_list = []
+    irow_list = []
+    nvalues_list = []
+    iword_list = []
+    istring_list = []
+    istring = 0
+    while len(active):
+        iword = positions[active]
+        if is_big_mat:
+            nwords = words[iword].astype('int64') - 1
+            irow = words[iword + 1].astype('int64')
+        else:
+            IS = words[iword].astype('int64')
+            nwords = IS // 65536 - 1
+            irow = IS - 65536 * (nwords + 1)
+        if nwords.min() < 0:
+            raise RuntimeError('invalid sparse string header; L=%s' % nwords.min())
+
+        irecord_list.append(active)
+        irow_list.append(irow)
+        nvalues_list.append(nwords // nwords_per_value)
+        iword_list.append(iword + nheader_words)
+        istring_list.append(np.full(len(active), istring, dtype='int64'))
+
+        positions[active] = iword + nheader_words + nwords
+        if np.any(positions[active] > iends[active]):
+            raise RuntimeError('a sparse string is longer than its column record')
+        active = active[positions[active] < iends[active]]
+        istring += 1
+
+    if irecord_list:
+        # sort by column record, then by string
+        irecord = np.hstack(irecord_list)
+        isort = np.lexsort((np.hstack(istring_list), irecord))
+        strings = {
+            'icol' : icols[irecord[isort]],
+            'irow' : np.hstack(irow_list)[isort],
+            'nvalues' : np.hstack(nvalues_list)[isort],
+            'iword' : np.hstack(iword_list)[isort],
+        }
+    else:
+        strings = {key : np.zeros(0, dtype='int64')
+                   for key in ['icol', 'irow', 'nvalues', 'iword']}
+    return strings
+
+
+def _get_sparse_values(words, strings, nrows, nwords_per_value, value_dtype, dtype,
+                       chunk_size=1000000):
+    """
+    Gathers the values of the strings
+
+    A value may start on any word, so the words are viewed as values
+    at each word offset (e.g., 0 and 1 for a double) and each value is
+    taken from the view that it's aligned with.
+
+    Parameters
+    ----------
+    words : (nwords, ) int32 ndarray
+        the data of the column records
+    strings : dict[str] = (nstrings, ) int ndarray
+        the strings from ``_get_sparse_strings``
+    nrows : int
+        the number of rows in the matrix
+    nwords_per_value : int
+        the number of words per value
+    value_dtype : str
+        the dtype of the values in the file (e.g., '<f8')
+    dtype : str
+        the dtype of the matrix
+    chunk_size : int; default=1000000
+        the number of values that are gathered at once, which limits
+        the size of the temporary index arrays
+
+    Returns
+    -------
+    rows : (nvalues, ) int ndarray
+        the 0-based row of each value
+    cols : (nvalues, ) int ndarray
+        the 0-based column of each value
+    values : (nvalues, ) ndarray
+        the values
+
+    """
+    nvalues = strings['nvalues']
+    nvalues_total = int(nvalues.sum())
+    index_dtype = 'int32' if max(nrows, nvalues_total) < 2**31 - 1 else 'int64'
+    rows = np.zeros(nvalues_total, dtype=index_dtype)
+    cols = np.zeros(nvalues_total, dtype=index_dtype)
+    values = np.zeros(nvalues_total, dtype=dtype)
+    if nvalues_total == 0:
+        return rows, cols, values
+
+    nbytes = words.size * 4
+    word_bytes = words.view('uint8')
+    views = []
+    for ioffset in range(nwords_per_value):
+        nvalues_view = (nbytes - 4 * ioffset) // (4 * nwords_per_value)
+        views.append(np.frombuffer(word_bytes, dtype=value_dtype, count=nvalues_view,
+                                   offset=4 * ioffset))
+
+    # the first value of each string in the output
+    ivalue_starts = np.zeros(len(nvalues) + 1, dtype='int64')
+    np.cumsum(nvalues, out=ivalue_starts[1:])
+
+    istring0 = 0
+    nstrings = len(nvalues)
+    while istring0 < nstrings:
+        # group the strings, so the temporary arrays have ~chunk_size values
+        istring1 = np.searchsorted(ivalue_starts, ivalue_starts[istring0] + chunk_size,
+                                   side='right') - 1
+        istring1 = min(max(istring1, istring0 + 1), nstrings)
+        ivalue0 = ivalue_starts[istring0]
+        ivalue1 = ivalue_starts[istring1]
+
+        nvaluesi = nvalues[istring0:istring1]
+        istring = np.repeat(np.arange(istring0, istring1), nvaluesi)
+        ivalue_in_string = np.arange(ivalue0, ivalue1) - ivalue_starts[istring]
+
+        rows[ivalue0:ivalue1] = strings['irow'][istring] - 1 + ivalue_in_string
+        cols[ivalue0:ivalue1] = strings['icol'][istring] - 1
+        iword = strings['iword'][istring] + ivalue_in_string * nwords_per_value
+        del istring, ivalue_in_string
+
+        valuesi = values[ivalue0:ivalue1]
+        ioffset = iword % nwords_per_value
+        for ioffseti, view in enumerate(views):
+            i = np.where(ioffset == ioffseti)[0]
+            if len(i):
+                valuesi[i] = view[(iword[i] - ioffseti) // nwords_per_value]
+        istring0 = istring1
+
+    if len(rows) and (rows.min() < 0 or rows.max() >= nrows):
+        raise RuntimeError('invalid sparse row; nrows=%s rows=[%s, %s]' % (
+            nrows, rows.min(), rows.max()))
+    return rows, cols, values
+
+
+def _build_sparse_matrix(rows, cols, values, strings, nrows, ncols, dtype, sparse_format):
+    """
+    Creates the sparse matrix in the requested format
+
+    Parameters
+    ----------
+    rows / cols / values : (nvalues, ) ndarray
+        the values from ``_get_sparse_values``
+    strings : dict[str] = (nstrings, ) int ndarray
+        the strings from ``_get_sparse_strings``
+    nrows / ncols : int
+        the shape of the matrix
+    dtype : str
+        the dtype of the matrix
+    sparse_format : str
+        {'coo', 'csc', 'csr'}
+
+    Returns
+    -------
+    A : coo_matrix / csc_matrix / csr_matrix
+        the matrix
+
+    """
+    if sparse_format == 'coo':
+        return coo_matrix((values, (rows, cols)), shape=(nrows, ncols), dtype=dtype)
+
+    icol = strings['icol']
+    if len(icol) and (icol.min() < 1 or icol.max() > ncols or np.any(np.diff(icol) < 0)):
+        # the columns aren't in order, so let scipy sort them
+        A = coo_matrix((values, (rows, cols)), shape=(nrows, ncols), dtype=dtype).tocsc()
+    else:
+        # the values are in column order, so the column pointer is a
+        # sum of the column lengths
+        indptr = np.zeros(ncols + 1, dtype=rows.dtype)
+        column_lengths = np.bincount(icol - 1, weights=strings['nvalues'], minlength=ncols)
+        indptr[1:] = np.cumsum(column_lengths.astype('int64'))
+        A = csc_matrix((values, rows, indptr), shape=(nrows, ncols), dtype=dtype)
+    if sparse_format == 'csr':
+        A = A.tocsr()
+    return A
+
+
+def _is_matrix_name(name, matrix_names):
+    """
+    Is the matrix selected?
+
+    The names in a binary OP4 are bytes in Python 3, so a matrix may be
+    selected by the bytes or str name.
+    """
+    if matrix_names is None:
+        return True
+    if name in matrix_names:
+        return True
+    return not isinstance(name, str) and name.decode('latin1') in matrix_names
+
+
 def get_big_mat_nrows(nrows):
     """
     Parameters
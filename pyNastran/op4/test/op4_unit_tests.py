@@ -2,12 +2,13 @@
 from __future__ import print_function
 import os
 import unittest
-from six import iteritems, PY2
+from six import iteritems, PY2, PY3
 
 import numpy as np
 from numpy import ones, reshape, arange
 from numpy import ndarray, eye, array_equal, zeros
-from pyNastran.op4.op4 import OP4, read_op4
+from scipy.sparse import csc_matrix
+from pyNastran.op4.op4 import OP4, OP4SparseWriter, read_op4, read_op4_directory
 
 import pyNastran.op4.test
 OP4_PATH = pyNastran.op4.test.__path__[0]
@@ -189,6 +190,130 @@ class TestOP4(unittest.TestCase):
                           is_binary=True)
         os.remove(op4_filename)
 
+    def test_sparse_format(self):
+        """tests the coo/csc/csr sparse matrices with/without use_mmap"""
+        for fname in ['mat_b_s1.op4', 'mat_b_s2.op4']:
+            op4_filename = os.path.join(OP4_PATH, fname)
+            matrices_coo = read_op4(op4_filename, sparse_format='coo', debug=False)
+            for sparse_format in ['coo', 'csc', 'csr']:
+                for use_mmap in [False, True]:
+                    op4 = OP4(debug=False)
+                    op4.use_mmap = use_mmap
+                    matrices = op4.read_op4(op4_filename, sparse_format=sparse_format)
+                    self.assertEqual(sorted(matrices), sorted(matrices_coo))
+                    for name, (form, matrix) in sorted(iteritems(matrices)):
+                        form_coo, matrix_coo = matrices_coo[name]
+                        self.assertEqual(form, form_coo)
+                        if isinstance(matrix, ndarray):
+                            self.assertTrue(array_equal(matrix, matrix_coo))
+                            continue
+                        self.assertEqual(matrix.format, sparse_format)
+                        self.assertEqual(matrix.shape, matrix_coo.shape)
+                        self.assertEqual(matrix.dtype, matrix_coo.dtype)
+                        self.assertTrue(array_equal(matrix.toarray(), matrix_coo.toarray()))
+
+        with self.assertRaises(ValueError):
+            read_op4(op4_filename, sparse_format='dok', debug=False)
+
+    def test_op4_directory(self):
+        """tests the lazy matrices and reading only some of the matrices"""
+        for fname in ['mat_b_dn.op4', 'mat_b_s1.op4', 'mat_b_s2.op4']:
+            op4_filename = os.path.join(OP4_PATH, fname)
+            matrices = read_op4(op4_filename, debug=False)
+            for use_mmap in [False, True]:
+                directory = read_op4_directory(op4_filename, debug=False, use_mmap=use_mmap)
+                self.assertEqual(sorted(directory), sorted(matrices))
+                self._check_op4_directory(directory, matrices)
+
+            # the names are bytes in Python 3, but either works
+            matrices = read_op4(op4_filename, matrix_names=['EYE10', 'NULL'], debug=False)
+            self.assertEqual(len(matrices), 2)
+
+        with self.assertRaises(NotImplementedError):
+            read_op4_directory(os.path.join(OP4_PATH, 'mat_t_dn.op4'), debug=False)
+
+    def _check_op4_directory(self, directory, matrices):
+        """the lazy matrices are the same as the matrices from read_op4"""
+        for name, (form, matrix) in sorted(iteritems(matrices)):
+            if not isinstance(matrix, ndarray):
+                matrix = matrix.toarray()
+            op4_matrix = directory[name]
+            self.assertEqual(op4_matrix.form, form)
+            self.assertEqual(op4_matrix.shape, matrix.shape)
+            self.assertFalse(op4_matrix.is_loaded)
+            for icol in range(op4_matrix.ncols):
+                self.assertTrue(array_equal(op4_matrix.get_column(icol), matrix[:, icol]))
+
+            rows = [op4_matrix.nrows - 1, 0]
+            cols = [op4_matrix.ncols - 1, 0, op4_matrix.ncols - 1]
+            block = op4_matrix.get_block(rows, cols)
+            if not isinstance(block, ndarray):
+                block = block.toarray()
+            self.assertTrue(array_equal(block, matrix[np.ix_(rows, cols)]))
+
+            matrix2 = op4_matrix.load()
+            if not isinstance(matrix2, ndarray):
+                matrix2 = matrix2.toarray()
+            self.assertTrue(op4_matrix.is_loaded)
+            self.assertTrue(array_equal(matrix2, matrix))
+
+    def test_write_sparse_binary(self):
+        """tests writing sparse binary matrices a block of columns at a time"""
+        op4 = OP4(debug=False)
+        op4_filename = os.path.join(OP4_PATH, 'sparse_binary.op4')
+        for dtype in ['float32', 'float64', 'complex64', 'complex128']:
+            # 70000 rows is a BIGMAT and the 40000 row column has strings
+            # that are too long for the small string header
+            for nrows in [10, 40000, 70000]:
+                A = zeros((nrows, 8), dtype=dtype)
+                A[0, 0] = 1.
+                A[2:5, 0] = 2.
+                A[:, 3] = arange(nrows) + 1.
+                A[nrows - 1, 7] = 3.
+                if dtype.startswith('complex'):
+                    A[1, 1] = 1. + 2.j
+
+                with open(op4_filename, 'wb') as op4_file:
+                    writer = OP4SparseWriter(op4_file, 'A', nrows, 9, form=2, dtype=dtype)
+                    with writer:
+                        writer.write_columns(csc_matrix(A[:, :2]))
+                        writer.write_columns(A[:, 2:5])
+                        writer.write_columns(csc_matrix(A[:, 5:]), icol=6)
+                    op4.write_op4(op4_file, {'B': (6, csc_matrix(A))}, is_binary=True)
+
+                matrices = read_op4(op4_filename, debug=False)
+                expected = zeros((nrows, 9), dtype=dtype)
+                expected[:, :5] = A[:, :5]
+                expected[:, 6:] = A[:, 5:]
+                form, A2 = matrices[b'A' if PY3 else 'A']
+                self.assertEqual(form, 2)
+                self.assertEqual(A2.dtype, np.dtype(dtype))
+                self.assertTrue(array_equal(A2.toarray(), expected))
+                form, B2 = matrices[b'B' if PY3 else 'B']
+                self.assertEqual(form, 6)
+                self.assertTrue(array_equal(B2.toarray(), A))
+
+        column_blocks = (csc_matrix(A[:, icol:icol + 3]) for icol in range(0, 8, 3))
+        op4.write_op4_sparse(op4_filename, 'C', column_blocks, nrows, 8, dtype=A.dtype)
+        form, C = read_op4(op4_filename, debug=False)[b'C' if PY3 else 'C']
+        self.assertTrue(array_equal(C.toarray(), A))
+
+        # the duplicate entries are summed without modifying the matrix
+        D = csc_matrix((np.array([1., 2., 3.]), np.array([0, 0, 1]),
+                        np.array([0, 2, 3])), shape=(2, 2))
+        op4.write_op4_sparse(op4_filename, 'D', [D], 2, 2)
+        self.assertEqual(D.nnz, 3)
+        self.assertFalse(D.has_canonical_format)
+        form, D2 = read_op4(op4_filename, debug=False)[b'D' if PY3 else 'D']
+        self.assertTrue(array_equal(D2.toarray(), [[3., 0.], [0., 3.]]))
+
+        with open(op4_filename, 'wb') as op4_file:
+            writer = OP4SparseWriter(op4_file, 'A', nrows, 8)
+            writer.write_columns(A[:, 4:6], icol=4)
+            with self.assertRaises(ValueError):
+                writer.write_columns(A[:, 1:2], icol=1)
+        os.remove(op4_filename)
+
     def test_square_matrices_1(self):
         """tests reading/writing square matrices (A1, A2, A3)"""
         op4 = OP4(debug=False)